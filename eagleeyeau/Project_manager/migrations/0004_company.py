@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_company(apps, schema_editor):
+    """Copy each project's company from its estimate, falling back to its creator"""
+    User = apps.get_model('authentication', 'User')
+    Project = apps.get_model('Project_manager', 'Project')
+    Estimate = apps.get_model('estimator', 'Estimate')
+
+    Project.objects.filter(company__isnull=True).update(
+        company=models.Subquery(
+            Estimate.objects.filter(pk=models.OuterRef('estimate')).values('company')[:1]
+        )
+    )
+    Project.objects.filter(company__isnull=True, created_by__isnull=False).update(
+        company=models.Subquery(
+            User.objects.filter(pk=models.OuterRef('created_by')).values('company')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Project_manager', '0003_projectdocument'),
+        ('authentication', '0002_company'),
+        ('estimator', '0003_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='projects', to='authentication.company'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['company', 'status'], name='Project_man_company_c6cb03_idx'),
+        ),
+        migrations.RunPython(backfill_company, migrations.RunPython.noop),
+    ]
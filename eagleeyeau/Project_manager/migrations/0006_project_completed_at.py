@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+def backfill_completed_at(apps, schema_editor):
+    """Completed projects have no better completion time than their last update"""
+    Project = apps.get_model('Project_manager', 'Project')
+    Project.objects.filter(status='completed', completed_at__isnull=True).update(
+        completed_at=models.F('updated_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Project_manager', '0005_project_status_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, help_text='When the project last became completed', null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='Project_man_status_5b0542_idx',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'completed_at'], name='Project_man_status_b8aa19_idx'),
+        ),
+    ]
@@ -1,9 +1,48 @@
 from django.db import models
 from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from estimator.models import Estimate
+from eagleeyeau.tenancy import TenantOwnedMixin, TenantQuerySet
 
 
-class Project(models.Model):
+def _task_count_subquery(count_expression=None, **task_filters):
+    """Correlated COUNT over a project's tasks, independent of outer joins."""
+    tasks = Task.objects.filter(project=OuterRef('pk'), **task_filters)
+    counted = tasks.order_by().values('project').annotate(
+        c=count_expression or Count('pk')
+    ).values('c')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+class ProjectQuerySet(TenantQuerySet):
+    """
+    Project queryset with reusable task-count annotations.
+    
+    Serializers read these annotations when present so list endpoints run a
+    constant number of queries instead of several COUNTs per project.
+    """
+    
+    def with_task_counts(self):
+        """Annotate tasks_count, completed_tasks and assigned_employees_count."""
+        return self.annotate(
+            tasks_count=_task_count_subquery(),
+            completed_tasks=_task_count_subquery(status='completed'),
+            assigned_employees_count=_task_count_subquery(
+                Count('assigned_employee', distinct=True),
+                assigned_employee__isnull=False,
+            ),
+        )
+    
+    def with_employee_task_counts(self, employee):
+        """Annotate assigned_tasks_count for a single employee."""
+        return self.annotate(
+            assigned_tasks_count=_task_count_subquery(assigned_employee=employee),
+        )
+
+
+class Project(TenantOwnedMixin, models.Model):
     """
     Project model created from an approved Estimate.
     Project Manager can manage projects and add tasks.
@@ -43,20 +82,43 @@ class Project(models.Model):
     # Management
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_projects')
     assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_projects')
+    company = models.ForeignKey('authentication.Company', on_delete=models.SET_NULL, null=True, blank=True, related_name='projects')
     
     # Tracking
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True, help_text="When the project last became completed")
+    
+    objects = ProjectQuerySet.as_manager()
+    
+    # A project belongs to the company its estimate was prepared for
+    tenant_source = 'estimate'
     
     class Meta:
         ordering = ['-creating_date']
         indexes = [
+            models.Index(fields=['company', 'status']),
             models.Index(fields=['status']),
             models.Index(fields=['-creating_date']),
+            # Month-bucketed revenue of completed projects (admindashboard.analytics)
+            models.Index(fields=['status', 'completed_at']),
         ]
     
     def __str__(self):
         return f"{self.project_name} - {self.client_name}"
+    
+    def save(self, *args, **kwargs):
+        # Stamp the completion time once when the project becomes completed, and
+        # clear it when it is reopened; later edits leave it alone
+        completed_at = self.completed_at
+        if self.status == 'completed':
+            self.completed_at = completed_at or timezone.now()
+        else:
+            self.completed_at = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.completed_at != completed_at:
+            kwargs['update_fields'] = {*update_fields, 'completed_at'}
+        super().save(*args, **kwargs)
 
 
 class ProjectDocument(models.Model):
@@ -169,6 +231,18 @@ class Task(models.Model):
     
     def __str__(self):
         return f"{self.task_name} - {self.project.project_name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded status/project so signals can skip no-op saves"""
+        instance = super().from_db(db, field_names, values)
+        instance._remember_status_state()
+        return instance
+    
+    def _remember_status_state(self):
+        deferred = self.get_deferred_fields()
+        self._loaded_status = None if 'status' in deferred else self.status
+        self._loaded_project_id = None if 'project_id' in deferred else self.project_id
 
 
 # ====================== SIGNALS FOR AUTOMATIC PROJECT STATUS UPDATE ======================
@@ -177,36 +251,31 @@ from django.dispatch import receiver
 
 
 @receiver(post_save, sender=Task)
-def update_project_status_on_task_save(sender, instance, created, **kwargs):
+def update_project_status_on_task_save(sender, instance, created, update_fields=None, **kwargs):
     """
     Automatically update project status when a task is saved.
     
-    Rules:
-    - If ANY task is 'in_progress', project becomes 'in_progress'
-    - If ALL tasks are 'completed', project becomes 'completed'
-    - If any task starts (not 'not_started'), project becomes 'in_progress'
+    Rules live in Project_manager/project_status.py. Saves that change neither
+    the task's status nor its project are skipped without touching the database.
     """
-    project = instance.project
-    all_tasks = project.tasks.all()
-    
-    if all_tasks.exists():
-        # Check if any task is in_progress
-        if all_tasks.filter(status='in_progress').exists():
-            if project.status != 'in_progress':
-                project.status = 'in_progress'
-                project.save()
-        
-        # Check if all tasks are completed
-        elif all_tasks.filter(status='completed').count() == all_tasks.count():
-            if project.status != 'completed':
-                project.status = 'completed'
-                project.save()
-        
-        # If no tasks are in progress and not all completed, check if any started
-        elif all_tasks.exclude(status='not_started').exists():
-            if project.status == 'not_started':
-                project.status = 'in_progress'
-                project.save()
+    from .project_status import schedule_project_status
+    
+    loaded_status = getattr(instance, '_loaded_status', None)
+    loaded_project_id = getattr(instance, '_loaded_project_id', None)
+    instance._remember_status_state()
+    
+    if update_fields is not None and not {'status', 'project', 'project_id'} & set(update_fields):
+        return
+    
+    project_changed = loaded_project_id is not None and loaded_project_id != instance.project_id
+    if not created and not project_changed and loaded_status is not None and loaded_status == instance.status:
+        return
+    
+    cached_project = instance.project if Task.project.is_cached(instance) else None
+    schedule_project_status(instance.project_id, cached_project)
+    
+    if project_changed:
+        schedule_project_status(loaded_project_id)
 
 
 @receiver(post_delete, sender=Task)
@@ -215,26 +284,8 @@ def update_project_status_on_task_delete(sender, instance, **kwargs):
     Automatically update project status when a task is deleted.
     Recalculates project status based on remaining tasks.
     """
-    try:
-        project = instance.project
-        all_tasks = project.tasks.all()
-        
-        if not all_tasks.exists():
-            # No tasks left, reset to not_started
-            if project.status not in ['cancelled', 'on_hold']:
-                project.status = 'not_started'
-                project.save()
-        else:
-            # Recalculate based on remaining tasks
-            if all_tasks.filter(status='in_progress').exists():
-                project.status = 'in_progress'
-                project.save()
-            elif all_tasks.filter(status='completed').count() == all_tasks.count():
-                project.status = 'completed'
-                project.save()
-            elif all_tasks.exclude(status='not_started').exists():
-                if project.status == 'not_started':
-                    project.status = 'in_progress'
-                    project.save()
-    except Project.DoesNotExist:
-        pass  # Project was already deleted
+    from .project_status import schedule_project_status
+    
+    # A missing project (cascade delete) is simply skipped
+    cached_project = instance.project if Task.project.is_cached(instance) else None
+    schedule_project_status(instance.project_id, cached_project)
@@ -0,0 +1,247 @@
+"""
+PDF export of project reports.
+
+Rendering goes through eagleeyeau.pdf_rendering, so it runs on a background
+thread and the result is cached on disk until the project, its tasks or its
+documents change.
+"""
+from io import BytesIO
+from datetime import datetime
+
+from django.db.models import Count, Max
+
+from eagleeyeau.pdf_rendering import make_fingerprint
+from eagleeyeau.status_counts import task_status_counts
+
+from .models import Project, ProjectDocument, Task
+
+
+def project_pdf_fingerprint(project):
+    """Values the project report depends on; any change renders a new file"""
+    tasks = Task.objects.filter(project_id=project.pk).order_by().aggregate(
+        count=Count('pk'), last_change=Max('updated_at')
+    )
+    documents = ProjectDocument.objects.filter(project_id=project.pk).order_by().aggregate(
+        count=Count('pk'), last_change=Max('updated_at')
+    )
+    return make_fingerprint(
+        project.pk,
+        project.updated_at.isoformat() if project.updated_at else '',
+        tasks['count'], tasks['last_change'],
+        documents['count'], documents['last_change'],
+    )
+
+
+def build_project_pdf(project_id):
+    """Generate a comprehensive PDF of the project with all information"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+
+    project = Project.objects.select_related('created_by', 'assigned_to').get(pk=project_id)
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1f4788'),
+        spaceAfter=12,
+        fontName='Helvetica-Bold'
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=13,
+        textColor=colors.HexColor('#2d5aa6'),
+        spaceAfter=8,
+        spaceBefore=10,
+        fontName='Helvetica-Bold'
+    )
+
+    # Title
+    elements.append(Paragraph(f"Project Report: {project.project_name}", title_style))
+    elements.append(Spacer(1, 0.15 * inch))
+
+    # ===== PROJECT DETAILS =====
+    elements.append(Paragraph("PROJECT DETAILS", heading_style))
+    project_data = [
+        ['Field', 'Value'],
+        ['Project Name', project.project_name or 'N/A'],
+        ['Client Name', project.client_name or 'N/A'],
+        ['Status', project.status.replace('_', ' ').title()],
+        ['Created Date', project.creating_date.strftime('%Y-%m-%d') if project.creating_date else 'N/A'],
+        ['Start Date', project.start_date.strftime('%Y-%m-%d') if project.start_date else 'N/A'],
+        ['End Date', project.end_date.strftime('%Y-%m-%d') if project.end_date else 'N/A'],
+        ['Total Amount', f"${project.total_amount:,.2f}"],
+        ['Estimated Cost', f"${project.estimated_cost:,.2f}"],
+        ['Created By', f"{project.created_by.first_name} {project.created_by.last_name}" if project.created_by else 'N/A'],
+        ['Assigned To', f"{project.assigned_to.first_name} {project.assigned_to.last_name}" if project.assigned_to else 'Unassigned'],
+    ]
+
+    project_table = Table(project_data, colWidths=[1.8*inch, 3.7*inch])
+    project_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')]),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    elements.append(project_table)
+    elements.append(Spacer(1, 0.2 * inch))
+
+    # ===== DESCRIPTION =====
+    if project.description:
+        elements.append(Paragraph("DESCRIPTION", heading_style))
+        elements.append(Paragraph(project.description, styles['BodyText']))
+        elements.append(Spacer(1, 0.15 * inch))
+
+    # ===== ROOMS =====
+    if project.rooms:
+        elements.append(Paragraph("ROOMS INVOLVED", heading_style))
+        rooms_text = ', '.join(project.rooms) if isinstance(project.rooms, list) else str(project.rooms)
+        elements.append(Paragraph(rooms_text, styles['BodyText']))
+        elements.append(Spacer(1, 0.15 * inch))
+
+    # ===== TASKS SUMMARY =====
+    elements.append(Paragraph("TASKS SUMMARY", heading_style))
+    counts = task_status_counts(Task.objects.filter(project_id=project.pk))
+    task_count = counts['total']
+    completed_count = counts['status']['completed']
+    in_progress_count = counts['status']['in_progress']
+    not_started_count = counts['status']['not_started']
+    blocked_count = counts['status']['blocked']
+
+    task_summary_data = [
+        ['Status', 'Count'],
+        ['Total Tasks', str(task_count)],
+        ['Completed', str(completed_count)],
+        ['In Progress', str(in_progress_count)],
+        ['Not Started', str(not_started_count)],
+        ['Blocked', str(blocked_count)],
+    ]
+
+    task_table = Table(task_summary_data, colWidths=[2.5*inch, 2*inch])
+    task_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')]),
+    ]))
+    elements.append(task_table)
+    elements.append(Spacer(1, 0.2 * inch))
+
+    # ===== DETAILED TASKS LIST =====
+    if task_count > 0:
+        elements.append(Paragraph("DETAILED TASKS", heading_style))
+
+        tasks_list_data = [
+            ['Task', 'Room', 'Status', 'Priority', 'Assigned To', 'Due Date']
+        ]
+
+        tasks = Task.objects.filter(project_id=project.pk).select_related('assigned_employee')
+        for task in tasks.order_by('priority', 'due_date'):
+            assigned_to = task.assigned_employee.username if task.assigned_employee else 'Unassigned'
+            due_date = task.due_date.strftime('%Y-%m-%d') if task.due_date else 'N/A'
+
+            tasks_list_data.append([
+                task.task_name[:30],
+                task.room or 'N/A',
+                task.status.replace('_', ' ').title(),
+                task.priority.title(),
+                assigned_to,
+                due_date
+            ])
+
+        tasks_list_table = Table(tasks_list_data, colWidths=[1.4*inch, 1*inch, 1.1*inch, 0.9*inch, 1.1*inch, 1*inch])
+        tasks_list_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fafafa')]),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]))
+        elements.append(tasks_list_table)
+        elements.append(Spacer(1, 0.15 * inch))
+
+    # ===== DOCUMENTS =====
+    documents = list(
+        ProjectDocument.objects.filter(project_id=project.pk)
+        .select_related('uploaded_by').order_by('-uploaded_at')
+    )
+    if documents:
+        elements.append(Paragraph("DOCUMENTS", heading_style))
+
+        docs_data = [
+            ['Document Name', 'Uploaded By', 'Date']
+        ]
+
+        # Not named ``doc``: that would shadow the document template built below
+        for document in documents:
+            uploader = document.uploaded_by.username if document.uploaded_by else 'System'
+            date = document.uploaded_at.strftime('%Y-%m-%d %H:%M') if document.uploaded_at else 'N/A'
+
+            docs_data.append([
+                document.document_name[:35],
+                uploader,
+                date
+            ])
+
+        docs_table = Table(docs_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
+        docs_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fafafa')]),
+        ]))
+        elements.append(docs_table)
+        elements.append(Spacer(1, 0.15 * inch))
+
+    # ===== FOOTER =====
+    elements.append(Spacer(1, 0.3 * inch))
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.grey,
+        alignment=1
+    )
+    elements.append(Paragraph(
+        f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Lignaflow Project Management System",
+        footer_style
+    ))
+
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
@@ -0,0 +1,159 @@
+"""
+Project status engine.
+
+A project's status is derived from its tasks:
+- If ANY task is 'in_progress', project becomes 'in_progress'
+- If ALL tasks are 'completed', project becomes 'completed'
+- If any task has started (not 'not_started'), a 'not_started' project becomes 'in_progress'
+- If the project has no tasks left, it resets to 'not_started' (unless cancelled/on_hold)
+
+Task counts come from a single conditional aggregate, and the project row is
+only written when the derived status actually changes. Bulk operations can wrap
+their work in ``deferred_project_status()`` so each touched project is
+recomputed once, when the surrounding transaction commits.
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Project, Task
+
+
+_state = threading.local()
+
+TASK_COUNT_AGGREGATES = {
+    'total': Count('pk'),
+    'in_progress': Count('pk', filter=Q(status='in_progress')),
+    'completed': Count('pk', filter=Q(status='completed')),
+    'not_started': Count('pk', filter=Q(status='not_started')),
+}
+
+
+def derive_project_status(current_status, counts):
+    """Return the status a project should have given its task counts."""
+    total = counts.get('total') or 0
+
+    if total == 0:
+        if current_status in ['cancelled', 'on_hold']:
+            return current_status
+        return 'not_started'
+
+    if counts.get('in_progress'):
+        return 'in_progress'
+    if counts.get('completed') == total:
+        return 'completed'
+    if counts.get('not_started', 0) < total and current_status == 'not_started':
+        return 'in_progress'
+    return current_status
+
+
+def recompute_project_status(project):
+    """
+    Recompute and persist a single project's status.
+
+    Returns True if the status changed. The passed instance is updated in
+    place so callers can read ``project.status`` afterwards.
+    """
+    counts = Task.objects.filter(project_id=project.pk).order_by().aggregate(**TASK_COUNT_AGGREGATES)
+    new_status = derive_project_status(project.status, counts)
+    if new_status == project.status:
+        return False
+
+    project.status = new_status
+    project.save(update_fields=['status', 'updated_at'])
+    return True
+
+
+def recompute_project_statuses(project_ids):
+    """
+    Recompute the status of many projects with one grouped aggregate.
+
+    Projects are updated with one UPDATE per resulting status. Returns the
+    number of projects whose status changed.
+    """
+    project_ids = set(project_ids)
+    if not project_ids:
+        return 0
+
+    counts_by_project = {
+        row.pop('project_id'): row
+        for row in Task.objects.filter(project_id__in=project_ids).order_by()
+        .values('project_id').annotate(**TASK_COUNT_AGGREGATES)
+    }
+
+    changes = {}
+    companies = set()
+    projects = Project.objects.filter(id__in=project_ids).values_list('id', 'status', 'company_id')
+    for project_id, current_status, company_id in projects:
+        new_status = derive_project_status(current_status, counts_by_project.get(project_id, {}))
+        if new_status != current_status:
+            changes.setdefault(new_status, []).append(project_id)
+            companies.add(company_id)
+
+    now = timezone.now()
+    changed = 0
+    for new_status, ids in changes.items():
+        # Queryset updates skip Project.save(), so stamp completed_at here too
+        completed_at = now if new_status == 'completed' else None
+        changed += Project.objects.filter(id__in=ids).update(
+            status=new_status, updated_at=now, completed_at=completed_at
+        )
+
+    if changed:
+        # Queryset updates send no signals; drop the companies' cached dashboards explicitly
+        from eagleeyeau.dashboard_cache import invalidate_dashboards_on_commit
+        invalidate_dashboards_on_commit(*companies)
+    return changed
+
+
+def schedule_project_status(project_id, project=None):
+    """
+    Recompute a project's status now, or queue it when deferred mode is active.
+
+    Pass an already loaded ``project`` to have it updated in place; otherwise
+    it is fetched only when recomputing immediately. Returns True if the
+    status was recomputed immediately and changed.
+    """
+    pending = getattr(_state, 'pending', None)
+    if pending is not None:
+        pending.add(project_id)
+        return False
+
+    if project is None:
+        project = Project.objects.filter(pk=project_id).first()
+        if project is None:
+            return False
+    return recompute_project_status(project)
+
+
+@contextmanager
+def deferred_project_status():
+    """
+    Defer project status recomputation for bulk task changes.
+
+    Every project touched inside the block is recomputed exactly once when the
+    current transaction commits (immediately if not in a transaction). Nested
+    blocks join the outermost one. Nothing is scheduled if the block raises.
+
+    Usage:
+        with transaction.atomic(), deferred_project_status():
+            for task in tasks:
+                task.save()
+    """
+    if getattr(_state, 'pending', None) is not None:
+        yield
+        return
+
+    _state.pending = set()
+    try:
+        yield
+        project_ids = _state.pending
+    finally:
+        _state.pending = None
+
+    if project_ids:
+        transaction.on_commit(partial(recompute_project_statuses, project_ids))
@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from eagleeyeau.sparse_fields import SparseFieldsMixin
 from authentication.models import User
 from timesheet.models import TimeEntry
 from .models import Project, Task, ProjectDocument
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Employee users"""
     full_name = serializers.SerializerMethodField()
     
@@ -33,7 +34,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return f"{obj.first_name} {obj.last_name}".strip()
 
 
-class TimeEntrySerializer(serializers.ModelSerializer):
+class TimeEntrySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for TimeEntry"""
     employee_name = serializers.CharField(source='user.get_full_name', read_only=True)
     employee_email = serializers.CharField(source='user.email', read_only=True)
@@ -67,7 +68,7 @@ class TimeEntrySerializer(serializers.ModelSerializer):
         return obj.get_working_hours()
 
 
-class EmployeeTimesheetDetailSerializer(serializers.Serializer):
+class EmployeeTimesheetDetailSerializer(SparseFieldsMixin, serializers.Serializer):
     """Serializer for detailed employee timesheet with all info"""
     employee = EmployeeSerializer(read_only=True)
     timesheet_entries = TimeEntrySerializer(many=True, read_only=True)
@@ -88,7 +89,7 @@ class EmployeeTimesheetDetailSerializer(serializers.Serializer):
         return f"{hours}h {minutes}m"
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Task - assigned_employee_id accepts User ID and validates Employee role"""
     assigned_employee_id = serializers.IntegerField(
         write_only=True, 
@@ -144,9 +145,11 @@ class TaskSerializer(serializers.ModelSerializer):
         if value is None:
             return None  # Allow None (unassigned tasks)
         
+        # Bulk requests pass every referenced user in the context, loaded in one query
+        employees = self.context.get('employees')
         try:
-            user = User.objects.get(id=value)
-        except User.DoesNotExist:
+            user = employees[value] if employees is not None else User.objects.get(id=value)
+        except (KeyError, User.DoesNotExist):
             raise serializers.ValidationError(
                 f"User with ID {value} not found."
             )
@@ -232,7 +235,40 @@ class TaskSerializer(serializers.ModelSerializer):
         return None
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectTaskCountsMixin:
+    """
+    Task-count getters that read ProjectQuerySet annotations.
+    
+    Falls back to a COUNT query when the instance was loaded without
+    ``with_task_counts()`` (e.g. right after create/update).
+    """
+    
+    def _tasks_count(self, obj):
+        value = getattr(obj, 'tasks_count', None)
+        if value is None:
+            value = obj.tasks.count()
+        return value
+    
+    def _completed_tasks(self, obj):
+        value = getattr(obj, 'completed_tasks', None)
+        if value is None:
+            value = obj.tasks.filter(status='completed').count()
+        return value
+    
+    def _assigned_employees_count(self, obj):
+        value = getattr(obj, 'assigned_employees_count', None)
+        if value is None:
+            value = obj.tasks.filter(assigned_employee__isnull=False).values('assigned_employee').distinct().count()
+        return value
+    
+    def _progress(self, obj):
+        total_tasks = self._tasks_count(obj)
+        if total_tasks == 0:
+            return 0
+        return int((self._completed_tasks(obj) / total_tasks) * 100)
+
+
+class ProjectListSerializer(SparseFieldsMixin, ProjectTaskCountsMixin, serializers.ModelSerializer):
     """Serializer for Project list view"""
     tasks_count = serializers.SerializerMethodField()
     assigned_employees_count = serializers.SerializerMethodField()
@@ -259,11 +295,11 @@ class ProjectListSerializer(serializers.ModelSerializer):
         ]
     
     def get_tasks_count(self, obj):
-        return obj.tasks.count()
+        return self._tasks_count(obj)
     
     def get_assigned_employees_count(self, obj):
         """Get count of unique employees assigned to tasks"""
-        return obj.tasks.filter(assigned_employee__isnull=False).values('assigned_employee').distinct().count()
+        return self._assigned_employees_count(obj)
     
     def get_created_by_name(self, obj):
         if obj.created_by:
@@ -276,7 +312,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
         return None
 
 
-class ProjectDocumentSerializer(serializers.ModelSerializer):
+class ProjectDocumentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for ProjectDocument"""
     uploaded_by_name = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
@@ -326,7 +362,7 @@ class ProjectDocumentSerializer(serializers.ModelSerializer):
         return None
 
 
-class ProjectDetailSerializer(serializers.ModelSerializer):
+class ProjectDetailSerializer(SparseFieldsMixin, ProjectTaskCountsMixin, serializers.ModelSerializer):
     """Serializer for Project detail view with tasks and documents"""
     tasks = TaskSerializer(many=True, read_only=True)
     documents = ProjectDocumentSerializer(many=True, read_only=True)
@@ -364,13 +400,15 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'estimate', 'created_at', 'updated_at', 'created_by']
+        # Left out with ?fields= / ?expand= unless requested (see eagleeyeau/sparse_fields.py)
+        expandable_fields = ['estimate_info', 'tasks', 'documents']
     
     def get_tasks_count(self, obj):
-        return obj.tasks.count()
+        return self._tasks_count(obj)
     
     def get_assigned_employees_count(self, obj):
         """Get count of unique employees assigned to tasks"""
-        return obj.tasks.filter(assigned_employee__isnull=False).values('assigned_employee').distinct().count()
+        return self._assigned_employees_count(obj)
     
     def get_created_by_name(self, obj):
         if obj.created_by:
@@ -423,7 +461,7 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         return project
 
 
-class TaskGanttSerializer(serializers.ModelSerializer):
+class TaskGanttSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Gantt/Grid chart view - shows task timeline"""
     assigned_employee_name = serializers.SerializerMethodField()
     room = serializers.CharField(allow_null=True)
@@ -450,7 +488,7 @@ class TaskGanttSerializer(serializers.ModelSerializer):
         return None
 
 
-class ProjectGanttSerializer(serializers.Serializer):
+class ProjectGanttSerializer(SparseFieldsMixin, serializers.Serializer):
     """Serializer for Project Gantt/Grid chart view"""
     project_id = serializers.IntegerField()
     project_name = serializers.CharField()
@@ -474,7 +512,7 @@ class ProjectGanttSerializer(serializers.Serializer):
         ]
 
 
-class ProjectManagerAssignedProjectSerializer(serializers.ModelSerializer):
+class ProjectManagerAssignedProjectSerializer(SparseFieldsMixin, ProjectTaskCountsMixin, serializers.ModelSerializer):
     """Serializer for Project Manager to view all projects with progress"""
     progress = serializers.SerializerMethodField()
     total_tasks = serializers.SerializerMethodField()
@@ -507,19 +545,15 @@ class ProjectManagerAssignedProjectSerializer(serializers.ModelSerializer):
     
     def get_progress(self, obj):
         """Calculate progress percentage based on completed tasks"""
-        total_tasks = obj.tasks.count()
-        if total_tasks == 0:
-            return 0
-        completed_tasks = obj.tasks.filter(status='completed').count()
-        return int((completed_tasks / total_tasks) * 100)
+        return self._progress(obj)
     
     def get_total_tasks(self, obj):
         """Get total number of tasks in the project"""
-        return obj.tasks.count()
+        return self._tasks_count(obj)
     
     def get_completed_tasks(self, obj):
         """Get number of completed tasks"""
-        return obj.tasks.filter(status='completed').count()
+        return self._completed_tasks(obj)
     
     def get_created_by_name(self, obj):
         """Get project creator's full name"""
@@ -544,7 +578,7 @@ class ProjectManagerAssignedProjectSerializer(serializers.ModelSerializer):
         else:
             return f"{days_left} days left to deliver"
 
-class ProjectDocumentSerializer(serializers.ModelSerializer):
+class ProjectDocumentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for ProjectDocument"""
     uploaded_by_name = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
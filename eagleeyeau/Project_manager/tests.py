@@ -1,3 +1,761 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import zipfile
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from authentication.models import User
+from emopye.models import TaskTimer
+from estimator.models import Estimate
+from timesheet.models import TimeEntry
+from eagleeyeau.conditional import not_modified, object_state, queryset_state
+from eagleeyeau.exports import cell_value
+from eagleeyeau.pagination import InvalidCursor, KeysetPagination
+from eagleeyeau.status_counts import project_status_counts, task_status_counts
+from eagleeyeau.testing import QueryBudgetTestCase
+from . import project_status
+from .models import Project, Task
+from .serializers import ProjectDetailSerializer
+from .views import ProjectViewSet
+
+
+
+class ProjectManagerQueryBudgetTests(QueryBudgetTestCase):
+    """Query and response-time budgets of the Project Manager endpoints"""
+
+    def test_company_dashboard(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/company-dashboard/', 6)
+
+    def test_project_list(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/projects/', 5)
+
+    def test_project_detail(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/projects/{project}/', 3)
+
+    def test_gantt_chart(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/projects/{project}/gantt-chart/', 5)
+
+    def test_project_tasks(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/projects/{project}/tasks/', 3)
+
+    def test_all_projects_with_progress(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/all-projects/', 3)
+
+    def test_employee_timesheets(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/employee-timesheets/?page_size=50', 2)
+
+    def test_estimates(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/estimates/', 4)
+
+    def test_estimate_detail(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/estimates/{estimate}/', 6)
+
+    def test_company_employees(self):
+        self.assertQueryBudget('Project Manager', '/api/project-manager/employees/', 2)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CompanyDashboardScopeTests(APITestCase):
+    """The company dashboard only counts the requesting user's company"""
+
+    def setUp(self):
+        caches['dashboards'].clear()
+        for name, task_count in (('Acme', 2), ('Other', 5)):
+            manager = User.objects.create_user(
+                email=f'pm@{name.lower()}.com', username=f'pm@{name.lower()}.com', password='pw12345!',
+                role='Project Manager', company_name=name,
+            )
+            estimate = Estimate.objects.create(
+                serial_number=f'EST-{name}', client_name='Client', project_name='Kitchen', company=manager.company,
+            )
+            project = Project.objects.create(
+                estimate=estimate, project_name=f'{name} kitchen', client_name='Client',
+                status='in_progress', end_date=date(2026, 12, 1),
+            )
+            Task.objects.bulk_create(
+                Task(project=project, task_name=f'Task {number}', due_date=date(2026, 11, 1))
+                for number in range(task_count)
+            )
+        self.client.force_authenticate(user=User.objects.get(email='pm@acme.com'))
+
+    def test_counts_and_lists_are_scoped(self):
+        response = self.client.get('/api/project-manager/company-dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(data['overall_stats']['total_projects'], 1)
+        self.assertEqual(data['task_stats']['total_tasks'], 2)
+        self.assertEqual([row['project_name'] for row in data['upcoming_deadlines']], ['Acme kitchen'])
+        self.assertEqual([row['project_name'] for row in data['in_progress_projects']], ['Acme kitchen'])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TaskBulkTests(APITestCase):
+    """POST /api/project-manager/projects/<id>/tasks/bulk/"""
+
+    def user(self, email, role, company_name='Acme'):
+        return User.objects.create_user(
+            email=email, username=email, password='pw12345!', role=role, company_name=company_name,
+        )
+
+    def setUp(self):
+        self.manager = self.user('pm@example.com', 'Project Manager')
+        self.employee = self.user('emp@example.com', 'Employee')
+        self.outsider = self.user('outsider@example.com', 'Employee', company_name='Other')
+        estimate = Estimate.objects.create(serial_number='EST-1', client_name='Client', project_name='Kitchen')
+        self.project = Project.objects.create(
+            estimate=estimate, project_name='Kitchen', client_name='Client', created_by=self.manager,
+        )
+        self.task = Task.objects.create(
+            project=self.project, task_name='Measure', priority='high', due_date=date(2026, 11, 1),
+            assigned_employee=self.employee, created_by=self.manager,
+        )
+        self.url = f'/api/project-manager/projects/{self.project.pk}/tasks/bulk/'
+        self.client.force_authenticate(user=self.manager)
+
+    def new_task(self, **fields):
+        return {'task_name': 'Fit', 'priority': 'medium', 'due_date': '2026-11-15', **fields}
+
+    def post(self, create=(), update=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {'create': list(create), 'update': list(update)}, format='json')
+
+    def post_invalid(self, create=(), update=()):
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.post(create, update)
+        self.assertEqual(response.status_code, 400)
+        return response.data['data']
+
+    def test_mixed_create_and_update(self):
+        response = self.post(
+            create=[self.new_task(assigned_employee_id=self.employee.pk), self.new_task(task_name='Paint')],
+            update=[{'id': self.task.pk, 'status': 'in_progress', 'priority': 'low'}],
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']['created']), 2)
+        self.assertEqual(response.data['data']['created'][0]['assigned_employee']['id'], self.employee.pk)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.status, self.task.priority), ('in_progress', 'low'))
+        self.assertEqual(self.task.assigned_employee, self.employee)
+        self.assertEqual(
+            sorted(self.project.tasks.values_list('task_name', flat=True)), ['Fit', 'Measure', 'Paint']
+        )
+
+    def test_one_invalid_row_rejects_the_whole_batch(self):
+        errors = self.post_invalid(
+            create=[self.new_task(), self.new_task(priority='urgent')],
+            update=[{'id': self.task.pk, 'status': 'completed'}, {'id': 999999, 'status': 'completed'}],
+        )
+
+        self.assertEqual(errors['create'][0], {})
+        self.assertIn('priority', errors['create'][1])
+        self.assertEqual(errors['update'][0], {})
+        self.assertIn('id', errors['update'][1])
+        self.assertEqual(self.project.tasks.count(), 1)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'not_started')
+
+    def test_employee_of_another_company_is_rejected(self):
+        errors = self.post_invalid(
+            create=[self.new_task(assigned_employee_id=self.outsider.pk)],
+            update=[{'id': self.task.pk, 'assigned_employee_id': self.outsider.pk}],
+        )
+
+        self.assertIn('assigned_employee_id', errors['create'][0])
+        self.assertIn('assigned_employee_id', errors['update'][0])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.assigned_employee, self.employee)
+
+    def test_explicit_null_unassigns(self):
+        other = Task.objects.create(
+            project=self.project, task_name='Order', priority='low', due_date=date(2026, 11, 2),
+            assigned_employee=self.employee, created_by=self.manager,
+        )
+        response = self.post(update=[
+            {'id': self.task.pk, 'assigned_employee_id': None},
+            {'id': other.pk, 'status': 'in_progress'},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.task.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNone(self.task.assigned_employee)
+        self.assertEqual(other.assigned_employee, self.employee)
+
+    def test_project_status_recomputed_once(self):
+        with mock.patch.object(
+            project_status, 'recompute_project_statuses', wraps=project_status.recompute_project_statuses
+        ) as batch, mock.patch.object(project_status, 'recompute_project_status') as single:
+            response = self.post(
+                create=[self.new_task(status='completed') for _ in range(3)],
+                update=[{'id': self.task.pk, 'status': 'completed'}],
+            )
+
+        self.assertEqual(response.status_code, 200)
+        batch.assert_called_once_with({self.project.pk})
+        single.assert_not_called()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'completed')
+        self.assertIsNotNone(self.project.completed_at)
+
+
+SHEET_NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TimesheetExportTests(APITestCase):
+    """Streamed CSV / XLSX exports of company timers and time entries"""
+
+    task_name = 'Fit <cabinets> & "doors"\x01\x0b'
+
+    def user(self, email, role, company_name='Acme', **fields):
+        return User.objects.create_user(
+            email=email, username=email, password='pw12345!', role=role, company_name=company_name, **fields,
+        )
+
+    def setUp(self):
+        self.manager = self.user('pm@example.com', 'Project Manager')
+        self.ada = self.user('ada@example.com', 'Employee', first_name='Ada', last_name='Lovelace')
+        self.bob = self.user('bob@example.com', 'Employee', first_name='Bob', last_name='Smith, Jr.')
+        self.outsider = self.user('outsider@example.com', 'Employee', company_name='Other', first_name='Eve')
+        estimate = Estimate.objects.create(serial_number='EST-1', client_name='Client', project_name='Kitchen')
+        project = Project.objects.create(estimate=estimate, project_name='Kitchen', client_name='Client')
+        task = Task.objects.create(
+            project=project, task_name=self.task_name, priority='high', due_date=date(2026, 11, 1),
+        )
+
+        start = timezone.make_aware(datetime(2026, 10, 1, 9))
+        for employee, is_active in ((self.ada, False), (self.bob, True), (self.outsider, False)):
+            TaskTimer.objects.create(
+                employee=employee, task=task, work_date=start.date(), start_time=start,
+                end_time=None if is_active else start + timedelta(hours=2),
+                duration_seconds=0 if is_active else 7200, is_active=is_active,
+            )
+        for employee, day in ((self.ada, 1), (self.bob, 5), (self.outsider, 5)):
+            TimeEntry.objects.create(
+                user=employee, date=date(2026, 10, day), entry_time=time(8), exit_time=time(16), attendance='Present',
+            )
+        self.client.force_authenticate(user=self.manager)
+
+    def download(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def csv_rows(self, url):
+        response, content = self.download(url)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        return list(csv.reader(io.StringIO(content.decode('utf-8'))))
+
+    def xlsx_rows(self, url):
+        response, content = self.download(url)
+        self.assertIn('.xlsx"', response['Content-Disposition'])
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            for name in ('[Content_Types].xml', 'xl/workbook.xml', 'xl/_rels/workbook.xml.rels'):
+                ElementTree.fromstring(archive.read(name))
+            sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        return [
+            [cell.findtext('s:is/s:t', namespaces=SHEET_NS) or cell.findtext('s:v', namespaces=SHEET_NS)
+             for cell in row.findall('s:c', SHEET_NS)]
+            for row in sheet.findall('s:sheetData/s:row', SHEET_NS)
+        ]
+
+    def test_timesheets_csv(self):
+        rows = self.csv_rows('/api/project-manager/employee-timesheets/export/')
+
+        self.assertEqual(rows[0][:6], ['id', 'employee_id', 'employee_name', 'employee_email', 'task_id', 'task_name'])
+        self.assertEqual(
+            sorted((row[2], row[5], row[12], row[13]) for row in rows[1:]),
+            [('Ada Lovelace', self.task_name, '7200', 'false'), ('Bob Smith, Jr.', self.task_name, '0', 'true')],
+        )
+
+    def test_timesheets_xlsx_escapes_markup_and_strips_control_characters(self):
+        rows = self.xlsx_rows('/api/project-manager/employee-timesheets/export/?file_format=xlsx')
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0][-1], 'is_active')
+        self.assertEqual({row[5] for row in rows[1:]}, {'Fit <cabinets> & "doors"'})
+        self.assertEqual(sorted(row[2] for row in rows[1:]), ['Ada Lovelace', 'Bob Smith, Jr.'])
+
+    def test_timesheet_filters(self):
+        url = '/api/project-manager/employee-timesheets/export/'
+        self.assertEqual([row[3] for row in self.csv_rows(f'{url}?employee_id={self.ada.pk}')[1:]], ['ada@example.com'])
+        self.assertEqual([row[3] for row in self.csv_rows(f'{url}?is_active=true')[1:]], ['bob@example.com'])
+        self.assertEqual(self.csv_rows(f'{url}?date=2026-10-02')[1:], [])
+
+    def test_time_entries_csv_and_xlsx_match(self):
+        url = '/api/project-manager/time-entries/export/'
+        rows = self.csv_rows(url)
+
+        self.assertEqual(rows[0], [
+            'id', 'employee_id', 'employee_name', 'employee_email', 'date',
+            'entry_time', 'exit_time', 'total_working_seconds', 'attendance',
+        ])
+        # Newest first
+        self.assertEqual([row[2:] for row in rows[1:]], [
+            ['Bob Smith, Jr.', 'bob@example.com', '2026-10-05', '08:00:00', '16:00:00', '28800', 'Present'],
+            ['Ada Lovelace', 'ada@example.com', '2026-10-01', '08:00:00', '16:00:00', '28800', 'Present'],
+        ])
+        self.assertEqual(self.xlsx_rows(f'{url}?file_format=xlsx'), rows)
+
+    def test_time_entry_filters(self):
+        url = '/api/project-manager/time-entries/export/'
+        self.assertEqual([row[3] for row in self.csv_rows(f'{url}?employee_name=ada')[1:]], ['ada@example.com'])
+        self.assertEqual([row[3] for row in self.csv_rows(f'{url}?start_date=2026-10-03')[1:]], ['bob@example.com'])
+        self.assertEqual(self.csv_rows(f'{url}?attendance=Absent')[1:], [])
+
+    def test_invalid_parameters(self):
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.get('/api/project-manager/time-entries/export/?start_date=yesterday')
+        self.assertEqual(response.status_code, 400)
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.get('/api/project-manager/employee-timesheets/export/?file_format=pdf')
+        self.assertEqual(response.status_code, 400)
+        # Rejected before streaming starts, not halfway through a 200 download
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.get('/api/project-manager/employee-timesheets/export/?employee_id=ada')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.data['message'], 'employee_id must be an integer')
+
+    def test_formula_cells_are_neutralised(self):
+        Task.objects.update(task_name='=HYPERLINK("http://evil.example","pay")')
+        Project.objects.update(project_name='+1+1', client_name='@SUM(A1)')
+        url = '/api/project-manager/employee-timesheets/export/'
+
+        for rows in (self.csv_rows(url), self.xlsx_rows(f'{url}?file_format=xlsx')):
+            self.assertEqual(
+                {(row[5], row[7], row[8]) for row in rows[1:]},
+                {("'=HYPERLINK(\"http://evil.example\",\"pay\")", "'+1+1", "'@SUM(A1)")},
+            )
+
+    def test_cell_value(self):
+        self.assertEqual(
+            [cell_value(value) for value in ('-2', '\tcmd', 'Kitchen', 'a=b', -2, None, True)],
+            ["'-2", "'\tcmd", 'Kitchen', 'a=b', -2, '', 'true'],
+        )
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, CONDITIONAL_GET={'ENABLED': True})
+class ConditionalGetTests(APITestCase):
+    """ETag / If-None-Match (and Last-Modified) on the project list and Gantt chart"""
+
+    url = '/api/project-manager/projects/'
+
+    def user(self, email):
+        return User.objects.create_user(
+            email=email, username=email, password='pw12345!', role='Project Manager', company_name='Acme',
+        )
+
+    def setUp(self):
+        self.manager = self.user('pm@example.com')
+        estimate = Estimate.objects.create(serial_number='EST-1', client_name='Client', project_name='Kitchen')
+        self.project = Project.objects.create(
+            estimate=estimate, project_name='Kitchen', client_name='Client', created_by=self.manager,
+        )
+        self.tasks = [
+            Task.objects.create(project=self.project, task_name=name, priority='high', due_date=date(2026, 11, 1))
+            for name in ('Measure', 'Fit')
+        ]
+        # Distinct stamps, the second task being the latest
+        for offset, task in enumerate(self.tasks):
+            Task.objects.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(hours=2 - offset))
+        self.client.force_authenticate(user=self.manager)
+
+    def etag(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        etag = self.etag()
+
+        with mock.patch.object(ProjectViewSet, 'get_serializer') as get_serializer:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        get_serializer.assert_not_called()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='W/"stale"').status_code, 200)
+
+    def test_etag_changes_after_an_update(self):
+        etag = self.etag()
+
+        self.tasks[0].status = 'in_progress'
+        self.tasks[0].save()
+
+        self.assertNotEqual(self.etag(), etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_changes_after_a_delete(self):
+        gantt_url = f'/api/project-manager/projects/{self.project.pk}/gantt-chart/'
+        etags = (self.etag(), self.etag(gantt_url))
+
+        # Not the latest task: MAX(updated_at) is unchanged, only the count moves
+        Task.objects.filter(pk=self.tasks[0].pk).delete()
+
+        self.assertNotEqual(self.etag(), etags[0])
+        self.assertNotEqual(self.etag(gantt_url), etags[1])
+
+    def test_if_modified_since_alone_is_not_honoured_for_lists(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', response)
+
+        # The latest task is deleted: the count drops and the max goes down
+        since = http_date(timezone.now().timestamp())
+        Task.objects.filter(pk=self.tasks[1].pk).delete()
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+
+    def test_single_object_state_sends_last_modified(self):
+        request = Request(APIRequestFactory().get('/'))
+        request.user = self.manager
+        _, validators = not_modified(request, object_state(self.project))
+        self.assertEqual(validators.last_modified, self.project.updated_at)
+
+        _, validators = not_modified(request, object_state(self.project), queryset_state(self.project.tasks.all()))
+        self.assertIsNone(validators.last_modified)
+
+    def test_etag_differs_per_user_and_query_string(self):
+        etag = self.etag()
+        self.assertEqual(self.etag(), etag)
+        self.assertNotEqual(self.etag(f'{self.url}?status=not_started'), etag)
+
+        self.client.force_authenticate(user=self.user('pm2@example.com'))
+        self.assertNotEqual(self.etag(), etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SparseFieldsTests(TestCase):
+    """?fields= / ?expand= on ProjectDetailSerializer (eagleeyeau/sparse_fields.py)"""
+
+    expandable = {'estimate_info', 'tasks', 'documents'}
+
+    @classmethod
+    def setUpTestData(cls):
+        estimate = Estimate.objects.create(serial_number='EST-1', client_name='Client', project_name='Kitchen')
+        project = Project.objects.create(estimate=estimate, project_name='Kitchen', client_name='Client')
+        Task.objects.create(project=project, task_name='Measure', priority='high', due_date=date(2026, 11, 1))
+        cls.project_id = project.pk
+
+    def serialize(self, query='', method='get', project=None):
+        request = Request(getattr(APIRequestFactory(), method)(f'/api/project-manager/projects/1/{query}'))
+        project = project or Project.objects.get(pk=self.project_id)
+        return ProjectDetailSerializer(project, context={'request': request}).data
+
+    def test_no_parameters_return_the_full_payload(self):
+        data = self.serialize()
+        self.assertEqual(set(data), set(ProjectDetailSerializer.Meta.fields))
+        self.assertEqual(set(self.serialize('?fields=id', method='post')), set(ProjectDetailSerializer.Meta.fields))
+
+    def test_fields_selects_columns_and_ignores_unknown_names(self):
+        self.assertEqual(set(self.serialize('?fields=id,project_name,no_such_field')), {'id', 'project_name'})
+
+        data = self.serialize('?fields=id,tasks.task_name,tasks.no_such_field')
+        self.assertEqual(set(data), {'id', 'tasks'})
+        self.assertEqual(data['tasks'], [{'task_name': 'Measure'}])
+
+    def test_expand_adds_relations_to_the_regular_fields(self):
+        regular = set(ProjectDetailSerializer.Meta.fields) - self.expandable
+
+        self.assertEqual(set(self.serialize('?expand=no_such_relation')), regular)
+        data = self.serialize('?expand=estimate_info')
+        self.assertEqual(set(data), regular | {'estimate_info'})
+        self.assertEqual(data['estimate_info']['serial_number'], 'EST-1')
+
+    def test_unexpanded_relations_issue_no_queries(self):
+        # Loaded like the views load them (task counts annotated, no relations),
+        # so any relation read shows up as a query
+        project = Project.objects.with_task_counts().get(pk=self.project_id)
+        with self.assertNumQueries(0):
+            self.serialize('?fields=id,project_name,status', project=project)
+        with self.assertNumQueries(0):
+            self.serialize('?expand=no_such_relation', project=project)
+
+        # The estimate is only fetched once it is asked for
+        project = Project.objects.with_task_counts().get(pk=self.project_id)
+        with self.assertNumQueries(1):
+            self.serialize('?fields=id&expand=estimate_info', project=project)
+
+    def test_requests_field(self):
+        def requests_tasks(query):
+            request = Request(APIRequestFactory().get(f'/api/project-manager/projects/1/{query}'))
+            return ProjectDetailSerializer.requests_field(request, 'tasks')
+
+        self.assertTrue(requests_tasks(''))
+        self.assertFalse(requests_tasks('?fields=id'))
+        self.assertTrue(requests_tasks('?expand=tasks'))
+
+
+class KeysetPaginationTests(TestCase):
+    """eagleeyeau.pagination cursors over timers (NOT NULL time) and time entries (nullable time)"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=email, username=email, password='pw12345!', role='Employee')
+            for email in ('ada@example.com', 'bob@example.com', 'eve@example.com')
+        ]
+        estimate = Estimate.objects.create(serial_number='EST-1', client_name='Client', project_name='Kitchen')
+        project = Project.objects.create(estimate=estimate, project_name='Kitchen', client_name='Client')
+        self.task = Task.objects.create(project=project, task_name='Fit', priority='high', due_date=date(2026, 11, 1))
+
+    def request(self, **params):
+        return Request(APIRequestFactory().get('/', params))
+
+    def walk(self, paginator, queryset, page_size):
+        seen, cursor = [], None
+        while True:
+            params = {'page_size': page_size, **({'cursor': cursor} if cursor else {})}
+            rows, info = paginator.paginate(queryset, self.request(**params))
+            seen.extend(row.pk for row in rows)
+            if not info['has_more']:
+                return seen
+            cursor = info['next_cursor']
+
+    def test_not_null_time_sorts_without_nulls_last(self):
+        timers = KeysetPagination('work_date', 'start_time').order(TaskTimer.objects.all())
+        entries = KeysetPagination('date', 'entry_time').order(TimeEntry.objects.all())
+
+        self.assertEqual([expr.nulls_last for expr in timers.query.order_by], [None, None, None])
+        self.assertEqual([expr.nulls_last for expr in entries.query.order_by], [None, True, None])
+
+    def test_pages_cover_every_timer_once_in_order(self):
+        start = timezone.make_aware(datetime(2026, 10, 1, 9))
+        for day, hour in ((1, 9), (1, 9), (1, 11), (2, 8), (3, 10), (3, 10)):
+            TaskTimer.objects.create(
+                employee=self.users[0], task=self.task, work_date=date(2026, 10, day),
+                start_time=start.replace(day=day, hour=hour), is_active=False,
+            )
+        paginator = KeysetPagination('work_date', 'start_time')
+        expected = list(paginator.order(TaskTimer.objects.all()).values_list('pk', flat=True))
+
+        for page_size in (1, 2, 4):
+            self.assertEqual(self.walk(paginator, TaskTimer.objects.all(), page_size), expected)
+
+    def test_null_time_tail_is_paged_after_timed_rows(self):
+        for user, entry_time in zip(self.users, (time(9), None, None)):
+            TimeEntry.objects.create(user=user, date=date(2026, 10, 1), entry_time=entry_time)
+        TimeEntry.objects.create(user=self.users[0], date=date(2026, 9, 30), entry_time=None)
+        paginator = KeysetPagination('date', 'entry_time')
+
+        rows, info = paginator.paginate(TimeEntry.objects.all(), self.request(page_size=2))
+        self.assertEqual([row.entry_time for row in rows], [time(9), None])
+        # The cursor carries the NULL time; the rest of the tail follows by id
+        self.assertIsNone(paginator._decode(TimeEntry, info['next_cursor'])[1])
+
+        walked = self.walk(paginator, TimeEntry.objects.all(), 1)
+        self.assertEqual(walked, list(paginator.order(TimeEntry.objects.all()).values_list('pk', flat=True)))
+        self.assertEqual(TimeEntry.objects.get(pk=walked[-1]).date, date(2026, 9, 30))
+
+    def test_cursor_round_trip(self):
+        timer = TaskTimer.objects.create(
+            employee=self.users[0], task=self.task, work_date=date(2026, 10, 1),
+            start_time=timezone.make_aware(datetime(2026, 10, 1, 9, 30)), is_active=False,
+        )
+        paginator = KeysetPagination('work_date', 'start_time')
+
+        self.assertEqual(
+            paginator._decode(TaskTimer, paginator._encode(timer)),
+            (timer.work_date, timer.start_time, timer.pk),
+        )
+
+    def test_tampered_cursors_are_rejected(self):
+        paginator = KeysetPagination('work_date', 'start_time')
+        encode = lambda key: base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+        for cursor in (
+            'not-a-cursor!',
+            encode({'id': 1}),
+            encode(['2026-10-01', None]),
+            encode(['2026-13-45', None, 1]),
+            encode([None, None, 1]),
+            encode(['2026-10-01', 'noon', 1]),
+            encode(['2026-10-01', None, 'one']),
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                paginator.paginate(TaskTimer.objects.all(), self.request(cursor=cursor))
+
+
+def make_project(name):
+    estimate = Estimate.objects.create(serial_number=f'EST-{name}', client_name='Client', project_name=name)
+    return Project.objects.create(estimate=estimate, project_name=name, client_name='Client')
+
+
+class DeriveProjectStatusTests(SimpleTestCase):
+    """Every transition of project_status.derive_project_status"""
+
+    def derive(self, current_status, not_started=0, in_progress=0, completed=0, blocked=0):
+        counts = {
+            'total': not_started + in_progress + completed + blocked,
+            'not_started': not_started,
+            'in_progress': in_progress,
+            'completed': completed,
+        }
+        return project_status.derive_project_status(current_status, counts)
+
+    def test_no_tasks_resets_unless_paused(self):
+        for current in ('not_started', 'in_progress', 'completed'):
+            self.assertEqual(self.derive(current), 'not_started', current)
+        for current in ('cancelled', 'on_hold'):
+            self.assertEqual(self.derive(current), current)
+
+    def test_any_task_in_progress(self):
+        for current in ('not_started', 'completed', 'on_hold', 'cancelled'):
+            self.assertEqual(self.derive(current, not_started=2, in_progress=1), 'in_progress', current)
+
+    def test_all_tasks_completed(self):
+        for current in ('not_started', 'in_progress', 'on_hold'):
+            self.assertEqual(self.derive(current, completed=3), 'completed', current)
+
+    def test_started_work_moves_a_not_started_project(self):
+        self.assertEqual(self.derive('not_started', not_started=1, completed=1), 'in_progress')
+        self.assertEqual(self.derive('not_started', not_started=1, blocked=1), 'in_progress')
+        self.assertEqual(self.derive('not_started', not_started=2), 'not_started')
+
+    def test_otherwise_the_status_is_kept(self):
+        self.assertEqual(self.derive('on_hold', not_started=1, completed=1), 'on_hold')
+        self.assertEqual(self.derive('completed', not_started=1, completed=1), 'completed')
+        self.assertEqual(self.derive('in_progress', not_started=2), 'in_progress')
+
+
+class RecomputeProjectStatusesTests(TestCase):
+    """project_status.recompute_project_statuses: grouped aggregate and UPDATEs"""
+
+    def project(self, name, current_status, *task_statuses):
+        project = make_project(name)
+        # Set up the rows without going through the task signals
+        Task.objects.bulk_create(
+            Task(project=project, task_name=f'{name} {number}', status=task_status)
+            for number, task_status in enumerate(task_statuses)
+        )
+        Project.objects.filter(pk=project.pk).update(
+            status=current_status, completed_at=timezone.now() if current_status == 'completed' else None
+        )
+        return project.pk
+
+    def test_changed_projects_are_updated_per_status(self):
+        ids = {
+            'finished': self.project('finished', 'in_progress', 'completed', 'completed'),
+            'also_finished': self.project('also_finished', 'not_started', 'completed'),
+            'reopened': self.project('reopened', 'completed', 'in_progress', 'completed'),
+            'unchanged': self.project('unchanged', 'in_progress', 'in_progress'),
+        }
+        unchanged_before = Project.objects.values_list('updated_at', flat=True).get(pk=ids['unchanged'])
+
+        # Task counts, current statuses, then one UPDATE per new status
+        with self.assertNumQueries(4):
+            changed = project_status.recompute_project_statuses(ids.values())
+
+        self.assertEqual(changed, 3)
+        projects = {project.project_name: project for project in Project.objects.all()}
+        self.assertEqual(projects['finished'].status, 'completed')
+        self.assertEqual(projects['also_finished'].status, 'completed')
+        self.assertEqual(projects['finished'].completed_at, projects['finished'].updated_at)
+        self.assertEqual(projects['reopened'].status, 'in_progress')
+        self.assertIsNone(projects['reopened'].completed_at)
+        self.assertEqual(projects['unchanged'].updated_at, unchanged_before)
+
+    def test_nothing_to_do(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(project_status.recompute_project_statuses([]), 0)
+        unchanged = self.project('unchanged', 'in_progress', 'in_progress')
+        with self.assertNumQueries(2):
+            self.assertEqual(project_status.recompute_project_statuses([unchanged]), 0)
+
+
+class DeferredProjectStatusTests(TestCase):
+    """deferred_project_status batches task writes into one recompute on commit"""
+
+    def setUp(self):
+        self.projects = [make_project(name) for name in ('Kitchen', 'Bath')]
+
+    def patched(self):
+        batch = mock.patch.object(
+            project_status, 'recompute_project_statuses', wraps=project_status.recompute_project_statuses
+        )
+        single = mock.patch.object(project_status, 'recompute_project_status')
+        return batch, single
+
+    def test_task_writes_coalesce_into_one_recompute(self):
+        batch_patch, single_patch = self.patched()
+        with batch_patch as batch, single_patch as single:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic(), project_status.deferred_project_status():
+                    for project in self.projects:
+                        for number in range(3):
+                            Task.objects.create(project=project, task_name=f'Task {number}', status='completed')
+                    # Nested blocks join the outer one
+                    with project_status.deferred_project_status():
+                        Task.objects.filter(project=self.projects[1]).first().delete()
+
+        batch.assert_called_once_with({project.pk for project in self.projects})
+        single.assert_not_called()
+        self.assertEqual(
+            list(Project.objects.filter(pk__in=[p.pk for p in self.projects]).values_list('status', flat=True)),
+            ['completed', 'completed'],
+        )
+
+    def test_rollback_drops_the_pending_projects(self):
+        batch_patch, _ = self.patched()
+        with batch_patch as batch:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertRaises(ValueError):
+                    with transaction.atomic(), project_status.deferred_project_status():
+                        Task.objects.create(project=self.projects[0], task_name='Fit', status='completed')
+                        raise ValueError('rolled back')
+
+        self.assertEqual(callbacks, [])
+        batch.assert_not_called()
+        self.assertFalse(Task.objects.exists())
+
+        # Deferred mode is over: the next write recomputes right away
+        Task.objects.create(project=self.projects[0], task_name='Fit', status='completed')
+        self.projects[0].refresh_from_db()
+        self.assertEqual(self.projects[0].status, 'completed')
+
+
+class StatusCountsTests(TestCase):
+    """eagleeyeau.status_counts histograms: one query, every choice present"""
+
+    def setUp(self):
+        self.project = make_project('Kitchen')
+        for status, priority in (('in_progress', 'high'), ('in_progress', 'low'), ('completed', 'high')):
+            Task.objects.create(project=self.project, task_name='Fit', status=status, priority=priority)
+
+    def test_task_histogram_is_one_query_with_zero_counts(self):
+        with self.assertNumQueries(1):
+            counts = task_status_counts(
+                Task.objects.filter(project=self.project),
+                extra={'high_open': Q(priority='high') & ~Q(status='completed')},
+            )
+
+        self.assertEqual(counts, {
+            'total': 3,
+            'status': {'not_started': 0, 'in_progress': 2, 'completed': 1, 'blocked': 0},
+            'priority': {'low': 1, 'medium': 0, 'high': 2},
+            'high_open': 1,
+        })
+
+    def test_empty_queryset_counts_zero(self):
+        with self.assertNumQueries(1):
+            counts = project_status_counts(Project.objects.filter(project_name='Bathroom'))
+        self.assertEqual(counts['total'], 0)
+        self.assertEqual(set(counts['status']), {value for value, _ in Project.STATUS_CHOICES})
+        self.assertEqual(set(counts['status'].values()), {0})
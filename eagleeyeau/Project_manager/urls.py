@@ -18,6 +18,9 @@ urlpatterns = [
         'get': 'list',
         'post': 'create'
     }), name='project-tasks-list'),
+    path('projects/<int:project_id>/tasks/bulk/', views.TaskViewSet.as_view({
+        'post': 'bulk'
+    }), name='project-tasks-bulk'),
     path('projects/<int:project_id>/tasks/<int:pk>/', views.TaskViewSet.as_view({
         'get': 'retrieve',
         'patch': 'partial_update',
@@ -39,6 +42,8 @@ urlpatterns = [
     
     # Employee Timesheet Management
     path('employee-timesheets/', views.view_company_timesheets, name='view_company_timesheets'),
+    path('employee-timesheets/export/', views.export_company_timesheets, name='export_company_timesheets'),
+    path('time-entries/export/', views.export_company_time_entries, name='export_company_time_entries'),
     
     # Estimate APIs
     path('estimates/', views.get_estimates_list, name='get_estimates_list'),
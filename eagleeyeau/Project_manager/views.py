@@ -3,10 +3,16 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes, action
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.db.models import Q
+from django.db.models import Q, Prefetch
 from django.utils import timezone
 from datetime import datetime, timedelta
 from eagleeyeau.response_formatter import format_response
+from eagleeyeau.pagination import KeysetPagination, InvalidCursor
+from eagleeyeau.conditional import not_modified, object_state, queryset_state, with_validators
+from eagleeyeau.dashboard_cache import get_or_compute
+from eagleeyeau.exports import EXPORT_FORMATS, CHUNK_SIZE as EXPORT_CHUNK_SIZE, streaming_export_response
+from eagleeyeau.search import apply_search, order_by_relevance
+from eagleeyeau.status_counts import project_status_counts, task_status_counts, estimate_status_counts
 from authentication.models import User
 from timesheet.models import TimeEntry
 from estimator.models import Estimate
@@ -17,6 +23,12 @@ from .serializers import (
     TaskSerializer
 )
 
+# Columns the employee searches match on (trigram-indexed on PostgreSQL)
+EMPLOYEE_SEARCH_FIELDS = ['first_name', 'last_name', 'email', 'username']
+
+# Upper bound on create + update rows in one bulk task request
+MAX_BULK_TASKS = 500
+
 
 # ====================== PERMISSIONS ======================
 class IsProjectManager(permissions.BasePermission):
@@ -78,7 +90,7 @@ def get_company_employees(request):
         current_user = request.user
         company_name = current_user.company_name
         
-        if not company_name:
+        if not current_user.company_id:
             return Response(
                 format_response(
                     success=False,
@@ -89,28 +101,20 @@ def get_company_employees(request):
             )
         
         # Get all Employee users from the same company
-        employees = User.objects.filter(
-            company_name=company_name,
-            role='Employee'
-        )
+        employees = User.objects.for_company(current_user).filter(role='Employee')
         
         # Apply search filter if provided
         search_query = request.query_params.get('q', '').strip()
         filters_applied = {'q': search_query if search_query else None}
         
         if search_query:
-            employees = employees.filter(
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query) |
-                Q(email__icontains=search_query) |
-                Q(username__icontains=search_query)
-            )
+            employees = apply_search(employees, search_query, EMPLOYEE_SEARCH_FIELDS)
         
-        employees = employees.order_by('first_name', 'last_name')
+        employees = order_by_relevance(employees, 'first_name', 'last_name')
         employee_count = employees.count()
         
         # Serialize the data
-        serializer = EmployeeSerializer(employees, many=True)
+        serializer = EmployeeSerializer(employees, many=True, context={'request': request})
         
         return Response(
             format_response(
@@ -155,7 +159,7 @@ def get_company_employees_filtered(request):
         current_user = request.user
         company_name = current_user.company_name
         
-        if not company_name:
+        if not current_user.company_id:
             return Response(
                 format_response(
                     success=False,
@@ -166,20 +170,12 @@ def get_company_employees_filtered(request):
             )
         
         # Start with base query
-        employees = User.objects.filter(
-            company_name=company_name,
-            role='Employee'
-        )
+        employees = User.objects.for_company(current_user).filter(role='Employee')
         
         # Apply search filter
         search_query = request.query_params.get('search', '').strip()
         if search_query:
-            employees = employees.filter(
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query) |
-                Q(email__icontains=search_query) |
-                Q(username__icontains=search_query)
-            )
+            employees = apply_search(employees, search_query, EMPLOYEE_SEARCH_FIELDS)
         
         # Apply email verification filter
         is_verified = request.query_params.get('is_verified', '').strip()
@@ -188,10 +184,10 @@ def get_company_employees_filtered(request):
         elif is_verified.lower() in ['false', '0']:
             employees = employees.filter(is_email_verified=False)
         
-        employees = employees.order_by('first_name', 'last_name')
+        employees = order_by_relevance(employees, 'first_name', 'last_name')
         employee_count = employees.count()
         
-        serializer = EmployeeSerializer(employees, many=True)
+        serializer = EmployeeSerializer(employees, many=True, context={'request': request})
         
         return Response(
             format_response(
@@ -222,6 +218,43 @@ def get_company_employees_filtered(request):
 
 
 # ====================== TIMESHEET API ======================
+def _company_time_entries(request):
+    """
+    Time entries of the requesting user's company employees, narrowed by the
+    employee_name, start_date, end_date and attendance query params.
+
+    Raises ValueError (with a client-facing message) on a malformed date.
+    """
+    timesheets = TimeEntry.objects.filter(
+        user__company_id=request.user.company_id,
+        user__role='Employee'
+    )
+    
+    # Apply employee name filter
+    employee_name = request.query_params.get('employee_name', '').strip()
+    if employee_name:
+        timesheets = timesheets.filter(
+            Q(user__first_name__icontains=employee_name) |
+            Q(user__last_name__icontains=employee_name)
+        )
+    
+    # Apply date range filter
+    for param, lookup in (('start_date', 'date__gte'), ('end_date', 'date__lte')):
+        value = request.query_params.get(param, '').strip()
+        if value:
+            try:
+                timesheets = timesheets.filter(**{lookup: datetime.strptime(value, '%Y-%m-%d').date()})
+            except ValueError:
+                raise ValueError(f"Invalid {param} format. Use YYYY-MM-DD")
+    
+    # Apply attendance filter
+    attendance = request.query_params.get('attendance', '').strip()
+    if attendance in ['Present', 'Absent', 'Half Day']:
+        timesheets = timesheets.filter(attendance=attendance)
+    
+    return timesheets
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsProjectManager])
 def get_company_timesheets(request):
@@ -235,9 +268,12 @@ def get_company_timesheets(request):
     - start_date: Start date for timesheet (YYYY-MM-DD format, optional)
     - end_date: End date for timesheet (YYYY-MM-DD format, optional)
     - attendance: Filter by attendance status (Present/Absent/Half Day, optional)
+    - page_size: Opt in to keyset pagination with this many entries per page (max 500)
+    - cursor: next_cursor value from the previous page
     
     Examples:
     - /api/project-manager/timesheets/
+    - /api/project-manager/timesheets/?page_size=100
     - /api/project-manager/timesheets/?employee_name=Jane
     - /api/project-manager/timesheets/?start_date=2025-02-01&end_date=2025-02-28
     - /api/project-manager/timesheets/?employee_name=Jane&start_date=2025-02-01
@@ -246,7 +282,7 @@ def get_company_timesheets(request):
         current_user = request.user
         company_name = current_user.company_name
         
-        if not company_name:
+        if not current_user.company_id:
             return Response(
                 format_response(
                     success=False,
@@ -256,69 +292,46 @@ def get_company_timesheets(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get all employees from the company
-        company_employees = User.objects.filter(
-            company_name=company_name,
-            role='Employee'
-        )
-        
-        # Start with timesheet entries from company employees
-        timesheets = TimeEntry.objects.filter(
-            user__in=company_employees
-        )
-        
-        # Apply employee name filter
-        employee_name = request.query_params.get('employee_name', '').strip()
-        if employee_name:
-            timesheets = timesheets.filter(
-                Q(user__first_name__icontains=employee_name) |
-                Q(user__last_name__icontains=employee_name)
+        try:
+            timesheets = _company_time_entries(request).select_related('user')
+        except ValueError as e:
+            return Response(
+                format_response(
+                    success=False,
+                    message=str(e),
+                    data=None
+                ),
+                status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Apply date range filter
+        employee_name = request.query_params.get('employee_name', '').strip()
         start_date = request.query_params.get('start_date', '').strip()
         end_date = request.query_params.get('end_date', '').strip()
+        attendance = request.query_params.get('attendance', '').strip()
         
-        if start_date:
-            try:
-                start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-                timesheets = timesheets.filter(date__gte=start_date_obj)
-            except ValueError:
-                return Response(
-                    format_response(
-                        success=False,
-                        message="Invalid start_date format. Use YYYY-MM-DD",
-                        data=None
-                    ),
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        total_entries = timesheets.count()
         
-        if end_date:
+        # Keyset pagination is opt-in via page_size/cursor
+        paginator = KeysetPagination('date', 'entry_time')
+        pagination = None
+        if paginator.is_requested(request):
             try:
-                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-                timesheets = timesheets.filter(date__lte=end_date_obj)
-            except ValueError:
+                timesheets, pagination = paginator.paginate(timesheets, request)
+            except InvalidCursor:
                 return Response(
                     format_response(
                         success=False,
-                        message="Invalid end_date format. Use YYYY-MM-DD",
+                        message="Invalid cursor",
                         data=None
                     ),
                     status=status.HTTP_400_BAD_REQUEST
                 )
-        
-        # Apply attendance filter
-        attendance = request.query_params.get('attendance', '').strip()
-        if attendance in ['Present', 'Absent', 'Half Day']:
-            timesheets = timesheets.filter(attendance=attendance)
-        
-        # Order by date descending, then by entry_time
-        timesheets = timesheets.order_by('-date', '-entry_time')
-        
-        total_entries = timesheets.count()
+        else:
+            # Order by date descending, then by entry_time
+            timesheets = paginator.order(timesheets)
         
         # Serialize the data
-        serializer = TimeEntrySerializer(timesheets, many=True)
+        serializer = TimeEntrySerializer(timesheets, many=True, context={'request': request})
         
         return Response(
             format_response(
@@ -333,6 +346,7 @@ def get_company_timesheets(request):
                         'end_date': end_date if end_date else None,
                         'attendance': attendance if attendance else None,
                     },
+                    'pagination': pagination,
                     'timesheets': serializer.data
                 }
             ),
@@ -366,9 +380,8 @@ def get_employee_timesheet_detail(request, employee_id):
     """
     try:
         current_user = request.user
-        company_name = current_user.company_name
         
-        if not company_name:
+        if not current_user.company_id:
             return Response(
                 format_response(
                     success=False,
@@ -380,9 +393,8 @@ def get_employee_timesheet_detail(request, employee_id):
         
         # Get the employee - must be from the same company
         try:
-            employee = User.objects.get(
+            employee = User.objects.for_company(current_user).get(
                 id=employee_id,
-                company_name=company_name,
                 role='Employee'
             )
         except User.DoesNotExist:
@@ -584,11 +596,8 @@ def get_estimates_list(request):
         }
         
         if search_query:
-            estimates = estimates.filter(
-                Q(serial_number__icontains=search_query) |
-                Q(estimate_number__icontains=search_query) |
-                Q(client_name__icontains=search_query) |
-                Q(project_name__icontains=search_query)
+            estimates = apply_search(
+                estimates, search_query, ['serial_number', 'estimate_number', 'client_name', 'project_name']
             )
         
         # Filter by status
@@ -596,20 +605,14 @@ def get_estimates_list(request):
         if status_filter and status_filter in valid_statuses:
             estimates = estimates.filter(status=status_filter)
         
-        # Order by created_at descending
-        estimates = estimates.order_by('-created_at')
+        # Best matches first when searching, newest first otherwise
+        estimates = order_by_relevance(estimates, '-created_at')
         
         # Calculate status summary of ALL estimates (not just filtered)
-        all_estimates = Estimate.objects.all()
-        status_summary = {
-            'pending': all_estimates.filter(status='pending').count(),
-            'sent': all_estimates.filter(status='sent').count(),
-            'approved': all_estimates.filter(status='approved').count(),
-            'rejected': all_estimates.filter(status='rejected').count(),
-        }
+        status_summary = estimate_status_counts()['status']
         
         # Serialize data
-        serializer = EstimateListSerializer(estimates, many=True)
+        serializer = EstimateListSerializer(estimates, many=True, context={'request': request})
         
         return Response(
             format_response(
@@ -663,7 +666,7 @@ def get_estimate_detail(request, estimate_id):
         estimate = Estimate.objects.get(id=estimate_id)
         
         # Serialize data
-        serializer = EstimateSerializer(estimate)
+        serializer = EstimateSerializer(estimate, context={'request': request})
         
         return Response(
             format_response(
@@ -719,9 +722,24 @@ class ProjectViewSet(viewsets.ModelViewSet):
         is_project_manager = user.role in ['Project Manager', 'Admin']
         
         if is_project_manager:
-            return Project.objects.all().order_by('-creating_date')
+            queryset = Project.objects.all()
         else:
-            return Project.objects.filter(assigned_to=user).order_by('-creating_date')
+            queryset = Project.objects.filter(assigned_to=user)
+        
+        queryset = queryset.select_related(
+            'estimate', 'created_by', 'assigned_to'
+        ).with_task_counts()
+        
+        if self.action == 'retrieve':
+            # Skip the prefetches a ?fields= / ?expand= request leaves out
+            if ProjectDetailSerializer.requests_field(self.request, 'tasks'):
+                queryset = queryset.prefetch_related(
+                    Prefetch('tasks', queryset=Task.objects.select_related('assigned_employee', 'created_by')),
+                )
+            if ProjectDetailSerializer.requests_field(self.request, 'documents'):
+                queryset = queryset.prefetch_related('documents__uploaded_by')
+        
+        return queryset.order_by('-creating_date')
     
     def get_serializer_class(self):
         """Use different serializers for list vs detail"""
@@ -751,15 +769,24 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
+        # The task counts in the payload change with the tasks, not the project rows
+        not_modified_response, validators = not_modified(
+            request,
+            queryset_state(queryset),
+            queryset_state(Task.objects.filter(project__in=queryset.values('pk'))),
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+        
         serializer = self.get_serializer(queryset, many=True)
-        return Response(
+        return with_validators(Response(
             format_response(
                 success=True,
                 message=f"Projects retrieved successfully (Total: {queryset.count()})",
                 data={'total_count': queryset.count(), 'results': serializer.data}
             ),
             status=status.HTTP_200_OK
-        )
+        ), validators)
     
     @swagger_auto_schema(
         operation_summary="Create project from approved estimate",
@@ -1015,7 +1042,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def gantt_chart(self, request, pk=None):
         """Get project in Gantt chart format for grid/timeline visualization with optional filters"""
         project = self.get_object()
-        tasks = project.tasks.all().order_by('priority', 'due_date')
+        tasks = project.tasks.select_related('assigned_employee').order_by('priority', 'due_date')
+        
+        not_modified_response, validators = not_modified(
+            request, object_state(project), queryset_state(project.tasks.all())
+        )
+        if not_modified_response is not None:
+            return not_modified_response
         
         # Get filter parameters from query string
         room_filter = request.query_params.get('room', '').strip()
@@ -1062,14 +1095,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
             'tasks': TaskGanttSerializer(tasks, many=True).data
         }
         
-        return Response(
+        return with_validators(Response(
             format_response(
                 success=True,
                 message=f"Gantt chart data for project '{project.project_name}'",
                 data=data
             ),
             status=status.HTTP_200_OK
-        )
+        ), validators)
     
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     @swagger_auto_schema(
@@ -1151,41 +1184,38 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     @swagger_auto_schema(
         operation_summary="Download project as PDF",
-        operation_description="Download complete project information as a single PDF file with all details, tasks, and metadata.",
-        responses={200: openapi.Response(description="PDF file with all project information")},
+        operation_description=(
+            "Download complete project information as a single PDF file with all details, tasks, and metadata. "
+            "PDFs are rendered in the background and cached until the project, its tasks or documents change; "
+            "if rendering takes longer than the server wait (or async=true is passed) a 202 is returned with a "
+            "download_url to poll."
+        ),
+        manual_parameters=[
+            openapi.Parameter('async', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+                              description='Return 202 immediately instead of waiting for a fresh render'),
+        ],
+        responses={
+            200: openapi.Response(description="PDF file with all project information"),
+            202: openapi.Response(description="PDF is being generated; poll download_url"),
+        },
         tags=['Projects - Documents']
     )
     def download_documents(self, request, pk=None):
-        """Download complete project information as PDF"""
+        """Download complete project information as PDF (rendered in the background and cached)"""
         try:
+            from eagleeyeau.pdf_rendering import pdf_download_response
+            from .pdf import build_project_pdf, project_pdf_fingerprint
+
             project = self.get_object()
-            
-            # Generate PDF with all project info
-            pdf_content = self._generate_project_pdf(project)
-            
-            if not pdf_content:
-                return Response(
-                    format_response(
-                        success=False,
-                        message="Error generating PDF",
-                        data=None
-                    ),
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            from django.http import FileResponse
-            import io
-            
-            pdf_buffer = io.BytesIO(pdf_content)
-            filename = f"{project.project_name}_Project_Report.pdf"
-            response = FileResponse(
-                pdf_buffer,
-                content_type='application/pdf',
-                as_attachment=True,
-                filename=filename
+            return pdf_download_response(
+                request,
+                'project',
+                project.pk,
+                project_pdf_fingerprint(project),
+                build_project_pdf,
+                filename=f"{project.project_name}_Project_Report.pdf"
             )
-            return response
-        
+
         except Exception as e:
             return Response(
                 format_response(
@@ -1195,222 +1225,6 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 ),
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _generate_project_pdf(self, project):
-        """Generate a comprehensive PDF of the project with all information"""
-        try:
-            from io import BytesIO
-            from reportlab.lib.pagesizes import letter
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.lib import colors
-            from datetime import datetime
-            
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#1f4788'),
-                spaceAfter=12,
-                fontName='Helvetica-Bold'
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=13,
-                textColor=colors.HexColor('#2d5aa6'),
-                spaceAfter=8,
-                spaceBefore=10,
-                fontName='Helvetica-Bold'
-            )
-            
-            # Title
-            elements.append(Paragraph(f"Project Report: {project.project_name}", title_style))
-            elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== PROJECT DETAILS =====
-            elements.append(Paragraph("PROJECT DETAILS", heading_style))
-            project_data = [
-                ['Field', 'Value'],
-                ['Project Name', project.project_name or 'N/A'],
-                ['Client Name', project.client_name or 'N/A'],
-                ['Status', project.status.replace('_', ' ').title()],
-                ['Created Date', project.creating_date.strftime('%Y-%m-%d') if project.creating_date else 'N/A'],
-                ['Start Date', project.start_date.strftime('%Y-%m-%d') if project.start_date else 'N/A'],
-                ['End Date', project.end_date.strftime('%Y-%m-%d') if project.end_date else 'N/A'],
-                ['Total Amount', f"${project.total_amount:,.2f}"],
-                ['Estimated Cost', f"${project.estimated_cost:,.2f}"],
-                ['Created By', f"{project.created_by.first_name} {project.created_by.last_name}" if project.created_by else 'N/A'],
-                ['Assigned To', f"{project.assigned_to.first_name} {project.assigned_to.last_name}" if project.assigned_to else 'Unassigned'],
-            ]
-            
-            project_table = Table(project_data, colWidths=[1.8*inch, 3.7*inch])
-            project_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')]),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
-            elements.append(project_table)
-            elements.append(Spacer(1, 0.2 * inch))
-            
-            # ===== DESCRIPTION =====
-            if project.description:
-                elements.append(Paragraph("DESCRIPTION", heading_style))
-                elements.append(Paragraph(project.description, styles['BodyText']))
-                elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== ROOMS =====
-            if project.rooms:
-                elements.append(Paragraph("ROOMS INVOLVED", heading_style))
-                rooms_text = ', '.join(project.rooms) if isinstance(project.rooms, list) else str(project.rooms)
-                elements.append(Paragraph(rooms_text, styles['BodyText']))
-                elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== TASKS SUMMARY =====
-            elements.append(Paragraph("TASKS SUMMARY", heading_style))
-            tasks = project.tasks.all()
-            task_count = tasks.count()
-            completed_count = tasks.filter(status='completed').count()
-            in_progress_count = tasks.filter(status='in_progress').count()
-            not_started_count = tasks.filter(status='not_started').count()
-            blocked_count = tasks.filter(status='blocked').count()
-            
-            task_summary_data = [
-                ['Status', 'Count'],
-                ['Total Tasks', str(task_count)],
-                ['Completed', str(completed_count)],
-                ['In Progress', str(in_progress_count)],
-                ['Not Started', str(not_started_count)],
-                ['Blocked', str(blocked_count)],
-            ]
-            
-            task_table = Table(task_summary_data, colWidths=[2.5*inch, 2*inch])
-            task_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')]),
-            ]))
-            elements.append(task_table)
-            elements.append(Spacer(1, 0.2 * inch))
-            
-            # ===== DETAILED TASKS LIST =====
-            if task_count > 0:
-                elements.append(Paragraph("DETAILED TASKS", heading_style))
-                
-                tasks_list_data = [
-                    ['Task', 'Room', 'Status', 'Priority', 'Assigned To', 'Due Date']
-                ]
-                
-                for task in tasks.order_by('priority', 'due_date'):
-                    assigned_to = task.assigned_employee.username if task.assigned_employee else 'Unassigned'
-                    due_date = task.due_date.strftime('%Y-%m-%d') if task.due_date else 'N/A'
-                    
-                    tasks_list_data.append([
-                        task.task_name[:30],
-                        task.room or 'N/A',
-                        task.status.replace('_', ' ').title(),
-                        task.priority.title(),
-                        assigned_to,
-                        due_date
-                    ])
-                
-                tasks_list_table = Table(tasks_list_data, colWidths=[1.4*inch, 1*inch, 1.1*inch, 0.9*inch, 1.1*inch, 1*inch])
-                tasks_list_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fafafa')]),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                elements.append(tasks_list_table)
-                elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== DOCUMENTS =====
-            from .models import ProjectDocument
-            documents = ProjectDocument.objects.filter(project=project)
-            if documents.exists():
-                elements.append(Paragraph("DOCUMENTS", heading_style))
-                
-                docs_data = [
-                    ['Document Name', 'Uploaded By', 'Date']
-                ]
-                
-                for doc in documents.order_by('-uploaded_at'):
-                    uploader = doc.uploaded_by.username if doc.uploaded_by else 'System'
-                    date = doc.uploaded_at.strftime('%Y-%m-%d %H:%M') if doc.uploaded_at else 'N/A'
-                    
-                    docs_data.append([
-                        doc.document_name[:35],
-                        uploader,
-                        date
-                    ])
-                
-                docs_table = Table(docs_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
-                docs_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fafafa')]),
-                ]))
-                elements.append(docs_table)
-                elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== FOOTER =====
-            elements.append(Spacer(1, 0.3 * inch))
-            footer_style = ParagraphStyle(
-                'Footer',
-                parent=styles['Normal'],
-                fontSize=8,
-                textColor=colors.grey,
-                alignment=1
-            )
-            elements.append(Paragraph(
-                f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Lignaflow Project Management System",
-                footer_style
-            ))
-            
-            # Build PDF
-            doc.build(elements)
-            return buffer.getvalue()
-        
-        except ImportError:
-            return None
-        except Exception as e:
-            return None
 
 
 # ====================== TASK VIEWSET ======================
@@ -1426,9 +1240,10 @@ class TaskViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Get tasks filtered by project"""
         project_id = self.kwargs.get('project_id')
+        tasks = Task.objects.select_related('assigned_employee', 'created_by')
         if project_id:
-            return Task.objects.filter(project_id=project_id).order_by('priority', 'due_date')
-        return Task.objects.all().order_by('priority', 'due_date')
+            return tasks.filter(project_id=project_id).order_by('priority', 'due_date')
+        return tasks.order_by('priority', 'due_date')
     
     @swagger_auto_schema(
         operation_summary="List tasks for a project",
@@ -1664,6 +1479,214 @@ class TaskViewSet(viewsets.ModelViewSet):
             status=status.HTTP_204_NO_CONTENT
         )
 
+    @swagger_auto_schema(
+        operation_summary="Bulk create/update tasks in project",
+        operation_description=f"""
+        Create and update many tasks of a project in one request.
+        
+        - 'create': list of new tasks (same fields as task create)
+        - 'update': list of partial task updates, each with the task 'id'
+        
+        All rows are validated first; if any row is invalid nothing is saved and
+        the errors are returned per row, in request order. Otherwise all rows are
+        written in one transaction (bulk insert / bulk update) and the project
+        status is recomputed once at the end.
+        
+        At most {MAX_BULK_TASKS} rows per request.
+        
+        Permission:
+        - Creating: project creator or Project Manager/Admin
+        - Updating: project creator, task creator or Project Manager/Admin
+        """,
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'create': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                    description='Tasks to create'
+                ),
+                'update': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                    description='Partial task updates; each row needs the task "id"'
+                ),
+            },
+            example={
+                'create': [
+                    {'task_name': 'Demolition', 'priority': 'high', 'phase': 'construction', 'due_date': '2025-12-05'},
+                    {'task_name': 'Electrical rough-in', 'priority': 'medium', 'due_date': '2025-12-12', 'assigned_employee_id': 7},
+                ],
+                'update': [
+                    {'id': 12, 'status': 'completed'},
+                ],
+            }
+        ),
+        responses={
+            200: openapi.Response(description="Tasks created/updated successfully"),
+            400: openapi.Response(description="Validation error - per-row errors, nothing saved"),
+            403: openapi.Response(description="Permission denied"),
+            404: openapi.Response(description="Project not found"),
+        },
+        tags=['Tasks']
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        """Create and update many tasks of a project with one project status recompute"""
+        from django.db import transaction
+        from eagleeyeau.dashboard_cache import invalidate_dashboards_on_commit
+        from .project_status import deferred_project_status, schedule_project_status
+        
+        project_id = self.kwargs.get('project_id')
+        
+        try:
+            project = Project.objects.get(id=project_id)
+        except Project.DoesNotExist:
+            return Response(
+                format_response(success=False, message="Project not found", data=None),
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        create_rows = request.data.get('create') or []
+        update_rows = request.data.get('update') or []
+        if not isinstance(create_rows, list) or not isinstance(update_rows, list):
+            return Response(
+                format_response(success=False, message="'create' and 'update' must be lists", data=None),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not create_rows and not update_rows:
+            return Response(
+                format_response(success=False, message="Provide at least one task in 'create' or 'update'", data=None),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(create_rows) + len(update_rows) > MAX_BULK_TASKS:
+            return Response(
+                format_response(success=False, message=f"At most {MAX_BULK_TASKS} tasks per request", data=None),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not all(isinstance(row, dict) for row in create_rows + update_rows):
+            return Response(
+                format_response(success=False, message="Every task row must be an object", data=None),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Permission: same rules as the single-task create / update endpoints
+        is_project_manager = request.user.role in ['Project Manager', 'Admin'] if hasattr(request.user, 'role') else request.user.is_staff
+        is_project_creator = project.created_by_id == request.user.id
+        if create_rows and not (is_project_manager or is_project_creator):
+            return Response(
+                format_response(success=False, message="Permission denied: only project creator or Project Manager can add tasks", data=None),
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # Load every task being updated and every referenced employee in one query each
+        def as_int(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+        
+        update_ids = [as_int(row.get('id')) for row in update_rows]
+        tasks_by_id = Task.objects.filter(project=project).in_bulk([i for i in update_ids if i is not None])
+        employee_ids = {as_int(row.get('assigned_employee_id')) for row in create_rows + update_rows}
+        employee_ids.discard(None)
+        context = {**self.get_serializer_context(), 'employees': User.objects.in_bulk(employee_ids)}
+        
+        # ========== VALIDATE ALL ROWS ==========
+        has_errors = False
+        create_errors = []
+        new_tasks = []
+        for row in create_rows:
+            serializer = TaskSerializer(data=row, context=context)
+            if serializer.is_valid():
+                data = dict(serializer.validated_data)
+                assigned_employee = data.pop('assigned_employee_id', None)
+                new_tasks.append(Task(
+                    **data,
+                    project=project,
+                    created_by=request.user,
+                    assigned_employee=assigned_employee,
+                ))
+                create_errors.append({})
+            else:
+                has_errors = True
+                create_errors.append(serializer.errors)
+        
+        update_errors = []
+        changed_tasks = []
+        update_fields = set()
+        seen_ids = set()
+        for task_id, row in zip(update_ids, update_rows):
+            task = tasks_by_id.get(task_id)
+            if task is None or task_id in seen_ids:
+                has_errors = True
+                update_errors.append({'id': [
+                    f"Task {row.get('id')} is listed twice" if task_id in seen_ids
+                    else f"Task {row.get('id')} not found in this project"
+                ]})
+                continue
+            seen_ids.add(task_id)
+            if not (is_project_manager or is_project_creator or task.created_by_id == request.user.id):
+                has_errors = True
+                update_errors.append({'id': [f"Permission denied: cannot update task {task_id}"]})
+                continue
+            serializer = TaskSerializer(task, data=row, partial=True, context=context)
+            if serializer.is_valid():
+                data = dict(serializer.validated_data)
+                # An explicit null unassigns the task; a missing key leaves it alone
+                if 'assigned_employee_id' in data:
+                    task.assigned_employee = data.pop('assigned_employee_id')
+                    update_fields.add('assigned_employee')
+                for attr, value in data.items():
+                    setattr(task, attr, value)
+                update_fields.update(data)
+                changed_tasks.append(task)
+                update_errors.append({})
+            else:
+                has_errors = True
+                update_errors.append(serializer.errors)
+        
+        if has_errors:
+            return Response(
+                format_response(
+                    success=False,
+                    message="Validation error",
+                    data={'create': create_errors, 'update': update_errors}
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # ========== WRITE ==========
+        # bulk_create / bulk_update send no signals: the project status is
+        # queued explicitly and recomputed once when the transaction commits
+        with transaction.atomic(), deferred_project_status():
+            created = Task.objects.bulk_create(new_tasks)
+            if changed_tasks:
+                now = timezone.now()
+                for task in changed_tasks:
+                    task.updated_at = now
+                Task.objects.bulk_update(changed_tasks, [*sorted(update_fields), 'updated_at'])
+            schedule_project_status(project.id)
+            invalidate_dashboards_on_commit(project.company_id)
+        
+        created_ids = [task.id for task in created]
+        tasks = {
+            task.id: task
+            for task in Task.objects.filter(id__in=created_ids + [task.id for task in changed_tasks])
+            .select_related('assigned_employee', 'created_by')
+        }
+        return Response(
+            format_response(
+                success=True,
+                message=f"{len(created_ids)} tasks created, {len(changed_tasks)} tasks updated",
+                data={
+                    'created': TaskSerializer([tasks[i] for i in created_ids], many=True).data,
+                    'updated': TaskSerializer([tasks[task.id] for task in changed_tasks], many=True).data,
+                }
+            ),
+            status=status.HTTP_200_OK
+        )
+
 
 # ====================== PROJECT MANAGER ALL PROJECTS VIEW ======================
 @api_view(['GET'])
@@ -1769,7 +1792,7 @@ def get_all_projects_with_progress(request):
     """
     try:
         # Get all projects
-        projects = Project.objects.all().order_by('-creating_date')
+        projects = Project.objects.select_related('created_by').with_task_counts().order_by('-creating_date')
         
         # Apply status filter
         status_filter = request.query_params.get('status', '').strip()
@@ -1792,24 +1815,20 @@ def get_all_projects_with_progress(request):
             )
         
         # Calculate status summary of ALL projects (not just filtered)
-        all_projects = Project.objects.all()
-        status_summary = {
-            'not_started': all_projects.filter(status='not_started').count(),
-            'in_progress': all_projects.filter(status='in_progress').count(),
-            'completed': all_projects.filter(status='completed').count(),
-            'on_hold': all_projects.filter(status='on_hold').count(),
-            'cancelled': all_projects.filter(status='cancelled').count(),
-        }
+        status_summary = project_status_counts()['status']
         
-        # Calculate statistics for filtered projects
-        total_projects = projects.count()
-        completed_projects = projects.filter(status='completed').count()
-        due_projects = projects.filter(
-            end_date__lt=timezone.now().date(),
-            status__in=['not_started', 'in_progress', 'on_hold']
-        ).count()
-        cancelled_projects = projects.filter(status='cancelled').count()
-        in_progress_projects = projects.filter(status='in_progress').count()
+        # Calculate statistics for filtered projects (single aggregate query)
+        filtered_counts = project_status_counts(projects, extra={
+            'due': Q(
+                end_date__lt=timezone.now().date(),
+                status__in=['not_started', 'in_progress', 'on_hold']
+            ),
+        })
+        total_projects = filtered_counts['total']
+        completed_projects = filtered_counts['status']['completed']
+        due_projects = filtered_counts['due']
+        cancelled_projects = filtered_counts['status']['cancelled']
+        in_progress_projects = filtered_counts['status']['in_progress']
         
         # Serialize the data
         from .serializers import ProjectManagerAssignedProjectSerializer
@@ -1851,6 +1870,192 @@ def get_all_projects_with_progress(request):
 
 
 # ====================== COMPANY DASHBOARD API ======================
+def _company_dashboard_data(company_id):
+    """Compute the company dashboard payload (cached per company by company_dashboard)"""
+    from django.db.models import Count, Q
+    today = timezone.now().date()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+
+    # Everything below is scoped to the company the payload is cached for
+    projects = Project.objects.for_company(company_id)
+    tasks = Task.objects.filter(project__in=projects)
+
+    # ========== OVERALL STATS ==========
+    # One aggregate query per model; weekly counters ride along as extras
+    project_counts = project_status_counts(projects, extra={
+        'completed_this_week': Q(
+            status='completed',
+            completed_at__date__gte=week_start,
+            completed_at__date__lte=week_end
+        ),
+    })
+    total_projects = project_counts['total']
+    active_projects = project_counts['status']['in_progress']
+    completed_projects = project_counts['status']['completed']
+    on_hold_projects = project_counts['status']['on_hold']
+    cancelled_projects = project_counts['status']['cancelled']
+
+    # ========== TASK STATS ==========
+    task_counts = task_status_counts(tasks, extra={
+        'completed_this_week': Q(
+            status='completed',
+            updated_at__date__gte=week_start,
+            updated_at__date__lte=week_end
+        ),
+        'created_this_week': Q(
+            created_at__date__gte=week_start,
+            created_at__date__lte=week_end
+        ),
+    })
+    total_tasks = task_counts['total']
+    completed_tasks = task_counts['status']['completed']
+    in_progress_tasks = task_counts['status']['in_progress']
+    not_started_tasks = task_counts['status']['not_started']
+    blocked_tasks = task_counts['status']['blocked']
+
+    # ========== PROGRESS RATES ==========
+    overall_progress = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    project_completion_rate = (completed_projects / total_projects * 100) if total_projects > 0 else 0
+    task_completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+
+    # ========== WEEKLY PROGRESS ==========
+    tasks_completed_this_week = task_counts['completed_this_week']
+    projects_completed_this_week = project_counts['completed_this_week']
+    new_tasks_created_this_week = task_counts['created_this_week']
+
+    # ========== UPCOMING DEADLINES (All projects with end dates) ==========
+    # Get all projects with end dates, sorted by closest deadline first
+    upcoming_projects = projects.filter(
+        end_date__isnull=False
+    ).exclude(
+        status='completed'
+    ).annotate(
+        task_total=Count('tasks'),
+        task_completed=Count('tasks', filter=Q(tasks__status='completed')),
+    ).order_by('end_date')
+
+    upcoming_deadlines = []
+    for project in upcoming_projects:
+        completed = project.task_completed
+        total = project.task_total
+
+        # Calculate days remaining
+        days_remaining = (project.end_date - today).days
+
+        upcoming_deadlines.append({
+            'project_id': project.id,
+            'project_name': project.project_name,
+            'client_name': project.client_name,
+            'deadline': project.end_date.isoformat(),
+            'days_remaining': days_remaining,
+            'status': project.status,
+            'tasks_completed': completed,
+            'total_tasks': total,
+            'progress_percentage': round((completed / total * 100), 2) if total > 0 else 0,
+        })
+
+    # ========== IN PROGRESS PROJECTS ==========
+    in_progress_projects_query = projects.filter(
+        status='in_progress'
+    ).annotate(
+        task_total=Count('tasks'),
+        task_completed=Count('tasks', filter=Q(tasks__status='completed')),
+        task_in_progress=Count('tasks', filter=Q(tasks__status='in_progress')),
+    ).order_by('-updated_at')
+
+    in_progress_projects = []
+    for project in in_progress_projects_query:
+        completed = project.task_completed
+        total = project.task_total
+        in_progress_count = project.task_in_progress
+
+        # Calculate days remaining if end_date exists
+        days_remaining = None
+        if project.end_date:
+            days_remaining = (project.end_date - today).days
+
+        in_progress_projects.append({
+            'project_id': project.id,
+            'project_name': project.project_name,
+            'client_name': project.client_name,
+            'start_date': project.start_date.isoformat() if project.start_date else None,
+            'end_date': project.end_date.isoformat() if project.end_date else None,
+            'days_remaining': days_remaining,
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'in_progress_tasks': in_progress_count,
+            'progress_percentage': round((completed / total * 100), 2) if total > 0 else 0,
+            'last_updated': project.updated_at.isoformat(),
+        })
+
+    # ========== EMPLOYEE SUMMARY ==========
+    from authentication.models import User
+    employee_counts = User.objects.for_company(company_id).filter(
+        role='Employee'
+    ).aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    total_employees = employee_counts['total']
+    active_employees = employee_counts['active']
+
+    # Top performers (employees with most completed tasks)
+    top_performers_query = User.objects.for_company(company_id).filter(
+        role='Employee'
+    ).annotate(
+        completed_count=Count('assigned_tasks', filter=Q(assigned_tasks__status='completed')),
+        active_count=Count('assigned_tasks', filter=Q(assigned_tasks__status='in_progress'))
+    ).order_by('-completed_count')[:5]
+
+    top_performers = []
+    for employee in top_performers_query:
+        top_performers.append({
+            'employee_name': f"{employee.first_name} {employee.last_name}",
+            'tasks_completed': employee.completed_count,
+            'active_tasks': employee.active_count,
+        })
+
+    # ========== COMPILE RESPONSE ==========
+    dashboard_data = {
+        'overall_stats': {
+            'total_projects': total_projects,
+            'active_projects': active_projects,
+            'completed_projects': completed_projects,
+            'on_hold_projects': on_hold_projects,
+            'cancelled_projects': cancelled_projects,
+        },
+        'task_stats': {
+            'total_tasks': total_tasks,
+            'completed_tasks': completed_tasks,
+            'in_progress_tasks': in_progress_tasks,
+            'not_started_tasks': not_started_tasks,
+            'blocked_tasks': blocked_tasks,
+        },
+        'progress_rate': {
+            'overall_progress': round(overall_progress, 2),
+            'project_completion_rate': round(project_completion_rate, 2),
+            'task_completion_rate': round(task_completion_rate, 2),
+        },
+        'weekly_progress': {
+            'week_start': week_start.isoformat(),
+            'week_end': week_end.isoformat(),
+            'tasks_completed_this_week': tasks_completed_this_week,
+            'projects_completed_this_week': projects_completed_this_week,
+            'new_tasks_created_this_week': new_tasks_created_this_week,
+        },
+        'upcoming_deadlines': upcoming_deadlines,
+        'in_progress_projects': in_progress_projects,
+        'employee_summary': {
+            'total_employees': total_employees,
+            'active_employees': active_employees,
+            'top_performers': top_performers,
+        },
+    }
+    
+    return dashboard_data
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsProjectManager])
 @swagger_auto_schema(
@@ -1961,172 +2166,13 @@ def company_dashboard(request):
     Get comprehensive company dashboard with all statistics and metrics.
     """
     try:
-        from django.db.models import Count, Q
-        today = timezone.now().date()
-        week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=6)
-        
-        # ========== OVERALL STATS ==========
-        all_projects = Project.objects.all()
-        total_projects = all_projects.count()
-        active_projects = all_projects.filter(status='in_progress').count()
-        completed_projects = all_projects.filter(status='completed').count()
-        on_hold_projects = all_projects.filter(status='on_hold').count()
-        cancelled_projects = all_projects.filter(status='cancelled').count()
-        
-        # ========== TASK STATS ==========
-        all_tasks = Task.objects.all()
-        total_tasks = all_tasks.count()
-        completed_tasks = all_tasks.filter(status='completed').count()
-        in_progress_tasks = all_tasks.filter(status='in_progress').count()
-        not_started_tasks = all_tasks.filter(status='not_started').count()
-        blocked_tasks = all_tasks.filter(status='blocked').count()
-        
-        # ========== PROGRESS RATES ==========
-        overall_progress = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        project_completion_rate = (completed_projects / total_projects * 100) if total_projects > 0 else 0
-        task_completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        # ========== WEEKLY PROGRESS ==========
-        tasks_completed_this_week = Task.objects.filter(
-            status='completed',
-            updated_at__date__gte=week_start,
-            updated_at__date__lte=week_end
-        ).count()
-        
-        projects_completed_this_week = Project.objects.filter(
-            status='completed',
-            updated_at__date__gte=week_start,
-            updated_at__date__lte=week_end
-        ).count()
-        
-        new_tasks_created_this_week = Task.objects.filter(
-            created_at__date__gte=week_start,
-            created_at__date__lte=week_end
-        ).count()
-        
-        # ========== UPCOMING DEADLINES (All projects with end dates) ==========
-        # Get all projects with end dates, sorted by closest deadline first
-        upcoming_projects = Project.objects.filter(
-            end_date__isnull=False
-        ).exclude(
-            status='completed'
-        ).order_by('end_date')
-        
-        upcoming_deadlines = []
-        for project in upcoming_projects:
-            tasks = project.tasks.all()
-            completed = tasks.filter(status='completed').count()
-            total = tasks.count()
-            
-            # Calculate days remaining
-            days_remaining = (project.end_date - today).days
-            
-            upcoming_deadlines.append({
-                'project_id': project.id,
-                'project_name': project.project_name,
-                'client_name': project.client_name,
-                'deadline': project.end_date.isoformat(),
-                'days_remaining': days_remaining,
-                'status': project.status,
-                'tasks_completed': completed,
-                'total_tasks': total,
-                'progress_percentage': round((completed / total * 100), 2) if total > 0 else 0,
-            })
-        
-        # ========== IN PROGRESS PROJECTS ==========
-        in_progress_projects_query = Project.objects.filter(
-            status='in_progress'
-        ).order_by('-updated_at')
-        
-        in_progress_projects = []
-        for project in in_progress_projects_query:
-            tasks = project.tasks.all()
-            completed = tasks.filter(status='completed').count()
-            total = tasks.count()
-            in_progress_count = tasks.filter(status='in_progress').count()
-            
-            # Calculate days remaining if end_date exists
-            days_remaining = None
-            if project.end_date:
-                days_remaining = (project.end_date - today).days
-            
-            in_progress_projects.append({
-                'project_id': project.id,
-                'project_name': project.project_name,
-                'client_name': project.client_name,
-                'start_date': project.start_date.isoformat() if project.start_date else None,
-                'end_date': project.end_date.isoformat() if project.end_date else None,
-                'days_remaining': days_remaining,
-                'total_tasks': total,
-                'completed_tasks': completed,
-                'in_progress_tasks': in_progress_count,
-                'progress_percentage': round((completed / total * 100), 2) if total > 0 else 0,
-                'last_updated': project.updated_at.isoformat(),
-            })
-        
-        # ========== EMPLOYEE SUMMARY ==========
-        from authentication.models import User
-        total_employees = User.objects.filter(role='Employee', company_name=request.user.company_name).count()
-        active_employees = User.objects.filter(
-            role='Employee',
-            company_name=request.user.company_name,
-            is_active=True
-        ).count()
-        
-        # Top performers (employees with most completed tasks)
-        top_performers_query = User.objects.filter(
-            role='Employee',
-            company_name=request.user.company_name
-        ).annotate(
-            completed_count=Count('assigned_tasks', filter=Q(assigned_tasks__status='completed')),
-            active_count=Count('assigned_tasks', filter=Q(assigned_tasks__status='in_progress'))
-        ).order_by('-completed_count')[:5]
-        
-        top_performers = []
-        for employee in top_performers_query:
-            top_performers.append({
-                'employee_name': f"{employee.first_name} {employee.last_name}",
-                'tasks_completed': employee.completed_count,
-                'active_tasks': employee.active_count,
-            })
-        
-        # ========== COMPILE RESPONSE ==========
-        dashboard_data = {
-            'overall_stats': {
-                'total_projects': total_projects,
-                'active_projects': active_projects,
-                'completed_projects': completed_projects,
-                'on_hold_projects': on_hold_projects,
-                'cancelled_projects': cancelled_projects,
-            },
-            'task_stats': {
-                'total_tasks': total_tasks,
-                'completed_tasks': completed_tasks,
-                'in_progress_tasks': in_progress_tasks,
-                'not_started_tasks': not_started_tasks,
-                'blocked_tasks': blocked_tasks,
-            },
-            'progress_rate': {
-                'overall_progress': round(overall_progress, 2),
-                'project_completion_rate': round(project_completion_rate, 2),
-                'task_completion_rate': round(task_completion_rate, 2),
-            },
-            'weekly_progress': {
-                'week_start': week_start.isoformat(),
-                'week_end': week_end.isoformat(),
-                'tasks_completed_this_week': tasks_completed_this_week,
-                'projects_completed_this_week': projects_completed_this_week,
-                'new_tasks_created_this_week': new_tasks_created_this_week,
-            },
-            'upcoming_deadlines': upcoming_deadlines,
-            'in_progress_projects': in_progress_projects,
-            'employee_summary': {
-                'total_employees': total_employees,
-                'active_employees': active_employees,
-                'top_performers': top_performers,
-            },
-        }
+        company_id = request.user.company_id
+        dashboard_data = get_or_compute(
+            'company_dashboard',
+            company_id,
+            lambda: _company_dashboard_data(company_id),
+            vary=timezone.now().date().isoformat(),
+        )
         
         return Response(
             format_response(
@@ -2149,6 +2195,88 @@ def company_dashboard(request):
 
 
 # ====================== EMPLOYEE TIMESHEET API ======================
+def _company_timer_filters(request):
+    """
+    TaskTimer lookups for the requesting user's company employees, built from
+    the employee_id, date, start_date, end_date, week, task_id and project_id
+    query params. Malformed dates and weeks are ignored.
+
+    Every lookup also exists on TaskTimerDailyRollup, so the same dict filters
+    the timer sessions and their daily rollups.
+    """
+    # Start with all task timers for company employees
+    filters = {
+        'employee__company_id': request.user.company_id,
+        'employee__role': 'Employee',
+    }
+    
+    # Filter by employee
+    employee_id = request.query_params.get('employee_id', '').strip()
+    if employee_id:
+        filters['employee_id'] = employee_id
+    
+    # Filter by specific date
+    date_param = request.query_params.get('date', '').strip()
+    if date_param:
+        try:
+            filter_date = datetime.strptime(date_param, '%Y-%m-%d').date()
+            filters['work_date'] = filter_date
+        except ValueError:
+            pass
+    
+    # Filter by date range
+    start_date_param = request.query_params.get('start_date', '').strip()
+    end_date_param = request.query_params.get('end_date', '').strip()
+    
+    if start_date_param:
+        try:
+            start_date = datetime.strptime(start_date_param, '%Y-%m-%d').date()
+            filters['work_date__gte'] = start_date
+        except ValueError:
+            pass
+    
+    if end_date_param:
+        try:
+            end_date = datetime.strptime(end_date_param, '%Y-%m-%d').date()
+            filters['work_date__lte'] = end_date
+        except ValueError:
+            pass
+    
+    # Filter by week (ISO week format: YYYY-W##)
+    week_param = request.query_params.get('week', '').strip()
+    if week_param:
+        try:
+            # Parse week format (e.g., 2025-W47)
+            year, week = week_param.split('-W')
+            year = int(year)
+            week = int(week)
+            
+            # Calculate Monday of the week
+            jan_4 = timezone.now().replace(year=year, month=1, day=4)
+            week_one_monday = jan_4 - timedelta(days=jan_4.weekday())
+            week_monday = week_one_monday + timedelta(weeks=week-1)
+            week_sunday = week_monday + timedelta(days=6)
+            
+            # Narrow (never widen) any start_date/end_date range given as well
+            filters['work_date__gte'] = max(filters.get('work_date__gte', week_monday.date()), week_monday.date())
+            filters['work_date__lte'] = min(filters.get('work_date__lte', week_sunday.date()), week_sunday.date())
+        except (ValueError, AttributeError):
+            pass
+    
+    # Filter by task
+    task_id = request.query_params.get('task_id', '').strip()
+    if task_id:
+        filters['task_id'] = task_id
+    
+    # Filter by project
+    project_id = request.query_params.get('project_id', '').strip()
+    if project_id:
+        filters['task__project_id'] = project_id
+    
+    
+    return filters
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsProjectManager])
 @swagger_auto_schema(
@@ -2239,6 +2367,20 @@ def company_dashboard(request):
             required=False,
             enum=['true', 'false', '1', '0']
         ),
+        openapi.Parameter(
+            'page_size',
+            openapi.IN_QUERY,
+            description='Opt in to keyset pagination with this many records per page (max 500)',
+            type=openapi.TYPE_INTEGER,
+            required=False
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            description='next_cursor value from the previous page',
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
     ],
     responses={
         200: openapi.Response(
@@ -2261,6 +2403,15 @@ def company_dashboard(request):
                                     'completed': openapi.Schema(type=openapi.TYPE_INTEGER),
                                 }
                             ),
+                            'pagination': openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                nullable=True,
+                                properties={
+                                    'page_size': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    'has_more': openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                                    'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, nullable=True),
+                                }
+                            ),
                             'timesheets': openapi.Schema(
                                 type=openapi.TYPE_ARRAY,
                                 items=openapi.Schema(
@@ -2301,111 +2452,68 @@ def view_company_timesheets(request):
     Get all timesheets for company employees with optional filtering.
     """
     try:
-        from datetime import datetime, timedelta
-        from emopye.models import TaskTimer
-        
-        # Get all employees from the company
-        company_employees = User.objects.filter(
-            role='Employee',
-            company_name=request.user.company_name
-        )
-        
-        # Start with all task timers for company employees
-        timesheets = TaskTimer.objects.filter(
-            employee__in=company_employees
-        ).select_related('employee', 'task', 'task__project').order_by('-work_date', '-start_time')
+        from datetime import timedelta
+        from django.db.models import Count, F, Sum
+        from emopye.models import TaskTimer, TaskTimerDailyRollup
         
         # ========== FILTERS ==========
+        # Applied to both the timer sessions (listed) and the daily rollups (summed)
+        filters = _company_timer_filters(request)
         
-        # Filter by employee
-        employee_id = request.query_params.get('employee_id', '').strip()
-        if employee_id:
-            timesheets = timesheets.filter(employee_id=employee_id)
-        
-        # Filter by specific date
-        date_param = request.query_params.get('date', '').strip()
-        if date_param:
-            try:
-                filter_date = datetime.strptime(date_param, '%Y-%m-%d').date()
-                timesheets = timesheets.filter(work_date=filter_date)
-            except ValueError:
-                pass
-        
-        # Filter by date range
-        start_date_param = request.query_params.get('start_date', '').strip()
-        end_date_param = request.query_params.get('end_date', '').strip()
-        
-        if start_date_param:
-            try:
-                start_date = datetime.strptime(start_date_param, '%Y-%m-%d').date()
-                timesheets = timesheets.filter(work_date__gte=start_date)
-            except ValueError:
-                pass
-        
-        if end_date_param:
-            try:
-                end_date = datetime.strptime(end_date_param, '%Y-%m-%d').date()
-                timesheets = timesheets.filter(work_date__lte=end_date)
-            except ValueError:
-                pass
-        
-        # Filter by week (ISO week format: YYYY-W##)
-        week_param = request.query_params.get('week', '').strip()
-        if week_param:
-            try:
-                # Parse week format (e.g., 2025-W47)
-                year, week = week_param.split('-W')
-                year = int(year)
-                week = int(week)
-                
-                # Calculate Monday of the week
-                jan_4 = timezone.now().replace(year=year, month=1, day=4)
-                week_one_monday = jan_4 - timedelta(days=jan_4.weekday())
-                week_monday = week_one_monday + timedelta(weeks=week-1)
-                week_sunday = week_monday + timedelta(days=6)
-                
-                timesheets = timesheets.filter(
-                    work_date__gte=week_monday.date(),
-                    work_date__lte=week_sunday.date()
-                )
-            except (ValueError, AttributeError):
-                pass
-        
-        # Filter by task
-        task_id = request.query_params.get('task_id', '').strip()
-        if task_id:
-            timesheets = timesheets.filter(task_id=task_id)
-        
-        # Filter by project
-        project_id = request.query_params.get('project_id', '').strip()
-        if project_id:
-            timesheets = timesheets.filter(task__project_id=project_id)
+        timesheets = TaskTimer.objects.filter(**filters).select_related(
+            'employee', 'task', 'task__project'
+        ).order_by('-work_date', '-start_time')
+        rollups = TaskTimerDailyRollup.objects.filter(**filters)
         
         # Filter by is_active status
         is_active_param = request.query_params.get('is_active', '').strip()
+        count_active = count_completed = True
         if is_active_param.lower() in ['true', '1']:
             timesheets = timesheets.filter(is_active=True)
+            rollups = rollups.filter(active_count__gt=0)
+            count_completed = False
         elif is_active_param.lower() in ['false', '0']:
             timesheets = timesheets.filter(is_active=False)
+            rollups = rollups.filter(session_count__gt=F('active_count'))
+            count_active = False
         
         # ========== CALCULATE STATISTICS ==========
-        total_records = timesheets.count()
-        unique_employees = timesheets.values('employee_id').distinct().count()
-        
-        # Timer status summary
-        active_timers = timesheets.filter(is_active=True).count()
-        completed_timers = timesheets.filter(is_active=False).count()
-        
-        # Total working hours
-        total_duration = timedelta()
-        for timer in timesheets:
-            total_duration += timedelta(seconds=timer.duration_seconds)
+        # All summary figures come from a single aggregate over the daily rollups
+        stats = rollups.order_by().aggregate(
+            unique_employees=Count('employee', distinct=True),
+            active_timers=Sum('active_count'),
+            completed_timers=Sum(F('session_count') - F('active_count')),
+            total_seconds=Sum('total_seconds'),
+        )
+        unique_employees = stats['unique_employees']
+        active_timers = (stats['active_timers'] or 0) if count_active else 0
+        completed_timers = (stats['completed_timers'] or 0) if count_completed else 0
+        total_records = active_timers + completed_timers
         
-        total_seconds = int(total_duration.total_seconds())
+        # Total working hours (stopped timers only)
+        total_seconds = (stats['total_seconds'] or 0) if count_completed else 0
         total_hours = total_seconds // 3600
         total_minutes = (total_seconds % 3600) // 60
         total_working_hours = f"{total_hours} hours {total_minutes} minutes"
         
+        # ========== PAGINATION (opt-in keyset) ==========
+        paginator = KeysetPagination('work_date', 'start_time')
+        pagination = None
+        if paginator.is_requested(request):
+            try:
+                timesheets, pagination = paginator.paginate(timesheets, request)
+            except InvalidCursor:
+                return Response(
+                    format_response(
+                        success=False,
+                        message="Invalid cursor",
+                        data=None
+                    ),
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            timesheets = paginator.order(timesheets)
+        
         # ========== FORMAT TIMESHEET DATA ==========
         timesheet_list = []
         for timer in timesheets:
@@ -2462,6 +2570,7 @@ def view_company_timesheets(request):
                 'active': active_timers,
                 'completed': completed_timers,
             },
+            'pagination': pagination,
             'timesheets': timesheet_list,
         }
         
@@ -2483,3 +2592,209 @@ def view_company_timesheets(request):
             ),
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+# ====================== TIMESHEET EXPORT API ======================
+FILE_FORMAT_PARAMETER = openapi.Parameter(
+    'file_format',
+    openapi.IN_QUERY,
+    description='Export file format (default: csv)',
+    type=openapi.TYPE_STRING,
+    required=False,
+    enum=list(EXPORT_FORMATS)
+)
+
+
+def _export_file_format(request):
+    """Requested export format, or None if it is not one of EXPORT_FORMATS"""
+    file_format = request.query_params.get('file_format', '').strip().lower() or 'csv'
+    return file_format if file_format in EXPORT_FORMATS else None
+
+
+def _invalid_id_param(request, names=('employee_id', 'task_id', 'project_id')):
+    """Name of the first id query param that is not an integer, or None"""
+    for name in names:
+        value = request.query_params.get(name, '').strip()
+        if value:
+            try:
+                int(value)
+            except ValueError:
+                return name
+    return None
+
+
+def _invalid_file_format_response():
+    return Response(
+        format_response(
+            success=False,
+            message=f"Invalid file_format. Use one of: {', '.join(EXPORT_FORMATS)}",
+            data=None
+        ),
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, IsProjectManager])
+@swagger_auto_schema(
+    operation_summary="Export employee task timers (CSV/XLSX)",
+    operation_description=(
+        "Download company employee task timers as CSV or XLSX. Accepts the same "
+        "filters as GET /api/project-manager/employee-timesheets/. Rows are streamed "
+        "from the database in chunks, so exports of any size use constant memory."
+    ),
+    manual_parameters=[
+        FILE_FORMAT_PARAMETER,
+        openapi.Parameter('employee_id', openapi.IN_QUERY, description='Filter by specific employee ID', type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('task_id', openapi.IN_QUERY, description='Filter by specific task ID', type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('project_id', openapi.IN_QUERY, description='Filter by specific project ID', type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('date', openapi.IN_QUERY, description='Filter by specific date (YYYY-MM-DD)', type=openapi.TYPE_STRING, format='date', required=False),
+        openapi.Parameter('start_date', openapi.IN_QUERY, description='Filter from start date (YYYY-MM-DD)', type=openapi.TYPE_STRING, format='date', required=False),
+        openapi.Parameter('end_date', openapi.IN_QUERY, description='Filter to end date (YYYY-MM-DD)', type=openapi.TYPE_STRING, format='date', required=False),
+        openapi.Parameter('week', openapi.IN_QUERY, description='Filter by week (format: YYYY-W##, e.g., 2025-W47)', type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('is_active', openapi.IN_QUERY, description='Filter by timer status (true/false or 1/0)', type=openapi.TYPE_STRING, required=False, enum=['true', 'false', '1', '0']),
+    ],
+    responses={
+        200: openapi.Response(description="CSV or XLSX file attachment"),
+        400: "Invalid file_format or non-integer employee_id / task_id / project_id",
+    },
+    tags=['Project Manager - Timesheet Management']
+)
+def export_company_timesheets(request):
+    """
+    Stream company employee task timers as a CSV / XLSX download.
+
+    Endpoint: GET /api/project-manager/employee-timesheets/export/?file_format=xlsx
+    """
+    try:
+        from emopye.models import TaskTimer
+        
+        file_format = _export_file_format(request)
+        if file_format is None:
+            return _invalid_file_format_response()
+        
+        # Checked up front: once streaming starts, the 200 headers are already sent
+        invalid_param = _invalid_id_param(request)
+        if invalid_param:
+            return Response(
+                format_response(
+                    success=False,
+                    message=f"{invalid_param} must be an integer",
+                    data=None
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        timers = TaskTimer.objects.filter(**_company_timer_filters(request))
+        
+        is_active_param = request.query_params.get('is_active', '').strip().lower()
+        if is_active_param in ['true', '1']:
+            timers = timers.filter(is_active=True)
+        elif is_active_param in ['false', '0']:
+            timers = timers.filter(is_active=False)
+        
+        # Plain tuples straight off the cursor: no model instances are built
+        rows = KeysetPagination('work_date', 'start_time').order(timers).values_list(
+            'id', 'employee_id', 'employee__first_name', 'employee__last_name', 'employee__email',
+            'task_id', 'task__task_name', 'task__project_id', 'task__project__project_name',
+            'task__project__client_name', 'work_date', 'start_time', 'end_time',
+            'duration_seconds', 'is_active',
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        
+        header = [
+            'id', 'employee_id', 'employee_name', 'employee_email', 'task_id', 'task_name',
+            'project_id', 'project_name', 'client_name', 'work_date', 'start_time', 'end_time',
+            'duration_seconds', 'is_active',
+        ]
+        records = (
+            (row[0], row[1], f"{row[2]} {row[3]}".strip(), *row[4:])
+            for row in rows
+        )
+        return streaming_export_response(
+            file_format, f"employee-timesheets-{timezone.localdate().isoformat()}",
+            header, records, sheet_name='Timesheets'
+        )
+    
+    except Exception as e:
+        return Response(
+            format_response(
+                success=False,
+                message=f"Error exporting employee timesheets: {str(e)}",
+                data=None
+            ),
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, IsProjectManager])
+@swagger_auto_schema(
+    operation_summary="Export employee time entries (CSV/XLSX)",
+    operation_description=(
+        "Download company employee clock-in/clock-out time entries as CSV or XLSX. "
+        "Rows are streamed from the database in chunks, so exports of any size use "
+        "constant memory. total_working_seconds is the worked time in seconds."
+    ),
+    manual_parameters=[
+        FILE_FORMAT_PARAMETER,
+        openapi.Parameter('employee_name', openapi.IN_QUERY, description='Filter by employee first or last name', type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('start_date', openapi.IN_QUERY, description='Filter from start date (YYYY-MM-DD)', type=openapi.TYPE_STRING, format='date', required=False),
+        openapi.Parameter('end_date', openapi.IN_QUERY, description='Filter to end date (YYYY-MM-DD)', type=openapi.TYPE_STRING, format='date', required=False),
+        openapi.Parameter('attendance', openapi.IN_QUERY, description='Filter by attendance status', type=openapi.TYPE_STRING, required=False, enum=['Present', 'Absent', 'Half Day']),
+    ],
+    responses={
+        200: openapi.Response(description="CSV or XLSX file attachment"),
+        400: "Invalid file_format or date",
+    },
+    tags=['Project Manager - Timesheet Management']
+)
+def export_company_time_entries(request):
+    """
+    Stream company employee time entries as a CSV / XLSX download.
+
+    Endpoint: GET /api/project-manager/time-entries/export/?file_format=csv
+    """
+    try:
+        file_format = _export_file_format(request)
+        if file_format is None:
+            return _invalid_file_format_response()
+        
+        try:
+            entries = _company_time_entries(request)
+        except ValueError as e:
+            return Response(
+                format_response(
+                    success=False,
+                    message=str(e),
+                    data=None
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        rows = KeysetPagination('date', 'entry_time').order(entries).values_list(
+            'id', 'user_id', 'user__first_name', 'user__last_name', 'user__email',
+            'date', 'entry_time', 'exit_time', 'total_working_time', 'attendance',
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        
+        header = [
+            'id', 'employee_id', 'employee_name', 'employee_email', 'date',
+            'entry_time', 'exit_time', 'total_working_seconds', 'attendance',
+        ]
+        records = (
+            (row[0], row[1], f"{row[2]} {row[3]}".strip(), *row[4:])
+            for row in rows
+        )
+        return streaming_export_response(
+            file_format, f"time-entries-{timezone.localdate().isoformat()}",
+            header, records, sheet_name='Time Entries'
+        )
+    
+    except Exception as e:
+        return Response(
+            format_response(
+                success=False,
+                message=f"Error exporting timesheets: {str(e)}",
+                data=None
+            ),
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Material, EstimateDefaults, Component, ComponentMaterialQuantity, ComponentEstimateQuantity
+from .models import (
+    Material, EstimateDefaults, Component, ComponentMaterialQuantity, ComponentEstimateQuantity,
+    MonthlyMetricSnapshot,
+)
 
 
 @admin.register(Material)
@@ -96,3 +99,13 @@ class ComponentEstimateQuantityAdmin(admin.ModelAdmin):
     list_filter = ['created_at', 'component']
     search_fields = ['component__component_name', 'estimate_default__name']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(MonthlyMetricSnapshot)
+class MonthlyMetricSnapshotAdmin(admin.ModelAdmin):
+    """Admin configuration for MonthlyMetricSnapshot model"""
+    
+    list_display = ['month', 'company', 'revenue', 'completed_projects', 'new_users', 'updated_at']
+    list_filter = ['company']
+    readonly_fields = ['created_at', 'updated_at']
+    ordering = ['-month']
@@ -0,0 +1,193 @@
+"""
+Month-bucketed analytics behind the admin dashboard overview.
+
+Every series is scoped to one company (``company`` accepts anything
+``tenancy.company_id_of`` does) and is a single ``TruncMonth`` GROUP BY over
+an indexed date range:
+- revenue and completions: completed projects, bucketed by the month they
+  were completed in (``completed_at``, so later edits do not move them)
+- signups: users, bucketed by ``date_joined``
+
+Months that have already closed can be served from per-company
+``MonthlyMetricSnapshot`` rows instead (``ANALYTICS['USE_SNAPSHOTS']``). A
+closed month missing from the table is computed once and stored, so the
+overview costs the same few queries however much history there is.
+Snapshots are not updated afterwards: a project reopened and completed again
+later counts in both its old (snapshotted) month and its new one, and
+backdated signups or deleted projects are not reflected. Refresh them with
+``python manage.py snapshot_monthly_metrics --rebuild``.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+DEFAULT_ANALYTICS = {
+    'USE_SNAPSHOTS': True,
+}
+
+METRIC_FIELDS = ['revenue', 'completed_projects', 'new_users']
+
+
+def get_analytics_settings():
+    """Merge settings.ANALYTICS over the defaults"""
+    return {**DEFAULT_ANALYTICS, **getattr(settings, 'ANALYTICS', {})}
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    years, month_index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def month_range(start_month, end_month):
+    """Every first-of-month from start_month to end_month, inclusive"""
+    months = []
+    month = month_start(start_month)
+    while month <= end_month:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def current_month():
+    return month_start(timezone.localdate())
+
+
+def _empty_metrics():
+    return {'revenue': Decimal('0'), 'completed_projects': 0, 'new_users': 0}
+
+
+def _datetime_bounds(start_month, end_month):
+    """Aware [start, end) datetimes covering the months, for index range scans"""
+    start = datetime(start_month.year, start_month.month, 1)
+    end_month = add_months(end_month, 1)
+    end = datetime(end_month.year, end_month.month, 1)
+    if settings.USE_TZ:
+        start, end = timezone.make_aware(start), timezone.make_aware(end)
+    return start, end
+
+
+def _month_buckets(queryset, field, start_month, end_month, **aggregates):
+    start, end = _datetime_bounds(start_month, end_month)
+    return (
+        queryset.filter(**{f'{field}__gte': start, f'{field}__lt': end})
+        .annotate(month=TruncMonth(field, output_field=DateField()))
+        .values('month')
+        .annotate(**aggregates)
+        .order_by('month')
+    )
+
+
+def compute_monthly_metrics(company, start_month, end_month):
+    """Live metrics of ``company`` for every month in the range: one query per series"""
+    from Project_manager.models import Project
+    from authentication.models import User
+
+    metrics = {month: _empty_metrics() for month in month_range(start_month, end_month)}
+
+    completions = _month_buckets(
+        Project.objects.for_company(company).filter(status='completed'), 'completed_at', start_month, end_month,
+        revenue=Sum('total_amount'),
+        completed_projects=Count('id'),
+    )
+    for row in completions:
+        metrics[row['month']]['revenue'] = row['revenue'] or Decimal('0')
+        metrics[row['month']]['completed_projects'] = row['completed_projects']
+
+    signups = _month_buckets(
+        User.objects.for_company(company), 'date_joined', start_month, end_month,
+        new_users=Count('id'),
+    )
+    for row in signups:
+        metrics[row['month']]['new_users'] = row['new_users']
+
+    return metrics
+
+
+def monthly_metrics(company, start_month, end_month):
+    """
+    ``{month: {'revenue', 'completed_projects', 'new_users'}}`` of ``company``
+    for every month in the range, reading closed months from snapshots when
+    enabled.
+    """
+    from eagleeyeau.tenancy import company_id_of
+    from .models import MonthlyMetricSnapshot
+
+    company_id = company_id_of(company)
+    start_month, end_month = month_start(start_month), month_start(end_month)
+    if company_id is None:
+        # No tenant, nothing to count (and nothing worth snapshotting)
+        return {month: _empty_metrics() for month in month_range(start_month, end_month)}
+    metrics = {}
+    live_from = start_month
+
+    last_closed = min(end_month, add_months(current_month(), -1))
+    if get_analytics_settings()['USE_SNAPSHOTS'] and start_month <= last_closed:
+        snapshots = MonthlyMetricSnapshot.objects.filter(company_id=company_id, month__range=(start_month, last_closed))
+        for snapshot in snapshots:
+            metrics[snapshot.month] = {field: getattr(snapshot, field) for field in METRIC_FIELDS}
+
+        missing = [month for month in month_range(start_month, last_closed) if month not in metrics]
+        if missing:
+            computed = compute_monthly_metrics(company_id, missing[0], missing[-1])
+            fresh = {month: computed[month] for month in missing}
+            MonthlyMetricSnapshot.objects.bulk_create(
+                [
+                    MonthlyMetricSnapshot(company_id=company_id, month=month, **values)
+                    for month, values in fresh.items()
+                ],
+                ignore_conflicts=True,
+            )
+            metrics.update(fresh)
+        live_from = add_months(last_closed, 1)
+
+    if live_from <= end_month:
+        metrics.update(compute_monthly_metrics(company_id, live_from, end_month))
+    return metrics
+
+
+def snapshot_closed_months(company, start_month, end_month=None, rebuild=False):
+    """
+    Store ``company``'s snapshots for the closed months in the range (by
+    default up to last month). Existing rows are kept unless ``rebuild``.
+    Returns the months written.
+    """
+    from eagleeyeau.tenancy import company_id_of
+    from .models import MonthlyMetricSnapshot
+
+    company_id = company_id_of(company)
+    if company_id is None:
+        return []
+
+    last_closed = add_months(current_month(), -1)
+    end_month = min(month_start(end_month), last_closed) if end_month else last_closed
+    start_month = month_start(start_month)
+    if start_month > end_month:
+        return []
+
+    months = month_range(start_month, end_month)
+    if not rebuild:
+        existing = set(
+            MonthlyMetricSnapshot.objects.filter(company_id=company_id, month__range=(start_month, end_month))
+            .values_list('month', flat=True)
+        )
+        months = [month for month in months if month not in existing]
+    if not months:
+        return []
+
+    computed = compute_monthly_metrics(company_id, months[0], months[-1])
+    MonthlyMetricSnapshot.objects.bulk_create(
+        [MonthlyMetricSnapshot(company_id=company_id, month=month, **computed[month]) for month in months],
+        update_conflicts=True,
+        unique_fields=['company', 'month'],
+        update_fields=[*METRIC_FIELDS, 'updated_at'],
+    )
+    return months
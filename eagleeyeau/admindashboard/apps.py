@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AdmindashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admindashboard'
+
+    def ready(self):
+        # Invalidate cached dashboards when the data behind them changes
+        from eagleeyeau.dashboard_cache import connect_signals
+        connect_signals()
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from authentication.models import Company
+from admindashboard.analytics import add_months, current_month, snapshot_closed_months
+
+
+class Command(BaseCommand):
+    help = 'Store monthly revenue / completion / signup snapshots of every company for closed months'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=24,
+            help='Number of closed months to snapshot, counting back from last month (default: 24)'
+        )
+        parser.add_argument('--start-month', help='First month to snapshot (YYYY-MM); overrides --months')
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute months that already have a snapshot'
+        )
+
+    def handle(self, *args, **options):
+        if options['start_month']:
+            try:
+                start_month = datetime.strptime(options['start_month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError(f'Invalid --start-month "{options["start_month"]}". Use YYYY-MM')
+        else:
+            start_month = add_months(current_month(), -max(options['months'], 1))
+
+        self.stdout.write(self.style.WARNING(f'Snapshotting closed months from {start_month:%Y-%m}...'))
+
+        written = 0
+        for company_id in Company.objects.order_by('pk').values_list('pk', flat=True):
+            written += len(snapshot_closed_months(company_id, start_month, rebuild=options['rebuild']))
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} monthly snapshots'))
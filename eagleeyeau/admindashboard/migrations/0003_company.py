@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_company(apps, schema_editor):
+    """Copy each row's company from its creator"""
+    User = apps.get_model('authentication', 'User')
+    for model_name in ['Material', 'EstimateDefaults', 'Component']:
+        model = apps.get_model('admindashboard', model_name)
+        model.objects.filter(company__isnull=True, created_by__isnull=False).update(
+            company=models.Subquery(
+                User.objects.filter(pk=models.OuterRef('created_by')).values('company')[:1]
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admindashboard', '0002_initial'),
+        ('authentication', '0002_company'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='component',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='components', to='authentication.company'),
+        ),
+        migrations.AddField(
+            model_name='estimatedefaults',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='estimate_defaults', to='authentication.company'),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='materials', to='authentication.company'),
+        ),
+        migrations.RunPython(backfill_company, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-17 09:30
+
+from django.db import migrations
+
+from eagleeyeau.search import AddTrigramIndex, TrigramExtension
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admindashboard', '0003_company'),
+    ]
+
+    # pg_trgm GIN indexes behind the icontains searches (no-ops outside PostgreSQL)
+    operations = [
+        TrigramExtension(),
+        AddTrigramIndex(model_name='material', field='material_name', name='material_name_trgm'),
+        AddTrigramIndex(model_name='material', field='supplier', name='material_supplier_trgm'),
+        AddTrigramIndex(model_name='material', field='category', name='material_category_trgm'),
+        AddTrigramIndex(model_name='material', field='unit', name='material_unit_trgm'),
+        AddTrigramIndex(model_name='estimatedefaults', field='name', name='estimate_default_name_trgm'),
+        AddTrigramIndex(model_name='estimatedefaults', field='description', name='estimate_default_desc_trgm'),
+        AddTrigramIndex(model_name='estimatedefaults', field='category', name='estimate_default_category_trgm'),
+        AddTrigramIndex(model_name='component', field='component_name', name='component_name_trgm'),
+        AddTrigramIndex(model_name='component', field='description', name='component_description_trgm'),
+    ]
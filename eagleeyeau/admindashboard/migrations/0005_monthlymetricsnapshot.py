@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admindashboard', '0004_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyMetricSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month', unique=True)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, help_text='Total amount of projects completed in the month', max_digits=15)),
+                ('completed_projects', models.IntegerField(default=0)),
+                ('new_users', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Monthly Metric Snapshot',
+                'verbose_name_plural': 'Monthly Metric Snapshots',
+                'ordering': ['-month'],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def drop_global_snapshots(apps, schema_editor):
+    """Snapshots used to cover every company; they are rebuilt per company on the next read"""
+    MonthlyMetricSnapshot = apps.get_model('admindashboard', 'MonthlyMetricSnapshot')
+    MonthlyMetricSnapshot.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admindashboard', '0005_monthlymetricsnapshot'),
+        ('authentication', '0002_company'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_global_snapshots, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='monthlymetricsnapshot',
+            name='month',
+            field=models.DateField(help_text='First day of the month'),
+        ),
+        migrations.AddField(
+            model_name='monthlymetricsnapshot',
+            name='company',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_metric_snapshots', to='authentication.company'),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name='monthlymetricsnapshot',
+            constraint=models.UniqueConstraint(fields=('company', 'month'), name='unique_company_month_snapshot'),
+        ),
+    ]
@@ -1,8 +1,9 @@
 from django.db import models
-from authentication.models import User
+from authentication.models import Company, User
+from eagleeyeau.tenancy import TenantOwnedMixin, TenantQuerySet
 
 
-class Material(models.Model):
+class Material(TenantOwnedMixin, models.Model):
     """Material Model for Admin Dashboard"""
     
     material_name = models.CharField(max_length=255, help_text="Name of the material")
@@ -13,6 +14,9 @@ class Material(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='materials_created')
+    company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True, related_name='materials')
+
+    objects = TenantQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
@@ -23,7 +27,7 @@ class Material(models.Model):
         return f"{self.material_name} - {self.supplier}"
 
 
-class EstimateDefaults(models.Model):
+class EstimateDefaults(TenantOwnedMixin, models.Model):
     """Estimate Defaults Model for Admin Dashboard"""
     
     name = models.CharField(max_length=255, help_text="Name of the estimate default")
@@ -32,6 +36,9 @@ class EstimateDefaults(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='estimate_defaults_created')
+    company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True, related_name='estimate_defaults')
+
+    objects = TenantQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
@@ -42,7 +49,7 @@ class EstimateDefaults(models.Model):
         return f"{self.name} - {self.category}"
 
 
-class Component(models.Model):
+class Component(TenantOwnedMixin, models.Model):
     """Component Model for Admin Dashboard"""
     
     component_name = models.CharField(max_length=255, help_text="Name of the component")
@@ -65,6 +72,9 @@ class Component(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='components_created')
+    company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True, related_name='components')
+
+    objects = TenantQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
@@ -133,5 +143,32 @@ class ComponentEstimateQuantity(models.Model):
 
     def __str__(self):
         return f"{self.component.component_name} - {self.estimate_default.name} ({self.quantity})"
+
+
+class MonthlyMetricSnapshot(models.Model):
+    """
+    Frozen dashboard figures of one company for one closed calendar month.
+
+    Written by admindashboard.analytics (on first read of a closed month, or by
+    the snapshot_monthly_metrics command) so the overview charts never
+    re-aggregate old history.
+    """
     
-    
\ No newline at end of file
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='monthly_metric_snapshots')
+    month = models.DateField(help_text="First day of the month")
+    revenue = models.DecimalField(max_digits=15, decimal_places=2, default=0, help_text="Total amount of projects completed in the month")
+    completed_projects = models.IntegerField(default=0)
+    new_users = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'month'], name='unique_company_month_snapshot'),
+        ]
+        verbose_name = "Monthly Metric Snapshot"
+        verbose_name_plural = "Monthly Metric Snapshots"
+
+    def __str__(self):
+        return f"{self.company} {self.month:%Y-%m}: {self.revenue} revenue, {self.new_users} new users"
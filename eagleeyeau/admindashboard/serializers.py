@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from eagleeyeau.sparse_fields import SparseFieldsMixin
 from .models import Material, EstimateDefaults, Component, ComponentMaterialQuantity, ComponentEstimateQuantity
 
 
-class MaterialSerializer(serializers.ModelSerializer):
+class MaterialSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Material model"""
     
     created_by_email = serializers.EmailField(source='created_by.email', read_only=True)
@@ -54,7 +55,7 @@ class MaterialSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class EstimateDefaultsSerializer(serializers.ModelSerializer):
+class EstimateDefaultsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for EstimateDefaults model"""
     
     created_by_email = serializers.EmailField(source='created_by.email', read_only=True)
@@ -86,7 +87,7 @@ class EstimateDefaultsSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class ComponentMaterialQuantitySerializer(serializers.ModelSerializer):
+class ComponentMaterialQuantitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for material quantities in components"""
     
     class Meta:
@@ -94,7 +95,7 @@ class ComponentMaterialQuantitySerializer(serializers.ModelSerializer):
         fields = ['id', 'material', 'quantity']
 
 
-class ComponentEstimateQuantitySerializer(serializers.ModelSerializer):
+class ComponentEstimateQuantitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for estimate quantities in components"""
     
     class Meta:
@@ -102,7 +103,7 @@ class ComponentEstimateQuantitySerializer(serializers.ModelSerializer):
         fields = ['id', 'estimate_default', 'quantity']
 
 
-class ComponentSerializer(serializers.ModelSerializer):
+class ComponentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Component model with quantities"""
     
     created_by_email = serializers.EmailField(source='created_by.email', read_only=True)
@@ -124,6 +125,8 @@ class ComponentSerializer(serializers.ModelSerializer):
             'created_by_email'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'created_by', 'created_by_email', 'material_quantities', 'estimate_quantities']
+        # Left out with ?fields= / ?expand= unless requested (see eagleeyeau/sparse_fields.py)
+        expandable_fields = ['material_quantities', 'estimate_quantities']
     
     def get_material_quantities(self, obj):
         """Get material quantities for the component"""
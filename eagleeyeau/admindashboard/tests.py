@@ -1,3 +1,375 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import Company, User
+from Project_manager.models import Project, Task
+from Project_manager.project_status import recompute_project_status
+from emopye.models import TaskTimer
+from estimator.models import Estimate
+from eagleeyeau.dashboard_cache import _PendingInvalidation, get_or_compute, invalidate_dashboards
+from eagleeyeau.db_routing import ReplicaRoutingMiddleware, read_from_replica
+from eagleeyeau.testing import QueryBudgetTestCase
+
+from .analytics import monthly_metrics
+from .models import MonthlyMetricSnapshot
+
+
+
+class AdminDashboardQueryBudgetTests(QueryBudgetTestCase):
+    """Query and response-time budgets of the Admin dashboard endpoints"""
+
+    def test_dashboard_overview(self):
+        self.assertQueryBudget('Admin', '/api/admin/dashboard-overview/', 6)
+
+    def test_comprehensive_list(self):
+        self.assertQueryBudget('Admin', '/api/admin/comprehensive-list/', 7)
+
+    def test_all_projects(self):
+        self.assertQueryBudget('Admin', '/api/admin/projects/', 3)
+
+    def test_project_detail(self):
+        self.assertQueryBudget('Admin', '/api/admin/projects/{project}/', 9)
+
+    def test_materials(self):
+        self.assertQueryBudget('Admin', '/api/admin/materials/', 4)
+
+    def test_components(self):
+        self.assertQueryBudget('Admin', '/api/admin/components/', 10)
+
+    def test_estimate_defaults(self):
+        self.assertQueryBudget('Admin', '/api/admin/estimate-defaults/', 4)
+
+    def test_estimates(self):
+        self.assertQueryBudget('Admin', '/api/admin/estimates/', 3)
+
+
+@override_settings(ANALYTICS={'USE_SNAPSHOTS': True})
+class MonthlyMetricsTests(TestCase):
+    """Completed projects are counted in the month they were completed"""
+
+    def at(self, month, day):
+        return timezone.make_aware(datetime(2026, month, day, 12))
+
+    def setUp(self):
+        self.company = Company.objects.create(name='Acme')
+        estimate = Estimate.objects.create(
+            serial_number='EST-1', client_name='Client', project_name='Kitchen', company=self.company,
+        )
+        with mock.patch('django.utils.timezone.now', return_value=self.at(9, 10)):
+            self.project = Project.objects.create(
+                estimate=estimate, project_name='Kitchen', client_name='Client', total_amount=Decimal('100'),
+            )
+            Task.objects.create(project=self.project, task_name='Fit', status='completed')
+            recompute_project_status(self.project)
+
+    def revenue(self, today):
+        with mock.patch('django.utils.timezone.localdate', return_value=today):
+            metrics = monthly_metrics(self.company, date(2026, 9, 1), date(2026, 10, 1))
+        return [metrics[month]['revenue'] for month in (date(2026, 9, 1), date(2026, 10, 1))]
+
+    def test_later_edit_does_not_move_revenue(self):
+        self.assertEqual(self.project.status, 'completed')
+        self.assertEqual(self.project.completed_at, self.at(9, 10))
+
+        # September closes and is snapshotted, then the project is edited in October
+        self.assertEqual(self.revenue(date(2026, 10, 5)), [Decimal('100'), Decimal('0')])
+        with mock.patch('django.utils.timezone.now', return_value=self.at(10, 12)):
+            self.project.description = 'Edited'
+            self.project.save()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completed_at, self.at(9, 10))
+        self.assertEqual(self.revenue(date(2026, 10, 20)), [Decimal('100'), Decimal('0')])
+
+    def test_other_companies_are_not_counted(self):
+        other = Company.objects.create(name='Other')
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2026, 10, 5)):
+            metrics = monthly_metrics(other, date(2026, 9, 1), date(2026, 10, 1))
+        self.assertEqual(metrics[date(2026, 9, 1)]['revenue'], Decimal('0'))
+        self.assertEqual(
+            list(MonthlyMetricSnapshot.objects.values_list('company__name', 'month', 'revenue')),
+            [('Other', date(2026, 9, 1), Decimal('0'))],
+        )
+
+    def test_reopening_clears_completed_at(self):
+        self.project.status = 'in_progress'
+        self.project.save(update_fields=['status'])
+
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.completed_at)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class AdminDashboardOverviewScopeTests(APITestCase):
+    """The overview only aggregates the requesting Admin's company"""
+
+    def setUp(self):
+        caches['dashboards'].clear()
+        for name, amounts in (('Acme', ['100', '50']), ('Other', ['1000'])):
+            admin = User.objects.create_user(
+                email=f'admin@{name.lower()}.com', username=f'admin@{name.lower()}.com', password='pw12345!',
+                role='Admin', company_name=name,
+            )
+            for number, amount in enumerate(amounts):
+                estimate = Estimate.objects.create(
+                    serial_number=f'{name}-{number}', client_name='Client', project_name='Kitchen',
+                    company=admin.company,
+                )
+                Project.objects.create(
+                    estimate=estimate, project_name='Kitchen', client_name='Client',
+                    total_amount=Decimal(amount), status='completed',
+                )
+        self.admin = User.objects.get(email='admin@acme.com')
+
+    def test_overview_is_scoped_to_the_company(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/api/admin/dashboard-overview/')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(data['overview_stats']['total_projects'], 2)
+        self.assertEqual(data['overview_stats']['total_revenue'], '$150.00')
+        self.assertEqual(data['user_growth']['total_users'], 1)
+        self.assertEqual(sum(month['completed_projects'] for month in data['revenue_overview']['monthly']), 2)
+
+
+REPLICA_PATH = '/api/admin/dashboard-overview/'
+
+
+@override_settings(READ_REPLICAS={
+    'ALIASES': ['test_replica'],
+    'STICKY_SECONDS': 10,
+    'CACHE_ALIAS': 'default',
+    'PATHS': [r'^/api/admin/dashboard-overview/'],
+})
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    ReplicaRoutingMiddleware + PrimaryReplicaRouter against a mirrored replica
+    alias. Not a TestCase: reads inside its per-test transaction always stay
+    on the primary.
+    """
+
+    databases = {'default', 'test_replica'}
+
+    def setUp(self):
+        caches['default'].clear()
+        self.factory = RequestFactory()
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin@example.com', password='pw12345!',
+            role='Admin', company_name='Acme',
+        )
+        self.other = User.objects.create_user(
+            email='other@example.com', username='other@example.com', password='pw12345!',
+            role='Admin', company_name='Other',
+        )
+
+    def route(self, user, method='get', path=REPLICA_PATH, write=False):
+        """Run a request through the middleware; returns the alias of each read in the view"""
+        reads = []
+
+        def view(request):
+            # DRF sets this during authentication
+            request.user = user
+            reads.append(Project.objects.all().db)
+            list(Project.objects.all())
+            if write:
+                Company.objects.create(name='Written')
+                reads.append(Project.objects.all().db)
+            return HttpResponse()
+
+        request = getattr(self.factory, method)(path, HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        ReplicaRoutingMiddleware(view)(request)
+        return reads
+
+    def test_replica_safe_get_reads_from_the_replica(self):
+        self.assertEqual(self.route(self.admin), ['test_replica'])
+        self.assertEqual(self.route(self.admin, path='/api/admin/users/'), ['default'])
+
+    def test_write_pins_the_rest_of_the_request(self):
+        self.assertEqual(self.route(self.admin, write=True), ['test_replica', 'default'])
+
+    def test_write_pins_the_user_across_requests(self):
+        self.route(self.admin, method='post', write=True)
+
+        self.assertEqual(self.route(self.admin), ['default'])
+        self.assertEqual(self.route(self.other), ['test_replica'])
+
+        # Once the sticky window has passed the user reads from the replica again
+        caches['default'].clear()
+        self.assertEqual(self.route(self.admin), ['test_replica'])
+
+    def test_non_get_requests_stay_on_the_primary(self):
+        for method in ('post', 'put', 'patch', 'delete'):
+            self.assertEqual(self.route(self.admin, method=method), ['default'])
+
+
+@override_settings(DASHBOARD_CACHE={'ENABLED': True, 'ALIAS': 'dashboards'})
+class DashboardCacheReplicaTests(TransactionTestCase):
+    """Payloads computed on a replica right after an invalidation are not cached"""
+
+    databases = {'default', 'test_replica'}
+
+    def setUp(self):
+        caches['dashboards'].clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {'projects': Project.objects.count()}
+
+    def load_twice(self):
+        for _ in range(2):
+            get_or_compute('overview', 1, self.compute)
+        return self.calls
+
+    @override_settings(READ_REPLICAS={'ALIASES': ['test_replica'], 'STICKY_SECONDS': 10})
+    def test_replica_recompute_after_bump_is_not_cached(self):
+        invalidate_dashboards()
+        with read_from_replica('test_replica'):
+            self.assertEqual(self.load_twice(), 2)
+
+    @override_settings(READ_REPLICAS={'ALIASES': ['test_replica'], 'STICKY_SECONDS': 10})
+    def test_primary_recompute_is_cached(self):
+        invalidate_dashboards()
+        self.assertEqual(self.load_twice(), 1)
+
+    @override_settings(READ_REPLICAS={'ALIASES': ['test_replica'], 'STICKY_SECONDS': 0})
+    def test_replica_recompute_is_cached_once_replicas_caught_up(self):
+        invalidate_dashboards()
+        with read_from_replica('test_replica'):
+            self.assertEqual(self.load_twice(), 1)
+
+
+@override_settings(DASHBOARD_CACHE={'ENABLED': True, 'ALIAS': 'dashboards'})
+class DashboardCacheInvalidationTests(TestCase):
+    """Writes only drop their own company's dashboards, once they commit"""
+
+    def setUp(self):
+        caches['dashboards'].clear()
+        self.acme = Company.objects.create(name='Acme')
+        self.other = Company.objects.create(name='Other')
+        self.calls = []
+
+    def load(self, company):
+        def compute():
+            self.calls.append(company.name)
+            return company.name
+        return get_or_compute('overview', company.pk, compute)
+
+    def load_both(self):
+        self.calls = []
+        self.load(self.acme)
+        self.load(self.other)
+        return self.calls
+
+    def test_writes_invalidate_only_their_company(self):
+        self.assertEqual(self.load_both(), ['Acme', 'Other'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            estimate = Estimate.objects.create(
+                serial_number='EST-1', client_name='Client', project_name='Kitchen', company=self.acme,
+            )
+        self.assertEqual(self.load_both(), ['Acme'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(estimate=estimate, project_name='Kitchen', client_name='Client')
+        self.assertEqual(self.load_both(), ['Acme'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(project=project, task_name='Fit')
+        self.assertEqual(self.load_both(), ['Acme'])
+
+        # A task loaded without its project looks the company up before the row is gone
+        task = Task.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(self.load_both(), ['Acme'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(
+                email='emp@other.com', username='emp@other.com', password='pw12345!', company_name='Other',
+            )
+        self.assertEqual(self.load_both(), ['Other'])
+
+    def test_versions_are_bumped_on_commit(self):
+        self.load_both()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Estimate.objects.create(
+                serial_number='EST-1', client_name='Client', project_name='Kitchen', company=self.acme,
+            )
+            # Not committed yet: a recompute now would read the old rows
+            self.assertEqual(self.load_both(), [])
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        self.assertEqual(self.load_both(), ['Acme'])
+
+    def test_cascade_looks_up_each_owner_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            employee = User.objects.create_user(
+                email='emp@acme.com', username='emp@acme.com', password='pw12345!', company_name='Acme',
+            )
+            estimate = Estimate.objects.create(
+                serial_number='EST-1', client_name='Client', project_name='Kitchen', company=self.acme,
+            )
+            project = Project.objects.create(estimate=estimate, project_name='Kitchen', client_name='Client')
+            task = Task.objects.create(project=project, task_name='Fit')
+            for day in range(1, 6):
+                TaskTimer.objects.create(
+                    employee=employee, task=task, work_date=date(2026, 10, day),
+                    start_time=timezone.make_aware(datetime(2026, 10, day, 9)), is_active=False,
+                )
+        self.load_both()
+
+        task = Task.objects.get()
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True) as callbacks:
+            task.delete()
+
+        user_lookups = [query for query in queries if 'FROM "authentication_user"' in query['sql']]
+        self.assertEqual(len(user_lookups), 1)
+        self.assertEqual(len([callback for callback in callbacks if isinstance(callback, _PendingInvalidation)]), 1)
+        self.assertEqual(self.load_both(), ['Acme'])
+
+    def test_concurrent_misses_share_one_recompute(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(threading.get_ident())
+            started.set()
+            release.wait(5)
+            return {'projects': 3}
+
+        results = []
+
+        def load():
+            results.append(get_or_compute('overview', self.acme.pk, compute))
+
+        first = threading.Thread(target=load)
+        first.start()
+        self.assertTrue(started.wait(5))
+        # The first caller holds the cache.add lock; these wait for its result
+        waiters = [threading.Thread(target=load) for _ in range(4)]
+        for thread in waiters:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in [first, *waiters]:
+            thread.join(10)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'projects': 3}] * 5)
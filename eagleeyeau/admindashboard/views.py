@@ -5,9 +5,15 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes, action
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.db.models import Q
+from django.db.models import Q, Count, Prefetch, Sum
 from eagleeyeau.response_formatter import format_response
-from .models import Material, EstimateDefaults, Component
+from eagleeyeau.status_counts import project_status_counts, task_status_counts
+from eagleeyeau.conditional import not_modified, object_state, queryset_state, with_validators
+from eagleeyeau.dashboard_cache import get_or_compute
+from eagleeyeau.search import apply_search, order_by_relevance
+from .models import (
+    Material, EstimateDefaults, Component, ComponentMaterialQuantity, ComponentEstimateQuantity,
+)
 from .serializers import MaterialSerializer, EstimateDefaultsSerializer, ComponentSerializer
 from estimator.models import Estimate
 from estimator.serializers import EstimateSerializer, EstimateListSerializer, AdminEstimateListSerializer
@@ -15,6 +21,10 @@ from Project_manager.models import Project, Task
 from Project_manager.serializers import ProjectListSerializer, ProjectDetailSerializer, TaskSerializer
 
 
+# Relations ComponentSerializer reads for every component
+COMPONENT_PREFETCH = ['material_quantities__material', 'estimate_quantities__estimate_default']
+
+
 # ====================== PERMISSIONS ======================
 class IsAdmin(permissions.BasePermission):
     """Allow only Admin users"""
@@ -38,7 +48,7 @@ class IsAdminOrEstimator(permissions.BasePermission):
 
 # ====================== MATERIAL VIEWSET ======================
 class MaterialViewSet(viewsets.ModelViewSet):
-    queryset = Material.objects.all()
+    queryset = Material.objects.select_related('created_by')
     serializer_class = MaterialSerializer
     permission_classes = [IsAdmin]
 
@@ -63,15 +73,9 @@ class MaterialViewSet(viewsets.ModelViewSet):
             filters_applied = {'q': q if q else None}
 
             if q:
-                # Text search across common fields
-                text_q = (
-                    Q(material_name__icontains=q) |
-                    Q(supplier__icontains=q) |
-                    Q(category__icontains=q) |
-                    Q(unit__icontains=q)
-                )
-
-                or_q = text_q
+                # Text search across common fields (trigram-indexed, see eagleeyeau/search.py),
+                # OR'd with the exact matches below
+                or_q = Q()
 
                 # Numeric search for cost_per_unit
                 try:
@@ -91,10 +95,17 @@ class MaterialViewSet(viewsets.ModelViewSet):
                     # not a date in that format
                     pass
 
-                queryset = queryset.filter(or_q)
+                queryset = apply_search(
+                    queryset, q, ['material_name', 'supplier', 'category', 'unit'], extra=or_q
+                )
+                queryset = order_by_relevance(queryset, '-created_at')
+
+            not_modified_response, validators = not_modified(request, queryset_state(queryset))
+            if not_modified_response is not None:
+                return not_modified_response
 
             serializer = self.get_serializer(queryset, many=True)
-            return Response(
+            return with_validators(Response(
                 format_response(
                     success=True,
                     message=f"Materials retrieved successfully (Total: {queryset.count()})",
@@ -105,7 +116,7 @@ class MaterialViewSet(viewsets.ModelViewSet):
                     }
                 ),
                 status=status.HTTP_200_OK
-            )
+            ), validators)
         except Exception as e:
             return Response(
                 format_response(
@@ -125,15 +136,19 @@ class MaterialViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
+            not_modified_response, validators = not_modified(request, object_state(instance))
+            if not_modified_response is not None:
+                return not_modified_response
+
             serializer = self.get_serializer(instance)
-            return Response(
+            return with_validators(Response(
                 format_response(
                     success=True,
                     message="Material retrieved successfully",
                     data=serializer.data
                 ),
                 status=status.HTTP_200_OK
-            )
+            ), validators)
         except Material.DoesNotExist:
             return Response(
                 format_response(success=False, message="Material not found", data=None),
@@ -292,7 +307,7 @@ class MaterialViewSet(viewsets.ModelViewSet):
 
 # ====================== ESTIMATE DEFAULTS VIEWSET ======================
 class EstimateDefaultsViewSet(viewsets.ModelViewSet):
-    queryset = EstimateDefaults.objects.all()
+    queryset = EstimateDefaults.objects.select_related('created_by')
     serializer_class = EstimateDefaultsSerializer
     permission_classes = [IsAdmin]
 
@@ -317,19 +332,20 @@ class EstimateDefaultsViewSet(viewsets.ModelViewSet):
             
             # Apply universal search across multiple fields
             if search_query:
-                queryset = queryset.filter(
-                    Q(name__icontains=search_query) |
-                    Q(description__icontains=search_query) |
-                    Q(category__icontains=search_query)
-                )
+                queryset = apply_search(queryset, search_query, ['name', 'description', 'category'])
+                queryset = order_by_relevance(queryset, '-created_at')
             
+            not_modified_response, validators = not_modified(request, queryset_state(queryset))
+            if not_modified_response is not None:
+                return not_modified_response
+
             serializer = self.get_serializer(queryset, many=True)
             
             filters_applied = {
                 'search': search_query if search_query else None,
             }
             
-            return Response(
+            return with_validators(Response(
                 format_response(
                     success=True,
                     message=f"Estimate defaults retrieved successfully (Total: {queryset.count()})",
@@ -340,7 +356,7 @@ class EstimateDefaultsViewSet(viewsets.ModelViewSet):
                     }
                 ),
                 status=status.HTTP_200_OK
-            )
+            ), validators)
         except Exception as e:
             return Response(
                 format_response(success=False, message=f"Error: {str(e)}", data=None),
@@ -355,15 +371,19 @@ class EstimateDefaultsViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
+            not_modified_response, validators = not_modified(request, object_state(instance))
+            if not_modified_response is not None:
+                return not_modified_response
+
             serializer = self.get_serializer(instance)
-            return Response(
+            return with_validators(Response(
                 format_response(
                     success=True,
                     message="Estimate default retrieved successfully",
                     data=serializer.data
                 ),
                 status=status.HTTP_200_OK
-            )
+            ), validators)
         except EstimateDefaults.DoesNotExist:
             return Response(
                 format_response(success=False, message="Estimate default not found", data=None),
@@ -513,11 +533,38 @@ class EstimateDefaultsViewSet(viewsets.ModelViewSet):
 
 
 # ====================== COMPONENT VIEWSET ======================
+def _component_states(components, instance=None):
+    """
+    Conditional GET states for component payloads: the components themselves
+    plus their material / estimate-default quantities and the rows those point
+    to (names and prices are part of the payload).
+    """
+    component_ids = components.values('pk')
+    return [
+        object_state(instance) if instance is not None else queryset_state(components),
+        queryset_state(
+            ComponentMaterialQuantity.objects.filter(component__in=component_ids),
+            fields=('updated_at', 'material__updated_at'),
+        ),
+        queryset_state(
+            ComponentEstimateQuantity.objects.filter(component__in=component_ids),
+            fields=('updated_at', 'estimate_default__updated_at'),
+        ),
+    ]
+
+
 class ComponentViewSet(viewsets.ModelViewSet):
-    queryset = Component.objects.all()
+    queryset = Component.objects.select_related('created_by')
     serializer_class = ComponentSerializer
     permission_classes = [IsAdmin]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Writes re-read the quantities they replace, so only reads use the prefetch
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.prefetch_related(*COMPONENT_PREFETCH)
+        return queryset
+
     @swagger_auto_schema(
         operation_summary="List components",
         manual_parameters=[
@@ -538,13 +585,9 @@ class ComponentViewSet(viewsets.ModelViewSet):
             filters_applied = {'q': q if q else None}
 
             if q:
-                # Text search across text fields
-                text_q = (
-                    Q(component_name__icontains=q) |
-                    Q(description__icontains=q)
-                )
-
-                or_q = text_q
+                # Text search across text fields (trigram-indexed, see eagleeyeau/search.py),
+                # OR'd with the exact matches below
+                or_q = Q()
 
                 # Numeric search for base_price
                 try:
@@ -562,10 +605,15 @@ class ComponentViewSet(viewsets.ModelViewSet):
                 except Exception:
                     pass
 
-                queryset = queryset.filter(or_q)
+                queryset = apply_search(queryset, q, ['component_name', 'description'], extra=or_q)
+                queryset = order_by_relevance(queryset, '-created_at')
+
+            not_modified_response, validators = not_modified(request, *_component_states(queryset))
+            if not_modified_response is not None:
+                return not_modified_response
 
             serializer = self.get_serializer(queryset, many=True)
-            return Response(
+            return with_validators(Response(
                 format_response(
                     success=True,
                     message=f"Components retrieved successfully (Total: {queryset.count()})",
@@ -576,7 +624,7 @@ class ComponentViewSet(viewsets.ModelViewSet):
                     }
                 ),
                 status=status.HTTP_200_OK
-            )
+            ), validators)
         except Exception as e:
             return Response(
                 format_response(success=False, message=f"Error: {str(e)}", data=None),
@@ -590,15 +638,21 @@ class ComponentViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
+            not_modified_response, validators = not_modified(
+                request, *_component_states(Component.objects.filter(pk=instance.pk), instance)
+            )
+            if not_modified_response is not None:
+                return not_modified_response
+
             serializer = self.get_serializer(instance)
-            return Response(
+            return with_validators(Response(
                 format_response(
                     success=True,
                     message="Component retrieved successfully",
                     data=serializer.data
                 ),
                 status=status.HTTP_200_OK
-            )
+            ), validators)
         except Component.DoesNotExist:
             return Response(
                 format_response(success=False, message="Component not found", data=None),
@@ -870,7 +924,8 @@ class ComponentViewSet(viewsets.ModelViewSet):
     Query Parameters:
     - search: Search across all tables (materials, estimate defaults, components)
     - table_type: Filter by table type (materials, estimate_defaults, components)
-    - sort_by: Sort field (name, created_at, cost_per_unit, base_price)
+    - sort_by: Sort field (relevance, name, created_at, cost_per_unit, base_price).
+      Defaults to relevance when searching, otherwise name.
     - sort_order: asc or desc (default: asc)
     
     - Admin: sees all from their company
@@ -920,8 +975,6 @@ class ComponentViewSet(viewsets.ModelViewSet):
 @permission_classes([IsAdminOrEstimator])
 def get_comprehensive_list(request):
     try:
-        from django.db.models import Q
-        
         user = request.user
         company = user.company_name
         role = user.role
@@ -935,16 +988,16 @@ def get_comprehensive_list(request):
         # Get query parameters
         search_query = request.query_params.get('search', '').strip()
         table_type = request.query_params.get('table_type', '').strip().lower()
-        sort_by = request.query_params.get('sort_by', 'name').strip()
+        sort_by = request.query_params.get('sort_by', '').strip() or ('relevance' if search_query else 'name')
         sort_order = request.query_params.get('sort_order', 'asc').strip().lower()
         
         # Validate sort_order
         sort_order = '' if sort_order == 'asc' else '-'
         
         # Base querysets filtered by company and creator role
-        materials = Material.objects.filter(created_by__company_name=company)
-        estimate_defaults = EstimateDefaults.objects.filter(created_by__company_name=company)
-        components = Component.objects.filter(created_by__company_name=company)
+        materials = Material.objects.for_company(user).select_related('created_by')
+        estimate_defaults = EstimateDefaults.objects.for_company(user).select_related('created_by')
+        components = Component.objects.for_company(user).select_related('created_by').prefetch_related(*COMPONENT_PREFETCH)
 
         if role == 'Estimator':
             materials = materials.filter(created_by__role='Admin')
@@ -956,22 +1009,11 @@ def get_comprehensive_list(request):
         if search_query:
             search_applied = True
             # Search in materials by material_name, supplier, category
-            materials = materials.filter(
-                Q(material_name__icontains=search_query) |
-                Q(supplier__icontains=search_query) |
-                Q(category__icontains=search_query)
-            )
+            materials = apply_search(materials, search_query, ['material_name', 'supplier', 'category'])
             # Search in estimate defaults by name, description, category
-            estimate_defaults = estimate_defaults.filter(
-                Q(name__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(category__icontains=search_query)
-            )
+            estimate_defaults = apply_search(estimate_defaults, search_query, ['name', 'description', 'category'])
             # Search in components by component_name, description
-            components = components.filter(
-                Q(component_name__icontains=search_query) |
-                Q(description__icontains=search_query)
-            )
+            components = apply_search(components, search_query, ['component_name', 'description'])
 
         # Apply sorting
         sort_mapping = {
@@ -980,23 +1022,29 @@ def get_comprehensive_list(request):
             'components': {'name': 'component_name', 'created_at': 'created_at', 'cost': 'base_price'}
         }
         
-        # Sort materials
-        if sort_by in sort_mapping['materials']:
-            materials = materials.order_by(f'{sort_order}{sort_mapping["materials"][sort_by]}')
+        if sort_by == 'relevance':
+            # Best search matches first (ranked on PostgreSQL; name order elsewhere)
+            materials = order_by_relevance(materials, 'material_name')
+            estimate_defaults = order_by_relevance(estimate_defaults, 'name')
+            components = order_by_relevance(components, 'component_name')
         else:
-            materials = materials.order_by(f'{sort_order}material_name')
-        
-        # Sort estimate defaults
-        if sort_by in sort_mapping['estimate_defaults']:
-            estimate_defaults = estimate_defaults.order_by(f'{sort_order}{sort_mapping["estimate_defaults"][sort_by]}')
-        else:
-            estimate_defaults = estimate_defaults.order_by(f'{sort_order}name')
-        
-        # Sort components
-        if sort_by in sort_mapping['components']:
-            components = components.order_by(f'{sort_order}{sort_mapping["components"][sort_by]}')
-        else:
-            components = components.order_by(f'{sort_order}component_name')
+            # Sort materials
+            if sort_by in sort_mapping['materials']:
+                materials = materials.order_by(f'{sort_order}{sort_mapping["materials"][sort_by]}')
+            else:
+                materials = materials.order_by(f'{sort_order}material_name')
+
+            # Sort estimate defaults
+            if sort_by in sort_mapping['estimate_defaults']:
+                estimate_defaults = estimate_defaults.order_by(f'{sort_order}{sort_mapping["estimate_defaults"][sort_by]}')
+            else:
+                estimate_defaults = estimate_defaults.order_by(f'{sort_order}name')
+
+            # Sort components
+            if sort_by in sort_mapping['components']:
+                components = components.order_by(f'{sort_order}{sort_mapping["components"][sort_by]}')
+            else:
+                components = components.order_by(f'{sort_order}component_name')
 
         # Filter by table type if specified
         filters_applied = {}
@@ -1049,7 +1097,7 @@ class AdminEstimateViewSet(viewsets.ModelViewSet):
     Admins can search by client name, project name, estimate number, change status, and delete estimates.
     Returns creator name and email in list responses.
     """
-    queryset = Estimate.objects.all().order_by('-created_at')
+    queryset = Estimate.objects.select_related('created_by').order_by('-created_at')
     serializer_class = AdminEstimateListSerializer
     permission_classes = [IsAdmin]
 
@@ -1083,12 +1131,10 @@ class AdminEstimateViewSet(viewsets.ModelViewSet):
             
             # Search across multiple fields
             if q:
-                queryset = queryset.filter(
-                    Q(client_name__icontains=q) |
-                    Q(project_name__icontains=q) |
-                    Q(estimate_number__icontains=q) |
-                    Q(serial_number__icontains=q)
+                queryset = apply_search(
+                    queryset, q, ['client_name', 'project_name', 'estimate_number', 'serial_number']
                 )
+                queryset = order_by_relevance(queryset, '-created_at')
             
             # Filter by status
             if status_filter and status_filter in ['pending', 'sent', 'approved', 'rejected']:
@@ -1277,12 +1323,11 @@ def admin_all_projects(request):
     """
     try:
         user = request.user
-        company_name = user.company_name
         
-        # Get all projects linked to estimates created by users in the same company
-        projects = Project.objects.filter(
-            estimate__created_by__company_name=company_name
-        ).select_related('estimate', 'created_by', 'assigned_to').distinct()
+        # Get all projects of the admin's company
+        projects = Project.objects.for_company(user).select_related(
+            'estimate', 'created_by', 'assigned_to'
+        ).with_task_counts()
         
         # Search parameter
         search_query = request.query_params.get('search', '').strip()
@@ -1322,7 +1367,7 @@ def admin_all_projects(request):
             'sort_order': sort_order,
         }
         
-        serializer = ProjectListSerializer(projects, many=True)
+        serializer = ProjectListSerializer(projects, many=True, context={'request': request})
         
         return Response(
             format_response(
@@ -1397,14 +1442,15 @@ def admin_project_detail(request, project_id):
     """
     try:
         user = request.user
-        company_name = user.company_name
         
         # Get the project and verify it belongs to the admin's company
         try:
-            project = Project.objects.get(
-                id=project_id,
-                estimate__created_by__company_name=company_name
-            )
+            project = Project.objects.for_company(user).select_related(
+                'estimate', 'created_by', 'assigned_to'
+            ).prefetch_related(
+                Prefetch('tasks', queryset=Task.objects.select_related('assigned_employee', 'created_by')),
+                'documents__uploaded_by',
+            ).with_task_counts().get(id=project_id)
         except Project.DoesNotExist:
             return Response(
                 format_response(
@@ -1416,29 +1462,21 @@ def admin_project_detail(request, project_id):
             )
         
         # Get related tasks
-        tasks = Task.objects.filter(project=project).select_related('project').prefetch_related('assigned_employees')
+        tasks = Task.objects.filter(project=project)
         
-        # Calculate task summary
+        # Calculate task summary (status and priority in a single query)
+        task_counts = task_status_counts(tasks)
         task_summary = {
-            'total_tasks': tasks.count(),
-            'by_status': {},
-            'by_priority': {},
+            'total_tasks': task_counts['total'],
+            'by_status': task_counts['status'],
+            'by_priority': task_counts['priority'],
         }
         
-        # Count by status
-        for status_choice in ['not_started', 'in_progress', 'completed', 'blocked']:
-            count = tasks.filter(status=status_choice).count()
-            task_summary['by_status'][status_choice] = count
-        
-        # Count by priority
-        for priority_choice in ['low', 'medium', 'high']:
-            count = tasks.filter(priority=priority_choice).count()
-            task_summary['by_priority'][priority_choice] = count
-        
         # Serialize data
         project_serializer = ProjectDetailSerializer(project)
         estimate_serializer = EstimateSerializer(project.estimate)
-        tasks_serializer = TaskSerializer(tasks, many=True)
+        # Same rows as the prefetched project.tasks
+        tasks_serializer = TaskSerializer(project.tasks.all(), many=True)
         
         data = {
             'project': project_serializer.data,
@@ -1468,6 +1506,141 @@ def admin_project_detail(request, project_id):
 
 
 # ====================== ADMIN DASHBOARD OVERVIEW ======================
+def _admin_dashboard_overview_data(company_id):
+    """Compute the admin dashboard overview payload (cached per company by admin_dashboard_overview)"""
+    from datetime import date
+    from Project_manager.models import Project
+    from authentication.models import User
+    from decimal import Decimal
+    from .analytics import current_month, monthly_metrics
+
+    current_year = current_month().year
+    last_year = current_year - 1
+
+    # ========== OVERVIEW STATS ==========
+    all_projects = Project.objects.for_company(company_id)
+    project_counts = project_status_counts(all_projects)
+    total_projects = project_counts['total']
+    completed_projects = project_counts['status']['completed']
+    pending_projects = project_counts['status']['not_started']
+
+    # ========== REVENUE CALCULATION ==========
+    # Revenue from completed projects
+    completed_project_revenue = all_projects.filter(status='completed').aggregate(
+        total=Sum('total_amount')
+    )['total'] or Decimal('0')
+
+    total_revenue_str = f"${completed_project_revenue:,.2f}"
+
+    # ========== MONTHLY SERIES ==========
+    # Revenue, completions and signups for last year and this year, bucketed by
+    # month (closed months come from snapshots, see admindashboard/analytics.py)
+    months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+    metrics = monthly_metrics(company_id, date(last_year, 1, 1), date(current_year, 12, 1))
+    current_year_metrics = [metrics[date(current_year, i + 1, 1)] for i in range(12)]
+    last_year_metrics = [metrics[date(last_year, i + 1, 1)] for i in range(12)]
+
+    monthly_revenue_current = [float(m['revenue']) for m in current_year_metrics]
+    monthly_revenue_last_year = [float(m['revenue']) for m in last_year_metrics]
+
+    # Build monthly revenue list
+    monthly_revenue = []
+    for i, month in enumerate(months):
+        monthly_revenue.append({
+            'month': month,
+            'revenue': monthly_revenue_current[i],
+            'completed_projects': current_year_metrics[i]['completed_projects'],
+        })
+
+    # ========== YEARLY REVENUE ==========
+    current_year_total = sum(monthly_revenue_current)
+    last_year_total = sum(monthly_revenue_last_year)
+
+    if last_year_total > 0:
+        growth_percentage = ((current_year_total - last_year_total) / last_year_total) * 100
+    else:
+        growth_percentage = 0 if current_year_total == 0 else 100
+
+    yearly_revenue = {
+        'current_year': current_year_total,
+        'last_year': last_year_total,
+        'growth_percentage': round(growth_percentage, 2)
+    }
+
+    # ========== USER GROWTH ==========
+    user_counts = User.objects.for_company(company_id).aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    total_users = user_counts['total']
+    active_users = user_counts['active']
+
+    # Monthly user count: users who joined this year up to the end of each month
+    monthly_users = []
+    users_created = 0
+    for i, month in enumerate(months):
+        users_created += current_year_metrics[i]['new_users']
+        monthly_users.append({
+            'month': month,
+            'count': users_created
+        })
+
+    # Calculate monthly growth rate (average)
+    if len(monthly_users) > 1:
+        last_month_count = monthly_users[-1]['count']
+        prev_month_count = monthly_users[-2]['count'] if len(monthly_users) > 1 else 0
+
+        if prev_month_count > 0:
+            monthly_growth_rate = ((last_month_count - prev_month_count) / prev_month_count) * 100
+        else:
+            monthly_growth_rate = 0 if last_month_count == 0 else 100
+    else:
+        monthly_growth_rate = 0
+
+    user_growth = {
+        'monthly': monthly_users,
+        'total_users': total_users,
+        'active_users': active_users,
+        'monthly_growth_rate': round(monthly_growth_rate, 2)
+    }
+
+    # ========== PROJECT STATS ==========
+    active_projects = project_counts['status']['in_progress']
+    on_hold_projects = project_counts['status']['on_hold']
+    cancelled_projects = project_counts['status']['cancelled']
+
+    if completed_projects > 0:
+        average_project_value = completed_project_revenue / completed_projects
+        average_project_value_str = f"${average_project_value:,.2f}"
+    else:
+        average_project_value_str = "$0.00"
+
+    project_stats = {
+        'active_projects': active_projects,
+        'on_hold_projects': on_hold_projects,
+        'cancelled_projects': cancelled_projects,
+        'average_project_value': average_project_value_str,
+    }
+
+    # ========== COMPILE RESPONSE ==========
+    dashboard_data = {
+        'overview_stats': {
+            'total_projects': total_projects,
+            'pending_requests': pending_projects,
+            'completed_projects': completed_projects,
+            'total_revenue': total_revenue_str,
+        },
+        'revenue_overview': {
+            'monthly': monthly_revenue,
+            'yearly': yearly_revenue,
+        },
+        'user_growth': user_growth,
+        'project_stats': project_stats,
+    }
+    
+    return dashboard_data
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsAdmin])
 @swagger_auto_schema(
@@ -1511,6 +1684,7 @@ def admin_project_detail(request, project_id):
                                             properties={
                                                 'month': openapi.Schema(type=openapi.TYPE_STRING, example='JAN'),
                                                 'revenue': openapi.Schema(type=openapi.TYPE_NUMBER, example=5000),
+                                                'completed_projects': openapi.Schema(type=openapi.TYPE_INTEGER, example=2),
                                             }
                                         )
                                     ),
@@ -1564,141 +1738,15 @@ def admin_dashboard_overview(request):
     Get comprehensive admin dashboard with revenue and user growth analytics.
     """
     try:
-        from datetime import datetime, timedelta
-        from Project_manager.models import Project
-        from authentication.models import User
-        from decimal import Decimal
-        
-        today = datetime.now().date()
-        current_year = today.year
-        last_year = current_year - 1
-        
-        # ========== OVERVIEW STATS ==========
-        all_projects = Project.objects.all()
-        total_projects = all_projects.count()
-        completed_projects = all_projects.filter(status='completed').count()
-        pending_projects = all_projects.filter(status='not_started').count()
-        
-        # ========== REVENUE CALCULATION ==========
-        # Revenue from completed projects
-        completed_project_revenue = Decimal('0')
-        for project in all_projects.filter(status='completed'):
-            if project.total_amount:
-                completed_project_revenue += project.total_amount
-        
-        total_revenue_str = f"${completed_project_revenue:,.2f}"
-        
-        # ========== MONTHLY REVENUE ==========
-        months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
-        monthly_revenue_current = [0] * 12
-        monthly_revenue_last_year = [0] * 12
-        
-        # Current year revenue by month
-        for project in all_projects.filter(status='completed', updated_at__year=current_year):
-            month_index = project.updated_at.month - 1
-            if project.total_amount:
-                monthly_revenue_current[month_index] += float(project.total_amount)
-        
-        # Last year revenue by month
-        for project in all_projects.filter(status='completed', updated_at__year=last_year):
-            month_index = project.updated_at.month - 1
-            if project.total_amount:
-                monthly_revenue_last_year[month_index] += float(project.total_amount)
-        
-        # Build monthly revenue list
-        monthly_revenue = []
-        for i, month in enumerate(months):
-            monthly_revenue.append({
-                'month': month,
-                'revenue': monthly_revenue_current[i]
-            })
+        from datetime import datetime
         
-        # ========== YEARLY REVENUE ==========
-        current_year_total = sum(monthly_revenue_current)
-        last_year_total = sum(monthly_revenue_last_year)
-        
-        if last_year_total > 0:
-            growth_percentage = ((current_year_total - last_year_total) / last_year_total) * 100
-        else:
-            growth_percentage = 0 if current_year_total == 0 else 100
-        
-        yearly_revenue = {
-            'current_year': current_year_total,
-            'last_year': last_year_total,
-            'growth_percentage': round(growth_percentage, 2)
-        }
-        
-        # ========== USER GROWTH ==========
-        all_users = User.objects.all()
-        total_users = all_users.count()
-        active_users = all_users.filter(is_active=True).count()
-        
-        # Monthly user count
-        monthly_users = []
-        for i, month in enumerate(months):
-            month_num = i + 1
-            # Count users created up to end of current month
-            users_created = User.objects.filter(
-                date_joined__year=current_year,
-                date_joined__month__lte=month_num
-            ).count()
-            monthly_users.append({
-                'month': month,
-                'count': users_created
-            })
-        
-        # Calculate monthly growth rate (average)
-        if len(monthly_users) > 1:
-            last_month_count = monthly_users[-1]['count']
-            prev_month_count = monthly_users[-2]['count'] if len(monthly_users) > 1 else 0
-            
-            if prev_month_count > 0:
-                monthly_growth_rate = ((last_month_count - prev_month_count) / prev_month_count) * 100
-            else:
-                monthly_growth_rate = 0 if last_month_count == 0 else 100
-        else:
-            monthly_growth_rate = 0
-        
-        user_growth = {
-            'monthly': monthly_users,
-            'total_users': total_users,
-            'active_users': active_users,
-            'monthly_growth_rate': round(monthly_growth_rate, 2)
-        }
-        
-        # ========== PROJECT STATS ==========
-        active_projects = all_projects.filter(status='in_progress').count()
-        on_hold_projects = all_projects.filter(status='on_hold').count()
-        cancelled_projects = all_projects.filter(status='cancelled').count()
-        
-        if completed_projects > 0:
-            average_project_value = completed_project_revenue / completed_projects
-            average_project_value_str = f"${average_project_value:,.2f}"
-        else:
-            average_project_value_str = "$0.00"
-        
-        project_stats = {
-            'active_projects': active_projects,
-            'on_hold_projects': on_hold_projects,
-            'cancelled_projects': cancelled_projects,
-            'average_project_value': average_project_value_str,
-        }
-        
-        # ========== COMPILE RESPONSE ==========
-        dashboard_data = {
-            'overview_stats': {
-                'total_projects': total_projects,
-                'pending_requests': pending_projects,
-                'completed_projects': completed_projects,
-                'total_revenue': total_revenue_str,
-            },
-            'revenue_overview': {
-                'monthly': monthly_revenue,
-                'yearly': yearly_revenue,
-            },
-            'user_growth': user_growth,
-            'project_stats': project_stats,
-        }
+        company_id = request.user.company_id
+        dashboard_data = get_or_compute(
+            'admin_dashboard_overview',
+            company_id,
+            lambda: _admin_dashboard_overview_data(company_id),
+            vary=datetime.now().date().isoformat(),
+        )
         
         return Response(
             format_response(
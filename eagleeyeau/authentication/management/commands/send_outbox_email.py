@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from authentication.outbox import get_email_outbox_settings, run_worker
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbox emails (OTP, invitations); keeps polling unless --once is given'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once no email is due')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Emails sent per SMTP connection (default: EMAIL_OUTBOX["BATCH_SIZE"])'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            help='Seconds to sleep when nothing is due (default: EMAIL_OUTBOX["POLL_SECONDS"])'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if not get_email_outbox_settings()['ENABLED']:
+            self.stdout.write(self.style.WARNING('EMAIL_OUTBOX is disabled; emails are sent by the request handlers'))
+
+        self.stdout.write(self.style.WARNING('Sending outbox emails...'))
+        try:
+            run_worker(
+                once=options['once'],
+                batch_size=options['batch_size'],
+                poll_seconds=options['poll_interval'],
+                stdout=self.stdout,
+            )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS('Outbox worker stopped'))
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:55
+
+import authentication.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_companies(apps, schema_editor):
+    """Create a Company per distinct company_name and link users to it"""
+    Company = apps.get_model('authentication', 'Company')
+    User = apps.get_model('authentication', 'User')
+    Invitation = apps.get_model('authentication', 'Invitation')
+
+    names = set(User.objects.exclude(company_name__isnull=True).exclude(company_name='').values_list('company_name', flat=True))
+    names |= set(Invitation.objects.exclude(company_name__isnull=True).exclude(company_name='').values_list('company_name', flat=True))
+    existing = set(Company.objects.filter(name__in=names).values_list('name', flat=True))
+    Company.objects.bulk_create([Company(name=name) for name in sorted(names - existing)])
+
+    User.objects.exclude(company_name__isnull=True).exclude(company_name='').update(
+        company=models.Subquery(
+            Company.objects.filter(name=models.OuterRef('company_name')).values('pk')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Companies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', authentication.models.TenantUserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='authentication.company'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['company', 'role'], name='authenticat_company_6632b5_idx'),
+        ),
+        migrations.RunPython(backfill_companies, migrations.RunPython.noop),
+    ]
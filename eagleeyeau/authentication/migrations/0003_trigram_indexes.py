@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 09:30
+
+from django.db import migrations
+
+from eagleeyeau.search import AddTrigramIndex, TrigramExtension
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_company'),
+    ]
+
+    # pg_trgm GIN indexes behind the icontains searches (no-ops outside PostgreSQL)
+    operations = [
+        TrigramExtension(),
+        AddTrigramIndex(model_name='user', field='first_name', name='user_first_name_trgm'),
+        AddTrigramIndex(model_name='user', field='last_name', name='user_last_name_trgm'),
+        AddTrigramIndex(model_name='user', field='email', name='user_email_trgm'),
+        AddTrigramIndex(model_name='user', field='username', name='user_username_trgm'),
+    ]
@@ -1,10 +1,37 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.utils import timezone
 import random
 import string
 import uuid
 
+from eagleeyeau.tenancy import TenantQuerySet
+
+
+class TenantUserManager(UserManager.from_queryset(TenantQuerySet)):
+    """Default user manager with tenant filtering (``User.objects.for_company(...)``)"""
+
+
+class Company(models.Model):
+    """Tenant company; users and company-owned records point at it"""
+    name = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = "Companies"
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def for_name(cls, name):
+        """Return the company called ``name``, creating it if needed (None for blank names)"""
+        if not name:
+            return None
+        company, _ = cls.objects.get_or_create(name=name)
+        return company
+
 
 class User(AbstractUser):
     """Custom User Model"""
@@ -20,6 +47,8 @@ class User(AbstractUser):
     first_name = models.CharField(max_length=150)
     last_name = models.CharField(max_length=150)
     company_name = models.CharField(max_length=255, blank=True, null=True)
+    # Kept in sync with company_name on save; use it for tenant filtering
+    company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True, related_name='users')
     country = models.CharField(max_length=100, blank=True, null=True)
     role = models.CharField(max_length=100, choices=ROLE_CHOICES, default='Admin')
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
@@ -28,12 +57,41 @@ class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantUserManager()
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['company', 'role']),
+            # Monthly signup series (admindashboard.analytics)
+            models.Index(fields=['date_joined']),
+        ]
+
     def __str__(self):
         return self.email
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded company_name so saves only resolve the company when it changes"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_company_name = instance.__dict__.get('company_name')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Keep the company foreign key in sync with company_name"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'company_name' in update_fields:
+            if not self.company_name:
+                self.company = None
+            elif self.company_id is None or getattr(self, '_loaded_company_name', None) != self.company_name:
+                self.company = Company.for_name(self.company_name)
+            self._loaded_company_name = self.company_name
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'company'}
+        super().save(*args, **kwargs)
+
 
 class OTP(models.Model):
     """OTP Model for email verification and password reset"""
@@ -99,15 +157,59 @@ class Invitation(models.Model):
         return not self.is_used and timezone.now() < self.expires_at
 
     @classmethod
-    def create_invitation(cls, email, role, invited_by):
-        """Create a new invitation"""
+    def build_invitation(cls, email, role, invited_by):
+        """Return an unsaved invitation (saved one by one or with bulk_create)"""
         expires_at = timezone.now() + timezone.timedelta(days=7)  # 7 days validity
         # Automatically use admin's company name
         company_name = invited_by.company_name if invited_by else ''
-        return cls.objects.create(
+        return cls(
             email=email,
             role=role,
             company_name=company_name,
             invited_by=invited_by,
             expires_at=expires_at
         )
+
+    @classmethod
+    def create_invitation(cls, email, role, invited_by):
+        """Create a new invitation"""
+        invitation = cls.build_invitation(email, role, invited_by)
+        invitation.save()
+        return invitation
+
+    @classmethod
+    def open_invitations(cls):
+        """Invitations that can still be accepted"""
+        return cls.objects.filter(is_used=False, expires_at__gt=timezone.now())
+
+
+class OutboxEmail(models.Model):
+    """Outgoing email queued by request handlers and sent by the outbox worker (authentication/outbox.py)"""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    # Pending rows are sent once this has passed; claimed rows are pushed forward while they are sent
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Worker polling: due pending rows
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
@@ -0,0 +1,197 @@
+"""
+Database-backed email outbox.
+
+Request handlers call ``enqueue_email()`` (``enqueue_emails()`` for several
+at once), which only inserts ``OutboxEmail`` rows, so OTP and invitation
+endpoints no longer wait on the SMTP handshake. The ``send_outbox_email`` worker command polls for due rows
+and calls ``send_pending()``:
+
+- a batch of due rows is claimed in a short transaction by pushing their
+  ``next_attempt_at`` forward by a lease (``SELECT ... FOR UPDATE SKIP LOCKED``
+  where the database supports it, so several workers can run side by side);
+- the whole batch goes through one connection of the configured email
+  backend (one SMTP login per batch instead of one per message);
+- sent rows are marked ``sent``; failed ones are retried with exponential
+  backoff until ``MAX_ATTEMPTS``, then marked ``failed``.
+
+A worker that dies mid-batch leaves its rows pending; they are picked up
+again once the lease runs out. Sent rows (they carry OTP codes) are deleted
+after ``KEEP_SENT_DAYS``.
+
+With ``EMAIL_OUTBOX['ENABLED'] = False`` ``enqueue_email()`` sends right
+away, as before the outbox existed.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, connection as db_connection, transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMAIL_OUTBOX = {
+    'ENABLED': True,
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 6,
+    # Retry delays: BACKOFF_SECONDS, then doubling up to BACKOFF_MAX_SECONDS
+    'BACKOFF_SECONDS': 30,
+    'BACKOFF_MAX_SECONDS': 3600,
+    # How long a claimed batch is hidden from other workers while it is sent
+    'LEASE_SECONDS': 300,
+    # Worker sleep between polls when nothing is due
+    'POLL_SECONDS': 1,
+    'KEEP_SENT_DAYS': 7,
+}
+
+
+def get_email_outbox_settings():
+    """Merge settings.EMAIL_OUTBOX over the defaults"""
+    return {**DEFAULT_EMAIL_OUTBOX, **getattr(settings, 'EMAIL_OUTBOX', {})}
+
+
+def _message(email, connection=None):
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.recipients,
+        connection=connection,
+    )
+
+
+def enqueue_emails(messages, from_email=None):
+    """
+    Queue several ``(subject, body, recipients)`` emails with one insert, or
+    send them right away over one connection when the outbox is disabled.
+    """
+    emails = [
+        OutboxEmail(
+            subject=subject,
+            body=body,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients=list(recipients),
+        )
+        for subject, body, recipients in messages
+    ]
+    if not get_email_outbox_settings()['ENABLED']:
+        get_connection(fail_silently=False).send_messages([_message(email) for email in emails])
+        return emails
+    return OutboxEmail.objects.bulk_create(emails)
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    """Queue an email for the outbox worker (or send it now when the outbox is disabled)"""
+    return enqueue_emails([(subject, body, recipients)], from_email)[0]
+
+
+def retry_delay(attempts, config=None):
+    """Backoff before the next attempt after ``attempts`` failed ones"""
+    config = config or get_email_outbox_settings()
+    return min(config['BACKOFF_SECONDS'] * 2 ** max(attempts - 1, 0), config['BACKOFF_MAX_SECONDS'])
+
+
+def claim_batch(batch_size=None, now=None):
+    """Lease up to ``batch_size`` due pending emails to this worker and return them"""
+    config = get_email_outbox_settings()
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = OutboxEmail.objects.filter(status='pending', next_attempt_at__lte=now).order_by('next_attempt_at')
+        if db_connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size or config['BATCH_SIZE']])
+        if batch:
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                next_attempt_at=now + timedelta(seconds=config['LEASE_SECONDS'])
+            )
+    return batch
+
+
+def _failed(email, error, config):
+    email.attempts += 1
+    email.last_error = str(error)[:2000]
+    if email.attempts >= config['MAX_ATTEMPTS']:
+        email.status = 'failed'
+        logger.error('Giving up on outbox email %s after %s attempts: %s', email.pk, email.attempts, error)
+    else:
+        email.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(email.attempts, config))
+        logger.warning('Outbox email %s failed (attempt %s): %s', email.pk, email.attempts, error)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def send_pending(batch_size=None, now=None):
+    """
+    Send one batch of due emails over a single backend connection.
+    Returns (sent, failed) counts for the batch.
+    """
+    config = get_email_outbox_settings()
+    batch = claim_batch(batch_size, now)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    try:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+    except Exception as e:
+        # Server unreachable or login refused: the whole batch is retried later
+        for email in batch:
+            _failed(email, e, config)
+        return 0, len(batch)
+
+    try:
+        for email in batch:
+            try:
+                _message(email, connection).send(fail_silently=False)
+            except Exception as e:
+                _failed(email, e, config)
+                failed += 1
+                continue
+            email.attempts += 1
+            email.status = 'sent'
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.save(update_fields=['attempts', 'status', 'sent_at', 'last_error'])
+            sent += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            logger.warning('Error closing the email connection', exc_info=True)
+    return sent, failed
+
+
+def purge_sent(now=None):
+    """Delete sent emails older than KEEP_SENT_DAYS; returns the number deleted"""
+    keep_days = get_email_outbox_settings()['KEEP_SENT_DAYS']
+    cutoff = (now or timezone.now()) - timedelta(days=keep_days)
+    deleted, _ = OutboxEmail.objects.filter(status='sent', sent_at__lt=cutoff).delete()
+    return deleted
+
+
+def run_worker(once=False, batch_size=None, poll_seconds=None, stdout=None):
+    """Send due emails until interrupted (or until the queue is drained when ``once``)"""
+    config = get_email_outbox_settings()
+    poll_seconds = config['POLL_SECONDS'] if poll_seconds is None else poll_seconds
+    last_purge = None
+    while True:
+        # Long-running process: drop connections past CONN_MAX_AGE or broken by a database restart
+        close_old_connections()
+        if last_purge is None or time.monotonic() - last_purge > 3600:
+            purge_sent()
+            last_purge = time.monotonic()
+
+        sent, failed = send_pending(batch_size)
+        if (sent or failed) and stdout:
+            stdout.write(f'Sent {sent} emails, {failed} failed')
+        if sent or failed:
+            # More may be due right away
+            continue
+        if once:
+            return
+        time.sleep(poll_seconds)
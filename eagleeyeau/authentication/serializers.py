@@ -136,6 +136,25 @@ class SendInvitationSerializer(serializers.Serializer):
         return value
 
 
+class BulkInvitationRowSerializer(SendInvitationSerializer):
+    """One row of a bulk invitation; existing users are checked for all rows at once by the view"""
+
+    def validate_email(self, value):
+        return value
+
+
+class BulkInvitationSerializer(serializers.Serializer):
+    """Bulk invitation request: a JSON list of rows or a CSV file / text of email,role lines"""
+    invitations = serializers.ListField(child=serializers.DictField(), required=False)
+    file = serializers.FileField(required=False, help_text="CSV file with email and role columns")
+    csv = serializers.CharField(required=False, help_text="CSV text with email and role columns")
+
+    def validate(self, attrs):
+        if sum(1 for key in ('invitations', 'file', 'csv') if attrs.get(key)) != 1:
+            raise serializers.ValidationError("Provide exactly one of invitations, file or csv")
+        return attrs
+
+
 class AcceptInvitationSerializer(serializers.Serializer):
     """Serializer for accepting invitation and setting password (token is in URL)"""
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
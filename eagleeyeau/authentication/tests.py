@@ -1,3 +1,415 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from smtplib import SMTPException
 
-# Create your tests here.
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from eagleeyeau.tenancy import company_id_of
+from .models import Company, Invitation, OutboxEmail, User
+from .outbox import enqueue_email, purge_sent, retry_delay, send_pending
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend that counts opened connections"""
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+class FailingBackend(EmailBackend):
+    """Every send fails"""
+
+    def send_messages(self, messages):
+        raise SMTPException('451 try again later')
+
+
+class UnreachableBackend(EmailBackend):
+    """The server cannot be reached at all"""
+
+    def open(self):
+        raise ConnectionRefusedError('connection refused')
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class OutboxEndpointTests(APITestCase):
+    """OTP and invitation endpoints queue their email instead of sending it"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin@example.com', password='pw12345!',
+            role='Admin', company_name='Acme', is_email_verified=True,
+        )
+
+    def test_forgot_password_queues_the_otp(self):
+        response = self.client.post('/api/auth/forgot-password/', {'email': 'admin@example.com'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.status, 'pending')
+        self.assertEqual(queued.recipients, ['admin@example.com'])
+
+        self.assertEqual(send_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Reset Your Password - Lignaflow')
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('sent', 1))
+        self.assertIsNotNone(queued.sent_at)
+
+    def test_send_invitation_queues_the_invitation(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(
+            '/api/auth/admin/send-invitation/', {'email': 'new@example.com', 'role': 'Employee'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().recipients, ['new@example.com'])
+
+
+class OutboxWorkerTests(TestCase):
+    """send_pending: batching, retries and backoff"""
+
+    @override_settings(EMAIL_BACKEND='authentication.tests.CountingBackend')
+    def test_batch_uses_one_connection(self):
+        CountingBackend.opened = 0
+        for number in range(3):
+            enqueue_email(f'Message {number}', 'Body', [f'user{number}@example.com'])
+
+        self.assertEqual(send_pending(), (3, 0))
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(send_pending(), (0, 0))
+
+    @override_settings(
+        EMAIL_BACKEND='authentication.tests.FailingBackend',
+        EMAIL_OUTBOX={'MAX_ATTEMPTS': 3, 'BACKOFF_SECONDS': 30, 'BACKOFF_MAX_SECONDS': 3600},
+    )
+    def test_failures_back_off_then_give_up(self):
+        queued = enqueue_email('Subject', 'Body', ['user@example.com'])
+
+        with self.assertLogs('authentication.outbox', 'WARNING'):
+            self.assertEqual(send_pending(), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('pending', 1))
+        self.assertIn('451', queued.last_error)
+        self.assertGreater(queued.next_attempt_at, timezone.now() + timedelta(seconds=25))
+        # Not due again until the backoff has passed
+        self.assertEqual(send_pending(), (0, 0))
+
+        with self.assertLogs('authentication.outbox', 'WARNING') as logs:
+            self.assertEqual(send_pending(now=timezone.now() + timedelta(minutes=1)), (0, 1))
+            self.assertEqual(send_pending(now=timezone.now() + timedelta(minutes=5)), (0, 1))
+        self.assertIn('Giving up', logs.output[-1])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 3))
+        self.assertEqual(send_pending(now=timezone.now() + timedelta(days=1)), (0, 0))
+
+    @override_settings(EMAIL_BACKEND='authentication.tests.UnreachableBackend')
+    def test_unreachable_server_retries_the_whole_batch(self):
+        enqueue_email('One', 'Body', ['one@example.com'])
+        enqueue_email('Two', 'Body', ['two@example.com'])
+
+        with self.assertLogs('authentication.outbox', 'WARNING'):
+            self.assertEqual(send_pending(), (0, 2))
+        self.assertEqual(list(OutboxEmail.objects.values_list('status', 'attempts')), [('pending', 1)] * 2)
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        config = {'BACKOFF_SECONDS': 30, 'BACKOFF_MAX_SECONDS': 100}
+        self.assertEqual([retry_delay(attempts, config) for attempts in (1, 2, 3, 4)], [30, 60, 100, 100])
+
+    @override_settings(EMAIL_OUTBOX={'ENABLED': False})
+    def test_disabled_outbox_sends_immediately(self):
+        enqueue_email('Subject', 'Body', ['user@example.com'])
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_purge_deletes_old_sent_emails(self):
+        enqueue_email('Old', 'Body', ['old@example.com'])
+        enqueue_email('Pending', 'Body', ['pending@example.com'])
+        OutboxEmail.objects.filter(subject='Old').update(status='sent', sent_at=timezone.now() - timedelta(days=30))
+
+        self.assertEqual(purge_sent(), 1)
+        self.assertEqual(list(OutboxEmail.objects.values_list('subject', flat=True)), ['Pending'])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BulkInvitationTests(APITestCase):
+    """POST /api/auth/admin/send-invitations/bulk/"""
+
+    url = '/api/auth/admin/send-invitations/bulk/'
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin@example.com', password='pw12345!',
+            role='Admin', company_name='Acme', is_email_verified=True,
+        )
+        User.objects.create_user(
+            email='member@example.com', username='member@example.com', password='pw12345!',
+            role='Employee', company_name='Acme',
+        )
+        Invitation.create_invitation('pending@example.com', 'Employee', self.admin)
+        self.client.force_authenticate(user=self.admin)
+
+    def statuses(self, response):
+        return [(row['email'], row['status']) for row in response.data['data']['results']]
+
+    def test_json_rows_get_per_row_results(self):
+        response = self.client.post(self.url, {'invitations': [
+            {'email': 'new1@example.com', 'role': 'Employee'},
+            {'email': 'member@example.com', 'role': 'Employee'},
+            {'email': 'pending@example.com', 'role': 'Estimator'},
+            {'email': 'new2@example.com', 'role': 'Project Manager'},
+            {'email': 'new1@example.com', 'role': 'Estimator'},
+            {'email': 'boss@example.com', 'role': 'Admin'},
+            {'email': 'not-an-email', 'role': 'Employee'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.statuses(response), [
+            ('new1@example.com', 'invited'),
+            ('member@example.com', 'skipped'),
+            ('pending@example.com', 'skipped'),
+            ('new2@example.com', 'invited'),
+            ('new1@example.com', 'skipped'),
+            ('boss@example.com', 'invalid'),
+            ('not-an-email', 'invalid'),
+        ])
+        self.assertEqual(
+            response.data['data']['summary'], {'total': 7, 'invited': 2, 'skipped': 3, 'invalid': 2}
+        )
+        invited = response.data['data']['results'][0]['invitation']
+        self.assertEqual((invited['email'], invited['company_name']), ('new1@example.com', 'Acme'))
+        self.assertEqual(
+            sorted(Invitation.objects.filter(invited_by=self.admin).values_list('email', flat=True)),
+            ['new1@example.com', 'new2@example.com', 'pending@example.com'],
+        )
+        self.assertEqual(
+            sorted(email.recipients[0] for email in OutboxEmail.objects.all()),
+            ['new1@example.com', 'new2@example.com'],
+        )
+
+    def test_existing_emails_match_case_insensitively(self):
+        response = self.client.post(self.url, {'invitations': [
+            {'email': 'Member@Example.com', 'role': 'Employee'},
+            {'email': 'PENDING@example.com', 'role': 'Employee'},
+            {'email': 'New@example.com', 'role': 'Employee'},
+            {'email': 'new@EXAMPLE.com', 'role': 'Employee'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['status'] for row in response.data['data']['results']], [
+            'skipped', 'skipped', 'invited', 'skipped',
+        ])
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        counts = []
+        for size, start in ((2, 0), (40, 100)):
+            rows = [{'email': f'crew{number}@example.com', 'role': 'Employee'} for number in range(start, start + size)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {'invitations': rows}, format='json')
+            self.assertEqual(response.status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    @override_settings(EMAIL_BACKEND='authentication.tests.CountingBackend')
+    def test_csv_upload_goes_out_over_one_connection(self):
+        upload = SimpleUploadedFile(
+            'crew.csv',
+            '\ufeffEmail,Role\n' .encode('utf-8') + ''.join(
+                f'crew{number}@example.com,Employee\n' for number in range(60)
+            ).encode('utf-8'),
+            content_type='text/csv',
+        )
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['summary']['invited'], 60)
+
+        CountingBackend.opened = 0
+        self.assertEqual(send_pending(), (60, 0))
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 60)
+
+    def test_csv_text_without_header(self):
+        response = self.client.post(self.url, {
+            'csv': 'a@example.com,Employee\n\nb@example.com,Estimator\nmember@example.com,Employee\n',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.statuses(response), [
+            ('a@example.com', 'invited'), ('b@example.com', 'invited'), ('member@example.com', 'skipped'),
+        ])
+
+    def test_nothing_new_returns_200(self):
+        response = self.client.post(
+            self.url, {'invitations': [{'email': 'member@example.com', 'role': 'Employee'}]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_rejected_requests(self):
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, 400)
+        too_many = [{'email': f'crew{number}@example.com', 'role': 'Employee'} for number in range(101)]
+        self.assertEqual(self.client.post(self.url, {'invitations': too_many}, format='json').status_code, 400)
+
+        self.client.force_authenticate(user=User.objects.get(email='member@example.com'))
+        response = self.client.post(
+            self.url, {'invitations': [{'email': 'x@example.com', 'role': 'Employee'}]}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Invitation.objects.filter(email='x@example.com').exists())
+
+
+class UserCompanySyncTests(TestCase):
+    """User.save keeps the company foreign key in sync with company_name"""
+
+    def test_company_follows_company_name(self):
+        user = User.objects.create_user(
+            email='emp@example.com', username='emp@example.com', password='pw12345!', company_name='Acme',
+        )
+        acme = Company.objects.get(name='Acme')
+        self.assertEqual(user.company, acme)
+
+        # A colleague joins the existing company instead of creating another one
+        colleague = User.objects.create_user(
+            email='pm@example.com', username='pm@example.com', password='pw12345!', company_name='Acme',
+        )
+        self.assertEqual(colleague.company, acme)
+
+        user = User.objects.get(pk=user.pk)
+        user.company_name = 'Other'
+        user.save(update_fields=['company_name'])
+        user.refresh_from_db()
+        self.assertEqual(user.company.name, 'Other')
+
+        user.company_name = ''
+        user.save()
+        user.refresh_from_db()
+        self.assertIsNone(user.company)
+        self.assertEqual(Company.objects.count(), 2)
+
+    def test_unrelated_saves_do_not_resolve_the_company(self):
+        user = User.objects.create_user(
+            email='emp@example.com', username='emp@example.com', password='pw12345!', company_name='Acme',
+        )
+        user = User.objects.get(pk=user.pk)
+        with self.assertNumQueries(1):
+            user.save(update_fields=['first_name'])
+        with self.assertNumQueries(1):
+            user.save()
+
+
+class CompanyIdOfTests(SimpleTestCase):
+    """tenancy.company_id_of accepts ids and tenant rows, and rejects anything else"""
+
+    def test_accepted_values(self):
+        self.assertIsNone(company_id_of(None))
+        self.assertEqual(company_id_of(7), 7)
+        self.assertEqual(company_id_of('7'), 7)
+        self.assertEqual(company_id_of(Company(pk=7)), 7)
+        self.assertEqual(company_id_of(User(company_id=7)), 7)
+
+    def test_rejected_values(self):
+        with self.assertRaises(ValueError):
+            company_id_of('acme')
+        with self.assertRaises(TypeError):
+            company_id_of(uuid.uuid4())
+
+
+class CompanyBackfillMigrationTests(TransactionTestCase):
+    """The 000x_company migrations create companies and link existing rows to them"""
+
+    migrate_from = [
+        ('authentication', '0001_initial'),
+        ('estimator', '0002_estimate_totals'),
+        ('Project_manager', '0003_projectdocument'),
+        ('admindashboard', '0002_initial'),
+    ]
+    migrate_to = [
+        ('authentication', '0002_company'),
+        ('estimator', '0003_company'),
+        ('Project_manager', '0004_company'),
+        ('admindashboard', '0003_company'),
+    ]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_rows_are_linked_to_their_company(self):
+        apps = self.migrate(self.migrate_from)
+        HistoricalUser = apps.get_model('authentication', 'User')
+        HistoricalInvitation = apps.get_model('authentication', 'Invitation')
+        HistoricalEstimate = apps.get_model('estimator', 'Estimate')
+        HistoricalProject = apps.get_model('Project_manager', 'Project')
+        HistoricalMaterial = apps.get_model('admindashboard', 'Material')
+
+        users = {}
+        for email, company_name in (('a@acme.com', 'Acme'), ('b@acme.com', 'Acme'), ('o@other.com', 'Other'),
+                                    ('n@none.com', '')):
+            users[email] = HistoricalUser.objects.create(
+                email=email, username=email, password='!', company_name=company_name,
+            ).pk
+        HistoricalInvitation.objects.create(
+            email='new@invited.com', role='Employee', company_name='Invited', invited_by_id=users['a@acme.com'],
+            expires_at=timezone.now() + timedelta(days=7),
+        )
+        acme_estimate = HistoricalEstimate.objects.create(
+            serial_number='EST-1', client_name='Client', project_name='Kitchen', created_by_id=users['a@acme.com'],
+        )
+        orphan_estimate = HistoricalEstimate.objects.create(
+            serial_number='EST-2', client_name='Client', project_name='Bath',
+        )
+        from_estimate = HistoricalProject.objects.create(
+            estimate=acme_estimate, project_name='Kitchen', client_name='Client',
+            created_by_id=users['o@other.com'],
+        ).pk
+        from_creator = HistoricalProject.objects.create(
+            estimate=orphan_estimate, project_name='Bath', client_name='Client',
+            created_by_id=users['o@other.com'],
+        ).pk
+        material = HistoricalMaterial.objects.create(
+            material_name='Oak', supplier='Mill', category='Wood', unit='m', cost_per_unit=Decimal('3'),
+            created_by_id=users['b@acme.com'],
+        ).pk
+
+        apps = self.migrate(self.migrate_to)
+        HistoricalCompany = apps.get_model('authentication', 'Company')
+        HistoricalUser = apps.get_model('authentication', 'User')
+        HistoricalEstimate = apps.get_model('estimator', 'Estimate')
+        HistoricalProject = apps.get_model('Project_manager', 'Project')
+        HistoricalMaterial = apps.get_model('admindashboard', 'Material')
+
+        self.assertEqual(
+            sorted(HistoricalCompany.objects.values_list('name', flat=True)), ['Acme', 'Invited', 'Other']
+        )
+        self.assertEqual(
+            dict(HistoricalUser.objects.values_list('email', 'company__name')),
+            {'a@acme.com': 'Acme', 'b@acme.com': 'Acme', 'o@other.com': 'Other', 'n@none.com': None},
+        )
+        self.assertEqual(HistoricalEstimate.objects.get(serial_number='EST-1').company.name, 'Acme')
+        self.assertIsNone(HistoricalEstimate.objects.get(serial_number='EST-2').company)
+        # The estimate's company wins over the creator's; the creator is the fallback
+        self.assertEqual(HistoricalProject.objects.get(pk=from_estimate).company.name, 'Acme')
+        self.assertEqual(HistoricalProject.objects.get(pk=from_creator).company.name, 'Other')
+        self.assertEqual(HistoricalMaterial.objects.get(pk=material).company.name, 'Acme')
@@ -9,6 +9,7 @@ from .views import (
     ResetPasswordView,
     UserProfileView,
     SendInvitationView,
+    BulkSendInvitationView,
     AcceptInvitationView,
     AdminUserListView,
     AdminUserDetailView,
@@ -31,6 +32,7 @@ urlpatterns = [
     
     # Admin invitation system
     path('admin/send-invitation/', SendInvitationView.as_view(), name='send-invitation'),
+    path('admin/send-invitations/bulk/', BulkSendInvitationView.as_view(), name='send-invitations-bulk'),
     path('accept-invitation/<uuid:token>/', AcceptInvitationView.as_view(), name='accept-invitation'),
     
     # Admin user management
@@ -1,10 +1,12 @@
-from django.core.mail import send_mail
-from django.conf import settings
+import csv
+import io
+
+from .outbox import enqueue_email, enqueue_emails
 
 
 def send_otp_email(email, otp, purpose):
     """
-    Send OTP email to user
+    Queue OTP email to user (sent by the outbox worker)
     """
     if purpose == 'email_verification':
         subject = 'Verify Your Email - Lignaflow'
@@ -42,22 +44,16 @@ def send_otp_email(email, otp, purpose):
         return False
     
     try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [email],
-            fail_silently=False,
-        )
+        enqueue_email(subject, message, [email])
         return True
     except Exception as e:
         print(f"Error sending email: {e}")
         return False
 
 
-def send_invitation_email(email, role, token, company_name, base_url):
+def invitation_email_content(email, role, token, company_name):
     """
-    Send invitation email to user
+    Subject and body of an invitation email
     """
     # Frontend registration link
     invitation_link = "http://localhost:5173/register-via-link"
@@ -87,18 +83,53 @@ This invitation will expire in 7 days.
 Best regards,
 Lignaflow Team
     '''
+    return subject, message
+
+
+def send_invitation_email(email, role, token, company_name, base_url):
+    """
+    Queue invitation email to user (sent by the outbox worker)
+    """
+    subject, message = invitation_email_content(email, role, token, company_name)
     
     try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [email],
-            fail_silently=False,
-        )
+        enqueue_email(subject, message, [email])
         return True
     except Exception as e:
         print(f"Error sending invitation email: {e}")
         return False
-        print(f"Error sending email: {e}")
-        return False
+
+
+def send_invitation_emails(invitations, company_name):
+    """
+    Queue the emails of several invitations with one insert
+    (the outbox worker sends a whole batch over one connection)
+    """
+    enqueue_emails([
+        (*invitation_email_content(invitation.email, invitation.role, invitation.token, company_name),
+         [invitation.email])
+        for invitation in invitations
+    ])
+
+
+def parse_invitation_csv(text):
+    """
+    Parse CSV text into [{'email': ..., 'role': ...}] rows.
+    A header row naming 'email' and 'role' columns is optional; without one
+    the first two columns are email and role.
+    """
+    rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    if 'email' in header:
+        email_index = header.index('email')
+        role_index = header.index('role') if 'role' in header else None
+        rows = rows[1:]
+    else:
+        email_index, role_index = 0, 1
+
+    def cell(row, index):
+        return row[index].strip() if index is not None and index < len(row) else ''
+
+    return [{'email': cell(row, email_index), 'role': cell(row, role_index)} for row in rows]
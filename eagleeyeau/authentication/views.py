@@ -5,6 +5,9 @@ from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
+from django.db import transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Lower
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
@@ -18,18 +21,23 @@ from .serializers import (
     UserSerializer,
     TokenSerializer,
     SendInvitationSerializer,
+    BulkInvitationSerializer,
+    BulkInvitationRowSerializer,
     AcceptInvitationSerializer,
     InvitationSerializer,
     AdminUserSerializer,
     AdminUserRoleUpdateSerializer,
     UserProfileUpdateSerializer
 )
-from .utils import send_otp_email, send_invitation_email
+from .utils import send_otp_email, send_invitation_email, send_invitation_emails, parse_invitation_csv
 from eagleeyeau.response_formatter import format_response, extract_error_message
 from eagleeyeau.api_messages import AUTH_MESSAGES, GENERAL_MESSAGES
 
 User = get_user_model()
 
+# Rows per bulk invitation request; at most one outbox batch (EMAIL_OUTBOX['BATCH_SIZE'])
+MAX_BULK_INVITATIONS = 100
+
 
 class RegisterView(APIView):
     """
@@ -506,6 +514,146 @@ class SendInvitationView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkSendInvitationView(APIView):
+    """
+    API endpoint for admin to invite many users at once.
+    Accepts a JSON list or a CSV of (email, role) rows and returns a result per row.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body=BulkInvitationSerializer,
+        responses={
+            201: "Invitations queued; per-row results in data.results",
+            200: "No new invitations (every row skipped or invalid)",
+            400: "Bad Request",
+            403: "Not authorized"
+        },
+        operation_description=(
+            "Invite up to %d users (Admin only). Send either a JSON body "
+            '{"invitations": [{"email": "...", "role": "Employee"}, ...]}, a multipart CSV "file", '
+            'or "csv" text, with email and role columns (header row optional). Rows whose email '
+            "already belongs to a user or has an open invitation, and repeated rows, are skipped. "
+            "Each row's result is 'invited', 'skipped' or 'invalid'." % MAX_BULK_INVITATIONS
+        )
+    )
+    def post(self, request):
+        if request.user.role != 'Admin':
+            return Response({
+                'error': 'Only admins can send invitations'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = BulkInvitationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                format_response(
+                    success=False,
+                    message=extract_error_message(serializer.errors, status_code=status.HTTP_400_BAD_REQUEST),
+                    data=serializer.errors
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = serializer.validated_data.get('invitations')
+        if rows is None:
+            upload = serializer.validated_data.get('file')
+            try:
+                text = upload.read().decode('utf-8-sig') if upload else serializer.validated_data['csv']
+            except UnicodeDecodeError:
+                return Response(
+                    format_response(success=False, message="CSV file must be UTF-8 encoded", data=None),
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            rows = parse_invitation_csv(text)
+
+        if not rows or len(rows) > MAX_BULK_INVITATIONS:
+            return Response(
+                format_response(
+                    success=False,
+                    message=f"Send between 1 and {MAX_BULK_INVITATIONS} invitations per request",
+                    data=None
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Validate every row; invalid rows are reported, not fatal
+        results = []
+        candidates = []
+        for number, row in enumerate(rows, start=1):
+            row_serializer = BulkInvitationRowSerializer(data=row)
+            result = {'row': number, 'email': row.get('email'), 'role': row.get('role')}
+            if row_serializer.is_valid():
+                result.update(row_serializer.validated_data)
+                candidates.append(result)
+            else:
+                result.update(
+                    status='invalid',
+                    message=extract_error_message(row_serializer.errors, status_code=status.HTTP_400_BAD_REQUEST)
+                )
+            results.append(result)
+
+        # Existing users and open invitations of every row in one query,
+        # compared case-insensitively like the in-request dedup below
+        emails = {result['email'].lower() for result in candidates}
+        existing_users = User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=emails
+        ).order_by().annotate(
+            reason=Value('existing_user', output_field=CharField())
+        ).values_list('email_lower', 'reason')
+        open_invitations = Invitation.open_invitations().annotate(email_lower=Lower('email')).filter(
+            email_lower__in=emails
+        ).order_by().annotate(
+            reason=Value('already_invited', output_field=CharField())
+        ).values_list('email_lower', 'reason')
+        taken = {}
+        for email, reason in existing_users.union(open_invitations):
+            if taken.get(email) != 'existing_user':
+                taken[email] = reason
+
+        invitations = []
+        seen = set()
+        for result in candidates:
+            email = result['email']
+            key = email.lower()
+            if key in taken:
+                result.update(status='skipped', message=(
+                    "User with this email already exists" if taken[key] == 'existing_user'
+                    else "An open invitation for this email already exists"
+                ))
+            elif key in seen:
+                result.update(status='skipped', message="Duplicate of an earlier row")
+            else:
+                seen.add(key)
+                invitations.append(Invitation.build_invitation(email, result['role'], request.user))
+                result.update(status='invited', message=AUTH_MESSAGES['INVITATION_SENT'])
+
+        if invitations:
+            company_name = request.user.company_name or 'Not specified'
+            with transaction.atomic():
+                invitations = Invitation.objects.bulk_create(invitations)
+                # All emails are queued together and go out in one outbox batch (one SMTP connection)
+                send_invitation_emails(invitations, company_name)
+            by_email = {invitation.email: invitation for invitation in invitations}
+            for result in candidates:
+                if result['status'] == 'invited':
+                    result['invitation'] = InvitationSerializer(by_email[result['email']]).data
+
+        summary = {
+            'total': len(results),
+            'invited': len(invitations),
+            'skipped': sum(1 for result in results if result['status'] == 'skipped'),
+            'invalid': sum(1 for result in results if result['status'] == 'invalid'),
+        }
+        return Response(
+            format_response(
+                success=True,
+                message=f"{summary['invited']} of {summary['total']} invitations sent",
+                data={'summary': summary, 'results': results}
+            ),
+            status=status.HTTP_201_CREATED if invitations else status.HTTP_200_OK
+        )
+
+
 class AcceptInvitationView(APIView):
     """
     API endpoint for user to accept invitation and set password.
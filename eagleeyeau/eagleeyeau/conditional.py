@@ -0,0 +1,106 @@
+"""
+Conditional GET (ETag / Last-Modified) for endpoints clients poll.
+
+Validators are derived from the data rather than the rendered payload:
+``queryset_state`` runs one ``MAX(updated_at), COUNT(*)`` aggregate over the
+scoped queryset (the count catches deletions, which the max alone misses) and
+``object_state`` reads an already loaded object's ``updated_at``. When the
+request's ``If-None-Match`` / ``If-Modified-Since`` still match,
+``not_modified`` returns a 304 before anything is serialized or rendered.
+
+Only responses built from ``object_state`` alone carry ``Last-Modified``. A
+date cannot see that a row was deleted from a queryset (the count drops, the
+max stays or even goes down), so a client revalidating a list with
+``If-Modified-Since`` only would get a false 304; list responses are
+validated by their ETag alone.
+
+The ETag also covers the user, the full path (query string included) and an
+optional ``vary`` value, since equally stamped rows can render differently
+for another user, filter or day. ETags are weak: an unchanged payload is
+equivalent, not byte-identical.
+"""
+import hashlib
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+DEFAULT_CONDITIONAL_GET = {
+    'ENABLED': True,
+}
+
+Validators = namedtuple('Validators', ['etag', 'last_modified'])
+
+
+def get_conditional_get_settings():
+    """Merge settings.CONDITIONAL_GET over the defaults"""
+    return {**DEFAULT_CONDITIONAL_GET, **getattr(settings, 'CONDITIONAL_GET', {})}
+
+
+def queryset_state(queryset, fields=('updated_at',)):
+    """
+    ``(latest, token)`` for ``queryset`` from a single aggregate query.
+
+    ``fields`` are the timestamps to take the maximum of; related ones
+    (``'project__updated_at'``) cover joined data the payload shows.
+    ``latest`` is always None: only the token, which includes the row count,
+    tells whether the rows changed.
+    """
+    aggregates = {f'latest_{index}': Max(field) for index, field in enumerate(fields)}
+    result = queryset.order_by().aggregate(row_count=Count('pk'), **aggregates)
+    stamps = [result[f'latest_{index}'] for index in range(len(fields))]
+    token = ':'.join([queryset.model._meta.label, str(result['row_count'])] + [
+        stamp.isoformat() if stamp is not None else '-' for stamp in stamps
+    ])
+    return None, token
+
+
+def object_state(obj, field='updated_at'):
+    """``(latest, token)`` for one loaded object"""
+    stamp = getattr(obj, field)
+    return stamp, f'{obj._meta.label}:{obj.pk}:{stamp.isoformat() if stamp else "-"}'
+
+
+def compute_validators(request, *states, vary=None):
+    user_id = request.user.pk if request.user.is_authenticated else ''
+    parts = [str(user_id), request.get_full_path(), str(vary or '')]
+    parts.extend(token for _, token in states)
+    digest = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+    # Last-Modified only when every state has a date (see the module docstring)
+    stamps = [latest for latest, _ in states]
+    dated = stamps and None not in stamps
+    return Validators(f'W/"{digest}"', max(stamps) if dated else None)
+
+
+def not_modified(request, *states, vary=None):
+    """
+    Return ``(response, validators)`` for ``states`` (from ``queryset_state`` /
+    ``object_state``).
+
+    ``response`` is a 304 when the client's copy is still current, else None
+    and the view builds the payload and passes it through ``with_validators``.
+    """
+    if not get_conditional_get_settings()['ENABLED']:
+        return None, None
+
+    validators = compute_validators(request, *states, vary=vary)
+    last_modified = int(validators.last_modified.timestamp()) if validators.last_modified else None
+    response = get_conditional_response(request, etag=validators.etag, last_modified=last_modified)
+    if response is not None:
+        response = with_validators(response, validators)
+    return response, validators
+
+
+def with_validators(response, validators):
+    """Set ETag / Last-Modified on a 200 (or 304) response and ask clients to revalidate"""
+    if validators is None or response.status_code not in (200, 304):
+        return response
+    response['ETag'] = validators.etag
+    if validators.last_modified is not None:
+        response['Last-Modified'] = http_date(validators.last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,245 @@
+"""
+Per-company cache for read-heavy dashboard payloads.
+
+Dashboards are cached under keys that embed two version stamps: a global one
+and one per company (``User.company``). Invalidation bumps a version
+instead of deleting keys, so it is a single cache write and works the same on
+every backend (local memory, file, Redis). The backend is whatever
+``settings.CACHES`` defines for the alias in ``DASHBOARD_CACHE['ALIAS']``.
+
+Model signals (see ``connect_signals``) bump the version of the company that
+owns the changed row (Project / Estimate / User by their ``company``, Task
+through its project, TaskTimer through its employee), so one tenant's writes
+never clear another tenant's dashboards. The bump runs when the transaction
+commits: bumped earlier, a recompute could still read the uncommitted (old)
+rows and cache them under the new version until ``TIMEOUT``.
+
+On a miss only one caller recomputes: it takes a short lock with
+``cache.add`` while concurrent callers poll for its result, so a burst of
+dashboard loads after an invalidation shares one recompute.
+
+A recompute that read from a replica (see ``db_routing``) within
+``READ_REPLICAS['STICKY_SECONDS']`` of the last version bump is returned but
+not cached: the replica may not have replayed the write behind the bump yet,
+and caching its result would pin the stale payload to the new version.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .db_routing import current_replica, get_read_replica_settings
+
+
+DEFAULT_DASHBOARD_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'dashboards',
+    # Seconds a computed payload is kept (safety net on top of signal invalidation)
+    'TIMEOUT': 300,
+    # Seconds the recompute lock is held at most
+    'LOCK_TIMEOUT': 30,
+    # Seconds a caller waits for another caller's recompute before doing it itself
+    'WAIT_SECONDS': 10,
+    'POLL_INTERVAL': 0.05,
+}
+
+KEY_PREFIX = 'dashboard'
+GLOBAL_SCOPE = '*'
+
+_MISSING = object()
+
+
+def get_dashboard_cache_settings():
+    """Merge settings.DASHBOARD_CACHE over the defaults"""
+    return {**DEFAULT_DASHBOARD_CACHE, **getattr(settings, 'DASHBOARD_CACHE', {})}
+
+
+def _cache():
+    return caches[get_dashboard_cache_settings()['ALIAS']]
+
+
+def _version_key(scope):
+    return f'{KEY_PREFIX}:version:{scope}'
+
+
+def _versions(cache, company):
+    """Current (global, company) version stamps, initialising missing ones"""
+    keys = [_version_key(GLOBAL_SCOPE), _version_key(company)]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return versions
+
+
+def invalidate_dashboards(company=None):
+    """Drop cached dashboards for one company, or for everyone if company is None"""
+    if not get_dashboard_cache_settings()['ENABLED']:
+        return
+    scope = GLOBAL_SCOPE if company is None else company
+    _cache().set(_version_key(scope), time.time_ns(), timeout=None)
+
+
+class _PendingInvalidation:
+    """on_commit callback bumping every company touched by the transaction once"""
+
+    def __init__(self):
+        self.companies = set()
+        # (model label, pk) -> company id, so a cascade over N rows of one
+        # owner looks the owner's company up once
+        self.owners = {}
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        for company in self.companies:
+            invalidate_dashboards(company or '')
+
+
+def _pending_invalidation():
+    # One callback per transaction: a rolled back transaction drops it from
+    # run_on_commit together with its companies
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    for _, callback, _ in connection.run_on_commit:
+        if isinstance(callback, _PendingInvalidation) and not callback.done:
+            return callback
+    pending = _PendingInvalidation()
+    transaction.on_commit(pending)
+    return pending
+
+
+def invalidate_dashboards_on_commit(*companies):
+    """
+    Drop cached dashboards of each company (an id, '' or None for users
+    without one) once the current transaction commits, or right away outside
+    a transaction. Each company is bumped once per transaction.
+    """
+    pending = _pending_invalidation()
+    if pending is None:
+        for company in set(companies):
+            invalidate_dashboards(company or '')
+        return
+    pending.companies.update(companies)
+
+
+def _within_replica_lag(*versions):
+    """True if a version was bumped less than STICKY_SECONDS ago (replicas may lag behind it)"""
+    lag_ns = get_read_replica_settings()['STICKY_SECONDS'] * 1_000_000_000
+    return time.time_ns() - max(versions) < lag_ns
+
+
+def get_or_compute(name, company, compute, vary=None):
+    """
+    Return the cached payload for dashboard ``name`` of ``company``.
+
+    ``compute()`` builds the payload on a miss; ``vary`` adds anything else the
+    payload depends on (user id, date, ...) to the key. Concurrent misses
+    share one ``compute()`` call.
+    """
+    config = get_dashboard_cache_settings()
+    if not config['ENABLED']:
+        return compute()
+
+    cache = _cache()
+    company = company or ''
+    global_version, company_version = _versions(cache, company)
+    key = f'{KEY_PREFIX}:{name}:{company}:{vary or ""}:{global_version}:{company_version}'
+
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, timeout=config['LOCK_TIMEOUT']):
+        try:
+            on_replica = current_replica() is not None
+            value = compute()
+            if not (on_replica and _within_replica_lag(global_version, company_version)):
+                cache.set(key, value, timeout=config['TIMEOUT'])
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    # Another caller is recomputing: wait for its result
+    deadline = time.monotonic() + config['WAIT_SECONDS']
+    while time.monotonic() < deadline:
+        time.sleep(config['POLL_INTERVAL'])
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if cache.get(lock_key) is None:
+            # The holder failed or timed out; stop waiting
+            break
+    return compute()
+
+
+# ====================== SIGNAL-BASED INVALIDATION ======================
+# The owning company is looked up when the signal fires (a deleted row is
+# gone by commit time), once per owner and transaction so cascades over many
+# rows stay cheap; only the version bump waits for the commit.
+
+def _invalidate_company(sender, instance, **kwargs):
+    invalidate_dashboards_on_commit(instance.company_id)
+
+
+def _owner_company(model, pk):
+    """company_id of ``model`` row ``pk``, looked up once per transaction"""
+    pending = _pending_invalidation()
+    owners = pending.owners if pending is not None else {}
+    key = (model._meta.label, pk)
+    if key not in owners:
+        owners[key] = model.objects.filter(pk=pk).values_list('company_id', flat=True).first()
+    return owners[key]
+
+
+def _invalidate_task_company(sender, instance, **kwargs):
+    from Project_manager.models import Project
+
+    if type(instance).project.is_cached(instance):
+        company_id = instance.project.company_id
+    else:
+        company_id = _owner_company(Project, instance.project_id)
+    invalidate_dashboards_on_commit(company_id)
+
+
+def _invalidate_user_company(sender, instance, update_fields=None, **kwargs):
+    # Login only touches last_login, which no dashboard shows
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_dashboards_on_commit(instance.company_id)
+
+
+def _invalidate_timer_company(sender, instance, **kwargs):
+    from authentication.models import User
+
+    if type(instance).employee.is_cached(instance):
+        company_id = instance.employee.company_id if instance.employee else None
+    else:
+        company_id = _owner_company(User, instance.employee_id)
+    invalidate_dashboards_on_commit(company_id)
+
+
+def connect_signals():
+    """Connect invalidation receivers; called from an AppConfig.ready()"""
+    receivers = [
+        ('Project_manager.Project', _invalidate_company),
+        ('Project_manager.Task', _invalidate_task_company),
+        ('estimator.Estimate', _invalidate_company),
+        ('authentication.User', _invalidate_user_company),
+        ('emopye.TaskTimer', _invalidate_timer_company),
+    ]
+    for sender, receiver in receivers:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                receiver,
+                sender=sender,
+                weak=False,
+                dispatch_uid=f'dashboard_cache:{sender}:{signal is post_save}',
+            )
@@ -0,0 +1,228 @@
+"""
+Read-replica routing for dashboard and reporting reads.
+
+``PrimaryReplicaRouter`` sends every write to ``default`` (the primary).
+Reads also go to ``default`` unless the current request has been marked
+replica-safe. ``ReplicaRoutingMiddleware`` does that for GET/HEAD requests
+whose path matches ``READ_REPLICAS['PATHS']`` (dashboards, timesheet
+listings, catalogue lists, report downloads) and picks one replica alias
+for the whole request.
+
+Read-your-writes stickiness:
+
+- Within a request, the first write pins the rest of it to the primary.
+  Reads inside a transaction on the primary stay there too.
+- Across requests, a request that wrote pins its user to the primary for
+  ``STICKY_SECONDS``. This covers the replication lag window. The pin is
+  kept in the ``CACHE_ALIAS`` cache, so that cache must be shared between
+  worker processes (e.g. Redis) for the pin to follow the user. The user is
+  read from the JWT without a database query.
+
+With no replicas configured, every query goes to ``default`` as before.
+Code outside a request (threads, management commands) can opt in with
+``read_from_replica()`` or force the primary with ``pin_to_primary()``.
+"""
+import random
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+DEFAULT_READ_REPLICAS = {
+    # Database aliases of the replicas; empty disables replica reads
+    'ALIASES': [],
+    # How long a user's reads stay on the primary after they wrote
+    'STICKY_SECONDS': 10,
+    # Cache holding the per-user pins; must be shared between workers
+    'CACHE_ALIAS': 'default',
+    # Regexes of request paths whose GET/HEAD reads may use a replica
+    'PATHS': [],
+}
+
+PIN_CACHE_KEY = 'db_routing:pin:{user_id}'
+
+
+class RoutingState:
+    """Routing decision for the current request (or ``read_from_replica`` block)"""
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.pinned = False
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def get_read_replica_settings():
+    """Merge settings.READ_REPLICAS over the defaults"""
+    return {**DEFAULT_READ_REPLICAS, **getattr(settings, 'READ_REPLICAS', {})}
+
+
+def replica_aliases():
+    """Configured replica aliases that exist in settings.DATABASES"""
+    return [alias for alias in get_read_replica_settings()['ALIASES'] if alias in settings.DATABASES]
+
+
+def choose_replica():
+    aliases = replica_aliases()
+    return random.choice(aliases) if aliases else None
+
+
+@contextmanager
+def read_from_replica(alias=None):
+    """Route reads in this block to a replica (writes still pin it to the primary)"""
+    token = _state.set(RoutingState(alias or choose_replica()))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def pin_to_primary():
+    """Route every query in this block to the primary"""
+    token = _state.set(None)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def current_replica():
+    """Replica alias reads are routed to right now, or None when they use the primary"""
+    state = _state.get()
+    if state is None or state.replica is None or state.pinned:
+        return None
+    # Reads inside a transaction on the primary must see its uncommitted writes
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return None
+    return state.replica
+
+
+class PrimaryReplicaRouter:
+    """Database router: writes to ``default``, replica-safe reads to a replica"""
+
+    def db_for_read(self, model, **hints):
+        return current_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.pinned = True
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def _pin_cache():
+    return caches[get_read_replica_settings()['CACHE_ALIAS']]
+
+
+def token_user_id(request):
+    """User id from the request's JWT (signature checked, no database query), or None"""
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+    from rest_framework_simplejwt.settings import api_settings
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        validated_token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return validated_token.get(api_settings.USER_ID_CLAIM)
+
+
+def is_pinned(user_id):
+    return user_id is not None and bool(_pin_cache().get(PIN_CACHE_KEY.format(user_id=user_id)))
+
+
+def pin_user(user_id, seconds=None):
+    """Keep ``user_id``'s reads on the primary for ``seconds`` (default STICKY_SECONDS)"""
+    if user_id is None:
+        return
+    if seconds is None:
+        seconds = get_read_replica_settings()['STICKY_SECONDS']
+    if seconds > 0:
+        _pin_cache().set(PIN_CACHE_KEY.format(user_id=user_id), True, seconds)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Marks replica-safe requests for ``PrimaryReplicaRouter`` and records
+    which users just wrote.
+
+    Place near the top of MIDDLEWARE, before anything that queries the database.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_read_replica_settings()
+        self.paths = [re.compile(pattern) for pattern in config['PATHS']]
+        self.enabled = bool(replica_aliases()) and bool(self.paths)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        user_id = None
+        replica = None
+        if self.replica_safe(request):
+            user_id = token_user_id(request)
+            if not is_pinned(user_id):
+                replica = choose_replica()
+
+        state = RoutingState(replica)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                user_id = user.pk
+            pin_user(user_id)
+        elif replica is not None and (getattr(response, 'streaming', False)
+                                      and getattr(response, 'file_to_stream', None) is None):
+            # Generated bodies (exports) are produced after this returns
+            response.streaming_content = self.route_stream(response.streaming_content, state)
+        return response
+
+    def replica_safe(self, request):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return False
+        return any(pattern.search(request.path) for pattern in self.paths)
+
+    @staticmethod
+    def route_stream(content, state):
+        """Apply ``state`` while each chunk of a streamed body is generated"""
+        iterator = iter(content)
+        while True:
+            token = _state.set(state)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _state.reset(token)
+            yield chunk
@@ -0,0 +1,177 @@
+"""
+Streaming CSV / XLSX exports.
+
+Rows come from ``QuerySet.iterator(chunk_size=...)``, which uses a
+server-side cursor on PostgreSQL. They are encoded as they are read and sent
+through a ``StreamingHttpResponse``, so memory stays flat however many rows
+an export has. Output is flushed in blocks of about ``FLUSH_BYTES``.
+
+XLSX is written with the standard library only: a zip archive streamed
+through an unseekable buffer (entries use data descriptors), holding a
+single worksheet of inline strings and numbers.
+
+Text that a spreadsheet would read as a formula (starting with ``=``, ``+``,
+``-``, ``@``, tab or carriage return) is prefixed with ``'``: task, project
+and client names are user input and end up in payroll exports.
+"""
+import csv
+import datetime
+import decimal
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from django.http import StreamingHttpResponse
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Rows fetched per database round trip
+CHUNK_SIZE = 2000
+
+FLUSH_BYTES = 64 * 1024
+
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def cell_value(value):
+    """Plain representation of a value for an export cell"""
+    if isinstance(value, str):
+        return f"'{value}" if value.startswith(FORMULA_PREFIXES) else value
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return int(value.total_seconds())
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+
+# ====================== CSV ======================
+
+def iter_csv(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([cell_value(value) for value in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+# ====================== XLSX ======================
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_SHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_DOC_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+# Characters XML 1.0 does not allow, even escaped
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]')
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Unseekable sink that collects what zipfile writes until it is drained"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def _xlsx_cell(value):
+    value = cell_value(value)
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return f'<c><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def iter_xlsx(header, rows, sheet_name='Export'):
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in _XLSX_PARTS.items():
+            archive.writestr(name, _XML_HEADER + xml)
+        archive.writestr('xl/workbook.xml', (
+            f'{_XML_HEADER}<workbook xmlns="{_SHEET_NS}" xmlns:r="{_DOC_REL}"><sheets>'
+            f'<sheet name="{quoteattr(sheet_name[:31])[1:-1]}" sheetId="1" r:id="rId1"/>'
+            '</sheets></workbook>'
+        ))
+        yield buffer.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(f'{_XML_HEADER}<worksheet xmlns="{_SHEET_NS}"><sheetData>'.encode('utf-8'))
+            sheet.write(_xlsx_row(header).encode('utf-8'))
+            for row in rows:
+                sheet.write(_xlsx_row(row).encode('utf-8'))
+                if buffer.size >= FLUSH_BYTES:
+                    yield buffer.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield buffer.drain()
+
+
+# ====================== RESPONSE ======================
+
+def streaming_export_response(file_format, filename, header, rows, sheet_name='Export'):
+    """
+    Stream ``rows`` (an iterable of sequences, typically
+    ``queryset.values_list(...).iterator(chunk_size=CHUNK_SIZE)``) as a
+    ``file_format`` download named ``filename.<file_format>``.
+    """
+    if file_format == 'xlsx':
+        content = iter_xlsx(header, rows, sheet_name=sheet_name)
+    else:
+        content = iter_csv(header, rows)
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
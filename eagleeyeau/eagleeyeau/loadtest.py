@@ -0,0 +1,397 @@
+"""
+Load-testing harness: replays role-based traffic against a running server.
+
+``run_load_test`` starts a number of virtual users, each a thread with its own
+keep-alive HTTP connection. A virtual user logs in through ``LoginView`` as an
+Employee, Project Manager, Estimator or Admin, looks up a few ids it can use
+(its assigned tasks, projects, estimates), then keeps picking a weighted
+random action of its role until the run ends, pausing a random think time
+between requests.
+
+A traffic mix (``MIXES``) sets the share of virtual users per role; the
+actions of each role and their weights are in ``ROLE_ACTIONS``. The result is
+a JSON-serializable report with request counts, status codes, requests per
+second and p50/p95/p99 latency per endpoint, so runs can be written to disk
+and compared with ``compare_reports``.
+
+Only the standard library is used, and nothing here touches the database:
+the harness is an ordinary HTTP client of the server under test.
+"""
+import http.client
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter, namedtuple
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+
+ROLES = ['Employee', 'Project Manager', 'Estimator', 'Admin']
+
+# One weighted request type. ``path`` may contain {task}, {project} or
+# {estimate}; ``body`` is called with the virtual user to build a JSON body.
+Action = namedtuple('Action', ['name', 'weight', 'method', 'path', 'body'])
+
+LOGIN_PATH = '/api/auth/login/'
+
+
+def _timer_toggle_body(user):
+    # Stop the running timer before starting another one, as the app expects
+    task_id, project_id = user.running_task or user.rng.choice(user.tasks)
+    return {'task_id': task_id, 'project_id': project_id}
+
+
+def _estimate_body(user):
+    number = uuid.uuid4().hex[:12].upper()
+    return {
+        'serial_number': f'LOAD-{number}',
+        'estimate_number': f'LOAD-{number}',
+        'client_name': 'Load Test Client',
+        'project_name': f'Load test {number}',
+        'targeted_rooms': ['Kitchen'],
+        'items': user.estimate_items,
+    }
+
+
+ROLE_ACTIONS = {
+    'Employee': [
+        Action('employee.assigned_tasks', 45, 'GET', '/api/employee/assigned-tasks/', None),
+        Action('employee.assigned_task_detail', 15, 'GET', '/api/employee/assigned-tasks/{task}/', None),
+        Action('employee.timer_toggle', 25, 'POST', '/api/employee/timer/toggle/', _timer_toggle_body),
+        Action('employee.daily_summary', 15, 'GET', '/api/employee/timer/daily-summary/', None),
+    ],
+    'Project Manager': [
+        Action('pm.company_dashboard', 30, 'GET', '/api/project-manager/company-dashboard/', None),
+        Action('pm.all_projects', 25, 'GET', '/api/project-manager/all-projects/', None),
+        Action('pm.gantt_chart', 20, 'GET', '/api/project-manager/projects/{project}/gantt-chart/', None),
+        Action('pm.project_tasks', 15, 'GET', '/api/project-manager/projects/{project}/tasks/', None),
+        Action('pm.project_pdf', 10, 'GET', '/api/project-manager/projects/{project}/download-documents/', None),
+    ],
+    'Estimator': [
+        Action('estimator.dashboard', 35, 'GET', '/api/estimator/dashboard/', None),
+        Action('estimator.estimates', 30, 'GET', '/api/estimator/estimates/', None),
+        Action('estimator.estimate_create', 15, 'POST', '/api/estimator/estimates/', _estimate_body),
+        Action('estimator.estimate_pdf', 20, 'GET', '/api/estimator/estimates/{estimate}/download_pdf/', None),
+    ],
+    'Admin': [
+        Action('admin.dashboard_overview', 40, 'GET', '/api/admin/dashboard-overview/', None),
+        Action('admin.projects', 25, 'GET', '/api/admin/projects/', None),
+        Action('admin.project_detail', 15, 'GET', '/api/admin/projects/{project}/', None),
+        Action('admin.comprehensive_list', 20, 'GET', '/api/admin/comprehensive-list/', None),
+    ],
+}
+
+# Share of virtual users per role
+MIXES = {
+    # A normal working day: mostly employees polling tasks and running timers
+    'default': {'Employee': 60, 'Project Manager': 15, 'Estimator': 15, 'Admin': 10},
+    # Start of a shift on site
+    'field': {'Employee': 90, 'Project Manager': 10},
+    # Office-only traffic: dashboards, estimates and PDFs
+    'office': {'Project Manager': 35, 'Estimator': 35, 'Admin': 30},
+}
+
+
+class LoadTestError(Exception):
+    """Raised when a load test cannot be started"""
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def assign_roles(mix, users):
+    """Split ``users`` virtual users across roles by weight (largest remainder)"""
+    total = sum(mix.values())
+    shares = {role: users * weight / total for role, weight in mix.items()}
+    counts = {role: int(share) for role, share in shares.items()}
+    leftover = users - sum(counts.values())
+    for role in sorted(shares, key=lambda role: shares[role] - counts[role], reverse=True)[:leftover]:
+        counts[role] += 1
+    return [role for role in mix for _ in range(counts[role])]
+
+
+class LoadStats:
+    """Thread-safe per-endpoint latency and status collector"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, name, method, path, status, seconds):
+        with self._lock:
+            endpoint = self._endpoints.setdefault(name, {
+                'method': method, 'path': path, 'latencies': [], 'statuses': Counter(),
+            })
+            endpoint['latencies'].append(seconds * 1000)
+            endpoint['statuses'][status] += 1
+
+    @staticmethod
+    def summarize(latencies, statuses, elapsed):
+        """Counts, throughput and latency percentiles (ms) of one endpoint or the whole run"""
+        latencies = sorted(latencies)
+        requests = len(latencies)
+        # Connection failures are recorded as status 0
+        errors = sum(count for status, count in statuses.items() if status == 0 or status >= 400)
+        return {
+            'requests': requests,
+            'errors': errors,
+            'statuses': {str(status): count for status, count in sorted(statuses.items())},
+            'rps': round(requests / elapsed, 2) if elapsed else 0,
+            'mean_ms': round(sum(latencies) / requests, 2) if requests else None,
+            'p50_ms': round(percentile(latencies, 50), 2) if requests else None,
+            'p95_ms': round(percentile(latencies, 95), 2) if requests else None,
+            'p99_ms': round(percentile(latencies, 99), 2) if requests else None,
+            'max_ms': round(latencies[-1], 2) if requests else None,
+        }
+
+    def report(self, elapsed):
+        with self._lock:
+            endpoints = {
+                name: {'method': data['method'], 'path': data['path'],
+                       **self.summarize(data['latencies'], data['statuses'], elapsed)}
+                for name, data in sorted(self._endpoints.items())
+            }
+            all_latencies = [ms for data in self._endpoints.values() for ms in data['latencies']]
+            all_statuses = sum((data['statuses'] for data in self._endpoints.values()), Counter())
+        return {'totals': self.summarize(all_latencies, all_statuses, elapsed), 'endpoints': endpoints}
+
+
+class VirtualUser(threading.Thread):
+    """One logged-in client replaying the actions of its role until ``deadline``"""
+
+    def __init__(self, base_url, role, email, password, stats, deadline, think_time, rng, timeout=30):
+        super().__init__(daemon=True)
+        self.base = urlsplit(base_url)
+        self.role = role
+        self.email = email
+        self.password = password
+        self.stats = stats
+        self.deadline = deadline
+        self.think_time = think_time
+        self.rng = rng
+        self.timeout = timeout
+        self.connection = None
+        self.token = None
+        self.failure = None
+        # Filled in by discover(); task entries are (task_id, project_id)
+        self.tasks = []
+        self.projects = []
+        self.estimates = []
+        self.estimate_items = []
+        self.running_task = None
+
+    def _connect(self):
+        connection_class = (
+            http.client.HTTPSConnection if self.base.scheme == 'https' else http.client.HTTPConnection
+        )
+        return connection_class(self.base.hostname, self.base.port, timeout=self.timeout)
+
+    def request(self, method, path, body=None, name=None, template=None):
+        """
+        Send one request; record it under ``name`` (and the path ``template``)
+        when given. Returns (status, parsed JSON or None).
+        """
+        headers = {'Accept': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        url = (self.base.path.rstrip('/') + path) if self.base.path else path
+
+        start = time.perf_counter()
+        try:
+            if self.connection is None:
+                self.connection = self._connect()
+            self.connection.request(method, url, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            # Drop the broken keep-alive connection; the next request reconnects
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            status, content = 0, b''
+        elapsed = time.perf_counter() - start
+
+        if name:
+            self.stats.record(name, method, template or path, status, elapsed)
+        data = None
+        if content and response.getheader('Content-Type', '').startswith('application/json'):
+            try:
+                data = json.loads(content)
+            except ValueError:
+                pass
+        return status, data
+
+    def login(self):
+        status, data = self.request(
+            'POST', LOGIN_PATH, {'email': self.email, 'password': self.password}, name='auth.login'
+        )
+        if status != 200 or not data:
+            self.failure = f'login as {self.email} failed with status {status}'
+            return False
+        self.token = data['data']['access']
+        return True
+
+    def discover(self):
+        """Collect ids of rows this user can see, for the actions that need them"""
+        if self.role == 'Employee':
+            status, data = self.request('GET', '/api/employee/assigned-tasks/?page_size=50')
+            if status == 200:
+                self.tasks = [(task['id'], task['project']) for task in data['data']['tasks']]
+            status, data = self.request('GET', '/api/employee/timer/daily-summary/')
+            if status == 200:
+                # Pick up a timer left running by an earlier session
+                self.running_task = next((
+                    (session['task_id'], session['project_id'])
+                    for session in data['data']['sessions'] if session['is_active']
+                ), None)
+        elif self.role == 'Project Manager':
+            status, data = self.request('GET', '/api/project-manager/all-projects/')
+            if status == 200:
+                self.projects = [project['id'] for project in data['data']['projects']]
+        elif self.role == 'Estimator':
+            status, data = self.request('GET', '/api/estimator/estimates/?page_size=50')
+            if status == 200:
+                self.estimates = [estimate['id'] for estimate in data['data']['results']['results']]
+            if self.estimates:
+                status, data = self.request('GET', f'/api/estimator/estimates/{self.estimates[0]}/')
+                if status == 200:
+                    # New estimates reuse the catalogue items of an existing one
+                    self.estimate_items = [
+                        {key: item[key] for key in ('item_type', 'item_id', 'quantity', 'unit_price')}
+                        for item in data['data']['items']
+                    ]
+        elif self.role == 'Admin':
+            status, data = self.request('GET', '/api/admin/projects/')
+            if status == 200:
+                self.projects = [project['id'] for project in data['data']['results']]
+
+    def available_actions(self):
+        """Actions of this role whose placeholders can be filled"""
+        needs = {'{task}': self.tasks, '{project}': self.projects, '{estimate}': self.estimates}
+        actions = [
+            action for action in ROLE_ACTIONS[self.role]
+            if all(values for placeholder, values in needs.items() if placeholder in action.path)
+        ]
+        if not self.tasks:
+            actions = [action for action in actions if action.name != 'employee.timer_toggle']
+        return actions
+
+    def perform(self, action):
+        path = action.path.format(
+            task=self.rng.choice(self.tasks)[0] if '{task}' in action.path else None,
+            project=self.rng.choice(self.projects) if '{project}' in action.path else None,
+            estimate=self.rng.choice(self.estimates) if '{estimate}' in action.path else None,
+        )
+        body = action.body(self) if action.body else None
+        status, data = self.request(action.method, path, body, name=action.name, template=action.path)
+        if action.name == 'employee.timer_toggle' and status == 200:
+            started = data['data']['action'] == 'started'
+            self.running_task = (body['task_id'], body['project_id']) if started else None
+
+    def run(self):
+        try:
+            if not self.login():
+                return
+            self.discover()
+            actions = self.available_actions()
+            if not actions:
+                self.failure = f'{self.email} has no data for any {self.role} action'
+                return
+            weights = [action.weight for action in actions]
+            while time.monotonic() < self.deadline:
+                self.perform(self.rng.choices(actions, weights)[0])
+                if self.think_time:
+                    time.sleep(min(self.rng.uniform(0, 2 * self.think_time),
+                                   max(0, self.deadline - time.monotonic())))
+            if self.running_task is not None:
+                # Leave no timer running behind
+                self.perform(next(action for action in actions if action.name == 'employee.timer_toggle'))
+        finally:
+            if self.connection is not None:
+                self.connection.close()
+
+
+def run_load_test(base_url, credentials, mix='default', users=10, duration=60, think_time=1.0,
+                  seed=0, timeout=30):
+    """
+    Run a traffic mix against ``base_url`` and return the report dict.
+
+    ``credentials`` maps a role to a list of (email, password) pairs; virtual
+    users of a role take turns using them. Roles of the mix without
+    credentials are left out.
+    """
+    if mix not in MIXES:
+        raise LoadTestError(f'Unknown mix {mix!r}; choose from {", ".join(MIXES)}')
+    weights = {role: weight for role, weight in MIXES[mix].items() if credentials.get(role)}
+    if not weights:
+        raise LoadTestError(f'No credentials for any role of the {mix!r} mix')
+    if users < len(weights):
+        raise LoadTestError(f'The {mix!r} mix needs at least {len(weights)} virtual users')
+
+    rng = random.Random(seed)
+    stats = LoadStats()
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    deadline = start + duration
+
+    virtual_users = []
+    per_role = Counter()
+    for role in assign_roles(weights, users):
+        email, password = credentials[role][per_role[role] % len(credentials[role])]
+        per_role[role] += 1
+        virtual_users.append(VirtualUser(
+            base_url, role, email, password, stats, deadline, think_time,
+            random.Random(rng.random()), timeout=timeout,
+        ))
+    for user in virtual_users:
+        user.start()
+    for user in virtual_users:
+        user.join()
+    elapsed = time.monotonic() - start
+
+    return {
+        'started_at': started_at.isoformat(),
+        'base_url': base_url,
+        'mix': mix,
+        'users': users,
+        'roles': dict(per_role),
+        'duration_seconds': round(elapsed, 2),
+        'think_time': think_time,
+        'seed': seed,
+        'failures': [user.failure for user in virtual_users if user.failure],
+        **stats.report(elapsed),
+    }
+
+
+def compare_reports(baseline, current):
+    """Per-endpoint rps and p95 of two reports, with the relative change of each"""
+    def change(before, after):
+        if not before or after is None:
+            return None
+        return round((after - before) / before * 100, 1)
+
+    rows = []
+    for name in sorted(set(baseline['endpoints']) | set(current['endpoints'])):
+        before = baseline['endpoints'].get(name, {})
+        after = current['endpoints'].get(name, {})
+        rows.append({
+            'endpoint': name,
+            'rps': (before.get('rps'), after.get('rps')),
+            'rps_change_pct': change(before.get('rps'), after.get('rps')),
+            'p95_ms': (before.get('p95_ms'), after.get('p95_ms')),
+            'p95_change_pct': change(before.get('p95_ms'), after.get('p95_ms')),
+        })
+    return rows
@@ -0,0 +1,90 @@
+"""
+Logging handlers that keep disk I/O off the request thread.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, WatchedFileHandler
+
+
+class QueueFileHandler(QueueHandler):
+    """
+    File handler that writes from a background thread.
+
+    Records are formatted on the calling thread (so the configured formatter
+    still applies) and pushed onto an in-memory queue; a QueueListener thread
+    drains the queue into the file. The listener is (re)started lazily per
+    process, so it keeps working in pre-forked server workers; a lock makes
+    sure concurrent first records start only one listener.
+
+    Without ``maxBytes`` the file is written through a WatchedFileHandler:
+    every gunicorn worker appends to the same file and reopens it when it has
+    been moved away, so rotate it externally (logrotate without
+    ``copytruncate``). With ``maxBytes`` a RotatingFileHandler rotates it
+    in-process, which is only safe when a single process writes the file:
+    several workers would each rotate it and clobber each other's backups.
+
+    Usable directly from settings.LOGGING:
+        'file': {
+            'class': 'eagleeyeau.logging_handlers.QueueFileHandler',
+            'filename': 'django_requests.log',
+        }
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding='utf-8', queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.filename = filename
+        self.max_bytes = maxBytes
+        self.backup_count = backupCount
+        self.encoding = encoding
+        self.queue_size = queue_size
+        self._listener = None
+        self._pid = None
+        self._listener_lock = threading.Lock()
+        atexit.register(self._stop_listener)
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._listener_lock:
+            if self._pid == os.getpid():
+                return
+            self._start_listener()
+
+    def _start_listener(self):
+        # New process (first use or after fork): the inherited thread is gone
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        if self.max_bytes:
+            file_handler = RotatingFileHandler(
+                self.filename,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding=self.encoding,
+                delay=True,
+            )
+        else:
+            file_handler = WatchedFileHandler(self.filename, encoding=self.encoding, delay=True)
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+        self._listener = QueueListener(self.queue, file_handler, respect_handler_level=False)
+        self._listener.start()
+        self._pid = os.getpid()
+
+    def _stop_listener(self):
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block a request on logging; drop the record instead
+            pass
+
+    def close(self):
+        self._stop_listener()
+        super().close()
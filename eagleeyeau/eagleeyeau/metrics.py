@@ -0,0 +1,194 @@
+"""
+In-process per-endpoint request metrics.
+
+MetricsMiddleware records, for every request, the wall time, number of SQL
+queries, total SQL time and response size under the resolved URL name. The
+collector keeps a rolling window of the most recent samples per endpoint and
+summarises them (percentiles plus a latency histogram) on demand. Data is per
+worker process and resets on restart; it is meant for spotting slow or
+N+1-heavy endpoints, not as a long-term store.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+DEFAULT_REQUEST_METRICS = {
+    'ENABLED': True,
+    # Number of most recent samples kept per endpoint
+    'WINDOW_SIZE': 1000,
+    # Path prefixes that are not measured
+    'EXCLUDE_PATHS': ['/static/', '/media/', '/swagger', '/redoc', '/favicon.ico'],
+}
+
+
+def get_request_metrics_settings():
+    """Merge settings.REQUEST_METRICS over the defaults"""
+    return {**DEFAULT_REQUEST_METRICS, **getattr(settings, 'REQUEST_METRICS', {})}
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summarise(values):
+    ordered = sorted(values)
+    count = len(ordered)
+    return {
+        'mean': round(sum(ordered) / count, 2) if count else 0,
+        'p50': round(_percentile(ordered, 50), 2),
+        'p95': round(_percentile(ordered, 95), 2),
+        'p99': round(_percentile(ordered, 99), 2),
+        'max': round(ordered[-1], 2) if count else 0,
+    }
+
+
+class EndpointStats:
+    """Rolling window of samples for a single endpoint"""
+
+    def __init__(self, window_size):
+        self.samples = deque(maxlen=window_size)
+        self.total_requests = 0
+        self.status_counts = {}
+
+    def add(self, sample, status_code):
+        self.samples.append(sample)
+        self.total_requests += 1
+        status_class = f'{status_code // 100}xx'
+        self.status_counts[status_class] = self.status_counts.get(status_class, 0) + 1
+
+    def snapshot(self):
+        samples = list(self.samples)
+        durations = [s[0] for s in samples]
+
+        histogram = {}
+        for bound in LATENCY_BUCKETS_MS:
+            histogram[f'<={bound}ms'] = 0
+        histogram[f'>{LATENCY_BUCKETS_MS[-1]}ms'] = 0
+        for duration in durations:
+            for bound in LATENCY_BUCKETS_MS:
+                if duration <= bound:
+                    histogram[f'<={bound}ms'] += 1
+                    break
+            else:
+                histogram[f'>{LATENCY_BUCKETS_MS[-1]}ms'] += 1
+
+        return {
+            'total_requests': self.total_requests,
+            'window_samples': len(samples),
+            'status_counts': dict(self.status_counts),
+            'latency_ms': _summarise(durations),
+            'latency_histogram': histogram,
+            'query_count': _summarise([s[1] for s in samples]),
+            'sql_time_ms': _summarise([s[2] for s in samples]),
+            'response_bytes': _summarise([s[3] for s in samples]),
+        }
+
+
+class MetricsCollector:
+    """Thread-safe registry of EndpointStats keyed by endpoint name"""
+
+    def __init__(self, window_size=1000):
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.started_at = time.time()
+
+    def record(self, endpoint, duration_ms, query_count, sql_time_ms, response_bytes, status_code):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats(self.window_size)
+            stats.add((duration_ms, query_count, sql_time_ms, response_bytes), status_code)
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {name: stats.snapshot() for name, stats in self._endpoints.items()}
+        return {
+            'collecting_since': self.started_at,
+            'window_size': self.window_size,
+            'endpoints': endpoints,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self.started_at = time.time()
+
+
+collector = MetricsCollector(get_request_metrics_settings()['WINDOW_SIZE'])
+
+
+class QueryCounter:
+    """connection.execute_wrapper callable that counts queries and SQL time"""
+
+    def __init__(self):
+        self.count = 0
+        self.time_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time_ms += (time.perf_counter() - start) * 1000
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL query count/time and response size per URL name.
+
+    Place near the top of MIDDLEWARE so the measurement covers the whole stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_request_metrics_settings()
+        self.enabled = config['ENABLED']
+        self.exclude_paths = tuple(config['EXCLUDE_PATHS'])
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.exclude_paths):
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if getattr(response, 'streaming', False):
+            response_bytes = 0
+        else:
+            response_bytes = len(response.content)
+
+        collector.record(
+            self.endpoint_name(request),
+            duration_ms,
+            counter.count,
+            counter.time_ms,
+            response_bytes,
+            response.status_code,
+        )
+        return response
+
+    @staticmethod
+    def endpoint_name(request):
+        """Resolved URL name (with namespace) plus method, or the route pattern"""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return f'{request.method} <unresolved>'
+        name = match.view_name or match.route
+        return f'{request.method} {name}'
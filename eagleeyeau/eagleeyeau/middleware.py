@@ -1,121 +1,127 @@
 import json
 import logging
+import random
+import time
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 
-logger = logging.getLogger(__name__)
+logger = logging.getLogger('eagleeyeau.requests')
+
+
+DEFAULT_REQUEST_LOGGING = {
+    # Path prefixes that are never logged
+    'EXCLUDE_PATHS': ['/static/', '/media/', '/swagger', '/redoc', '/favicon.ico'],
+    # Path prefixes whose request bodies are never captured (credentials, OTPs)
+    'BODY_EXCLUDE_PATHS': ['/api/auth/'],
+    # Fraction of requests (0.0 - 1.0) whose bodies are attached to the record
+    'BODY_SAMPLE_RATE': 0.0,
+    # Maximum number of body bytes attached when a request is sampled
+    'MAX_BODY_BYTES': 2048,
+    # Also attach (truncated) JSON response bodies for sampled requests
+    'LOG_RESPONSE_BODY': False,
+}
+
+
+def get_request_logging_settings():
+    """Merge settings.REQUEST_LOGGING over the defaults"""
+    return {**DEFAULT_REQUEST_LOGGING, **getattr(settings, 'REQUEST_LOGGING', {})}
+
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     """
-    Middleware to log all HTTP requests and responses with detailed information.
+    Middleware that writes one structured (single-line JSON) record per request.
+
+    Bodies are never parsed or pretty-printed: they are only attached, as raw
+    text truncated to MAX_BODY_BYTES, for the sampled fraction of requests.
+    Records go to the 'eagleeyeau.requests' logger, which settings route
+    through a queue-backed file handler so the request thread never waits on disk.
     """
-    
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        config = get_request_logging_settings()
+        self.exclude_paths = tuple(config['EXCLUDE_PATHS'])
+        self.body_exclude_paths = tuple(config['BODY_EXCLUDE_PATHS'])
+        self.body_sample_rate = float(config['BODY_SAMPLE_RATE'])
+        self.max_body_bytes = int(config['MAX_BODY_BYTES'])
+        self.log_response_body = bool(config['LOG_RESPONSE_BODY'])
+
     def process_request(self, request):
-        """Log incoming request details"""
-        # Get request data
-        method = request.method
-        path = request.path
-        user = request.user if request.user.is_authenticated else "Anonymous"
-        ip = self.get_client_ip(request)
-        
-        # Get query parameters
-        query_params = dict(request.GET)
-        
-        # Log the request
-        log_message = (
-            f"\n{'='*80}\n"
-            f"📨 INCOMING REQUEST\n"
-            f"{'='*80}\n"
-            f"Time: {self._get_timestamp()}\n"
-            f"Method: {method}\n"
-            f"Path: {path}\n"
-            f"User: {user}\n"
-            f"IP Address: {ip}\n"
+        """Record start time and, for sampled requests, capture the body"""
+        if request.path.startswith(self.exclude_paths):
+            request._log_skip = True
+            return None
+
+        request._start_time = time.monotonic()
+        request._log_sampled = (
+            self.body_sample_rate > 0
+            and not request.path.startswith(self.body_exclude_paths)
+            and random.random() < self.body_sample_rate
         )
-        
-        if query_params:
-            log_message += f"Query Params: {query_params}\n"
-        
-        if request.body and method in ['POST', 'PUT', 'PATCH']:
-            try:
-                body = json.loads(request.body)
-                log_message += f"Body: {json.dumps(body, indent=2)}\n"
-            except:
-                log_message += f"Body: {request.body[:500]}\n"  # First 500 chars
-        
-        log_message += f"{'='*80}"
-        logger.info(log_message)
-        
-        # Store request start time for response logging
-        request._start_time = __import__('time').time()
-        
+
+        if request._log_sampled and request.method in ['POST', 'PUT', 'PATCH']:
+            content_type = request.META.get('CONTENT_TYPE', '')
+            if 'json' in content_type:
+                request._log_body = self._truncate(request.body)
+
         return None
 
     def process_response(self, request, response):
-        """Log outgoing response details"""
-        # Calculate response time
-        if hasattr(request, '_start_time'):
-            response_time = __import__('time').time() - request._start_time
-        else:
-            response_time = 0
-        
-        # Get response data
-        method = request.method
-        path = request.path
-        status_code = response.status_code
-        
-        # Handle both regular and streaming responses
-        if hasattr(response, 'streaming_content'):
-            content_length = 0  # Streaming response, don't try to get content length
+        """Emit a single structured record for the request"""
+        if getattr(request, '_log_skip', False) or not logger.isEnabledFor(logging.INFO):
+            return response
+
+        start_time = getattr(request, '_start_time', None)
+        duration_ms = (time.monotonic() - start_time) * 1000 if start_time is not None else 0
+
+        # Streaming responses have no materialised content to measure
+        if getattr(response, 'streaming', False):
+            content_length = None
         else:
-            try:
-                content_length = len(response.content)
-            except (AttributeError, TypeError):
-                content_length = 0
-        
-        user = request.user if request.user.is_authenticated else "Anonymous"
-        
-        # Determine status color/indicator
-        if status_code < 300:
-            status_indicator = "✅"
-        elif status_code < 400:
-            status_indicator = "ℹ️"
-        elif status_code < 500:
-            status_indicator = "⚠️"
+            content_length = len(response.content)
+
+        user = getattr(request, 'user', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 2),
+            'size': content_length,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'ip': self.get_client_ip(request),
+        }
+
+        if request.META.get('QUERY_STRING'):
+            record['query'] = request.META['QUERY_STRING'][:self.max_body_bytes]
+
+        if hasattr(request, '_log_body'):
+            record['body'] = request._log_body
+
+        if (
+            getattr(request, '_log_sampled', False)
+            and self.log_response_body
+            and content_length
+            and 'application/json' in response.get('Content-Type', '')
+        ):
+            record['response_body'] = self._truncate(response.content)
+
+        if response.status_code >= 500:
+            level = logging.ERROR
+        elif response.status_code >= 400:
+            level = logging.WARNING
         else:
-            status_indicator = "❌"
-        
-        # Log the response
-        log_message = (
-            f"\n{'='*80}\n"
-            f"📤 OUTGOING RESPONSE\n"
-            f"{'='*80}\n"
-            f"Status: {status_indicator} {status_code}\n"
-            f"Method: {method}\n"
-            f"Path: {path}\n"
-            f"User: {user}\n"
-            f"Response Size: {content_length} bytes\n"
-            f"Response Time: {response_time:.3f}s\n"
-        )
-        
-        # Log response headers
-        log_message += f"\nHeaders:\n"
-        for key, value in dict(response.items()).items():
-            if key not in ['Set-Cookie']:  # Don't log sensitive headers
-                log_message += f"  {key}: {value}\n"
-        
-        # Try to log response body if JSON
-        if 'application/json' in response.get('Content-Type', ''):
-            try:
-                body = json.loads(response.content)
-                log_message += f"\nResponse Body:\n{json.dumps(body, indent=2)}\n"
-            except:
-                log_message += f"\nResponse Body (raw): {response.content[:500]}\n"
-        
-        log_message += f"{'='*80}"
-        logger.info(log_message)
-        
+            level = logging.INFO
+
+        logger.log(level, json.dumps(record, separators=(',', ':'), default=str))
         return response
-    
+
+    def _truncate(self, raw):
+        """Decode at most max_body_bytes of a body without parsing it"""
+        text = raw[:self.max_body_bytes].decode('utf-8', errors='replace')
+        if len(raw) > self.max_body_bytes:
+            text += f'...<{len(raw) - self.max_body_bytes} more bytes>'
+        return text
+
     @staticmethod
     def get_client_ip(request):
         """Extract client IP address from request"""
@@ -125,9 +131,3 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
-    
-    @staticmethod
-    def _get_timestamp():
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().strftime('%d/%b/%Y %H:%M:%S')
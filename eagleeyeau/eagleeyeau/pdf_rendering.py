@@ -0,0 +1,209 @@
+"""
+Background PDF rendering with an on-disk cache.
+
+PDF builds run in a small per-process thread pool instead of on the request
+thread. Each rendered file is cached on disk under a name derived from the
+object and a fingerprint of the data it shows (e.g. ``updated_at`` values and
+row counts), so repeat downloads are served straight from disk and any change
+to the underlying data produces a new file.
+
+Views call ``get_pdf()``: it returns immediately when the file is cached,
+otherwise it queues a render (once per file, however many clients ask) and
+optionally waits a bounded time for it. Callers that get ``pending`` back
+answer 202 and let the client poll the same URL.
+
+The cache directory must not be publicly served (it is outside MEDIA_ROOT by
+default); files are only handed out by the authenticated download views.
+"""
+import contextvars
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait as wait_for
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of any generated PDF changes to invalidate cached files
+RENDER_VERSION = 1
+
+DEFAULT_PDF_RENDER = {
+    'CACHE_DIR': None,  # defaults to BASE_DIR / 'pdf_cache'
+    'MAX_WORKERS': 2,
+    # How long a download request waits for a fresh render before answering 202
+    'SYNC_WAIT_SECONDS': 10,
+    # How long a failed render is reported before it is retried
+    'FAILURE_TTL_SECONDS': 60,
+}
+
+_lock = threading.RLock()
+_executor = None
+_executor_pid = None
+_jobs = {}
+_failures = {}
+
+
+def get_pdf_render_settings():
+    """Merge settings.PDF_RENDER over the defaults"""
+    config = {**DEFAULT_PDF_RENDER, **getattr(settings, 'PDF_RENDER', {})}
+    if not config['CACHE_DIR']:
+        config['CACHE_DIR'] = Path(settings.BASE_DIR) / 'pdf_cache'
+    return config
+
+
+class PdfResult:
+    """Outcome of ``get_pdf``: status is 'ready', 'pending' or 'failed'"""
+
+    def __init__(self, status, path=None, error=None):
+        self.status = status
+        self.path = path
+        self.error = error
+
+    @property
+    def is_ready(self):
+        return self.status == 'ready'
+
+
+def make_fingerprint(*parts):
+    """Short stable hash of the values a PDF depends on"""
+    raw = '|'.join(str(part) for part in (RENDER_VERSION,) + parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def cache_path(kind, object_id, fingerprint):
+    cache_dir = Path(get_pdf_render_settings()['CACHE_DIR'])
+    return cache_dir / f'{kind}_{object_id}_{fingerprint}.pdf'
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    # Threads do not survive a fork, so pre-forked workers build their own pool
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(
+            max_workers=get_pdf_render_settings()['MAX_WORKERS'],
+            thread_name_prefix='pdf-render',
+        )
+        _executor_pid = os.getpid()
+        _jobs.clear()
+    return _executor
+
+
+def _render(kind, object_id, path, build):
+    """Worker: build the PDF, write it atomically and drop stale versions"""
+    try:
+        content = build(object_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+        for stale in path.parent.glob(f'{kind}_{object_id}_*.pdf'):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        return path
+    finally:
+        # Worker threads get their own DB connections; don't leak them
+        connections.close_all()
+
+
+def _on_done(key, future):
+    with _lock:
+        _jobs.pop(key, None)
+        error = future.exception()
+        if error is not None:
+            logger.error('PDF render %s failed: %s', key, error)
+            _failures[key] = (time.monotonic(), str(error))
+
+
+def get_pdf(kind, object_id, fingerprint, build, wait=0):
+    """
+    Return a PdfResult for the PDF identified by (kind, object_id, fingerprint).
+
+    ``build(object_id)`` must load what it needs itself and return the PDF
+    bytes; it runs on a pool thread. ``wait`` is the number of seconds to
+    block for a render that is not cached yet (0 = don't wait).
+    """
+    path = cache_path(kind, object_id, fingerprint)
+    if path.exists():
+        return PdfResult('ready', path=path)
+
+    key = path.name
+    config = get_pdf_render_settings()
+    with _lock:
+        failure = _failures.get(key)
+        if failure is not None:
+            failed_at, error = failure
+            if time.monotonic() - failed_at < config['FAILURE_TTL_SECONDS']:
+                return PdfResult('failed', error=error)
+            del _failures[key]
+
+        future = _jobs.get(key)
+        if future is None:
+            # Run in a copy of the caller's context so its read-replica routing applies
+            context = contextvars.copy_context()
+            future = _get_executor().submit(context.run, _render, kind, object_id, path, build)
+            _jobs[key] = future
+            future.add_done_callback(lambda done, key=key: _on_done(key, done))
+
+    if wait:
+        wait_for([future], timeout=wait)
+
+    if future.done():
+        error = future.exception()
+        if error is not None:
+            return PdfResult('failed', error=str(error))
+        return PdfResult('ready', path=path)
+    return PdfResult('pending')
+
+
+def pdf_download_response(request, kind, object_id, fingerprint, build, filename):
+    """
+    Shared response logic for the PDF download actions.
+
+    Serves the cached file when ready. Otherwise waits up to SYNC_WAIT_SECONDS
+    (or not at all with ``?async=true``) and answers 202 with a poll URL.
+    """
+    from django.http import FileResponse
+    from rest_framework import status
+    from rest_framework.response import Response
+    from eagleeyeau.response_formatter import format_response
+
+    run_async = request.query_params.get('async', '').strip().lower() in ['1', 'true', 'yes']
+    wait = 0 if run_async else get_pdf_render_settings()['SYNC_WAIT_SECONDS']
+    result = get_pdf(kind, object_id, fingerprint, build, wait=wait)
+
+    if result.is_ready:
+        return FileResponse(
+            open(result.path, 'rb'),
+            content_type='application/pdf',
+            as_attachment=True,
+            filename=filename
+        )
+
+    if result.status == 'failed':
+        return Response(
+            format_response(
+                success=False,
+                message=f"Error generating PDF: {result.error}",
+                data=None
+            ),
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    return Response(
+        format_response(
+            success=True,
+            message="PDF is being generated. Poll download_url until it returns the file.",
+            data={
+                'status': result.status,
+                'download_url': request.build_absolute_uri(request.path),
+            }
+        ),
+        status=status.HTTP_202_ACCEPTED
+    )
@@ -0,0 +1,145 @@
+"""
+Text search for the catalogue, estimate and employee list endpoints.
+
+Every backend matches the same rows: a case-insensitive substring match on
+any of the searched columns (``icontains`` OR chain). On PostgreSQL
+``icontains`` compiles to ``UPPER(col::text) LIKE UPPER('%q%')``, which the
+``pg_trgm`` GIN indexes created by ``AddTrigramIndex`` migrations serve, so
+the OR chain becomes a bitmap OR of index scans instead of a sequential scan.
+PostgreSQL also gets a ``search_rank`` annotation (full-text rank plus
+trigram word similarity) that ``order_by_relevance`` sorts on. Other
+backends (SQLite in tests) skip the ranking and keep the given ordering.
+"""
+from django.contrib.postgres.operations import TrigramExtension as BaseTrigramExtension
+from django.db import connections
+from django.db.migrations.operations.base import Operation
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+RANK_ANNOTATION = 'search_rank'
+
+# No stemming or stop words: names, suppliers and estimate numbers are not prose
+SEARCH_CONFIG = 'simple'
+
+
+def is_postgresql(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def search_q(query, fields):
+    """``Q`` matching rows where any of ``fields`` contains ``query`` (case-insensitive)"""
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def _rank_expression(query, fields):
+    from django.contrib.postgres.search import (
+        SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity,
+    )
+
+    full_text = SearchRank(
+        SearchVector(*fields, config=SEARCH_CONFIG),
+        SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch'),
+    )
+    # Trigram similarity ranks partial words ("plyw" -> "Plywood") that full text misses
+    similarities = [TrigramWordSimilarity(query, field) for field in fields]
+    trigram = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    return Coalesce(full_text, Value(0.0)) + Coalesce(trigram, Value(0.0))
+
+
+def apply_search(queryset, query, fields, extra=None):
+    """
+    Filter ``queryset`` to rows matching ``query`` on any of ``fields``.
+
+    ``extra`` is OR'd into the match (e.g. an exact numeric or date match).
+    On PostgreSQL the rows are annotated with ``search_rank``.
+    """
+    query = (query or '').strip()
+    if not query:
+        return queryset
+
+    condition = search_q(query, fields)
+    if extra is not None:
+        condition |= extra
+    queryset = queryset.filter(condition)
+
+    if is_postgresql(queryset):
+        queryset = queryset.annotate(**{RANK_ANNOTATION: _rank_expression(query, fields)})
+    return queryset
+
+
+def order_by_relevance(queryset, *ordering):
+    """Order by ``search_rank`` when ``apply_search`` ranked the rows, then by ``ordering``"""
+    if RANK_ANNOTATION in queryset.query.annotations:
+        return queryset.order_by(f'-{RANK_ANNOTATION}', *ordering)
+    return queryset.order_by(*ordering)
+
+
+# ====================== MIGRATION OPERATION ======================
+
+class AddTrigramIndex(Operation):
+    """
+    Create a ``pg_trgm`` GIN index on ``UPPER(column::text)`` for ``icontains`` searches.
+
+    Runs on PostgreSQL only (requires the ``pg_trgm`` extension, see
+    ``TrigramExtension`` below) and is a no-op elsewhere. The index is not part of the model state, so it is invisible
+    to ``makemigrations``.
+    """
+    reversible = True
+
+    def __init__(self, model_name, field, name):
+        self.model_name = model_name
+        self.field = field
+        self.name = name
+
+    def deconstruct(self):
+        return (
+            self.__class__.__qualname__,
+            [],
+            {'model_name': self.model_name, 'field': self.field, 'name': self.name},
+        )
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if (schema_editor.connection.vendor != 'postgresql'
+                or not self.allow_migrate_model(schema_editor.connection.alias, model)):
+            return
+        quote = schema_editor.quote_name
+        column = model._meta.get_field(self.field).column
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {quote(self.name)} ON {quote(model._meta.db_table)} '
+            f'USING gin ((UPPER({quote(column)}::text)) gin_trgm_ops)'
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if (schema_editor.connection.vendor != 'postgresql'
+                or not self.allow_migrate_model(schema_editor.connection.alias, model)):
+            return
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(self.name)}')
+
+    def describe(self):
+        return f'Create trigram index {self.name} on {self.model_name}.{self.field}'
+
+    @property
+    def migration_name_fragment(self):
+        return self.name.lower()
+
+
+class TrigramExtension(BaseTrigramExtension):
+    """
+    ``CREATE EXTENSION pg_trgm`` that is left in place when unapplied.
+
+    Several apps' migrations install it, so dropping it when one of them is
+    rolled back would break the others' indexes; Django's operation also
+    queries ``pg_extension`` on reverse even outside PostgreSQL.
+    """
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
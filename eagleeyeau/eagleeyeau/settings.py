@@ -10,27 +10,56 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+# Environment-driven settings: production values unless overridden.
+# For local development export DEBUG=True (see .env.example).
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure--#)6=&0z@h#u$tq4^w0v89)8=_v74u*py9um)(#tvr&6#mgk%_'
+def env_bool(name, default=False):
+    return os.environ.get(name, str(default)).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# Running under ``manage.py test``
+TESTING = sys.argv[1:2] == ['test']
+
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG also keeps every SQL statement in connection.queries, so worker memory grows per request.
+DEBUG = env_bool('DEBUG', False)
+
+# SECURITY WARNING: keep the secret key used in production secret!
+# It signs JWTs and password-reset tokens, so production must set its own;
+# the published development key is only accepted with DEBUG or under tests.
+SECRET_KEY = os.environ.get('SECRET_KEY')
+if not SECRET_KEY:
+    if not (DEBUG or TESTING):
+        raise ImproperlyConfigured('The SECRET_KEY environment variable must be set when DEBUG is off')
+    SECRET_KEY = 'django-insecure--#)6=&0z@h#u$tq4^w0v89)8=_v74u*py9um)(#tvr&6#mgk%_'
 
-ALLOWED_HOSTS = ['10.10.13.27', 'localhost', '127.0.0.1', '*']
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS', ['10.10.13.27', 'localhost', '127.0.0.1'])
 
 # Production HTTPS Settings
 if not DEBUG:
-    SECURE_SSL_REDIRECT = True
+    # TLS terminates at nginx, which sets X-Forwarded-Proto
+    SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+    SECURE_SSL_REDIRECT = env_bool('SECURE_SSL_REDIRECT', True)
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
     SECURE_HSTS_SECONDS = 31536000
@@ -69,6 +98,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'eagleeyeau.metrics.MetricsMiddleware',
+    'eagleeyeau.db_routing.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -102,8 +133,8 @@ WSGI_APPLICATION = 'eagleeyeau.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-
-import os
+# Connections are kept open between requests (CONN_MAX_AGE seconds) and
+# checked before reuse, so a dropped connection fails over to a new one.
 
 DATABASES = {
     'default': {
@@ -113,9 +144,97 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres123'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas: DB_REPLICAS is a comma-separated list of host[:port]. They use
+# the primary's credentials unless DB_REPLICA_NAME / DB_REPLICA_USER /
+# DB_REPLICA_PASSWORD are set (e.g. a second local database for testing).
+for index, replica in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    replica_host, _, replica_port = replica.strip().partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.environ.get('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# The router tests (admindashboard/tests.py) read through this alias, which
+# mirrors the test database. It is not in READ_REPLICAS['ALIASES'], so other
+# tests keep reading from the primary.
+if TESTING:
+    DATABASES['test_replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['eagleeyeau.db_routing.PrimaryReplicaRouter']
+
+# Replica-safe GET endpoints and read-your-writes stickiness (see eagleeyeau/db_routing.py)
+READ_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias.startswith('replica_')],
+    'STICKY_SECONDS': int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10)),
+    'CACHE_ALIAS': 'default',
+    'PATHS': [
+        r'^/api/admin/(dashboard-overview|comprehensive-list|projects)/',
+        r'^/api/admin/(materials|components|estimate-defaults|estimates)/',
+        r'^/api/project-manager/(company-dashboard|all-projects|employee-timesheets|time-entries/export|estimates)/',
+        r'^/api/project-manager/projects/\d+/(gantt-chart|download-documents|download_documents)/',
+        r'^/api/estimator/dashboard/',
+        r'^/api/estimator/estimates/\d+/download_pdf/',
+        r'^/api/employee/(timer/daily-summary|timesheet/entries)/',
+        r'^/api/timesheet/(my-entries|weekly-hours|admin/all-entries)/',
+    ],
+}
+
+
+
+# Caches
+# gunicorn runs several worker processes, and dashboard invalidation, the
+# recompute lock and the read-your-writes pins (READ_REPLICAS) only work when
+# every worker sees the same cache. In production point both aliases at Redis
+# (see docker-compose.yml):
+#   CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   CACHE_LOCATION=redis://redis:6379/0
+#   DASHBOARD_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   DASHBOARD_CACHE_LOCATION=redis://redis:6379/1
+# Without them both fall back to file-based caches under CACHE_DIR, which
+# are shared by the workers of one host. Test runs use local memory: the
+# test database is recreated every run, so a persistent cache would serve
+# payloads left over from the previous one.
+CACHE_DIR = Path(os.environ.get('CACHE_DIR', BASE_DIR / 'django_cache'))
+FILE_CACHE_BACKEND = 'django.core.cache.backends.filebased.FileBasedCache'
+LOCMEM_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', LOCMEM_CACHE_BACKEND if TESTING else FILE_CACHE_BACKEND),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(CACHE_DIR / 'default')),
+    },
+    'dashboards': {
+        'BACKEND': os.environ.get(
+            'DASHBOARD_CACHE_BACKEND', LOCMEM_CACHE_BACKEND if TESTING else FILE_CACHE_BACKEND
+        ),
+        'LOCATION': os.environ.get('DASHBOARD_CACHE_LOCATION', str(CACHE_DIR / 'dashboards')),
+        'TIMEOUT': 300,
+    },
+}
+
+# Per-company dashboard payload cache (see eagleeyeau/dashboard_cache.py)
+DASHBOARD_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'dashboards',
+    'TIMEOUT': 300,
+    'LOCK_TIMEOUT': 30,
+    'WAIT_SECONDS': 10,
+}
+
+# ETag / Last-Modified validators on polled list and detail endpoints (see eagleeyeau/conditional.py)
+CONDITIONAL_GET = {
+    'ENABLED': True,
+}
 
 
 # Password validation
@@ -232,13 +351,28 @@ CSRF_TRUSTED_ORIGINS = [
     "https://lignaflow.com",
     "https://app.lignaflow.com",
 ]
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# e.g. django.core.mail.backends.filebased.EmailBackend with EMAIL_FILE_PATH for local runs
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER='nahid2887@gmail.com'
 EMAIL_HOST_PASSWORD='bggg jnwn lwyj jbrv'
 DEFAULT_FROM_EMAIL='nahid2887@gmail.com'
+EMAIL_TIMEOUT = 30
+
+# OTP / invitation emails are queued in OutboxEmail and sent by the
+# send_outbox_email worker (see authentication/outbox.py).
+EMAIL_OUTBOX = {
+    'ENABLED': env_bool('EMAIL_OUTBOX_ENABLED', True),
+    # Emails per SMTP connection; a full bulk invitation fits in one batch
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 6,
+    'BACKOFF_SECONDS': 30,
+    'BACKOFF_MAX_SECONDS': 3600,
+    'POLL_SECONDS': 1,
+}
 
 # Swagger Settings
 SWAGGER_SETTINGS = {
@@ -268,6 +402,11 @@ LOGGING = {
             'format': '{levelname} | {message}',
             'style': '{',
         },
+        'message': {
+            # The record is already a complete line (one JSON object per request)
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'console': {
@@ -275,12 +414,21 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        # Queue-backed file handlers: writes happen on a background thread. Every
+        # gunicorn worker appends to the same files, so they are not rotated
+        # in-process; rotate them with logrotate (see QueueFileHandler)
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': 'django_requests.log',
+            'class': 'eagleeyeau.logging_handlers.QueueFileHandler',
+            'filename': 'django.log',
             'formatter': 'verbose',
         },
+        'requests_file': {
+            'level': 'INFO',
+            'class': 'eagleeyeau.logging_handlers.QueueFileHandler',
+            'filename': 'django_requests.log',
+            'formatter': 'message',
+        },
     },
     'loggers': {
         'django': {
@@ -298,6 +446,45 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'eagleeyeau.requests': {
+            # One JSON record per line, file only (no console echo)
+            'handlers': ['requests_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
+# Request logging middleware (eagleeyeau.middleware.RequestLoggingMiddleware)
+REQUEST_LOGGING = {
+    'EXCLUDE_PATHS': ['/static/', '/media/', '/swagger', '/redoc', '/favicon.ico'],
+    'BODY_EXCLUDE_PATHS': ['/api/auth/'],
+    'BODY_SAMPLE_RATE': 0.0,
+    'MAX_BODY_BYTES': 2048,
+    'LOG_RESPONSE_BODY': False,
+}
+
+# Per-endpoint latency / SQL query metrics (see eagleeyeau/metrics.py),
+# readable by Admin users at /api/superadmin/metrics/
+REQUEST_METRICS = {
+    'ENABLED': True,
+    'WINDOW_SIZE': 1000,
+    'EXCLUDE_PATHS': ['/static/', '/media/', '/swagger', '/redoc', '/favicon.ico'],
+}
+
+
+# Admin dashboard month-bucketed analytics (see admindashboard/analytics.py).
+# Closed months are served from MonthlyMetricSnapshot rows when enabled.
+ANALYTICS = {
+    'USE_SNAPSHOTS': True,
+}
+
+
+# Background PDF rendering for estimate / project downloads (see eagleeyeau/pdf_rendering.py).
+# CACHE_DIR (PDF_CACHE_DIR) must not be publicly served, so keep it outside MEDIA_ROOT.
+PDF_RENDER = {
+    'CACHE_DIR': Path(os.environ.get('PDF_CACHE_DIR', BASE_DIR / 'pdf_cache')),
+    'MAX_WORKERS': 2,
+    'SYNC_WAIT_SECONDS': 10,
+    'FAILURE_TTL_SECONDS': 60,
+}
@@ -0,0 +1,121 @@
+"""
+Sparse fieldsets (``?fields=``) and expandable relations (``?expand=``).
+
+Serializers using ``SparseFieldsMixin`` build only the fields a GET request
+asks for. Unrequested fields are removed in ``get_fields()``, so their
+``SerializerMethodField`` methods and nested serializers (and the queries
+behind them) never run.
+
+- No parameters: the full legacy payload, unchanged.
+- ``?fields=id,project_name,tasks.task_name`` returns only those fields.
+  Dotted paths select fields of nested serializers.
+- ``?expand=estimate_info,tasks.assigned_employee`` returns every regular
+  field plus the named ``Meta.expandable_fields``. Those heavy relations are
+  left out by default once either parameter is used.
+
+Both parameters combine: ``fields`` gives the plain columns and ``expand``
+adds relations. Unknown names are ignored. Write requests are never affected.
+"""
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_field_paths(value):
+    """``'id,tasks.id,tasks.task_name'`` -> ``{'id': {}, 'tasks': {'id': {}, 'task_name': {}}}``"""
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for part in path.split('.'):
+            part = part.strip()
+            if not part:
+                break
+            node = node.setdefault(part, {})
+    return tree
+
+
+class FieldSelection:
+    """The fields to build at one level of a (possibly nested) serializer"""
+
+    def __init__(self, fields=None, expand=None):
+        # None: no restriction beyond leaving out unexpanded expandable fields
+        self.fields = fields
+        self.expand = expand or {}
+
+    @classmethod
+    def from_request(cls, request):
+        """Selection for a request, or None when it asks for the full payload"""
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        fields = request.query_params.get(FIELDS_PARAM, '').strip()
+        expand = request.query_params.get(EXPAND_PARAM, '').strip()
+        if not fields and not expand:
+            return None
+        return cls(parse_field_paths(fields) if fields else None, parse_field_paths(expand))
+
+    def includes(self, name, expandable=False):
+        if name in self.expand:
+            return True
+        if self.fields is not None:
+            return name in self.fields
+        return not expandable
+
+    def child(self, name):
+        """Selection for the nested serializer behind field ``name``"""
+        return FieldSelection((self.fields or {}).get(name) or None, self.expand.get(name))
+
+
+class SparseFieldsMixin:
+    """
+    Honour ``?fields=`` / ``?expand=`` on a serializer (see module docstring).
+
+    ``Meta.expandable_fields`` names the fields to leave out unless expanded.
+    Values a serializer computes in ``to_representation`` itself should be
+    guarded with ``self.wants(name)``.
+    """
+
+    @classmethod
+    def expandable_fields(cls):
+        meta = getattr(cls, 'Meta', None)
+        return set(getattr(meta, 'expandable_fields', ()))
+
+    @classmethod
+    def requests_field(cls, request, name):
+        """Whether a response for ``request`` will include ``name`` (e.g. to skip a prefetch)"""
+        selection = FieldSelection.from_request(request)
+        return selection is None or selection.includes(name, name in cls.expandable_fields())
+
+    @property
+    def field_selection(self):
+        if not hasattr(self, '_field_selection'):
+            # Only the outermost serializer reads the query string; nested ones
+            # get their part of the selection from their parent's get_fields()
+            parent = self.parent.parent if isinstance(self.parent, ListSerializer) else self.parent
+            self._field_selection = (
+                FieldSelection.from_request(self.context.get('request')) if parent is None else None
+            )
+        return self._field_selection
+
+    def wants(self, name):
+        selection = self.field_selection
+        return selection is None or selection.includes(name, name in self.expandable_fields())
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.field_selection
+        if selection is None:
+            return fields
+
+        expandable = self.expandable_fields()
+        for name in list(fields):
+            if not selection.includes(name, name in expandable):
+                del fields[name]
+                continue
+            field = fields[name]
+            nested = field.child if isinstance(field, ListSerializer) else field
+            if isinstance(nested, SparseFieldsMixin):
+                nested._field_selection = selection.child(name)
+        return fields
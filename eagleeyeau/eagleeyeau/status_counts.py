@@ -0,0 +1,71 @@
+"""
+Shared status histogram helpers for dashboard endpoints.
+
+Every dashboard needs per-status (and for tasks per-priority) counts. Instead of
+issuing one ``.filter(status=...).count()`` per choice, these helpers build a
+single conditional aggregate so the whole histogram costs one query.
+"""
+from django.db.models import Count, Q
+
+
+def count_choices(queryset, fields=('status',), extra=None):
+    """
+    Count rows of ``queryset`` per choice value of each field in ``fields``.
+
+    ``extra`` maps additional result names to ``Q`` objects that are counted in
+    the same query (e.g. "completed this week").
+
+    Returns ``{'total': n, '<field>': {choice: count, ...}, '<extra>': n}``
+    with every declared choice present, even when its count is zero.
+    """
+    model = queryset.model
+    aggregates = {'total': Count('pk')}
+    keys = {}
+
+    for field in fields:
+        choices = model._meta.get_field(field).choices or []
+        for value, _label in choices:
+            alias = f'_{field}_{value}'
+            keys[alias] = (field, value)
+            aggregates[alias] = Count('pk', filter=Q(**{field: value}))
+
+    for name, condition in (extra or {}).items():
+        aggregates[name] = Count('pk', filter=condition)
+
+    row = queryset.order_by().aggregate(**aggregates)
+
+    result = {'total': row.pop('total') or 0}
+    for field in fields:
+        result[field] = {}
+    for alias, (field, value) in keys.items():
+        result[field][value] = row.pop(alias) or 0
+    for name, value in row.items():
+        result[name] = value or 0
+    return result
+
+
+def project_status_counts(queryset=None, extra=None):
+    """Per-status project counts in one query."""
+    from Project_manager.models import Project
+
+    if queryset is None:
+        queryset = Project.objects.all()
+    return count_choices(queryset, fields=('status',), extra=extra)
+
+
+def task_status_counts(queryset=None, extra=None):
+    """Per-status and per-priority task counts in one query."""
+    from Project_manager.models import Task
+
+    if queryset is None:
+        queryset = Task.objects.all()
+    return count_choices(queryset, fields=('status', 'priority'), extra=extra)
+
+
+def estimate_status_counts(queryset=None, extra=None):
+    """Per-status estimate counts in one query."""
+    from estimator.models import Estimate
+
+    if queryset is None:
+        queryset = Estimate.objects.all()
+    return count_choices(queryset, fields=('status',), extra=extra)
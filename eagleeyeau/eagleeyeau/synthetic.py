@@ -0,0 +1,379 @@
+"""
+Synthetic tenant generator for load and query-budget testing.
+
+``generate_tenants`` creates whole companies: users in every role, a
+material / component / estimate-default catalogue, estimates whose JSON
+items reference that catalogue, projects with tasks built from the approved
+estimates, and a working history of TaskTimer sessions and TimeEntry rows
+for every employee. Rows are written with ``bulk_create`` in batches, so a
+large tenant costs a few dozen queries rather than one per row.
+
+``bulk_create`` skips ``save()`` and signals, so values the models normally
+derive on save are filled in here directly: user companies, estimate
+totals, project statuses from their tasks, TimeEntry working time. The
+daily TaskTimer rollups of the generated date range are rebuilt at the end.
+
+Data is deterministic for a given ``seed``. Company, email and estimate
+numbers carry ``prefix`` and a running company index, so repeated runs add
+new tenants instead of colliding with earlier ones.
+"""
+import random
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+
+# Rows per company; any value can be overridden per call
+SCALES = {
+    'small': {
+        'admins': 1, 'project_managers': 1, 'estimators': 1, 'employees': 3,
+        'materials': 5, 'components': 3, 'estimate_defaults': 3,
+        'estimates': 6, 'projects': 3, 'tasks_per_project': 4, 'days': 5,
+    },
+    'medium': {
+        'admins': 1, 'project_managers': 3, 'estimators': 3, 'employees': 25,
+        'materials': 60, 'components': 30, 'estimate_defaults': 20,
+        'estimates': 80, 'projects': 40, 'tasks_per_project': 10, 'days': 20,
+    },
+    'large': {
+        'admins': 2, 'project_managers': 8, 'estimators': 6, 'employees': 120,
+        'materials': 300, 'components': 150, 'estimate_defaults': 80,
+        'estimates': 600, 'projects': 300, 'tasks_per_project': 15, 'days': 60,
+    },
+}
+
+DEFAULT_PASSWORD = 'Synthetic123!'
+
+GeneratedTenants = namedtuple('GeneratedTenants', ['companies', 'counts'])
+
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Smith', 'Nguyen', 'Brown', 'Wilson', 'Taylor', 'Walker', 'Harris', 'Martin', 'Clarke', 'Young']
+CLIENTS = ['Harbour Homes', 'Greenfield Builders', 'Coastal Living', 'Summit Developments', 'Parkside Group']
+ROOMS = ['Kitchen', 'Bathroom', 'Laundry', 'Living Room', 'Bedroom', 'Ensuite', 'Garage']
+CATEGORIES = ['Timber', 'Hardware', 'Finishes', 'Panels', 'Fixtures']
+SUPPLIERS = ['Bunnings Trade', 'Mitre 10', 'Hafele', 'Blum', 'Laminex']
+UNITS = ['piece', 'm', 'm2', 'sheet', 'kg']
+
+
+def _person(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def generate_tenants(companies=1, scale='small', seed=0, prefix='synthetic', password=DEFAULT_PASSWORD,
+                     batch_size=1000, **overrides):
+    """
+    Create ``companies`` synthetic tenants of ``scale`` (a SCALES key), with
+    any per-company count overridden by keyword (e.g. ``employees=500``).
+
+    Returns ``GeneratedTenants(companies, counts)`` where ``counts`` maps
+    model names to the number of rows created.
+    """
+    from authentication.models import Company, User
+    from admindashboard.models import (
+        Component, ComponentEstimateQuantity, ComponentMaterialQuantity, EstimateDefaults, Material,
+    )
+    from emopye.models import TaskTimer
+    from emopye.rollups import rebuild_daily_rollups
+    from estimator.models import Estimate
+    from Project_manager.models import Project, Task
+    from Project_manager.project_status import derive_project_status
+    from timesheet.models import TimeEntry
+
+    if scale not in SCALES:
+        raise ValueError(f'Unknown scale "{scale}". Use one of: {", ".join(SCALES)}')
+    unknown = set(overrides) - set(SCALES[scale])
+    if unknown:
+        raise ValueError(f'Unknown tenant sizes: {", ".join(sorted(unknown))}')
+    size = {**SCALES[scale], **overrides}
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    today = timezone.localdate()
+    password_hash = make_password(password)
+    counts = {}
+
+    def created(model, rows):
+        counts[model.__name__] = counts.get(model.__name__, 0) + len(rows)
+        return rows
+
+    with transaction.atomic():
+        first_index = Company.objects.filter(name__startswith=f'{prefix} ').count() + 1
+        tenants = created(Company, Company.objects.bulk_create([
+            Company(name=f'{prefix} {index:04d}')
+            for index in range(first_index, first_index + companies)
+        ], batch_size=batch_size))
+
+        # ---------------- Users ----------------
+        users = []
+        for company in tenants:
+            slug = company.name.replace(' ', '-').lower()
+            for role, key in [('Admin', 'admins'), ('Project Manager', 'project_managers'),
+                              ('Estimator', 'estimators'), ('Employee', 'employees')]:
+                for number in range(1, size[key] + 1):
+                    first_name, last_name = _person(rng)
+                    email = f'{role.replace(" ", "").lower()}{number}@{slug}.example.com'
+                    users.append(User(
+                        email=email,
+                        username=email,
+                        password=password_hash,
+                        first_name=first_name,
+                        last_name=last_name,
+                        company_name=company.name,
+                        company=company,
+                        role=role,
+                        is_email_verified=True,
+                        date_joined=now - timedelta(days=rng.randint(0, 720)),
+                    ))
+        users = created(User, User.objects.bulk_create(users, batch_size=batch_size))
+
+        by_role = {}
+        for user in users:
+            by_role.setdefault((user.company_id, user.role), []).append(user)
+
+        def members(company, role):
+            return by_role.get((company.pk, role), [])
+
+        def pick(rows):
+            return rng.choice(rows) if rows else None
+
+        # ---------------- Catalogue ----------------
+        materials = []
+        estimate_defaults = []
+        components = []
+        for company in tenants:
+            admin = pick(members(company, 'Admin'))
+            for number in range(1, size['materials'] + 1):
+                materials.append(Material(
+                    material_name=f'Material {number}',
+                    supplier=rng.choice(SUPPLIERS),
+                    category=rng.choice(CATEGORIES),
+                    unit=rng.choice(UNITS),
+                    cost_per_unit=Decimal(rng.randint(100, 50000)) / 100,
+                    created_by=admin,
+                    company=company,
+                ))
+            for number in range(1, size['estimate_defaults'] + 1):
+                estimate_defaults.append(EstimateDefaults(
+                    name=f'Default {number}',
+                    category=rng.choice(CATEGORIES),
+                    description='Generated estimate default',
+                    created_by=admin,
+                    company=company,
+                ))
+            for number in range(1, size['components'] + 1):
+                components.append(Component(
+                    component_name=f'Component {number}',
+                    base_price=Decimal(rng.randint(1000, 200000)) / 100,
+                    description='Generated component',
+                    created_by=admin,
+                    company=company,
+                ))
+        materials = created(Material, Material.objects.bulk_create(materials, batch_size=batch_size))
+        estimate_defaults = created(EstimateDefaults, EstimateDefaults.objects.bulk_create(estimate_defaults, batch_size=batch_size))
+        components = created(Component, Component.objects.bulk_create(components, batch_size=batch_size))
+
+        catalogue = {}
+        for kind, rows in [('material', materials), ('estimate_default', estimate_defaults),
+                           ('component', components)]:
+            for row in rows:
+                catalogue.setdefault((row.company_id, kind), []).append(row)
+
+        material_quantities = []
+        estimate_quantities = []
+        for component in components:
+            company_materials = catalogue.get((component.company_id, 'material'), [])
+            for material in rng.sample(company_materials, min(3, len(company_materials))):
+                material_quantities.append(ComponentMaterialQuantity(
+                    component=component, material=material, quantity=Decimal(rng.randint(1, 20)),
+                ))
+            company_defaults = catalogue.get((component.company_id, 'estimate_default'), [])
+            for estimate_default in rng.sample(company_defaults, min(2, len(company_defaults))):
+                estimate_quantities.append(ComponentEstimateQuantity(
+                    component=component, estimate_default=estimate_default, quantity=Decimal(rng.randint(1, 5)),
+                ))
+        created(ComponentMaterialQuantity, ComponentMaterialQuantity.objects.bulk_create(material_quantities, batch_size=batch_size))
+        created(ComponentEstimateQuantity, ComponentEstimateQuantity.objects.bulk_create(estimate_quantities, batch_size=batch_size))
+
+        # ---------------- Estimates ----------------
+        estimates = []
+        for company in tenants:
+            estimators = members(company, 'Estimator')
+            company_projects = min(size['projects'], size['estimates'])
+            for number in range(1, size['estimates'] + 1):
+                items = []
+                for kind, price_field in [('material', 'cost_per_unit'), ('component', 'base_price'),
+                                          ('estimate_default', None)]:
+                    rows = catalogue.get((company.pk, kind), [])
+                    for row in rng.sample(rows, min(2, len(rows))):
+                        unit_price = getattr(row, price_field) if price_field else Decimal(rng.randint(500, 5000))
+                        items.append({
+                            'item_type': kind,
+                            'item_id': row.pk,
+                            'quantity': rng.randint(1, 12),
+                            'unit_price': float(unit_price),
+                            'notes': '',
+                        })
+                # The first estimates of each company become projects, so they are approved
+                status = 'approved' if number <= company_projects else rng.choice(['pending', 'sent', 'rejected'])
+                estimate = Estimate(
+                    serial_number=f'{company.name}-S{number:05d}',
+                    estimate_number=f'{company.name}-E{number:05d}',
+                    client_name=rng.choice(CLIENTS),
+                    project_name=f'Project {number}',
+                    status=status,
+                    end_date=today + timedelta(days=rng.randint(-60, 180)),
+                    targeted_rooms=rng.sample(ROOMS, 3),
+                    profit_margin=20,
+                    income_tax=2,
+                    created_by=pick(estimators),
+                    company=company,
+                    items=items,
+                )
+                estimate.calculate_totals()
+                estimates.append(estimate)
+        estimates = created(Estimate, Estimate.objects.bulk_create(estimates, batch_size=batch_size))
+
+        # ---------------- Projects and tasks ----------------
+        projects = []
+        project_tasks = []
+        for company in tenants:
+            managers = members(company, 'Project Manager')
+            employees = members(company, 'Employee')
+            approved = [
+                estimate for estimate in estimates
+                if estimate.company_id == company.pk and estimate.status == 'approved'
+            ]
+            for estimate in approved:
+                manager = pick(managers)
+                start_date = today - timedelta(days=rng.randint(0, 90))
+                project = Project(
+                    estimate=estimate,
+                    project_name=estimate.project_name,
+                    client_name=estimate.client_name,
+                    description='Generated project',
+                    status='not_started',
+                    start_date=start_date,
+                    end_date=start_date + timedelta(days=rng.randint(30, 180)),
+                    total_amount=estimate.total_with_tax,
+                    estimated_cost=estimate.total_cost,
+                    rooms=estimate.targeted_rooms,
+                    created_by=manager,
+                    assigned_to=manager,
+                    company=company,
+                )
+                # Mix of untouched, running and finished projects
+                stage = rng.choices(['new', 'active', 'done'], [1, 3, 1])[0]
+                tasks = []
+                for number in range(1, size['tasks_per_project'] + 1):
+                    if stage == 'active':
+                        task_status = rng.choices(['not_started', 'in_progress', 'completed', 'blocked'], [3, 3, 3, 1])[0]
+                    else:
+                        task_status = 'not_started' if stage == 'new' else 'completed'
+                    task_start = start_date + timedelta(days=rng.randint(0, 20))
+                    tasks.append(Task(
+                        task_name=f'Task {number}',
+                        description='Generated task',
+                        room=rng.choice(project.rooms) if project.rooms else None,
+                        status=task_status,
+                        priority=rng.choice(['low', 'medium', 'high']),
+                        phase=rng.choice(['planning', 'design', 'procurement', 'construction', 'handover']),
+                        start_date=task_start,
+                        due_date=task_start + timedelta(days=rng.randint(1, 30)),
+                        assigned_employee=pick(employees),
+                        created_by=manager,
+                    ))
+                task_counts = {
+                    'total': len(tasks),
+                    'in_progress': sum(task.status == 'in_progress' for task in tasks),
+                    'completed': sum(task.status == 'completed' for task in tasks),
+                    'not_started': sum(task.status == 'not_started' for task in tasks),
+                }
+                project.status = derive_project_status(project.status, task_counts)
+                if project.status == 'completed':
+                    # bulk_create skips Project.save(), which normally stamps this
+                    project.completed_at = now - timedelta(days=rng.randint(0, 365))
+                projects.append(project)
+                project_tasks.append(tasks)
+        projects = created(Project, Project.objects.bulk_create(projects, batch_size=batch_size))
+
+        tasks = []
+        for project, rows in zip(projects, project_tasks):
+            for task in rows:
+                task.project = project
+                tasks.append(task)
+        tasks = created(Task, Task.objects.bulk_create(tasks, batch_size=batch_size))
+
+        # ---------------- Working history ----------------
+        tasks_by_employee = {}
+        for task in tasks:
+            if task.assigned_employee_id is not None:
+                tasks_by_employee.setdefault(task.assigned_employee_id, []).append(task)
+
+        work_days = [today - timedelta(days=offset) for offset in range(1, size['days'] + 1)]
+        work_days = [day for day in work_days if day.weekday() < 5]
+
+        timers = []
+        time_entries = []
+        for company in tenants:
+            for employee in members(company, 'Employee'):
+                employee_tasks = tasks_by_employee.get(employee.pk, [])
+                for day in work_days:
+                    attendance = rng.choices(['Present', 'Half Day', 'Absent'], [17, 2, 1])[0]
+                    if attendance == 'Absent':
+                        time_entries.append(TimeEntry(user=employee, date=day, attendance=attendance))
+                        continue
+
+                    entry_time = time(8, rng.randint(0, 59))
+                    hours = 8 if attendance == 'Present' else 4
+                    exit_time = time(entry_time.hour + hours, entry_time.minute)
+                    time_entries.append(TimeEntry(
+                        user=employee,
+                        date=day,
+                        entry_time=entry_time,
+                        exit_time=exit_time,
+                        total_working_time=timedelta(hours=hours),
+                        attendance=attendance,
+                    ))
+
+                    # Back-to-back timer sessions filling the working day
+                    session_start = timezone.make_aware(datetime.combine(day, entry_time))
+                    day_end = session_start + timedelta(hours=hours)
+                    for task in rng.sample(employee_tasks, min(3, len(employee_tasks))):
+                        if session_start >= day_end:
+                            break
+                        session_end = min(session_start + timedelta(minutes=rng.randint(30, 180)), day_end)
+                        timers.append(TaskTimer(
+                            employee=employee,
+                            task=task,
+                            work_date=day,
+                            start_time=session_start,
+                            end_time=session_end,
+                            duration_seconds=int((session_end - session_start).total_seconds()),
+                            is_active=False,
+                        ))
+                        session_start = session_end
+
+                # One running timer today for employees who have work assigned
+                if employee_tasks:
+                    timers.append(TaskTimer(
+                        employee=employee,
+                        task=rng.choice(employee_tasks),
+                        work_date=today,
+                        start_time=now - timedelta(minutes=rng.randint(5, 120)),
+                        is_active=True,
+                    ))
+        created(TimeEntry, TimeEntry.objects.bulk_create(time_entries, batch_size=batch_size))
+        created(TaskTimer, TaskTimer.objects.bulk_create(timers, batch_size=batch_size))
+
+        if timers:
+            counts['TaskTimerDailyRollup'] = rebuild_daily_rollups(
+                start_date=min(timer.work_date for timer in timers),
+                end_date=today,
+                batch_size=batch_size,
+            )
+
+    return GeneratedTenants(tenants, counts)
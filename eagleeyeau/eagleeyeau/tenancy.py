@@ -0,0 +1,59 @@
+"""
+Tenant (company) scoping helpers.
+
+Company-owned models carry an indexed ``company`` foreign key, so scoping a
+query to a tenant is a single ``company_id = %s`` predicate instead of a join
+through the creator's ``company_name`` string.
+"""
+from django.db import models
+
+
+def company_id_of(company):
+    """
+    Accept a Company, a user, a primary key (int or numeric string) or None
+    and return the company id. Anything else raises ValueError/TypeError
+    rather than silently scoping to the wrong tenant.
+    """
+    if company is None or isinstance(company, int):
+        return company
+    if isinstance(company, str):
+        # e.g. an id taken from a URL or query parameter
+        if not company.strip().isdigit():
+            raise ValueError(f'Invalid company id: {company!r}')
+        return int(company)
+    if hasattr(company, 'company_id'):
+        # A user (or any other tenant-owned row)
+        return company.company_id
+    if isinstance(company, models.Model):
+        return company.pk
+    raise TypeError(f'Cannot derive a company id from {type(company).__name__}')
+
+
+class TenantQuerySet(models.QuerySet):
+    """QuerySet for models with a ``company`` foreign key"""
+
+    def for_company(self, company):
+        """Rows belonging to ``company`` (Company, user or id); none if it is unset"""
+        company_id = company_id_of(company)
+        if company_id is None:
+            return self.none()
+        return self.filter(company_id=company_id)
+
+
+class TenantOwnedMixin:
+    """
+    Fill ``company`` from a related row when a company-owned row is saved.
+
+    ``tenant_source`` names the foreign key whose company is copied (the
+    creator by default). Lets existing create paths, which only set that
+    relation, keep working while every row still ends up scoped to a tenant.
+    """
+    tenant_source = 'created_by'
+
+    def save(self, *args, **kwargs):
+        if self.company_id is None and getattr(self, f'{self.tenant_source}_id') is not None:
+            self.company_id = getattr(self, self.tenant_source).company_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and self.company_id is not None:
+                kwargs['update_fields'] = set(update_fields) | {'company'}
+        super().save(*args, **kwargs)
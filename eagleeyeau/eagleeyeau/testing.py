@@ -0,0 +1,114 @@
+"""
+Query-budget test helpers.
+
+``QueryBudgetTestCase`` builds two synthetic tenants once per test class (see
+eagleeyeau/synthetic.py): a small one and a large one with roughly ten times
+the rows. ``assertQueryBudget`` requests an endpoint as the same role in each
+tenant and fails when:
+
+- the response is not a 200,
+- either request runs more than ``max_queries`` SQL queries,
+- the large tenant needs more queries than the small one (an N+1: query
+  counts must not grow with row counts),
+- either request is slower than its response-time ceiling.
+
+Each endpoint is requested once before it is measured, so the numbers are
+those of a warmed-up server. Dashboard caching is disabled, though: the
+budgets cover the queries behind a cache miss.
+
+``QUERY_BUDGET_SCALE=large`` makes the large tenant bigger, and
+``QUERY_BUDGET_TIME_FACTOR`` scales the time ceilings on slow machines.
+"""
+import os
+import time
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from authentication.models import User
+from eagleeyeau.synthetic import generate_tenants
+from estimator.models import Estimate
+from Project_manager.models import Project, Task
+
+
+LARGE_SCALE = os.environ.get('QUERY_BUDGET_SCALE', 'medium')
+
+TIME_FACTOR = float(os.environ.get('QUERY_BUDGET_TIME_FACTOR', 1))
+
+# Response-time ceilings (milliseconds) per tenant size
+TIME_CEILINGS_MS = {
+    'small': 1000,
+    'large': 3000,
+}
+
+
+# Dashboards are measured uncached; HTTPS redirects are a deployment concern
+@override_settings(DASHBOARD_CACHE={'ENABLED': False}, SECURE_SSL_REDIRECT=False)
+class QueryBudgetTestCase(APITestCase):
+    """Base class for per-endpoint query and response-time budgets"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenants = {
+            'small': generate_tenants(scale='small', prefix='budget small', seed=1).companies[0],
+            'large': generate_tenants(scale=LARGE_SCALE, prefix='budget large', seed=2).companies[0],
+        }
+
+    def tenant_user(self, size, role):
+        return User.objects.filter(company=self.tenants[size], role=role).order_by('pk').first()
+
+    def format_url(self, url, size, user):
+        """Fill ``{project}`` / ``{task}`` / ``{estimate}`` with rows of the tenant ``user`` can see"""
+        values = {}
+        if '{project}' in url:
+            projects = Project.objects.filter(company=self.tenants[size]).order_by('pk')
+            if user.role == 'Project Manager':
+                projects = projects.filter(assigned_to=user)
+            elif user.role == 'Employee':
+                projects = projects.filter(tasks__assigned_employee=user)
+            values['project'] = projects.values_list('pk', flat=True).first()
+        if '{task}' in url:
+            tasks = Task.objects.filter(project__company=self.tenants[size]).order_by('pk')
+            if user.role == 'Employee':
+                tasks = tasks.filter(assigned_employee=user)
+            values['task'] = tasks.values_list('pk', flat=True).first()
+        if '{estimate}' in url:
+            estimates = Estimate.objects.filter(company=self.tenants[size]).order_by('pk')
+            if user.role == 'Estimator':
+                estimates = estimates.filter(created_by=user)
+            values['estimate'] = estimates.values_list('pk', flat=True).first()
+        return url.format(**values)
+
+    def assertQueryBudget(self, role, url, max_queries, max_ms=None):
+        """GET ``url`` as ``role`` in the small and the large tenant (see module docstring)"""
+        counts = {}
+        for size in ('small', 'large'):
+            user = self.tenant_user(size, role)
+            path = self.format_url(url, size, user)
+            self.client.force_authenticate(user=user)
+            # Warm up first so one-off work (e.g. lazily stored monthly snapshots) is not measured
+            self.client.get(path)
+
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(path)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            label = f'GET {path} as {role} ({size} tenant)'
+            self.assertEqual(response.status_code, 200, f'{label}: status {response.status_code}')
+            sql = '\n'.join(query['sql'] for query in queries.captured_queries)
+            self.assertLessEqual(
+                len(queries), max_queries,
+                f'{label}: {len(queries)} queries, budget {max_queries}\n{sql}'
+            )
+            ceiling = (max_ms or TIME_CEILINGS_MS[size]) * TIME_FACTOR
+            self.assertLessEqual(elapsed_ms, ceiling, f'{label}: {elapsed_ms:.0f}ms, ceiling {ceiling:.0f}ms')
+            counts[size] = len(queries)
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(
+            counts['small'], counts['large'],
+            f'GET {url} as {role}: query count grows with tenant size ({counts["small"]} -> {counts["large"]})'
+        )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TaskTimer
+from .models import TaskTimer, TaskTimerDailyRollup
 
 
 @admin.register(TaskTimer)
@@ -29,3 +29,19 @@ class TaskTimerAdmin(admin.ModelAdmin):
         """Display formatted duration"""
         return obj.get_duration_formatted()
     duration_formatted.short_description = 'Duration'
+
+
+@admin.register(TaskTimerDailyRollup)
+class TaskTimerDailyRollupAdmin(admin.ModelAdmin):
+    """Read-only admin for the daily timer rollups (rebuild with rebuild_timer_rollups)"""
+    
+    list_display = ['employee', 'task', 'work_date', 'total_seconds', 'session_count', 'active_count', 'first_start', 'last_stop']
+    list_filter = ['work_date']
+    search_fields = ['employee__username', 'employee__email', 'task__task_name']
+    ordering = ['-work_date']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
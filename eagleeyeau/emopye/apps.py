@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class EmopyeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'emopye'
+
+    def ready(self):
+        # Keep TaskTimerDailyRollup in step with session saves and deletes
+        from .rollups import connect_signals
+        connect_signals()
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from emopye.rollups import rebuild_daily_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily TaskTimer rollups from the timer session rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employee', type=int, help='Only rebuild rollups of this employee id')
+        parser.add_argument('--start-date', help='Only rebuild work dates on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--end-date', help='Only rebuild work dates on or before this date (YYYY-MM-DD)')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rollups written per bulk_create (default: 1000)'
+        )
+
+    def _parse_date(self, value, option):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Invalid {option} "{value}". Use YYYY-MM-DD')
+
+    def handle(self, *args, **options):
+        start_date = self._parse_date(options['start_date'], '--start-date')
+        end_date = self._parse_date(options['end_date'], '--end-date')
+
+        self.stdout.write(self.style.WARNING('Rebuilding daily timer rollups...'))
+
+        written = rebuild_daily_rollups(
+            employee_id=options['employee'],
+            start_date=start_date,
+            end_date=end_date,
+            batch_size=options['batch_size'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} daily rollups'))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emopye', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tasktimer',
+            index=models.Index(fields=['employee', '-work_date', '-start_time', '-id'], name='emopye_task_employe_7e37a3_idx'),
+        ),
+    ]
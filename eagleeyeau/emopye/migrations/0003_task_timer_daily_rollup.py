@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_rollups(apps, schema_editor):
+    """Roll existing timer sessions up per employee, task and day"""
+    TaskTimer = apps.get_model('emopye', 'TaskTimer')
+    TaskTimerDailyRollup = apps.get_model('emopye', 'TaskTimerDailyRollup')
+
+    groups = (
+        TaskTimer.objects.order_by()
+        .values('employee_id', 'task_id', 'work_date')
+        .annotate(
+            total_seconds=models.Sum('duration_seconds', filter=models.Q(is_active=False)),
+            session_count=models.Count('pk'),
+            active_count=models.Count('pk', filter=models.Q(is_active=True)),
+            first_start=models.Min('start_time'),
+            last_stop=models.Max('end_time'),
+        )
+    )
+    TaskTimerDailyRollup.objects.bulk_create(
+        (
+            TaskTimerDailyRollup(**{**values, 'total_seconds': values['total_seconds'] or 0})
+            for values in groups.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Project_manager', '0004_company'),
+        ('emopye', '0002_task_timer_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTimerDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('work_date', models.DateField()),
+                ('total_seconds', models.IntegerField(default=0, help_text='Total duration of stopped sessions in seconds')),
+                ('session_count', models.IntegerField(default=0, help_text='Number of sessions, running ones included')),
+                ('active_count', models.IntegerField(default=0, help_text='Number of running sessions')),
+                ('first_start', models.DateTimeField(blank=True, null=True)),
+                ('last_stop', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timer_rollups', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timer_rollups', to='Project_manager.task')),
+            ],
+            options={
+                'verbose_name': 'Task Timer Daily Rollup',
+                'verbose_name_plural': 'Task Timer Daily Rollups',
+                'ordering': ['-work_date'],
+                'indexes': [models.Index(fields=['employee', 'work_date'], name='emopye_task_employe_81764f_idx'), models.Index(fields=['task', 'work_date'], name='emopye_task_task_id_852f7d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'task', 'work_date'), name='unique_timer_rollup_day')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:16
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def stop_extra_active_timers(apps, schema_editor):
+    """Keep only each employee's latest running timer so the unique index can be built"""
+    TaskTimer = apps.get_model('emopye', 'TaskTimer')
+    TaskTimerDailyRollup = apps.get_model('emopye', 'TaskTimerDailyRollup')
+
+    employee_ids = (
+        TaskTimer.objects.filter(is_active=True).order_by()
+        .values('employee_id').annotate(running=models.Count('pk'))
+        .filter(running__gt=1).values_list('employee_id', flat=True)
+    )
+    now = timezone.now()
+    keys = set()
+    for employee_id in list(employee_ids):
+        running = TaskTimer.objects.filter(employee_id=employee_id, is_active=True).order_by('-start_time', '-id')
+        for timer in running[1:]:
+            timer.end_time = now
+            timer.duration_seconds = max(int((now - timer.start_time).total_seconds()), 0)
+            timer.is_active = False
+            timer.save(update_fields=['end_time', 'duration_seconds', 'is_active', 'updated_at'])
+            keys.add((timer.employee_id, timer.task_id, timer.work_date))
+
+    # Historical models send no signals, so refresh the affected daily rollups here
+    for employee_id, task_id, work_date in keys:
+        key_filter = {'employee_id': employee_id, 'task_id': task_id, 'work_date': work_date}
+        values = TaskTimer.objects.filter(**key_filter).aggregate(
+            total_seconds=models.Sum('duration_seconds', filter=models.Q(is_active=False)),
+            session_count=models.Count('pk'),
+            active_count=models.Count('pk', filter=models.Q(is_active=True)),
+            first_start=models.Min('start_time'),
+            last_stop=models.Max('end_time'),
+        )
+        TaskTimerDailyRollup.objects.update_or_create(
+            **key_filter,
+            defaults={**values, 'total_seconds': values['total_seconds'] or 0},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emopye', '0003_task_timer_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(stop_extra_active_timers, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='tasktimer',
+            name='emopye_task_is_acti_db66c1_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='tasktimer',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('employee',), name='one_active_timer_per_employee'),
+        ),
+    ]
@@ -40,7 +40,17 @@ class TaskTimer(models.Model):
         indexes = [
             models.Index(fields=['employee', 'work_date']),
             models.Index(fields=['task', 'work_date']),
-            models.Index(fields=['is_active']),
+            # Keyset pagination order for timesheet listings
+            models.Index(fields=['employee', '-work_date', '-start_time', '-id']),
+        ]
+        constraints = [
+            # At most one running timer per employee. The partial unique index
+            # also serves the "employee's active timer" lookups.
+            models.UniqueConstraint(
+                fields=['employee'],
+                condition=models.Q(is_active=True),
+                name='one_active_timer_per_employee',
+            ),
         ]
         verbose_name = "Task Timer"
         verbose_name_plural = "Task Timers"
@@ -48,6 +58,18 @@ class TaskTimer(models.Model):
     def __str__(self):
         return f"{self.employee.username} - {self.task.task_name} on {self.work_date}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which daily rollup the row was counted in (see emopye.rollups);
+        # read __dict__ so deferred fields are not fetched
+        loaded = instance.__dict__
+        instance._loaded_rollup_key = (loaded.get('employee_id'), loaded.get('task_id'), loaded.get('work_date'))
+        return instance
+    
+    def rollup_key(self):
+        return (self.employee_id, self.task_id, self.work_date)
+    
     def stop_timer(self):
         """Stop the timer and calculate duration"""
         if self.is_active and self.start_time:
@@ -68,3 +90,50 @@ class TaskTimer(models.Model):
         minutes = (current_duration % 3600) // 60
         seconds = current_duration % 60
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class TaskTimerDailyRollup(models.Model):
+    """
+    Per (employee, task, work_date) totals of TaskTimer sessions.
+
+    Maintained by emopye.rollups whenever a session is saved or deleted, so
+    timesheet and summary endpoints read one row per task-day instead of
+    summing session rows. ``total_seconds`` covers stopped sessions only;
+    callers add the live time of a running timer themselves. Rebuild with
+    ``python manage.py rebuild_timer_rollups``.
+    """
+    
+    employee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='timer_rollups'
+    )
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='timer_rollups'
+    )
+    work_date = models.DateField()
+    
+    total_seconds = models.IntegerField(default=0, help_text="Total duration of stopped sessions in seconds")
+    session_count = models.IntegerField(default=0, help_text="Number of sessions, running ones included")
+    active_count = models.IntegerField(default=0, help_text="Number of running sessions")
+    first_start = models.DateTimeField(null=True, blank=True)
+    last_stop = models.DateTimeField(null=True, blank=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-work_date']
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'task', 'work_date'], name='unique_timer_rollup_day'),
+        ]
+        indexes = [
+            models.Index(fields=['employee', 'work_date']),
+            models.Index(fields=['task', 'work_date']),
+        ]
+        verbose_name = "Task Timer Daily Rollup"
+        verbose_name_plural = "Task Timer Daily Rollups"
+    
+    def __str__(self):
+        return f"{self.employee_id} - {self.task_id} on {self.work_date}: {self.total_seconds}s"
@@ -0,0 +1,196 @@
+"""
+Daily TaskTimer rollups.
+
+``TaskTimerDailyRollup`` keeps one row per (employee, task, work_date) with
+the totals of that day's sessions. Every save or delete of a TaskTimer
+(``stop_timer()``, timer edits) recomputes just the affected task-day from
+its handful of session rows and upserts it, so read paths never aggregate
+session rows. Deletes, including cascades from deleted tasks or users, are
+collected per transaction and refreshed in one batch on commit. A task-day
+with no sessions left loses its rollup row.
+
+``rebuild_daily_rollups`` recomputes everything (or one employee / date
+range) from scratch; it backs the ``rebuild_timer_rollups`` command.
+"""
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.signals import post_save, post_delete
+
+from .models import TaskTimer, TaskTimerDailyRollup
+
+
+ROLLUP_AGGREGATES = {
+    'total_seconds': Sum('duration_seconds', filter=Q(is_active=False)),
+    'session_count': Count('pk'),
+    'active_count': Count('pk', filter=Q(is_active=True)),
+    'first_start': Min('start_time'),
+    'last_stop': Max('end_time'),
+}
+
+ROLLUP_KEY_FIELDS = ['employee', 'task', 'work_date']
+
+
+def _rollup(employee_id, task_id, work_date, values):
+    return TaskTimerDailyRollup(
+        employee_id=employee_id,
+        task_id=task_id,
+        work_date=work_date,
+        total_seconds=values['total_seconds'] or 0,
+        session_count=values['session_count'],
+        active_count=values['active_count'],
+        first_start=values['first_start'],
+        last_stop=values['last_stop'],
+    )
+
+
+def _keys_filter(keys):
+    key_filter = Q()
+    for employee_id, task_id, work_date in keys:
+        key_filter |= Q(employee_id=employee_id, task_id=task_id, work_date=work_date)
+    return key_filter
+
+
+def refresh_daily_rollups(keys, using='default', batch_size=500):
+    """
+    Recompute the rollups for an iterable of (employee_id, task_id, work_date) keys.
+
+    Each batch of keys costs one grouped aggregate, one delete of the rollups
+    left without sessions and one upsert, however many keys it holds.
+    """
+    keys = [key for key in set(keys) if None not in key]
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        key_filter = _keys_filter(batch)
+        groups = (
+            TaskTimer.objects.using(using)
+            .filter(key_filter)
+            .order_by()
+            .values('employee_id', 'task_id', 'work_date')
+            .annotate(**ROLLUP_AGGREGATES)
+        )
+        rollups = [
+            _rollup(values['employee_id'], values['task_id'], values['work_date'], values)
+            for values in groups
+        ]
+
+        emptied = set(batch) - {(rollup.employee_id, rollup.task_id, rollup.work_date) for rollup in rollups}
+        if emptied:
+            TaskTimerDailyRollup.objects.using(using).filter(_keys_filter(emptied)).delete()
+        if rollups:
+            TaskTimerDailyRollup.objects.using(using).bulk_create(
+                rollups,
+                update_conflicts=True,
+                unique_fields=ROLLUP_KEY_FIELDS,
+                update_fields=[*ROLLUP_AGGREGATES, 'updated_at'],
+            )
+
+
+def task_day_seconds(employee, task, work_date):
+    """Stopped-session seconds an employee logged on a task on one day"""
+    return TaskTimerDailyRollup.objects.filter(
+        employee=employee,
+        task=task,
+        work_date=work_date
+    ).values_list('total_seconds', flat=True).first() or 0
+
+
+def rebuild_daily_rollups(employee_id=None, start_date=None, end_date=None, batch_size=1000, using='default'):
+    """
+    Recompute rollups from the session rows, optionally limited to one
+    employee and/or a work_date range. Returns the number of rollup rows written.
+    """
+    scope = Q()
+    if employee_id is not None:
+        scope &= Q(employee_id=employee_id)
+    if start_date is not None:
+        scope &= Q(work_date__gte=start_date)
+    if end_date is not None:
+        scope &= Q(work_date__lte=end_date)
+
+    groups = (
+        TaskTimer.objects.using(using)
+        .filter(scope)
+        .order_by()
+        .values('employee_id', 'task_id', 'work_date')
+        .annotate(**ROLLUP_AGGREGATES)
+    )
+
+    written = 0
+    with transaction.atomic(using=using):
+        TaskTimerDailyRollup.objects.using(using).filter(scope).delete()
+        batch = []
+        for values in groups.iterator(chunk_size=batch_size):
+            batch.append(_rollup(values['employee_id'], values['task_id'], values['work_date'], values))
+            if len(batch) >= batch_size:
+                TaskTimerDailyRollup.objects.using(using).bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            TaskTimerDailyRollup.objects.using(using).bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+# ====================== SIGNAL-BASED MAINTENANCE ======================
+
+class _PendingRollups:
+    """on_commit callback refreshing every task-day whose sessions were deleted"""
+
+    def __init__(self, using):
+        self.using = using
+        self.keys = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        with transaction.atomic(using=self.using):
+            refresh_daily_rollups(self.keys, using=self.using)
+
+
+def _pending_rollups(using):
+    # One callback per transaction: a rolled back transaction drops it from
+    # run_on_commit together with its keys, so nothing leaks into the next one
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        return None
+    for _, callback, _ in connection.run_on_commit:
+        if isinstance(callback, _PendingRollups) and not callback.done:
+            return callback
+    pending = _PendingRollups(using)
+    transaction.on_commit(pending, using=using)
+    return pending
+
+
+def _refresh_for_timer(sender, instance, using, **kwargs):
+    keys = {instance.rollup_key(), getattr(instance, '_loaded_rollup_key', instance.rollup_key())}
+    refresh_daily_rollups(keys, using=using)
+    # A moved session (other day/task) is counted in its new rollup from now on
+    instance._loaded_rollup_key = instance.rollup_key()
+
+
+def _queue_refresh_for_timer(sender, instance, using, **kwargs):
+    # Deleting a task or user cascades to all of its sessions; queue their
+    # task-days and refresh them in one batch when the delete commits
+    # instead of once per deleted session.
+    keys = {instance.rollup_key(), getattr(instance, '_loaded_rollup_key', instance.rollup_key())}
+    pending = _pending_rollups(using)
+    if pending is None:
+        refresh_daily_rollups(keys, using=using)
+    else:
+        pending.keys.update(keys)
+
+
+def connect_signals():
+    """Connect rollup maintenance receivers; called from EmopyeConfig.ready()"""
+    post_save.connect(
+        _refresh_for_timer,
+        sender=TaskTimer,
+        weak=False,
+        dispatch_uid='timer_rollups:True',
+    )
+    post_delete.connect(
+        _queue_refresh_for_timer,
+        sender=TaskTimer,
+        weak=False,
+        dispatch_uid='timer_rollups:False',
+    )
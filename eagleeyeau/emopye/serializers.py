@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from eagleeyeau.sparse_fields import SparseFieldsMixin
 from authentication.models import User
 from Project_manager.models import Task, Project
+from Project_manager.serializers import ProjectTaskCountsMixin
 
 
-class EmployeeProjectSerializer(serializers.ModelSerializer):
+class EmployeeProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Project information in task context"""
     created_by_name = serializers.SerializerMethodField()
     
@@ -30,7 +32,7 @@ class EmployeeProjectSerializer(serializers.ModelSerializer):
         return None
 
 
-class EmployeeAssignedTaskSerializer(serializers.ModelSerializer):
+class EmployeeAssignedTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Task - for employee viewing their assigned tasks"""
     project_details = EmployeeProjectSerializer(source='project', read_only=True)
     created_by_name = serializers.SerializerMethodField()
@@ -68,6 +70,8 @@ class EmployeeAssignedTaskSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
+        # Left out with ?fields= / ?expand= unless requested (see eagleeyeau/sparse_fields.py)
+        expandable_fields = ['project_details']
     
     def get_created_by_name(self, obj):
         """Get creator full name"""
@@ -76,7 +80,7 @@ class EmployeeAssignedTaskSerializer(serializers.ModelSerializer):
         return None
 
 
-class EmployeeTaskStatsSerializer(serializers.Serializer):
+class EmployeeTaskStatsSerializer(SparseFieldsMixin, serializers.Serializer):
     """Serializer for employee task statistics"""
     total_tasks = serializers.IntegerField()
     completed_tasks = serializers.IntegerField()
@@ -86,7 +90,7 @@ class EmployeeTaskStatsSerializer(serializers.Serializer):
     not_started_tasks = serializers.IntegerField()
 
 
-class EmployeeAssignedProjectSerializer(serializers.ModelSerializer):
+class EmployeeAssignedProjectSerializer(SparseFieldsMixin, ProjectTaskCountsMixin, serializers.ModelSerializer):
     """Serializer for Employee to view their assigned projects with progress"""
     progress = serializers.SerializerMethodField()
     total_tasks = serializers.SerializerMethodField()
@@ -121,22 +125,21 @@ class EmployeeAssignedProjectSerializer(serializers.ModelSerializer):
     
     def get_progress(self, obj):
         """Calculate progress percentage based on completed tasks"""
-        total_tasks = obj.tasks.count()
-        if total_tasks == 0:
-            return 0
-        completed_tasks = obj.tasks.filter(status='completed').count()
-        return int((completed_tasks / total_tasks) * 100)
+        return self._progress(obj)
     
     def get_total_tasks(self, obj):
         """Get total number of tasks in the project"""
-        return obj.tasks.count()
+        return self._tasks_count(obj)
     
     def get_completed_tasks(self, obj):
         """Get number of completed tasks"""
-        return obj.tasks.filter(status='completed').count()
+        return self._completed_tasks(obj)
     
     def get_assigned_tasks_count(self, obj):
         """Get number of tasks assigned to this employee"""
+        value = getattr(obj, 'assigned_tasks_count', None)
+        if value is not None:
+            return value
         employee = self.context.get('employee')
         if employee:
             return obj.tasks.filter(assigned_employee=employee).count()
@@ -167,7 +170,7 @@ class EmployeeAssignedProjectSerializer(serializers.ModelSerializer):
             return f"{days_left} days left to deliver"
 
 
-class TaskTimerSerializer(serializers.ModelSerializer):
+class TaskTimerSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for TaskTimer"""
     task_id = serializers.IntegerField(source='task.id', read_only=True)
     task_name = serializers.CharField(source='task.task_name', read_only=True)
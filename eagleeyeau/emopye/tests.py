@@ -1,3 +1,372 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from authentication.models import User
+from estimator.models import Estimate
+from eagleeyeau.testing import QueryBudgetTestCase
+from Project_manager.models import Project, Task
+from .models import TaskTimer, TaskTimerDailyRollup
+from .rollups import _PendingRollups
+
+
+
+class EmployeeQueryBudgetTests(QueryBudgetTestCase):
+    """Query and response-time budgets of the Employee endpoints"""
+
+    def test_assigned_tasks(self):
+        self.assertQueryBudget('Employee', '/api/employee/assigned-tasks/', 10)
+
+    def test_single_assigned_task(self):
+        self.assertQueryBudget('Employee', '/api/employee/assigned-tasks/{task}/', 1)
+
+    def test_assigned_projects(self):
+        self.assertQueryBudget('Employee', '/api/employee/assigned-projects/', 3)
+
+    def test_single_assigned_project(self):
+        self.assertQueryBudget('Employee', '/api/employee/assigned-projects/{project}/', 6)
+
+    def test_project_tasks(self):
+        self.assertQueryBudget('Employee', '/api/employee/projects/{project}/tasks/', 11)
+
+    def test_task_schedule(self):
+        self.assertQueryBudget('Employee', '/api/employee/task-schedule/', 2)
+
+    def test_daily_timer_summary(self):
+        self.assertQueryBudget('Employee', '/api/employee/timer/daily-summary/', 4)
+
+    def test_timesheet_entries(self):
+        self.assertQueryBudget('Employee', '/api/employee/timesheet/entries/', 3)
+
+
+def make_project(name):
+    estimate = Estimate.objects.create(serial_number=f'EST-{name}', client_name='Client', project_name=name)
+    return Project.objects.create(estimate=estimate, project_name=name, client_name='Client')
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ToggleTaskTimerTests(APITestCase):
+    """POST /api/employee/timer/toggle/"""
+
+    url = '/api/employee/timer/toggle/'
+
+    def setUp(self):
+        self.employee = User.objects.create_user(
+            email='emp@example.com', username='emp@example.com', password='pw12345!',
+            role='Employee', company_name='Acme',
+        )
+        self.kitchen = make_project('Kitchen')
+        self.bathroom = make_project('Bathroom')
+        self.measure, self.fit = [
+            Task.objects.create(
+                project=self.kitchen, task_name=name, priority='high', due_date=date(2026, 11, 1),
+                assigned_employee=self.employee,
+            )
+            for name in ('Measure', 'Fit')
+        ]
+        self.tile = Task.objects.create(
+            project=self.bathroom, task_name='Tile', priority='low', due_date=date(2026, 11, 1),
+            assigned_employee=self.employee,
+        )
+        self.client.force_authenticate(user=self.employee)
+
+    def toggle(self, task):
+        return self.client.post(self.url, {'task_id': task.pk, 'project_id': task.project_id}, format='json')
+
+    def rollup(self, task, work_date):
+        return TaskTimerDailyRollup.objects.get(employee=self.employee, task=task, work_date=work_date)
+
+    def running(self, task, started):
+        return TaskTimer.objects.create(
+            employee=self.employee, task=task, work_date=timezone.localtime(started).date(),
+            start_time=started, is_active=True,
+        )
+
+    def test_start_then_stop(self):
+        started = self.toggle(self.measure)
+        self.assertEqual((started.status_code, started.data['data']['action']), (200, 'started'))
+
+        stopped = self.toggle(self.measure)
+        self.assertEqual((stopped.status_code, stopped.data['data']['action']), (200, 'stopped'))
+        self.assertFalse(TaskTimer.objects.filter(is_active=True).exists())
+        self.assertEqual(self.rollup(self.measure, timezone.now().date()).active_count, 0)
+
+    def test_switching_task_within_a_project_stops_the_running_timer(self):
+        timer = self.running(self.measure, timezone.now() - timedelta(minutes=30))
+
+        response = self.toggle(self.fit)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['stopped_timer']['id'], timer.pk)
+        timer.refresh_from_db()
+        self.assertFalse(timer.is_active)
+        self.assertGreaterEqual(timer.duration_seconds, 30 * 60)
+        self.assertEqual(list(TaskTimer.objects.filter(is_active=True).values_list('task', flat=True)), [self.fit.pk])
+
+        today = timezone.now().date()
+        self.assertEqual(self.rollup(self.measure, today).total_seconds, timer.duration_seconds)
+        self.assertEqual(self.rollup(self.fit, today).active_count, 1)
+
+    def test_timer_in_another_project_blocks_a_start(self):
+        self.running(self.tile, timezone.now() - timedelta(minutes=5))
+
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.toggle(self.measure)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['data']['active_timer_info']['task_name'], 'Tile')
+        self.assertFalse(TaskTimer.objects.filter(task=self.measure).exists())
+
+    def test_stale_timer_from_a_previous_day_is_stopped(self):
+        # Left running yesterday in another project: it no longer blocks a start
+        stale = self.running(self.tile, timezone.now() - timedelta(days=1))
+
+        response = self.toggle(self.measure)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['stopped_timer']['id'], stale.pk)
+        stale.refresh_from_db()
+        self.assertFalse(stale.is_active)
+
+        stale_rollup = self.rollup(self.tile, stale.work_date)
+        self.assertEqual(
+            (stale_rollup.total_seconds, stale_rollup.session_count, stale_rollup.active_count),
+            (stale.duration_seconds, 1, 0),
+        )
+        today_rollup = self.rollup(self.measure, timezone.now().date())
+        self.assertEqual((today_rollup.total_seconds, today_rollup.active_count), (0, 1))
+
+    def test_concurrent_start_returns_409(self):
+        # Another request's timer lands after our lookup found none
+        self.running(self.fit, timezone.now())
+        with mock.patch.object(TaskTimer.objects, 'select_for_update', return_value=TaskTimer.objects.none()):
+            with self.assertLogs('django.request', 'WARNING'):
+                response = self.toggle(self.measure)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(list(TaskTimer.objects.values_list('task', flat=True)), [self.fit.pk])
+
+
+class StopExtraActiveTimersMigrationTests(TransactionTestCase):
+    """emopye 0004 stops all but the latest running timer of each employee"""
+
+    migrate_from = [('emopye', '0003_task_timer_daily_rollup')]
+    migrate_to = [('emopye', '0004_one_active_timer_per_employee')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_latest_running_timer_is_kept(self):
+        apps = self.migrate(self.migrate_from)
+        HistoricalTimer = apps.get_model('emopye', 'TaskTimer')
+
+        employee = User.objects.create_user(
+            email='emp@example.com', username='emp@example.com', password='pw12345!', role='Employee',
+        )
+        other = User.objects.create_user(
+            email='other@example.com', username='other@example.com', password='pw12345!', role='Employee',
+        )
+        project = make_project('Kitchen')
+        task = Task.objects.create(project=project, task_name='Fit', priority='high', due_date=date(2026, 11, 1))
+
+        now = timezone.now()
+        day = timezone.localtime(now).date()
+        timers = {}
+        for name, user, minutes in (('old', employee, 90), ('new', employee, 10), ('single', other, 60)):
+            timers[name] = HistoricalTimer.objects.create(
+                employee_id=user.pk, task_id=task.pk, work_date=day,
+                start_time=now - timedelta(minutes=minutes), is_active=True,
+            ).pk
+
+        self.migrate(self.migrate_to)
+
+        running = TaskTimer.objects.filter(is_active=True).values_list('pk', flat=True)
+        self.assertEqual(sorted(running), sorted([timers['new'], timers['single']]))
+        old = TaskTimer.objects.get(pk=timers['old'])
+        self.assertGreaterEqual(old.duration_seconds, 90 * 60)
+        self.assertIsNotNone(old.end_time)
+
+        rollup = TaskTimerDailyRollup.objects.get(employee=employee, task=task, work_date=day)
+        self.assertEqual(
+            (rollup.total_seconds, rollup.session_count, rollup.active_count),
+            (old.duration_seconds, 2, 1),
+        )
+        # Only the task-days of stopped timers are refreshed
+        self.assertFalse(TaskTimerDailyRollup.objects.filter(employee=other).exists())
+
+
+def rollup_refreshes(callbacks):
+    return [callback for callback in callbacks if isinstance(callback, _PendingRollups)]
+
+
+class DailyRollupMaintenanceTests(TestCase):
+    """emopye.rollups keeps TaskTimerDailyRollup in step with the session rows"""
+
+    def setUp(self):
+        # Flush the on_commit work of the fixtures so each test starts a fresh batch
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee = User.objects.create_user(
+                email='emp@example.com', username='emp@example.com', password='pw12345!', role='Employee',
+            )
+            self.task = Task.objects.create(
+                project=make_project('Kitchen'), task_name='Fit', priority='high', due_date=date(2026, 11, 1),
+            )
+        self.day = date(2026, 10, 12)
+
+    def session(self, work_date=None, minutes=30, task=None):
+        start = timezone.make_aware(datetime.combine(work_date or self.day, time(9)))
+        return TaskTimer.objects.create(
+            employee=self.employee, task=task or self.task, work_date=work_date or self.day,
+            start_time=start, end_time=start + timedelta(minutes=minutes),
+            duration_seconds=minutes * 60, is_active=False,
+        )
+
+    def totals(self, work_date=None, task=None):
+        return TaskTimerDailyRollup.objects.filter(
+            employee=self.employee, task=task or self.task, work_date=work_date or self.day,
+        ).values_list('total_seconds', 'session_count', 'active_count').first()
+
+    def test_saved_sessions_are_summed(self):
+        self.session(minutes=30)
+        self.session(minutes=15)
+        self.assertEqual(self.totals(), (45 * 60, 2, 0))
+
+    def test_stopping_a_timer_adds_its_duration(self):
+        timer = TaskTimer.objects.create(
+            employee=self.employee, task=self.task, work_date=self.day,
+            start_time=timezone.now() - timedelta(minutes=20), is_active=True,
+        )
+        self.assertEqual(self.totals(), (0, 1, 1))
+
+        timer.stop_timer()
+
+        self.assertEqual(self.totals(), (timer.duration_seconds, 1, 0))
+        self.assertGreaterEqual(timer.duration_seconds, 20 * 60)
+
+    def test_moving_a_session_refreshes_both_days(self):
+        timer = self.session(minutes=30)
+        self.session(minutes=10)
+        next_day = self.day + timedelta(days=1)
+
+        timer.work_date = next_day
+        timer.save()
+
+        self.assertEqual(self.totals(), (10 * 60, 1, 0))
+        self.assertEqual(self.totals(next_day), (30 * 60, 1, 0))
+
+    def test_deleting_sessions_refreshes_on_commit(self):
+        first = self.session(minutes=30)
+        last = self.session(minutes=10)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            first.delete()
+            # Refreshed once the delete commits
+            self.assertEqual(self.totals(), (40 * 60, 2, 0))
+        self.assertEqual(len(rollup_refreshes(callbacks)), 1)
+        self.assertEqual(self.totals(), (10 * 60, 1, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            last.delete()
+        self.assertIsNone(self.totals())
+
+    def test_cascade_delete_refreshes_in_one_batch(self):
+        def delete_task_with_sessions(count):
+            with self.captureOnCommitCallbacks(execute=True):
+                task = Task.objects.create(
+                    project=self.task.project, task_name=f'Task {count}', priority='low', due_date=date(2026, 11, 1),
+                )
+                for offset in range(count):
+                    self.session(self.day - timedelta(days=offset), task=task)
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True) as callbacks:
+                task.delete()
+            self.assertEqual(len(rollup_refreshes(callbacks)), 1)
+            return len(queries)
+
+        self.assertEqual(delete_task_with_sessions(2), delete_task_with_sessions(8))
+
+    def test_rolled_back_delete_leaves_no_pending_refresh(self):
+        timer_id = self.session(minutes=30).pk
+        self.session(minutes=10)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    TaskTimer.objects.get(pk=timer_id).delete()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(rollup_refreshes(callbacks), [])
+        self.assertEqual(self.totals(), (40 * 60, 2, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskTimer.objects.get(pk=timer_id).delete()
+        self.assertEqual(self.totals(), (10 * 60, 1, 0))
+
+
+class RebuildTimerRollupsCommandTests(TestCase):
+    """python manage.py rebuild_timer_rollups"""
+
+    def setUp(self):
+        self.employee, self.other = [
+            User.objects.create_user(email=email, username=email, password='pw12345!', role='Employee')
+            for email in ('emp@example.com', 'other@example.com')
+        ]
+        self.task = Task.objects.create(
+            project=make_project('Kitchen'), task_name='Fit', priority='high', due_date=date(2026, 11, 1),
+        )
+        start = timezone.make_aware(datetime(2026, 10, 12, 9))
+        for employee, work_date, minutes in (
+            (self.employee, date(2026, 10, 12), 30),
+            (self.employee, date(2026, 10, 12), 15),
+            (self.employee, date(2026, 10, 13), 20),
+            (self.other, date(2026, 10, 12), 60),
+        ):
+            TaskTimer.objects.create(
+                employee=employee, task=self.task, work_date=work_date, start_time=start,
+                end_time=start + timedelta(minutes=minutes), duration_seconds=minutes * 60, is_active=False,
+            )
+        self.expected = set(TaskTimerDailyRollup.objects.values_list(
+            'employee', 'work_date', 'total_seconds', 'session_count',
+        ))
+        TaskTimerDailyRollup.objects.update(total_seconds=0, session_count=0)
+
+    def rollups(self):
+        return set(TaskTimerDailyRollup.objects.values_list('employee', 'work_date', 'total_seconds', 'session_count'))
+
+    def test_rebuilds_every_rollup(self):
+        call_command('rebuild_timer_rollups', stdout=StringIO())
+
+        self.assertEqual(self.rollups(), self.expected)
+        self.assertIn((self.employee.pk, date(2026, 10, 12), 45 * 60, 2), self.rollups())
+
+    def test_employee_and_date_scope(self):
+        out = StringIO()
+        call_command(
+            'rebuild_timer_rollups', employee=self.employee.pk,
+            start_date='2026-10-13', end_date='2026-10-13', stdout=out,
+        )
+
+        self.assertIn('Wrote 1 daily rollups', out.getvalue())
+        self.assertEqual(self.rollups(), {
+            (self.employee.pk, date(2026, 10, 12), 0, 0),
+            (self.employee.pk, date(2026, 10, 13), 20 * 60, 1),
+            (self.other.pk, date(2026, 10, 12), 0, 0),
+        })
+
+    def test_invalid_date_is_rejected(self):
+        with self.assertRaisesMessage(CommandError, 'Invalid --start-date'):
+            call_command('rebuild_timer_rollups', start_date='12/10/2026', stdout=StringIO())
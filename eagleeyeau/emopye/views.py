@@ -8,6 +8,10 @@ from django.utils import timezone
 from django.db import models
 from datetime import timedelta
 from eagleeyeau.response_formatter import format_response
+from eagleeyeau.pagination import KeysetPagination, InvalidCursor
+from eagleeyeau.status_counts import project_status_counts
+from eagleeyeau.conditional import not_modified, object_state, queryset_state, with_validators
+from eagleeyeau.dashboard_cache import get_or_compute
 from Project_manager.models import Task, Project
 from .serializers import (
     EmployeeAssignedTaskSerializer,
@@ -172,6 +176,20 @@ def get_employee_assigned_tasks(request):
         
         current_user = request.user
         
+        # Every task in the payload or the statistics is one of the employee's;
+        # the due/upcoming counts also move with the date
+        not_modified_response, validators = not_modified(
+            request,
+            object_state(current_user),
+            queryset_state(
+                Task.objects.filter(assigned_employee=current_user),
+                fields=('updated_at', 'project__updated_at'),
+            ),
+            vary=timezone.localdate().isoformat(),
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+        
         # Get all tasks assigned to the current employee
         tasks = Task.objects.filter(assigned_employee=current_user).select_related(
             'project', 'project__created_by', 'created_by'
@@ -231,7 +249,7 @@ def get_employee_assigned_tasks(request):
         paginated_tasks = paginator.paginate_queryset(tasks, request)
         
         # Serialize data
-        tasks_serializer = EmployeeAssignedTaskSerializer(paginated_tasks, many=True)
+        tasks_serializer = EmployeeAssignedTaskSerializer(paginated_tasks, many=True, context={'request': request})
         stats_serializer = EmployeeTaskStatsSerializer(stats)
         
         # Get pagination info
@@ -267,7 +285,7 @@ def get_employee_assigned_tasks(request):
             }
         )
         
-        return Response(response_data, status=status.HTTP_200_OK)
+        return with_validators(Response(response_data, status=status.HTTP_200_OK), validators)
     
     except Exception as e:
         return Response(
@@ -340,7 +358,7 @@ def get_single_assigned_task(request, task_id):
         ).get(id=task_id, assigned_employee=current_user)
         
         # Serialize the task
-        serializer = EmployeeAssignedTaskSerializer(task)
+        serializer = EmployeeAssignedTaskSerializer(task, context={'request': request})
         
         return Response(
             format_response(
@@ -438,7 +456,7 @@ def update_employee_task_status(request):
         
         # Get the task
         try:
-            task = Task.objects.get(id=task_id)
+            task = Task.objects.select_related('project').get(id=task_id)
         except Task.DoesNotExist:
             return Response(
                 format_response(
@@ -472,34 +490,13 @@ def update_employee_task_status(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update task status
+        # Update task status; the Task post_save signal recomputes the
+        # project status and updates task.project in place
         old_status = task.status
+        project = task.project
         task.status = new_status
         task.save()
         
-        # Automatically update project status based on tasks
-        project = task.project
-        all_tasks = project.tasks.all()
-        
-        if all_tasks.exists():
-            # Check if any task is in_progress
-            if all_tasks.filter(status='in_progress').exists():
-                if project.status != 'in_progress':
-                    project.status = 'in_progress'
-                    project.save()
-            
-            # Check if all tasks are completed
-            elif all_tasks.filter(status='completed').count() == all_tasks.count():
-                if project.status != 'completed':
-                    project.status = 'completed'
-                    project.save()
-            
-            # If no tasks are in progress and not all completed, check if any started
-            elif all_tasks.exclude(status='not_started').exists():
-                if project.status == 'not_started':
-                    project.status = 'in_progress'
-                    project.save()
-        
         serializer = EmployeeAssignedTaskSerializer(task)
         
         return Response(
@@ -681,7 +678,9 @@ def get_employee_assigned_projects(request):
         # Get all projects where employee has assigned tasks
         projects = Project.objects.filter(
             tasks__assigned_employee=employee
-        ).distinct().order_by('-creating_date')
+        ).distinct().select_related('created_by').with_task_counts().with_employee_task_counts(
+            employee
+        ).order_by('-creating_date')
         
         # Apply status filter
         status_filter = request.query_params.get('status', '').strip()
@@ -697,13 +696,16 @@ def get_employee_assigned_projects(request):
             )
         
         # Calculate statistics (before pagination)
-        total_projects = projects.count()
-        completed_projects = projects.filter(status='completed').count()
-        due_projects = projects.filter(
-            end_date__lt=timezone.now().date(),
-            status__in=['not_started', 'in_progress', 'on_hold']
-        ).count()
-        cancelled_projects = projects.filter(status='cancelled').count()
+        project_counts = project_status_counts(projects, extra={
+            'due': Q(
+                end_date__lt=timezone.now().date(),
+                status__in=['not_started', 'in_progress', 'on_hold']
+            ),
+        })
+        total_projects = project_counts['total']
+        completed_projects = project_counts['status']['completed']
+        due_projects = project_counts['due']
+        cancelled_projects = project_counts['status']['cancelled']
         
         # Pagination
         page_size = request.query_params.get('page_size', 10)
@@ -828,7 +830,9 @@ def get_single_assigned_project(request, project_id):
         project = Project.objects.filter(
             id=project_id, 
             tasks__assigned_employee=employee
-        ).distinct().first()
+        ).distinct().select_related('created_by').with_task_counts().with_employee_task_counts(
+            employee
+        ).first()
         
         # Check if project exists and employee has tasks in it
         if not project:
@@ -1047,7 +1051,7 @@ def get_employee_project_tasks(request, project_id):
         not_started_tasks = tasks.filter(status='not_started').count()
         
         # Serialize tasks
-        task_serializer = EmployeeAssignedTaskSerializer(tasks, many=True)
+        task_serializer = EmployeeAssignedTaskSerializer(tasks, many=True, context={'request': request})
         
         # Calculate deadline status
         if project.end_date:
@@ -1197,7 +1201,7 @@ def update_task_status(request, task_id):
         
         # Get the task
         try:
-            task = Task.objects.get(id=task_id)
+            task = Task.objects.select_related('project').get(id=task_id)
         except Task.DoesNotExist:
             return Response(
                 format_response(
@@ -1231,34 +1235,13 @@ def update_task_status(request, task_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update task status
+        # Update task status; the Task post_save signal recomputes the
+        # project status and updates task.project in place
         old_status = task.status
-        task.status = new_status
-        task.save()
-        
-        # Automatically update project status based on tasks
         project = task.project
-        all_tasks = project.tasks.all()
         old_project_status = project.status
-        
-        if all_tasks.exists():
-            # Check if any task is in_progress
-            if all_tasks.filter(status='in_progress').exists():
-                if project.status != 'in_progress':
-                    project.status = 'in_progress'
-                    project.save()
-            
-            # Check if all tasks are completed
-            elif all_tasks.filter(status='completed').count() == all_tasks.count():
-                if project.status != 'completed':
-                    project.status = 'completed'
-                    project.save()
-            
-            # If no tasks are in progress and not all completed, check if any started
-            elif all_tasks.exclude(status='not_started').exists():
-                if project.status == 'not_started':
-                    project.status = 'in_progress'
-                    project.save()
+        task.status = new_status
+        task.save()
         
         serializer = EmployeeAssignedTaskSerializer(task)
         
@@ -1397,6 +1380,20 @@ def get_employee_task_schedule(request):
         from datetime import datetime
         current_user = request.user
         
+        # Every task in the payload or the statistics is one of the employee's;
+        # the due/upcoming counts also move with the date
+        not_modified_response, validators = not_modified(
+            request,
+            object_state(current_user),
+            queryset_state(
+                Task.objects.filter(assigned_employee=current_user),
+                fields=('updated_at', 'project__updated_at'),
+            ),
+            vary=timezone.localdate().isoformat(),
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+        
         # Get all tasks assigned to the current employee
         tasks = Task.objects.filter(assigned_employee=current_user).select_related(
             'project', 'created_by'
@@ -1539,6 +1536,8 @@ def get_employee_task_schedule(request):
     2. Second call with same task → Stops timer and shows duration
     3. Third call with Project B task (while Project A timer active) → REJECTED with error
     4. After stopping Project A, call with Project B → Starts timer for Project B
+    5. Call with another Project A task while a Project A timer runs → stops it
+       (returned as stopped_timer) and starts the new one
     """,
     request_body=openapi.Schema(
         type=openapi.TYPE_OBJECT,
@@ -1591,6 +1590,11 @@ def get_employee_task_schedule(request):
                                     'is_active': openapi.Schema(type=openapi.TYPE_BOOLEAN, example=True),
                                 }
                             ),
+                            'stopped_timer': openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                nullable=True,
+                                description='Timer stopped to start this one (same project task switch), else null',
+                            ),
                             'project_info': openapi.Schema(
                                 type=openapi.TYPE_OBJECT,
                                 properties={
@@ -1630,6 +1634,7 @@ def get_employee_task_schedule(request):
             )
         ),
         404: openapi.Response(description="Not Found - Task not found, not assigned to you, or doesn't belong to project"),
+        409: openapi.Response(description="Conflict - Another timer was started concurrently"),
     },
     tags=['Employee - Task Timer']
 )
@@ -1649,12 +1654,18 @@ def toggle_task_timer(request):
     - Both task_id and project_id are required
     - task must belong to the specified project
     - Employee can only have ONE active timer at a time across ALL projects
+      (enforced by a partial unique index on TaskTimer)
+    - Starting a task while another task of the same project is running
+      stops the running one; a timer left running on an earlier day is
+      stopped the same way
     - Cannot start a new project timer if another project timer is already active
     
     Returns timer status and duration.
     """
     try:
+        from django.db import IntegrityError, transaction
         from .models import TaskTimer
+        from .rollups import task_day_seconds
         from .serializers import TaskTimerSerializer
         
         current_user = request.user
@@ -1672,23 +1683,20 @@ def toggle_task_timer(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check if project exists and is accessible
-        try:
-            project = Project.objects.get(id=project_id)
-        except Project.DoesNotExist:
-            return Response(
-                format_response(
-                    success=False,
-                    message="Project not found",
-                    data=None
-                ),
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Check if task exists and is assigned to employee
-        try:
-            task = Task.objects.get(id=task_id, assigned_employee=current_user, project=project)
-        except Task.DoesNotExist:
+        # Task and project in one query; tell the two 404s apart only on a miss
+        task = Task.objects.select_related('project').filter(
+            id=task_id, assigned_employee=current_user, project_id=project_id
+        ).first()
+        if task is None:
+            if not Project.objects.filter(id=project_id).exists():
+                return Response(
+                    format_response(
+                        success=False,
+                        message="Project not found",
+                        data=None
+                    ),
+                    status=status.HTTP_404_NOT_FOUND
+                )
             return Response(
                 format_response(
                     success=False,
@@ -1697,113 +1705,125 @@ def toggle_task_timer(request):
                 ),
                 status=status.HTTP_404_NOT_FOUND
             )
+        project = task.project
         
         # Get today's date
         today = timezone.now().date()
         
-        # Check if there's an active timer for this task today
-        active_timer_same_task = TaskTimer.objects.filter(
-            employee=current_user,
-            task=task,
-            work_date=today,
-            is_active=True
-        ).first()
-        
-        if active_timer_same_task:
-            # STOP the timer for this task
-            active_timer_same_task.stop_timer()
-            serializer = TaskTimerSerializer(active_timer_same_task)
-            
-            # Calculate total time worked today for this task
-            total_today = TaskTimer.objects.filter(
-                employee=current_user,
-                task=task,
-                work_date=today
-            ).aggregate(total=models.Sum('duration_seconds'))['total'] or 0
-            
-            hours = total_today // 3600
-            minutes = (total_today % 3600) // 60
-            seconds = total_today % 60
-            total_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
-            return Response(
-                format_response(
-                    success=True,
-                    message=f"Timer stopped for task '{task.task_name}'",
-                    data={
-                        'action': 'stopped',
-                        'timer': serializer.data,
-                        'total_time_today': {
-                            'seconds': total_today,
-                            'formatted': total_formatted
-                        }
-                    }
-                ),
-                status=status.HTTP_200_OK
-            )
-        else:
-            # Check if there's ANY active timer for a different project
-            active_timer_other_project = TaskTimer.objects.filter(
-                employee=current_user,
-                work_date=today,
-                is_active=True
-            ).exclude(task__project=project).first()
-            
-            if active_timer_other_project:
-                other_project_name = active_timer_other_project.task.project.project_name
-                other_task_name = active_timer_other_project.task.task_name
+        try:
+            with transaction.atomic():
+                # Lock the employee's running timer, if any (served by the
+                # one_active_timer_per_employee partial index)
+                active_timer = TaskTimer.objects.select_for_update(of=('self',)).select_related(
+                    'task__project'
+                ).filter(employee=current_user, is_active=True).first()
+                if active_timer is not None:
+                    # Saves below then skip the employee lookup for cache invalidation
+                    active_timer.employee = current_user
                 
-                return Response(
-                    format_response(
-                        success=False,
-                        message=f"Cannot start timer. You already have an active timer for '{other_task_name}' in project '{other_project_name}'. Please stop that timer first.",
-                        data={
-                            'active_timer_info': {
-                                'project_name': other_project_name,
-                                'task_name': other_task_name,
-                                'started_at': active_timer_other_project.start_time.isoformat(),
+                if active_timer is not None and active_timer.task_id == task.id:
+                    # STOP the timer for this task
+                    active_timer.stop_timer()
+                    serializer = TaskTimerSerializer(active_timer)
+                    
+                    # Calculate total time worked today for this task
+                    total_today = task_day_seconds(current_user, task, today)
+                    
+                    hours = total_today // 3600
+                    minutes = (total_today % 3600) // 60
+                    seconds = total_today % 60
+                    total_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+                    
+                    return Response(
+                        format_response(
+                            success=True,
+                            message=f"Timer stopped for task '{task.task_name}'",
+                            data={
+                                'action': 'stopped',
+                                'timer': serializer.data,
+                                'total_time_today': {
+                                    'seconds': total_today,
+                                    'formatted': total_formatted
+                                }
                             }
-                        }
-                    ),
-                    status=status.HTTP_400_BAD_REQUEST
+                        ),
+                        status=status.HTTP_200_OK
+                    )
+                
+                if (active_timer is not None
+                        and active_timer.task.project_id != project.id
+                        and active_timer.work_date == today):
+                    other_project_name = active_timer.task.project.project_name
+                    other_task_name = active_timer.task.task_name
+                    
+                    return Response(
+                        format_response(
+                            success=False,
+                            message=f"Cannot start timer. You already have an active timer for '{other_task_name}' in project '{other_project_name}'. Please stop that timer first.",
+                            data={
+                                'active_timer_info': {
+                                    'project_name': other_project_name,
+                                    'task_name': other_task_name,
+                                    'started_at': active_timer.start_time.isoformat(),
+                                }
+                            }
+                        ),
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                
+                # Switching tasks within the project (or leaving a stale timer behind)
+                stopped_timer = None
+                if active_timer is not None:
+                    active_timer.stop_timer()
+                    stopped_timer = TaskTimerSerializer(active_timer).data
+                
+                # START new timer for this task
+                new_timer = TaskTimer.objects.create(
+                    employee=current_user,
+                    task=task,
+                    work_date=today,
+                    start_time=timezone.now(),
+                    is_active=True
                 )
-            
-            # START new timer for this task
-            new_timer = TaskTimer.objects.create(
-                employee=current_user,
-                task=task,
-                work_date=today,
-                start_time=timezone.now(),
-                is_active=True
-            )
-            
-            # Auto-update project status to "in_progress" when any task starts
-            if project.status == 'not_started':
-                project.status = 'in_progress'
-                project.save()
-            
-            # Auto-update task status to "in_progress" when timer starts
-            if task.status == 'not_started':
-                task.status = 'in_progress'
-                task.save()
-            
-            serializer = TaskTimerSerializer(new_timer)
-            
+        except IntegrityError:
+            # A concurrent request started a timer between our lookup and insert
             return Response(
                 format_response(
-                    success=True,
-                    message=f"Timer started for task '{task.task_name}' in project '{project.project_name}'",
-                    data={
-                        'action': 'started',
-                        'timer': serializer.data,
-                        'project_info': {
-                            'project_id': project.id,
-                            'project_name': project.project_name,
-                        }
-                    }
+                    success=False,
+                    message="Another timer was started at the same time. Please refresh and try again.",
+                    data=None
                 ),
-                status=status.HTTP_200_OK
+                status=status.HTTP_409_CONFLICT
             )
+        
+        # Auto-update project status to "in_progress" when any task starts
+        if project.status == 'not_started':
+            project.status = 'in_progress'
+            project.save()
+        
+        # Auto-update task status to "in_progress" when timer starts
+        if task.status == 'not_started':
+            task.status = 'in_progress'
+            task.save()
+        
+        serializer = TaskTimerSerializer(new_timer)
+        
+        return Response(
+            format_response(
+                success=True,
+                message=f"Timer started for task '{task.task_name}' in project '{project.project_name}'",
+                data={
+                    'action': 'started',
+                    'timer': serializer.data,
+                    'stopped_timer': stopped_timer,
+                    'project_info': {
+                        'project_id': project.id,
+                        'project_name': project.project_name,
+                    }
+                }
+            ),
+            status=status.HTTP_200_OK
+        )
     
     except Exception as e:
         return Response(
@@ -1866,10 +1886,9 @@ def get_daily_timer_summary(request):
     Returns all timer sessions and total time for the date.
     """
     try:
-        from .models import TaskTimer
+        from .models import TaskTimer, TaskTimerDailyRollup
         from .serializers import TaskTimerSerializer
         from datetime import datetime
-        from django.db.models import Sum
         
         current_user = request.user
         
@@ -1896,40 +1915,45 @@ def get_daily_timer_summary(request):
             work_date=work_date
         ).select_related('task', 'task__project').order_by('start_time')
         
-        # Calculate total time
-        total_seconds = timers.aggregate(total=Sum('duration_seconds'))['total'] or 0
+        # Totals per task come from the daily rollups, not the session rows
+        rollups = TaskTimerDailyRollup.objects.filter(
+            employee=current_user,
+            work_date=work_date
+        ).select_related('task', 'task__project').order_by('first_start')
         
-        # Add current active timer duration
-        active_timer = timers.filter(is_active=True).first()
+        # The running timer (at most one) adds its live duration
+        active_timer = TaskTimer.objects.filter(
+            employee=current_user,
+            work_date=work_date,
+            is_active=True
+        ).first()
+        active_seconds = 0
         if active_timer:
-            current_duration = int((timezone.now() - active_timer.start_time).total_seconds())
-            total_seconds += current_duration
+            active_seconds = int((timezone.now() - active_timer.start_time).total_seconds())
+        
+        # Group by task
+        task_breakdown = {}
+        total_seconds = 0
+        total_sessions = 0
+        for rollup in rollups:
+            task_seconds = rollup.total_seconds
+            if active_timer and active_timer.task_id == rollup.task_id:
+                task_seconds += active_seconds
+            task_breakdown[rollup.task_id] = {
+                'task_id': rollup.task_id,
+                'task_name': rollup.task.task_name,
+                'project_name': rollup.task.project.project_name,
+                'total_seconds': task_seconds,
+                'sessions_count': rollup.session_count
+            }
+            total_seconds += task_seconds
+            total_sessions += rollup.session_count
         
         hours = total_seconds // 3600
         minutes = (total_seconds % 3600) // 60
         seconds = total_seconds % 60
         total_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
         
-        # Group by task
-        task_breakdown = {}
-        for timer in timers:
-            task_id = timer.task.id
-            if task_id not in task_breakdown:
-                task_breakdown[task_id] = {
-                    'task_id': task_id,
-                    'task_name': timer.task.task_name,
-                    'project_name': timer.task.project.project_name,
-                    'total_seconds': 0,
-                    'sessions_count': 0
-                }
-            
-            duration = timer.duration_seconds
-            if timer.is_active:
-                duration = int((timezone.now() - timer.start_time).total_seconds())
-            
-            task_breakdown[task_id]['total_seconds'] += duration
-            task_breakdown[task_id]['sessions_count'] += 1
-        
         # Format task breakdown
         for task_id, data in task_breakdown.items():
             secs = data['total_seconds']
@@ -1939,7 +1963,7 @@ def get_daily_timer_summary(request):
             data['formatted'] = f"{h:02d}:{m:02d}:{s:02d}"
         
         # Serialize timers
-        serializer = TaskTimerSerializer(timers, many=True)
+        serializer = TaskTimerSerializer(timers, many=True, context={'request': request})
         
         return Response(
             format_response(
@@ -1959,7 +1983,7 @@ def get_daily_timer_summary(request):
                         'minutes': minutes,
                     },
                     'active_timer': active_timer is not None,
-                    'total_sessions': timers.count(),
+                    'total_sessions': total_sessions,
                     'task_breakdown': list(task_breakdown.values()),
                     'sessions': serializer.data
                 }
@@ -1979,6 +2003,39 @@ def get_daily_timer_summary(request):
 
 
 # ====================== GET EMPLOYEE INFO API ======================
+def _employee_info_stats(user):
+    """Task counts and today's work time for get_employee_info (cached per employee)"""
+    from .models import TaskTimerDailyRollup
+    from datetime import date
+
+    # One aggregate for all task counts
+    task_counts = Task.objects.filter(assigned_employee=user).aggregate(
+        total=models.Count('id'),
+        completed=models.Count('id', filter=models.Q(status='completed')),
+        in_progress=models.Count('id', filter=models.Q(status='in_progress')),
+        pending=models.Count('id', filter=models.Q(status='not_started')),
+    )
+
+    # Get today's work time
+    total_seconds = TaskTimerDailyRollup.objects.filter(
+        employee=user,
+        work_date=date.today()
+    ).aggregate(total=models.Sum('total_seconds'))['total'] or 0
+
+    # Calculate hours and minutes
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+
+    return {
+        'total_assigned_tasks': task_counts['total'],
+        'completed_tasks': task_counts['completed'],
+        'in_progress_tasks': task_counts['in_progress'],
+        'pending_tasks': task_counts['pending'],
+        'total_work_hours_today': f"{hours}h {minutes}m",
+        'total_work_seconds_today': total_seconds,
+    }
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsEmployee])
 @swagger_auto_schema(
@@ -2058,26 +2115,16 @@ def get_employee_info(request):
     """Get complete employee profile information"""
     try:
         user = request.user
-        from .models import TaskTimer
         from datetime import date
-        
-        # Get task statistics
-        assigned_tasks = Task.objects.filter(assigned_to=user)
-        completed_tasks = assigned_tasks.filter(status='completed').count()
-        in_progress_tasks = assigned_tasks.filter(status='in_progress').count()
-        pending_tasks = assigned_tasks.filter(status='not_started').count()
-        total_assigned = assigned_tasks.count()
-        
-        # Get today's work time
-        today = date.today()
-        today_timers = TaskTimer.objects.filter(employee=user, work_date=today)
-        total_seconds = sum(t.duration_seconds for t in today_timers if t.duration_seconds)
-        
-        # Calculate hours and minutes
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        total_work_hours = f"{hours}h {minutes}m"
-        
+
+        # Task and work-time statistics are cached per employee
+        stats = get_or_compute(
+            'employee_info',
+            user.company_id,
+            lambda: _employee_info_stats(user),
+            vary=f"{user.pk}:{date.today().isoformat()}",
+        )
+
         # Profile completeness calculation
         required_fields = ['first_name', 'last_name', 'email', 'company_name']
         optional_fields = ['profile_image', 'country']
@@ -2108,14 +2155,7 @@ def get_employee_info(request):
             'is_email_verified': user.is_email_verified,
             'created_at': user.created_at,
             'updated_at': user.updated_at,
-            'stats': {
-                'total_assigned_tasks': total_assigned,
-                'completed_tasks': completed_tasks,
-                'in_progress_tasks': in_progress_tasks,
-                'pending_tasks': pending_tasks,
-                'total_work_hours_today': total_work_hours,
-                'total_work_seconds_today': total_seconds,
-            },
+            'stats': stats,
             'profile_completeness': {
                 'percentage': completeness,
                 'missing_fields': missing_fields,
@@ -2162,10 +2202,26 @@ def get_employee_info(request):
     - project_id: Filter by specific project
     - task_id: Filter by specific task
     - status: Filter by task status (not_started, in_progress, completed, blocked)
+    - page_size: Opt in to keyset pagination with this many entries per page (max 500)
+    - cursor: next_cursor value from the previous page
     
     Returns timesheet entries with weekly summary statistics.
     """,
     manual_parameters=[
+        openapi.Parameter(
+            'page_size',
+            openapi.IN_QUERY,
+            description='Opt in to keyset pagination with this many entries per page (max 500)',
+            type=openapi.TYPE_INTEGER,
+            required=False
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            description='next_cursor value from the previous page',
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
         openapi.Parameter(
             'start_date',
             openapi.IN_QUERY,
@@ -2220,9 +2276,9 @@ def get_employee_timesheet_entries(request):
     Returns all time tracking sessions grouped by date.
     """
     try:
-        from .models import TaskTimer
+        from .models import TaskTimer, TaskTimerDailyRollup
         from datetime import datetime, timedelta
-        from django.db.models import Sum, Count
+        from django.db.models import Sum, Count, Q
         
         current_user = request.user
         
@@ -2265,30 +2321,67 @@ def get_employee_timesheet_entries(request):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        # Build query
-        timers = TaskTimer.objects.filter(
-            employee=current_user,
-            work_date__range=[start_date, end_date]
-        ).select_related('task', 'task__project').order_by('-work_date', '-start_time')
-        
-        # Apply filters
+        # Same filters for the session rows (listed) and the daily rollups (summed)
+        filters = {
+            'employee': current_user,
+            'work_date__range': [start_date, end_date],
+        }
         if project_id:
-            timers = timers.filter(task__project__id=project_id)
+            filters['task__project__id'] = project_id
         
         if task_id:
-            timers = timers.filter(task__id=task_id)
+            filters['task__id'] = task_id
         
         if status_filter:
-            timers = timers.filter(task__status=status_filter)
+            filters['task__status'] = status_filter
+        
+        timers = TaskTimer.objects.filter(**filters).select_related(
+            'task', 'task__project'
+        ).order_by('-work_date', '-start_time')
+        
+        # Summary figures from a single aggregate over the daily rollups; running
+        # timers are few, so their live duration is added from a small follow-up query
+        stats = TaskTimerDailyRollup.objects.filter(**filters).order_by().aggregate(
+            total_entries=Sum('session_count'),
+            stopped_seconds=Sum('total_seconds'),
+            unique_tasks=Count('task', distinct=True),
+            unique_projects=Count('task__project', distinct=True),
+            completed=Sum('session_count', filter=Q(task__status='completed')),
+            in_progress=Sum('session_count', filter=Q(task__status='in_progress')),
+            not_started=Sum('session_count', filter=Q(task__status='not_started')),
+            blocked=Sum('session_count', filter=Q(task__status='blocked')),
+        )
+        stats = {key: value or 0 for key, value in stats.items()}
+        now = timezone.now()
+        total_seconds = stats['stopped_seconds']
+        for start_time in timers.filter(is_active=True).order_by().values_list('start_time', flat=True):
+            total_seconds += int((now - start_time).total_seconds())
+        
+        # Keyset pagination is opt-in via page_size/cursor
+        paginator = KeysetPagination('work_date', 'start_time')
+        pagination = None
+        if paginator.is_requested(request):
+            try:
+                timers, pagination = paginator.paginate(timers, request)
+            except InvalidCursor:
+                return Response(
+                    format_response(
+                        success=False,
+                        message="Invalid cursor",
+                        data=None
+                    ),
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            timers = paginator.order(timers)
         
         # Build flat list of entries (not grouped by date)
         entries_list = []
-        total_seconds = 0
         
         for timer in timers:
             # Calculate duration
             if timer.is_active:
-                duration_seconds = int((timezone.now() - timer.start_time).total_seconds())
+                duration_seconds = int((now - timer.start_time).total_seconds())
             else:
                 duration_seconds = timer.duration_seconds
             
@@ -2312,22 +2405,18 @@ def get_employee_timesheet_entries(request):
                 'start_time': timer.start_time,
                 'end_time': timer.end_time,
             })
-            
-            total_seconds += duration_seconds
         
         total_hours = total_seconds // 3600
         total_minutes = (total_seconds % 3600) // 60
         
-        # Get unique counts
-        unique_tasks = timers.values('task').distinct().count()
-        unique_projects = timers.values('task__project').distinct().count()
+        unique_tasks = stats['unique_tasks']
         
         # Count by status
         status_counts = {
-            'completed': timers.filter(task__status='completed').values('id').distinct().count(),
-            'in_progress': timers.filter(task__status='in_progress').values('id').distinct().count(),
-            'not_started': timers.filter(task__status='not_started').values('id').distinct().count(),
-            'blocked': timers.filter(task__status='blocked').values('id').distinct().count(),
+            'completed': stats['completed'],
+            'in_progress': stats['in_progress'],
+            'not_started': stats['not_started'],
+            'blocked': stats['blocked'],
         }
         
         return Response(
@@ -2347,7 +2436,8 @@ def get_employee_timesheet_entries(request):
                         'submitted': status_counts['completed'],
                     },
                     'entries': entries_list,
-                    'total_entries': timers.count(),
+                    'total_entries': stats['total_entries'],
+                    'pagination': pagination,
                     'status_breakdown': status_counts,
                 }
             ),
@@ -2464,6 +2554,7 @@ def edit_task_timer(request, timer_id):
     """
     try:
         from .models import TaskTimer
+        from .rollups import task_day_seconds
         from .serializers import TaskTimerSerializer
         from datetime import datetime
         
@@ -2494,11 +2585,7 @@ def edit_task_timer(request, timer_id):
             duration_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
             
             # Get total time for that day
-            total_today = TaskTimer.objects.filter(
-                employee=current_user,
-                task=timer.task,
-                work_date=timer.work_date
-            ).aggregate(total=models.Sum('duration_seconds'))['total'] or 0
+            total_today = task_day_seconds(current_user, timer.task_id, timer.work_date)
             
             total_hours = total_today // 3600
             total_minutes = (total_today % 3600) // 60
@@ -2625,12 +2712,8 @@ def edit_task_timer(request, timer_id):
             
             timer.save()
             
-            # Get total time worked on this task for this date
-            total_today = TaskTimer.objects.filter(
-                employee=current_user,
-                task=timer.task,
-                work_date=timer.work_date
-            ).aggregate(total=models.Sum('duration_seconds'))['total'] or 0
+            # Get total time worked on this task for this date (rollup refreshed by save())
+            total_today = task_day_seconds(current_user, timer.task_id, timer.work_date)
             
             hours = total_today // 3600
             minutes = (total_today % 3600) // 60
@@ -0,0 +1,32 @@
+"""
+Batched recalculation of persisted Estimate columns.
+
+Shared by migration 0002 (with its own frozen copy of the totals calculation
+and the historical model) and the ``backfill_estimate_totals`` command (with
+the current ``Estimate.calculate_totals``), so neither re-implements the
+batching.
+"""
+
+TOTAL_FIELDS = ['total_cost', 'total_with_profit', 'total_with_tax']
+
+
+def recalculate_in_batches(queryset, calculate, fields=TOTAL_FIELDS, batch_size=500):
+    """
+    Call ``calculate(obj)`` on every row of ``queryset`` and write ``fields``
+    back with one ``bulk_update`` per ``batch_size`` rows. Returns the number
+    of rows updated.
+    """
+    manager = queryset.model._default_manager.db_manager(queryset.db)
+    batch = []
+    updated = 0
+    for obj in queryset.order_by('pk').iterator(chunk_size=batch_size):
+        calculate(obj)
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            manager.bulk_update(batch, fields)
+            updated += len(batch)
+            batch = []
+    if batch:
+        manager.bulk_update(batch, fields)
+        updated += len(batch)
+    return updated
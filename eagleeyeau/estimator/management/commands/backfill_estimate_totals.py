@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from estimator.backfill import TOTAL_FIELDS, recalculate_in_batches
+from estimator.models import Estimate
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalculate the persisted total columns of every Estimate from its items. Migration 0002 '
+        'fills them once; run this after changing the calculation or editing rows outside the ORM'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of estimates written per bulk_update (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('Recalculating estimate totals...'))
+
+        queryset = Estimate.objects.only('id', 'items', 'profit_margin', 'income_tax', *TOTAL_FIELDS)
+        updated = recalculate_in_batches(
+            queryset, Estimate.calculate_totals, TOTAL_FIELDS, batch_size=options['batch_size']
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Updated totals for {updated} estimates'))
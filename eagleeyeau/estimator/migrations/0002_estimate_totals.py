@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:44
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+
+from estimator.backfill import recalculate_in_batches
+
+BATCH_SIZE = 500
+TOTAL_FIELDS = ['total_cost', 'total_with_profit', 'total_with_tax']
+
+
+def calculate_totals(estimate):
+    """Estimate.calculate_totals as of this migration; later changes must not alter it"""
+    total = 0
+    for item in estimate.items or []:
+        qty = item.get('quantity', 0)
+        unit_price = item.get('unit_price', 0)
+        total += qty * float(unit_price)
+    total_cost = round(total, 2)
+
+    profit = (total_cost * float(estimate.profit_margin)) / 100
+    total_with_profit = round(total_cost + profit, 2)
+
+    tax = (total_with_profit * float(estimate.income_tax)) / 100
+    total_with_tax = round(total_with_profit + tax, 2)
+
+    estimate.total_cost = Decimal(str(total_cost))
+    estimate.total_with_profit = Decimal(str(total_with_profit))
+    estimate.total_with_tax = Decimal(str(total_with_tax))
+
+
+def backfill_totals(apps, schema_editor):
+    """Fill the new total columns from each estimate's items, in batches"""
+    Estimate = apps.get_model('estimator', 'Estimate')
+    queryset = Estimate.objects.using(schema_editor.connection.alias).only(
+        'id', 'items', 'profit_margin', 'income_tax', *TOTAL_FIELDS
+    )
+    recalculate_in_batches(queryset, calculate_totals, TOTAL_FIELDS, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('estimator', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='estimate',
+            name='total_cost',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Sum of quantity × unit_price over items', max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='estimate',
+            name='total_with_profit',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Total cost plus profit margin', max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='estimate',
+            name='total_with_tax',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Total with profit plus income tax', max_digits=15),
+        ),
+        migrations.AddIndex(
+            model_name='estimate',
+            index=models.Index(fields=['status', 'total_with_tax'], name='estimator_e_status_a2fb6b_idx'),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_company(apps, schema_editor):
+    """Copy each estimate's company from its creator"""
+    User = apps.get_model('authentication', 'User')
+    Estimate = apps.get_model('estimator', 'Estimate')
+
+    Estimate.objects.filter(company__isnull=True, created_by__isnull=False).update(
+        company=models.Subquery(
+            User.objects.filter(pk=models.OuterRef('created_by')).values('company')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_company'),
+        ('estimator', '0002_estimate_totals'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='estimate',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='estimates', to='authentication.company'),
+        ),
+        migrations.AddIndex(
+            model_name='estimate',
+            index=models.Index(fields=['company', 'status'], name='estimator_e_company_97f26f_idx'),
+        ),
+        migrations.RunPython(backfill_company, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 09:30
+
+from django.db import migrations
+
+from eagleeyeau.search import AddTrigramIndex, TrigramExtension
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('estimator', '0003_company'),
+    ]
+
+    # pg_trgm GIN indexes behind the icontains searches (no-ops outside PostgreSQL)
+    operations = [
+        TrigramExtension(),
+        AddTrigramIndex(model_name='estimate', field='serial_number', name='estimate_serial_number_trgm'),
+        AddTrigramIndex(model_name='estimate', field='estimate_number', name='estimate_number_trgm'),
+        AddTrigramIndex(model_name='estimate', field='client_name', name='estimate_client_name_trgm'),
+        AddTrigramIndex(model_name='estimate', field='project_name', name='estimate_project_name_trgm'),
+    ]
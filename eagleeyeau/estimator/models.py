@@ -1,9 +1,11 @@
+from decimal import Decimal
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
+from eagleeyeau.tenancy import TenantOwnedMixin, TenantQuerySet
 
 
-class Estimate(models.Model):
+class Estimate(TenantOwnedMixin, models.Model):
     """
     Main Estimate model with items stored as a JSON array.
     Single model handles complete estimate creation with all items.
@@ -43,6 +45,7 @@ class Estimate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    company = models.ForeignKey('authentication.Company', on_delete=models.SET_NULL, null=True, blank=True, related_name='estimates')
     
     # Items stored as JSON array
     items = models.JSONField(
@@ -50,38 +53,48 @@ class Estimate(models.Model):
         help_text="Array of items: [{item_type, item_id, quantity, unit_price}]"
     )
     
+    # Persisted totals (recalculated from items on every save)
+    total_cost = models.DecimalField(max_digits=15, decimal_places=2, default=0, help_text="Sum of quantity × unit_price over items")
+    total_with_profit = models.DecimalField(max_digits=15, decimal_places=2, default=0, help_text="Total cost plus profit margin")
+    total_with_tax = models.DecimalField(max_digits=15, decimal_places=2, default=0, help_text="Total with profit plus income tax")
+    
+    objects = TenantQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
+            models.Index(fields=['company', 'status']),
             models.Index(fields=['status']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['status', 'total_with_tax']),
         ]
     
     def __str__(self):
         return f"{self.serial_number} - {self.client_name}"
     
-    @property
-    def total_cost(self):
-        """Calculate total cost from all items"""
-        if not self.items:
-            return 0
+    def calculate_totals(self):
+        """Recalculate the persisted totals from items, profit margin and tax"""
         total = 0
-        for item in self.items:
+        for item in self.items or []:
             qty = item.get('quantity', 0)
             unit_price = item.get('unit_price', 0)
-            total += qty * unit_price
-        return round(total, 2)
-    
-    @property
-    def total_with_profit(self):
-        """Calculate total with profit margin"""
-        base_total = self.total_cost
-        profit = (base_total * self.profit_margin) / 100
-        return round(base_total + profit, 2)
+            total += qty * float(unit_price)
+        total_cost = round(total, 2)
+        
+        profit = (total_cost * float(self.profit_margin)) / 100
+        total_with_profit = round(total_cost + profit, 2)
+        
+        tax = (total_with_profit * float(self.income_tax)) / 100
+        total_with_tax = round(total_with_profit + tax, 2)
+        
+        self.total_cost = Decimal(str(total_cost))
+        self.total_with_profit = Decimal(str(total_with_profit))
+        self.total_with_tax = Decimal(str(total_with_tax))
     
-    @property
-    def total_with_tax(self):
-        """Calculate final total with tax"""
-        total_with_profit = self.total_with_profit
-        tax = (total_with_profit * self.income_tax) / 100
-        return round(total_with_profit + tax, 2)
+    def save(self, *args, **kwargs):
+        """Override save to keep the persisted totals in sync with items"""
+        self.calculate_totals()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'total_cost', 'total_with_profit', 'total_with_tax'}
+        super().save(*args, **kwargs)
@@ -1,10 +1,65 @@
 from rest_framework import serializers
+from eagleeyeau.sparse_fields import SparseFieldsMixin
 from django.utils import timezone
 from .models import Estimate
 from admindashboard.models import Material, Component, EstimateDefaults
 
 
-class EstimateItemSerializer(serializers.Serializer):
+class EstimateItemResolver:
+    """
+    Bulk loader for the catalogue objects referenced by Estimate.items.
+    
+    Collects every (item_type, item_id) pair across the estimates being
+    serialized and loads each type with a single in_bulk() query, so item
+    details cost a fixed number of queries regardless of item count.
+    """
+    
+    def __init__(self, items):
+        ids = {'material': set(), 'component': set(), 'estimate_default': set()}
+        for item in items:
+            item_type = item.get('item_type')
+            if item_type in ids and item.get('item_id') is not None:
+                ids[item_type].add(item.get('item_id'))
+        
+        self._objects = {
+            'material': Material.objects.select_related('created_by').in_bulk(ids['material'])
+            if ids['material'] else {},
+            'component': Component.objects.select_related('created_by').prefetch_related(
+                'material_used', 'estimate_defaults'
+            ).in_bulk(ids['component']) if ids['component'] else {},
+            'estimate_default': EstimateDefaults.objects.select_related('created_by').in_bulk(ids['estimate_default'])
+            if ids['estimate_default'] else {},
+        }
+    
+    @classmethod
+    def for_estimates(cls, estimates):
+        """Build a resolver covering the items of every given estimate."""
+        return cls(item for estimate in estimates for item in (estimate.items or []))
+    
+    def get(self, item_type, item_id):
+        return self._objects.get(item_type, {}).get(item_id)
+
+
+class EstimateItemListSerializer(serializers.ListSerializer):
+    """
+    Resolves item details for a whole items array in bulk.
+    
+    A parent list serializer can set ``item_resolver`` to share one resolver
+    across many arrays; otherwise one is built per array. The resolver is
+    handed to each item explicitly rather than through the shared context.
+    """
+    
+    item_resolver = None
+    
+    def to_representation(self, data):
+        items = list(data or [])
+        resolver = None
+        if self.child.wants('item_details'):
+            resolver = self.item_resolver or EstimateItemResolver(items)
+        return [self.child.item_representation(item, resolver) for item in items]
+
+
+class EstimateItemSerializer(SparseFieldsMixin, serializers.Serializer):
     """
     Serializer for individual items within the items array.
     Includes item cost calculation and full item details.
@@ -15,89 +70,109 @@ class EstimateItemSerializer(serializers.Serializer):
     unit_price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, coerce_to_string=False)
     notes = serializers.CharField(required=False, allow_blank=True, default='')
     
+    class Meta:
+        list_serializer_class = EstimateItemListSerializer
+        # Computed in to_representation; left out with ?fields= / ?expand= unless requested
+        expandable_fields = ['item_details']
+    
     def to_representation(self, instance):
-        """Add calculated total_price and full item details when serializing"""
+        return self.item_representation(instance)
+    
+    def item_representation(self, instance, resolver=None):
+        """
+        Add calculated total_price and full item details when serializing.
+        
+        ``resolver`` is the bulk loader of the surrounding items array; a
+        single item on its own resolves just itself.
+        """
         data = super().to_representation(instance)
-        qty = instance.get('quantity', 0)
-        price = float(instance.get('unit_price', 0))
-        item_total = round(qty * price, 2)
-        data['item_total_cost'] = item_total  # Individual item total
+        if self.wants('item_total_cost'):
+            qty = instance.get('quantity', 0)
+            price = float(instance.get('unit_price', 0))
+            data['item_total_cost'] = round(qty * price, 2)  # Individual item total
         
         # Convert unit_price to float for JSON serialization
-        data['unit_price'] = float(data['unit_price'])
+        if 'unit_price' in data:
+            data['unit_price'] = float(data['unit_price'])
+        
+        if not self.wants('item_details'):
+            return data
         
-        # Fetch and include full item details based on item_type
+        # Look up full item details from the bulk resolver
         item_type = instance.get('item_type')
         item_id = instance.get('item_id')
-        item_details = None
+        resolver = resolver or EstimateItemResolver([instance])
+        obj = resolver.get(item_type, item_id)
         
-        try:
-            if item_type == 'material':
-                material = Material.objects.get(id=item_id)
-                item_details = {
-                    'id': material.id,
-                    'material_name': material.material_name,
-                    'supplier': material.supplier,
-                    'category': material.category,
-                    'unit': material.unit,
-                    'cost_per_unit': float(material.cost_per_unit),
-                    'created_at': material.created_at.isoformat(),
-                    'created_by_email': material.created_by.email if material.created_by else None,
-                }
-            
-            elif item_type == 'component':
-                component = Component.objects.get(id=item_id)
-                materials_list = [
-                    {
-                        'id': m.id,
-                        'material_name': m.material_name,
-                        'supplier': m.supplier,
-                        'category': m.category,
-                        'unit': m.unit,
-                        'cost_per_unit': float(m.cost_per_unit),
-                    }
-                    for m in component.material_used.all()
-                ]
-                estimate_defaults_list = [
-                    {
-                        'id': ed.id,
-                        'name': ed.name,
-                        'description': ed.description,
-                        'category': ed.category,
-                    }
-                    for ed in component.estimate_defaults.all()
-                ]
-                item_details = {
-                    'id': component.id,
-                    'component_name': component.component_name,
-                    'description': component.description,
-                    'base_price': float(component.base_price),
-                    'labor_hours': float(component.labor_hours),
-                    'material_used': materials_list,
-                    'estimate_defaults': estimate_defaults_list,
-                    'created_at': component.created_at.isoformat(),
-                    'created_by_email': component.created_by.email if component.created_by else None,
+        if obj is None:
+            item_details = {'error': f'{item_type} with id {item_id} not found'}
+        elif item_type == 'material':
+            item_details = {
+                'id': obj.id,
+                'material_name': obj.material_name,
+                'supplier': obj.supplier,
+                'category': obj.category,
+                'unit': obj.unit,
+                'cost_per_unit': float(obj.cost_per_unit),
+                'created_at': obj.created_at.isoformat(),
+                'created_by_email': obj.created_by.email if obj.created_by else None,
+            }
+        elif item_type == 'component':
+            materials_list = [
+                {
+                    'id': m.id,
+                    'material_name': m.material_name,
+                    'supplier': m.supplier,
+                    'category': m.category,
+                    'unit': m.unit,
+                    'cost_per_unit': float(m.cost_per_unit),
                 }
-            
-            elif item_type == 'estimate_default':
-                estimate_default = EstimateDefaults.objects.get(id=item_id)
-                item_details = {
-                    'id': estimate_default.id,
-                    'name': estimate_default.name,
-                    'description': estimate_default.description,
-                    'category': estimate_default.category,
-                    'created_at': estimate_default.created_at.isoformat(),
-                    'created_by_email': estimate_default.created_by.email if estimate_default.created_by else None,
+                for m in obj.material_used.all()
+            ]
+            estimate_defaults_list = [
+                {
+                    'id': ed.id,
+                    'name': ed.name,
+                    'description': ed.description,
+                    'category': ed.category,
                 }
-        
-        except (Material.DoesNotExist, Component.DoesNotExist, EstimateDefaults.DoesNotExist):
-            item_details = {'error': f'{item_type} with id {item_id} not found'}
+                for ed in obj.estimate_defaults.all()
+            ]
+            item_details = {
+                'id': obj.id,
+                'component_name': obj.component_name,
+                'description': obj.description,
+                'base_price': float(obj.base_price),
+                'material_used': materials_list,
+                'estimate_defaults': estimate_defaults_list,
+                'created_at': obj.created_at.isoformat(),
+                'created_by_email': obj.created_by.email if obj.created_by else None,
+            }
+        else:
+            item_details = {
+                'id': obj.id,
+                'name': obj.name,
+                'description': obj.description,
+                'category': obj.category,
+                'created_at': obj.created_at.isoformat(),
+                'created_by_email': obj.created_by.email if obj.created_by else None,
+            }
         
         data['item_details'] = item_details
         return data
 
 
-class EstimateSerializer(serializers.ModelSerializer):
+class EstimateBulkListSerializer(serializers.ListSerializer):
+    """Shares one item resolver across every estimate in a list."""
+    
+    def to_representation(self, data):
+        estimates = list(data.all() if hasattr(data, 'all') else data)
+        if self.child.needs_item_details():
+            self.child.fields['items'].item_resolver = EstimateItemResolver.for_estimates(estimates)
+        return super().to_representation(estimates)
+
+
+class EstimateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Main serializer for Estimate with items as array field.
     Handles complete estimate creation in single API call.
@@ -115,6 +190,7 @@ class EstimateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Estimate
+        list_serializer_class = EstimateBulkListSerializer
         fields = [
             'id',
             'serial_number',
@@ -142,6 +218,13 @@ class EstimateSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'status', 'created_at', 'updated_at', 'estimate_date']
+        # Left out with ?fields= / ?expand= unless requested (see eagleeyeau/sparse_fields.py)
+        expandable_fields = ['cost_breakdown']
+    
+    def needs_item_details(self):
+        """Whether the items will be rendered with their catalogue item_details"""
+        items = self.fields.get('items')
+        return items is not None and items.child.wants('item_details')
     
     def get_items_count(self, obj):
         """Get total number of items"""
@@ -253,7 +336,7 @@ class EstimateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class EstimateListSerializer(serializers.ModelSerializer):
+class EstimateListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for list view with summary.
     """
@@ -285,7 +368,7 @@ class EstimateListSerializer(serializers.ModelSerializer):
         return float(obj.total_cost)
 
 
-class AdminEstimateListSerializer(serializers.ModelSerializer):
+class AdminEstimateListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for admin view with creator information.
     Includes creator name and email.
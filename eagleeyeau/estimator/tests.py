@@ -1 +1,135 @@
-# Removed
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from admindashboard.models import Material
+from eagleeyeau.testing import QueryBudgetTestCase
+from .models import Estimate
+from .serializers import EstimateItemSerializer, EstimateSerializer
+
+
+class EstimatorQueryBudgetTests(QueryBudgetTestCase):
+    """Query and response-time budgets of the Estimator endpoints"""
+
+    def test_dashboard(self):
+        self.assertQueryBudget('Estimator', '/api/estimator/dashboard/', 5)
+
+    def test_estimates(self):
+        self.assertQueryBudget('Estimator', '/api/estimator/estimates/', 3)
+
+    def test_estimate_detail(self):
+        self.assertQueryBudget('Estimator', '/api/estimator/estimates/{estimate}/', 6)
+
+
+ITEMS = [{'quantity': 2, 'unit_price': '10.50'}, {'quantity': 3, 'unit_price': 4}]
+
+
+class EstimateTotalsMigrationTests(TransactionTestCase):
+    """estimator 0002 backfills the persisted totals with its own copy of the calculation"""
+
+    migrate_from = [('estimator', '0001_initial')]
+    migrate_to = [('estimator', '0002_estimate_totals')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_totals_are_backfilled(self):
+        apps = self.migrate(self.migrate_from)
+        HistoricalEstimate = apps.get_model('estimator', 'Estimate')
+        for serial, items in (('EST-1', ITEMS), ('EST-2', [])):
+            HistoricalEstimate.objects.create(
+                serial_number=serial, client_name='Client', project_name='Kitchen',
+                items=items, profit_margin=10, income_tax=5,
+            )
+
+        apps = self.migrate(self.migrate_to)
+        HistoricalEstimate = apps.get_model('estimator', 'Estimate')
+
+        totals = {
+            estimate.serial_number: (estimate.total_cost, estimate.total_with_profit, estimate.total_with_tax)
+            for estimate in HistoricalEstimate.objects.all()
+        }
+        self.assertEqual(totals, {
+            'EST-1': (Decimal('33.00'), Decimal('36.30'), Decimal('38.11')),
+            'EST-2': (Decimal('0.00'), Decimal('0.00'), Decimal('0.00')),
+        })
+
+
+class BackfillEstimateTotalsCommandTests(TestCase):
+    """python manage.py backfill_estimate_totals"""
+
+    def test_recalculates_every_estimate_in_batches(self):
+        for index in range(3):
+            Estimate.objects.create(
+                serial_number=f'EST-{index}', client_name='Client', project_name='Kitchen',
+                items=ITEMS, profit_margin=10, income_tax=5,
+            )
+        # Rows edited outside the ORM keep stale totals
+        Estimate.objects.update(total_cost=0, total_with_profit=0, total_with_tax=0)
+
+        out = StringIO()
+        # One SELECT plus one bulk_update per batch of two
+        with self.assertNumQueries(3):
+            call_command('backfill_estimate_totals', batch_size=2, stdout=out)
+
+        self.assertIn('Updated totals for 3 estimates', out.getvalue())
+        self.assertEqual(
+            set(Estimate.objects.values_list('total_cost', 'total_with_profit', 'total_with_tax')),
+            {(Decimal('33.00'), Decimal('36.30'), Decimal('38.11'))},
+        )
+
+
+class EstimateItemDetailsTests(TestCase):
+    """Item details are bulk-resolved without touching the serializer context"""
+
+    def setUp(self):
+        self.materials = [
+            Material.objects.create(
+                material_name=name, supplier='Supplier', category='Wood', unit='piece', cost_per_unit=4,
+            )
+            for name in ('Oak', 'Pine', 'Birch')
+        ]
+        for index, material in enumerate(self.materials):
+            Estimate.objects.create(
+                serial_number=f'EST-{index}', client_name='Client', project_name='Kitchen',
+                items=[{'item_type': 'material', 'item_id': material.pk, 'quantity': 1, 'unit_price': 4}],
+            )
+
+    def test_list_shares_one_resolver(self):
+        estimates = list(Estimate.objects.order_by('pk'))
+        context = {}
+        serializer = EstimateSerializer(estimates, many=True, context=context)
+
+        # One in_bulk() for the materials of every estimate
+        with self.assertNumQueries(1):
+            data = serializer.data
+
+        self.assertEqual(
+            [estimate['items'][0]['item_details']['material_name'] for estimate in data],
+            ['Oak', 'Pine', 'Birch'],
+        )
+        self.assertEqual(context, {})
+        self.assertEqual(serializer.context, {})
+
+    def test_single_estimate_and_single_item(self):
+        estimate = Estimate.objects.order_by('pk').first()
+        with self.assertNumQueries(1):
+            data = EstimateSerializer(estimate).data
+        self.assertEqual(data['items'][0]['item_details']['material_name'], 'Oak')
+
+        item = {'item_type': 'material', 'item_id': self.materials[1].pk, 'quantity': 2, 'unit_price': 4}
+        data = EstimateItemSerializer(item).data
+        self.assertEqual((data['item_details']['material_name'], data['item_total_cost']), ('Pine', 8.0))
+
+        missing = EstimateItemSerializer({**item, 'item_id': 0}).data
+        self.assertEqual(missing['item_details'], {'error': 'material with id 0 not found'})
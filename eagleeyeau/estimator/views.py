@@ -1,15 +1,19 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Sum
 from django.utils import timezone
 from datetime import timedelta
+from decimal import Decimal, InvalidOperation
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .models import Estimate
 from .serializers import EstimateSerializer, EstimateListSerializer
 from eagleeyeau.response_formatter import format_response
+from eagleeyeau.status_counts import estimate_status_counts
+from eagleeyeau.dashboard_cache import get_or_compute
 
 
 class EstimateViewSet(viewsets.ModelViewSet):
@@ -47,48 +51,81 @@ class EstimateViewSet(viewsets.ModelViewSet):
             # Estimators see only their own estimates
             return Estimate.objects.filter(created_by=user).order_by('-created_at')
     
+    def filter_queryset(self, queryset):
+        """
+        Apply value range filters and sorting for the list endpoint.
+        
+        Query Parameters:
+        - min_value / max_value: Range filter on total_with_tax
+        - sort_by: created_at, estimate_date, end_date, total_value (default: created_at)
+        - sort_order: asc or desc (default: desc)
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+        
+        params = self.request.query_params
+        min_value = params.get('min_value', '').strip()
+        max_value = params.get('max_value', '').strip()
+        
+        try:
+            if min_value:
+                queryset = queryset.filter(total_with_tax__gte=Decimal(min_value))
+            if max_value:
+                queryset = queryset.filter(total_with_tax__lte=Decimal(max_value))
+        except InvalidOperation:
+            raise ValidationError({'detail': 'min_value and max_value must be numbers'})
+        
+        sort_mapping = {
+            'created_at': 'created_at',
+            'estimate_date': 'estimate_date',
+            'end_date': 'end_date',
+            'total_value': 'total_with_tax',
+        }
+        sort_by = params.get('sort_by', 'created_at').strip()
+        sort_order = params.get('sort_order', 'desc').strip().lower()
+        sort_field = sort_mapping.get(sort_by, 'created_at')
+        sort_prefix = '' if sort_order == 'asc' else '-'
+        
+        return queryset.order_by(f'{sort_prefix}{sort_field}', f'{sort_prefix}id')
+    
     def get_serializer_class(self):
         """Use different serializers for list vs detail"""
         if self.action == 'list':
             return EstimateListSerializer
         return EstimateSerializer
     
+    @swagger_auto_schema(
+        operation_summary="List estimates with status counts",
+        manual_parameters=[
+            openapi.Parameter('min_value', openapi.IN_QUERY, description='Minimum total_with_tax', type=openapi.TYPE_NUMBER),
+            openapi.Parameter('max_value', openapi.IN_QUERY, description='Maximum total_with_tax', type=openapi.TYPE_NUMBER),
+            openapi.Parameter('sort_by', openapi.IN_QUERY, description='created_at, estimate_date, end_date or total_value', type=openapi.TYPE_STRING),
+            openapi.Parameter('sort_order', openapi.IN_QUERY, description='asc or desc (default: desc)', type=openapi.TYPE_STRING),
+        ],
+        tags=['Estimates']
+    )
     def list(self, request, *args, **kwargs):
         """List estimates with status counts"""
         queryset = self.filter_queryset(self.get_queryset())
         
-        # Get counts
-        total = queryset.count()
-        pending = queryset.filter(status='pending').count()
-        sent = queryset.filter(status='sent').count()
-        approved = queryset.filter(status='approved').count()
-        rejected = queryset.filter(status='rejected').count()
+        # Get counts (single aggregate query)
+        status_counts = estimate_status_counts(queryset)
+        counts = {'total': status_counts['total'], **status_counts['status']}
         
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             response = self.get_paginated_response(serializer.data)
             response.data = {
-                'counts': {
-                    'total': total,
-                    'pending': pending,
-                    'sent': sent,
-                    'approved': approved,
-                    'rejected': rejected,
-                },
+                'counts': counts,
                 'results': response.data
             }
             return response
         
         serializer = self.get_serializer(queryset, many=True)
         return Response({
-            'counts': {
-                'total': total,
-                'pending': pending,
-                'sent': sent,
-                'approved': approved,
-                'rejected': rejected,
-            },
+            'counts': counts,
             'results': serializer.data
         })
     
@@ -271,39 +308,38 @@ class EstimateViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     @swagger_auto_schema(
         operation_summary="Download estimate as PDF",
-        operation_description="Download complete estimate information as a PDF file with all items, pricing, and totals.",
-        responses={200: openapi.Response(description="PDF file with estimate information")},
+        operation_description=(
+            "Download complete estimate information as a PDF file with all items, pricing, and totals. "
+            "PDFs are rendered in the background and cached until the estimate changes; if rendering "
+            "takes longer than the server wait (or async=true is passed) a 202 is returned with a "
+            "download_url to poll."
+        ),
+        manual_parameters=[
+            openapi.Parameter('async', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+                              description='Return 202 immediately instead of waiting for a fresh render'),
+        ],
+        responses={
+            200: openapi.Response(description="PDF file with estimate information"),
+            202: openapi.Response(description="PDF is being generated; poll download_url"),
+        },
         tags=['Estimates']
     )
     def download_pdf(self, request, pk=None):
-        """Download estimate as PDF"""
+        """Download estimate as PDF (rendered in the background and cached)"""
         try:
+            from eagleeyeau.pdf_rendering import pdf_download_response
+            from .pdf import build_estimate_pdf, estimate_pdf_fingerprint
+
             estimate = self.get_object()
-            pdf_content = self._generate_estimate_pdf(estimate)
-            
-            if not pdf_content:
-                return Response(
-                    format_response(
-                        success=False,
-                        message="Error generating PDF",
-                        data=None
-                    ),
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            from django.http import FileResponse
-            import io
-            
-            pdf_buffer = io.BytesIO(pdf_content)
-            filename = f"Estimate_{estimate.serial_number}.pdf"
-            response = FileResponse(
-                pdf_buffer,
-                content_type='application/pdf',
-                as_attachment=True,
-                filename=filename
+            return pdf_download_response(
+                request,
+                'estimate',
+                estimate.pk,
+                estimate_pdf_fingerprint(estimate),
+                build_estimate_pdf,
+                filename=f"Estimate_{estimate.serial_number}.pdf"
             )
-            return response
-        
+
         except Exception as e:
             return Response(
                 format_response(
@@ -313,189 +349,7 @@ class EstimateViewSet(viewsets.ModelViewSet):
                 ),
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _generate_estimate_pdf(self, estimate):
-        """Generate PDF of the estimate with all details"""
-        try:
-            from io import BytesIO
-            from reportlab.lib.pagesizes import letter
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.lib import colors
-            from datetime import datetime
-            
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=22,
-                textColor=colors.HexColor('#1f4788'),
-                spaceAfter=12,
-                fontName='Helvetica-Bold'
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=13,
-                textColor=colors.HexColor('#2d5aa6'),
-                spaceAfter=8,
-                spaceBefore=10,
-                fontName='Helvetica-Bold'
-            )
-            
-            # Title
-            elements.append(Paragraph(f"ESTIMATE: {estimate.serial_number}", title_style))
-            if estimate.estimate_number:
-                elements.append(Paragraph(f"Estimate #: {estimate.estimate_number}", styles['Normal']))
-            elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== ESTIMATE DETAILS =====
-            elements.append(Paragraph("ESTIMATE DETAILS", heading_style))
-            details_data = [
-                ['Field', 'Value'],
-                ['Client Name', estimate.client_name or 'N/A'],
-                ['Project Name', estimate.project_name or 'N/A'],
-                ['Serial Number', estimate.serial_number],
-                ['Status', estimate.status.replace('_', ' ').title()],
-                ['Created Date', estimate.estimate_date.strftime('%Y-%m-%d') if estimate.estimate_date else 'N/A'],
-                ['End Date', estimate.end_date.strftime('%Y-%m-%d') if estimate.end_date else 'N/A'],
-                ['Created By', estimate.created_by.email if estimate.created_by else 'System'],
-            ]
-            
-            details_table = Table(details_data, colWidths=[1.8*inch, 3.7*inch])
-            details_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')]),
-            ]))
-            elements.append(details_table)
-            elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== ITEMS TABLE =====
-            if estimate.items:
-                elements.append(Paragraph("ESTIMATE ITEMS", heading_style))
-                
-                items_data = [
-                    ['Item Type', 'Item', 'Qty', 'Unit Price', 'Item Total', 'Notes']
-                ]
-                
-                for item in estimate.items:
-                    item_type = item.get('item_type', 'N/A')
-                    item_id = item.get('item_id', 'N/A')
-                    quantity = item.get('quantity', 0)
-                    unit_price = item.get('unit_price', 0)
-                    item_total = quantity * unit_price
-                    notes = item.get('notes', '')[:50]
-                    
-                    items_data.append([
-                        item_type.title(),
-                        f"ID: {item_id}",
-                        str(quantity),
-                        f"${float(unit_price):,.2f}",
-                        f"${item_total:,.2f}",
-                        notes or '-'
-                    ])
-                
-                items_table = Table(items_data, colWidths=[0.9*inch, 0.8*inch, 0.6*inch, 1.1*inch, 1.1*inch, 1.4*inch])
-                items_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fafafa')]),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ]))
-                elements.append(items_table)
-                elements.append(Spacer(1, 0.2 * inch))
-            
-            # ===== PRICING SUMMARY =====
-            elements.append(Paragraph("PRICING SUMMARY", heading_style))
-            
-            total_cost = estimate.total_cost
-            profit_margin = estimate.profit_margin
-            total_with_profit = estimate.total_with_profit
-            tax = estimate.income_tax
-            total_with_tax = estimate.total_with_tax
-            
-            pricing_data = [
-                ['Description', 'Amount'],
-                ['Subtotal', f"${total_cost:,.2f}"],
-                [f'Profit Margin ({profit_margin}%)', f"${total_with_profit - total_cost:,.2f}"],
-                ['Subtotal with Profit', f"${total_with_profit:,.2f}"],
-                [f'Tax ({tax}%)', f"${total_with_tax - total_with_profit:,.2f}"],
-                ['TOTAL AMOUNT', f"${total_with_tax:,.2f}"],
-            ]
-            
-            pricing_table = Table(pricing_data, colWidths=[3.25*inch, 2.25*inch])
-            pricing_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f0f8')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#d4e6f1')),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, -1), (-1, -1), 11),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f9f9f9')]),
-            ]))
-            elements.append(pricing_table)
-            elements.append(Spacer(1, 0.2 * inch))
-            
-            # ===== ROOMS =====
-            if estimate.targeted_rooms:
-                elements.append(Paragraph("TARGETED ROOMS", heading_style))
-                rooms_text = ', '.join(estimate.targeted_rooms) if isinstance(estimate.targeted_rooms, list) else str(estimate.targeted_rooms)
-                elements.append(Paragraph(rooms_text, styles['BodyText']))
-                elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== NOTES =====
-            if estimate.notes:
-                elements.append(Paragraph("NOTES", heading_style))
-                elements.append(Paragraph(estimate.notes, styles['BodyText']))
-                elements.append(Spacer(1, 0.15 * inch))
-            
-            # ===== FOOTER =====
-            elements.append(Spacer(1, 0.3 * inch))
-            footer_style = ParagraphStyle(
-                'Footer',
-                parent=styles['Normal'],
-                fontSize=8,
-                textColor=colors.grey,
-                alignment=1
-            )
-            elements.append(Paragraph(
-                f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Lignaflow Estimating System",
-                footer_style
-            ))
-            
-            # Build PDF
-            doc.build(elements)
-            return buffer.getvalue()
-        
-        except ImportError:
-            return None
-        except Exception as e:
-            return None
-    
+
     @swagger_auto_schema(
         operation_summary="Get estimates by status",
         operation_description="Filter estimates by status (pending, sent, approved, rejected).",
@@ -578,6 +432,130 @@ class EstimateViewSet(viewsets.ModelViewSet):
 
 
 # ====================== ESTIMATOR DASHBOARD API ======================
+def _estimator_dashboard_data(user, is_admin):
+    """Compute the estimator dashboard payload (cached per company and user by estimator_dashboard)"""
+    today = timezone.now().date()
+    thirty_days_later = today + timedelta(days=30)
+
+    # Get user's estimates (Admins see their company's, Estimators only their own)
+    if is_admin:
+        all_estimates = Estimate.objects.for_company(user)
+    else:
+        all_estimates = Estimate.objects.filter(created_by=user)
+
+    # ========== OVERVIEW STATISTICS ==========
+    status_counts = estimate_status_counts(all_estimates)
+    total_estimates = status_counts['total']
+    pending_count = status_counts['status']['pending']
+    sent_count = status_counts['status']['sent']
+    approved_count = status_counts['status']['approved']
+    rejected_count = status_counts['status']['rejected']
+
+    # ========== VALUE SUMMARY ==========
+    # Sum the persisted total_with_tax per status in a single GROUP BY query
+    value_by_status = {
+        row['status']: float(row['value'] or 0)
+        for row in all_estimates.order_by().values('status').annotate(value=Sum('total_with_tax'))
+    }
+
+    pending_value = value_by_status.get('pending', 0.0)
+    sent_value = value_by_status.get('sent', 0.0)
+    approved_value = value_by_status.get('approved', 0.0)
+    rejected_value = value_by_status.get('rejected', 0.0)
+    total_value = pending_value + sent_value + approved_value + rejected_value
+
+    # ========== DUE SOON (Next 30 days) ==========
+    due_soon = all_estimates.filter(
+        end_date__isnull=False,
+        end_date__gte=today,
+        end_date__lte=thirty_days_later
+    ).order_by('end_date')[:10]
+
+    due_soon_data = []
+    for estimate in due_soon:
+        days_remaining = (estimate.end_date - today).days
+        due_soon_data.append({
+            'id': estimate.id,
+            'serial_number': estimate.serial_number,
+            'estimate_number': estimate.estimate_number,
+            'project_name': estimate.project_name,
+            'client_name': estimate.client_name,
+            'end_date': estimate.end_date.isoformat(),
+            'days_remaining': days_remaining,
+            'status': estimate.status,
+            'total_value': float(estimate.total_with_tax),
+        })
+
+    # ========== RECENT ESTIMATES (Last 10) ==========
+    recent_estimates = all_estimates.order_by('-created_at')[:10]
+
+    recent_data = []
+    for estimate in recent_estimates:
+        recent_data.append({
+            'id': estimate.id,
+            'serial_number': estimate.serial_number,
+            'estimate_number': estimate.estimate_number,
+            'project_name': estimate.project_name,
+            'client_name': estimate.client_name,
+            'status': estimate.status,
+            'created_at': estimate.created_at.isoformat(),
+            'total_value': float(estimate.total_with_tax),
+            'estimate_date': estimate.estimate_date.isoformat(),
+        })
+
+    # ========== COMPLETED ESTIMATES (Approved) ==========
+    completed_estimates = all_estimates.filter(status='approved').order_by('-updated_at')
+
+    completed_data = []
+    for estimate in completed_estimates:
+        completed_data.append({
+            'id': estimate.id,
+            'serial_number': estimate.serial_number,
+            'estimate_number': estimate.estimate_number,
+            'project_name': estimate.project_name,
+            'client_name': estimate.client_name,
+            'status': estimate.status,
+            'total_value': float(estimate.total_with_tax),
+            'estimate_date': estimate.estimate_date.isoformat(),
+            'approved_date': estimate.updated_at.isoformat(),
+        })
+
+    # ========== PERFORMANCE METRICS ==========
+    approval_rate = (approved_count / total_estimates * 100) if total_estimates > 0 else 0
+    rejection_rate = (rejected_count / total_estimates * 100) if total_estimates > 0 else 0
+    pending_rate = (pending_count / total_estimates * 100) if total_estimates > 0 else 0
+    average_value = total_value / total_estimates if total_estimates > 0 else 0
+
+    # ========== COMPILE RESPONSE ==========
+    dashboard_data = {
+        'overview': {
+            'total_estimates': total_estimates,
+            'pending': pending_count,
+            'sent': sent_count,
+            'approved': approved_count,
+            'rejected': rejected_count,
+        },
+        'value_summary': {
+            'pending_value': round(pending_value, 2),
+            'sent_value': round(sent_value, 2),
+            'approved_value': round(approved_value, 2),
+            'rejected_value': round(rejected_value, 2),
+            'total_value': round(total_value, 2),
+        },
+        'due_soon': due_soon_data,
+        'recent_estimates': recent_data,
+        'completed_estimates': completed_data,
+        'performance': {
+            'approval_rate': round(approval_rate, 2),
+            'rejection_rate': round(rejection_rate, 2),
+            'pending_rate': round(pending_rate, 2),
+            'average_estimate_value': round(average_value, 2),
+        },
+    }
+    
+    return dashboard_data
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 @swagger_auto_schema(
@@ -672,125 +650,16 @@ def estimator_dashboard(request):
     Example: /api/estimator/dashboard/
     """
     try:
-        today = timezone.now().date()
-        thirty_days_later = today + timedelta(days=30)
-        
-        # Get user's estimates (Estimators see only their own)
-        is_admin = request.user.role == 'Admin' if hasattr(request.user, 'role') else request.user.is_staff
-        
-        if is_admin:
-            all_estimates = Estimate.objects.all()
-        else:
-            all_estimates = Estimate.objects.filter(created_by=request.user)
-        
-        # ========== OVERVIEW STATISTICS ==========
-        total_estimates = all_estimates.count()
-        pending_count = all_estimates.filter(status='pending').count()
-        sent_count = all_estimates.filter(status='sent').count()
-        approved_count = all_estimates.filter(status='approved').count()
-        rejected_count = all_estimates.filter(status='rejected').count()
-        
-        # ========== VALUE SUMMARY ==========
-        # Calculate total value for each status by summing total_with_tax for each estimate
-        pending_estimates = all_estimates.filter(status='pending')
-        sent_estimates = all_estimates.filter(status='sent')
-        approved_estimates = all_estimates.filter(status='approved')
-        rejected_estimates = all_estimates.filter(status='rejected')
-        
-        pending_value = sum([float(est.total_with_tax) for est in pending_estimates])
-        sent_value = sum([float(est.total_with_tax) for est in sent_estimates])
-        approved_value = sum([float(est.total_with_tax) for est in approved_estimates])
-        rejected_value = sum([float(est.total_with_tax) for est in rejected_estimates])
-        total_value = pending_value + sent_value + approved_value + rejected_value
-        
-        # ========== DUE SOON (Next 30 days) ==========
-        due_soon = all_estimates.filter(
-            end_date__isnull=False,
-            end_date__gte=today,
-            end_date__lte=thirty_days_later
-        ).order_by('end_date')[:10]
-        
-        due_soon_data = []
-        for estimate in due_soon:
-            days_remaining = (estimate.end_date - today).days
-            due_soon_data.append({
-                'id': estimate.id,
-                'serial_number': estimate.serial_number,
-                'estimate_number': estimate.estimate_number,
-                'project_name': estimate.project_name,
-                'client_name': estimate.client_name,
-                'end_date': estimate.end_date.isoformat(),
-                'days_remaining': days_remaining,
-                'status': estimate.status,
-                'total_value': float(estimate.total_with_tax),
-            })
-        
-        # ========== RECENT ESTIMATES (Last 10) ==========
-        recent_estimates = all_estimates.order_by('-created_at')[:10]
-        
-        recent_data = []
-        for estimate in recent_estimates:
-            recent_data.append({
-                'id': estimate.id,
-                'serial_number': estimate.serial_number,
-                'estimate_number': estimate.estimate_number,
-                'project_name': estimate.project_name,
-                'client_name': estimate.client_name,
-                'status': estimate.status,
-                'created_at': estimate.created_at.isoformat(),
-                'total_value': float(estimate.total_with_tax),
-                'estimate_date': estimate.estimate_date.isoformat(),
-            })
-        
-        # ========== COMPLETED ESTIMATES (Approved) ==========
-        completed_estimates = all_estimates.filter(status='approved').order_by('-updated_at')
-        
-        completed_data = []
-        for estimate in completed_estimates:
-            completed_data.append({
-                'id': estimate.id,
-                'serial_number': estimate.serial_number,
-                'estimate_number': estimate.estimate_number,
-                'project_name': estimate.project_name,
-                'client_name': estimate.client_name,
-                'status': estimate.status,
-                'total_value': float(estimate.total_with_tax),
-                'estimate_date': estimate.estimate_date.isoformat(),
-                'approved_date': estimate.updated_at.isoformat(),
-            })
-        
-        # ========== PERFORMANCE METRICS ==========
-        approval_rate = (approved_count / total_estimates * 100) if total_estimates > 0 else 0
-        rejection_rate = (rejected_count / total_estimates * 100) if total_estimates > 0 else 0
-        pending_rate = (pending_count / total_estimates * 100) if total_estimates > 0 else 0
-        average_value = total_value / total_estimates if total_estimates > 0 else 0
+        user = request.user
+        is_admin = user.role == 'Admin' if hasattr(user, 'role') else user.is_staff
         
-        # ========== COMPILE RESPONSE ==========
-        dashboard_data = {
-            'overview': {
-                'total_estimates': total_estimates,
-                'pending': pending_count,
-                'sent': sent_count,
-                'approved': approved_count,
-                'rejected': rejected_count,
-            },
-            'value_summary': {
-                'pending_value': round(pending_value, 2),
-                'sent_value': round(sent_value, 2),
-                'approved_value': round(approved_value, 2),
-                'rejected_value': round(rejected_value, 2),
-                'total_value': round(total_value, 2),
-            },
-            'due_soon': due_soon_data,
-            'recent_estimates': recent_data,
-            'completed_estimates': completed_data,
-            'performance': {
-                'approval_rate': round(approval_rate, 2),
-                'rejection_rate': round(rejection_rate, 2),
-                'pending_rate': round(pending_rate, 2),
-                'average_estimate_value': round(average_value, 2),
-            },
-        }
+        # Admins see their company's estimates, estimators only their own
+        dashboard_data = get_or_compute(
+            'estimator_dashboard',
+            user.company_id,
+            lambda: _estimator_dashboard_data(user, is_admin),
+            vary=f"{'all' if is_admin else user.pk}:{timezone.now().date().isoformat()}",
+        )
         
         return Response(
             format_response(
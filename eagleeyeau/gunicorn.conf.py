@@ -0,0 +1,53 @@
+"""
+Gunicorn configuration for the production container (see entrypoint.sh).
+
+Every value can be overridden from the environment:
+
+- GUNICORN_BIND (0.0.0.0:8005)
+- GUNICORN_WORKERS (2 x CPU count + 1)
+- GUNICORN_WORKER_CLASS (gthread) and GUNICORN_THREADS (4)
+- GUNICORN_TIMEOUT (120) and GUNICORN_GRACEFUL_TIMEOUT (30)
+- GUNICORN_MAX_REQUESTS (1000) and GUNICORN_MAX_REQUESTS_JITTER (100)
+
+The app is preloaded in the master, so workers share its imported code
+copy-on-write. Each worker is recycled gracefully after about
+MAX_REQUESTS requests; the jitter keeps workers from restarting together.
+
+Workers are separate processes, so anything kept in process memory is not
+shared between them. The Django caches must be a shared backend (Redis via
+CACHE_BACKEND / DASHBOARD_CACHE_BACKEND, or at least the file-based default
+on a single host): dashboard invalidation, the recompute lock and the
+read-your-writes replica pins all rely on every worker seeing the same cache.
+"""
+import multiprocessing
+import os
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8005')
+
+workers = int(os.environ.get('GUNICORN_WORKERS') or multiprocessing.cpu_count() * 2 + 1)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+# Threads let a worker keep serving while one request waits on a PDF render or export stream
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+preload_app = True
+
+# Graceful recycling: a worker finishes its in-flight requests before exiting
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Trust X-Forwarded-* from nginx; narrow this when port 8005 is reachable from outside
+forwarded_allow_ips = os.environ.get('GUNICORN_FORWARDED_ALLOW_IPS', '*')
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def pre_fork(server, worker):
+    # Don't let workers inherit a database connection opened while preloading
+    from django.db import connections
+    connections.close_all()
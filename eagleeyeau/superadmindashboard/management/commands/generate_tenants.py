@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from eagleeyeau.synthetic import DEFAULT_PASSWORD, SCALES, generate_tenants
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic tenant companies (users, catalogue, estimates, projects, timers) for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=1, help='Number of companies to create (default: 1)')
+        parser.add_argument(
+            '--scale',
+            choices=list(SCALES),
+            default='small',
+            help='Rows per company preset (default: small)'
+        )
+        for size in SCALES['small']:
+            parser.add_argument(
+                f'--{size.replace("_", "-")}',
+                type=int,
+                dest=size,
+                help=f'Override the number of {size.replace("_", " ")} per company'
+            )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument('--prefix', default='synthetic', help='Company name prefix (default: synthetic)')
+        parser.add_argument(
+            '--password',
+            default=DEFAULT_PASSWORD,
+            help=f'Password of every generated user (default: {DEFAULT_PASSWORD})'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows written per bulk_create (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        if options['companies'] < 1:
+            raise CommandError('--companies must be at least 1')
+        overrides = {size: options[size] for size in SCALES['small'] if options[size] is not None}
+
+        self.stdout.write(self.style.WARNING(
+            f'Generating {options["companies"]} {options["scale"]} synthetic companies...'
+        ))
+
+        result = generate_tenants(
+            companies=options['companies'],
+            scale=options['scale'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            password=options['password'],
+            batch_size=options['batch_size'],
+            **overrides,
+        )
+
+        for model_name, count in result.counts.items():
+            self.stdout.write(f'  {model_name}: {count}')
+        names = ', '.join(company.name for company in result.companies)
+        self.stdout.write(self.style.SUCCESS(f'Created companies: {names}'))
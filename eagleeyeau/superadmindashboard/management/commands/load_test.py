@@ -0,0 +1,134 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from authentication.models import User
+from eagleeyeau.loadtest import MIXES, ROLES, LoadTestError, compare_reports, run_load_test
+from eagleeyeau.synthetic import DEFAULT_PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a role-based traffic mix against a running server and report per-endpoint '
+        'latency percentiles and throughput'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://localhost:8000',
+            help='Server to load (default: http://localhost:8000)'
+        )
+        parser.add_argument('--mix', choices=list(MIXES), default='default', help='Traffic mix (default: default)')
+        parser.add_argument('--users', type=int, default=10, help='Number of virtual users (default: 10)')
+        parser.add_argument('--duration', type=float, default=60, help='Run time in seconds (default: 60)')
+        parser.add_argument(
+            '--think-time',
+            type=float,
+            default=1.0,
+            help='Mean pause between requests of a virtual user in seconds (default: 1.0)'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument('--timeout', type=float, default=30, help='Request timeout in seconds (default: 30)')
+        parser.add_argument(
+            '--company-prefix',
+            default='synthetic',
+            help='Log in as users of companies whose name starts with this (default: synthetic, '
+                 'see generate_tenants)'
+        )
+        parser.add_argument(
+            '--password',
+            default=DEFAULT_PASSWORD,
+            help='Password of those users (default: the generate_tenants password)'
+        )
+        parser.add_argument(
+            '--credentials',
+            help='JSON file with a list of {"email", "password", "role"} objects to log in with instead'
+        )
+        parser.add_argument(
+            '--output',
+            help='Where to write the JSON report (default: load_test_<mix>_<timestamp>.json)'
+        )
+        parser.add_argument('--baseline', help='Earlier JSON report to compare this run with')
+
+    def get_credentials(self, options):
+        """Role -> [(email, password)] from --credentials or the tenant users"""
+        credentials = {role: [] for role in ROLES}
+        if options['credentials']:
+            try:
+                entries = json.loads(Path(options['credentials']).read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read {options["credentials"]}: {e}')
+            for entry in entries:
+                if entry.get('role') in credentials:
+                    credentials[entry['role']].append((entry['email'], entry['password']))
+            return credentials
+
+        users = User.objects.filter(
+            company__name__startswith=options['company_prefix'], role__in=ROLES, is_active=True
+        ).order_by('pk').values_list('email', 'role')
+        for email, role in users:
+            credentials[role].append((email, options['password']))
+        return credentials
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1')
+        credentials = self.get_credentials(options)
+
+        self.stdout.write(self.style.WARNING(
+            f'Running the {options["mix"]} mix with {options["users"]} users against '
+            f'{options["base_url"]} for {options["duration"]:g}s...'
+        ))
+        try:
+            report = run_load_test(
+                options['base_url'],
+                credentials,
+                mix=options['mix'],
+                users=options['users'],
+                duration=options['duration'],
+                think_time=options['think_time'],
+                seed=options['seed'],
+                timeout=options['timeout'],
+            )
+        except LoadTestError as e:
+            raise CommandError(str(e))
+
+        for failure in report['failures']:
+            self.stdout.write(self.style.ERROR(f'  {failure}'))
+
+        self.stdout.write(f'{"endpoint":<32} {"reqs":>6} {"errs":>5} {"rps":>8} {"p50":>8} {"p95":>8} {"p99":>8}')
+        rows = list(report['endpoints'].items()) + [('TOTAL', report['totals'])]
+        for name, stats in rows:
+            self.stdout.write(
+                f'{name:<32} {stats["requests"]:>6} {stats["errors"]:>5} {stats["rps"]:>8.2f} '
+                f'{stats["p50_ms"] or 0:>8.1f} {stats["p95_ms"] or 0:>8.1f} {stats["p99_ms"] or 0:>8.1f}'
+            )
+
+        output = options['output'] or (
+            f'load_test_{options["mix"]}_{datetime.now().strftime("%Y%m%d-%H%M%S")}.json'
+        )
+        Path(output).write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Report written to {output}'))
+
+        if options['baseline']:
+            try:
+                baseline = json.loads(Path(options['baseline']).read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read {options["baseline"]}: {e}')
+            self.stdout.write(f'\nCompared with {options["baseline"]}:')
+            for row in compare_reports(baseline, report):
+                self.stdout.write(
+                    f'{row["endpoint"]:<32} rps {_pair(row["rps"])} ({_pct(row["rps_change_pct"])})  '
+                    f'p95 {_pair(row["p95_ms"])} ({_pct(row["p95_change_pct"])})'
+                )
+
+
+def _pair(values):
+    before, after = values
+    return f'{"-" if before is None else before} -> {"-" if after is None else after}'
+
+
+def _pct(value):
+    return 'n/a' if value is None else f'{value:+.1f}%'
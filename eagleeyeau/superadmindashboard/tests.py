@@ -1,3 +1,275 @@
-from django.test import TestCase
+import json
+import logging
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.http import HttpResponse
+from django.core.servers.basehttp import WSGIServer
+from django.test import LiveServerTestCase, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.testcases import LiveServerThread, QuietWSGIRequestHandler
+from rest_framework.test import APITestCase
+
+from authentication.models import Company, User
+from emopye.models import TaskTimer, TaskTimerDailyRollup
+from estimator.models import Estimate
+from Project_manager.models import Project
+from Project_manager.project_status import TASK_COUNT_AGGREGATES, derive_project_status
+from eagleeyeau.loadtest import ROLE_ACTIONS, assign_roles, compare_reports, percentile
+from eagleeyeau.logging_handlers import QueueFileHandler
+from eagleeyeau.metrics import collector
+from eagleeyeau.middleware import RequestLoggingMiddleware
+from eagleeyeau.synthetic import SCALES, generate_tenants
+
+
+class GenerateTenantsTests(TestCase):
+    """The synthetic tenant generator behind the query-budget tests"""
+
+    def test_command_creates_requested_companies(self):
+        out = StringIO()
+        call_command('generate_tenants', '--companies', '2', '--employees', '4', stdout=out)
+
+        companies = Company.objects.filter(name__startswith='synthetic ')
+        self.assertEqual(companies.count(), 2)
+        for company in companies:
+            self.assertEqual(User.objects.filter(company=company, role='Employee').count(), 4)
+            self.assertEqual(Project.objects.filter(company=company).count(), SCALES['small']['projects'])
+        self.assertIn('Created companies: synthetic 0001, synthetic 0002', out.getvalue())
+
+        # A second run adds new tenants instead of colliding with the first
+        call_command('generate_tenants', stdout=StringIO())
+        self.assertTrue(Company.objects.filter(name='synthetic 0003').exists())
+
+    def test_command_rejects_zero_companies(self):
+        with self.assertRaises(CommandError):
+            call_command('generate_tenants', '--companies', '0', stdout=StringIO())
+
+    def test_unknown_sizes_are_rejected(self):
+        with self.assertRaises(ValueError):
+            generate_tenants(widgets=3)
+
+    def test_derived_values_match_save_logic(self):
+        company = generate_tenants(scale='small', seed=3).companies[0]
+
+        for user in User.objects.filter(company=company):
+            self.assertEqual(user.company_name, company.name)
+
+        for estimate in Estimate.objects.filter(company=company):
+            stored = (estimate.total_cost, estimate.total_with_profit, estimate.total_with_tax)
+            estimate.calculate_totals()
+            self.assertEqual(stored, (estimate.total_cost, estimate.total_with_profit, estimate.total_with_tax))
+
+        for project in Project.objects.filter(company=company):
+            counts = project.tasks.order_by().aggregate(**TASK_COUNT_AGGREGATES)
+            self.assertEqual(project.status, derive_project_status(project.status, counts))
+
+        timers = TaskTimer.objects.filter(employee__company=company)
+        rollups = TaskTimerDailyRollup.objects.filter(employee__company=company)
+        self.assertEqual(
+            rollups.aggregate(total=Sum('total_seconds'))['total'],
+            timers.filter(is_active=False).aggregate(total=Sum('duration_seconds'))['total'],
+        )
+        self.assertEqual(rollups.aggregate(total=Sum('session_count'))['total'], timers.count())
+
+
+class LoadTestHelperTests(SimpleTestCase):
+    """Pure helpers of the load-testing harness"""
+
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_assign_roles_follows_the_mix(self):
+        roles = assign_roles({'Employee': 60, 'Project Manager': 15, 'Estimator': 15, 'Admin': 10}, 10)
+        self.assertEqual(len(roles), 10)
+        self.assertEqual(roles.count('Employee'), 6)
+        self.assertEqual(roles.count('Admin'), 1)
+
+    def test_compare_reports_marks_missing_endpoints(self):
+        baseline = {'endpoints': {'a': {'rps': 10, 'p95_ms': 100}}}
+        current = {'endpoints': {'a': {'rps': 12, 'p95_ms': 80}, 'b': {'rps': 1, 'p95_ms': 5}}}
+        rows = {row['endpoint']: row for row in compare_reports(baseline, current)}
+        self.assertEqual(rows['a']['rps_change_pct'], 20.0)
+        self.assertEqual(rows['a']['p95_change_pct'], -20.0)
+        self.assertIsNone(rows['b']['rps_change_pct'])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class RequestMetricsViewTests(APITestCase):
+    """/api/superadmin/metrics/: tenant Admins can read, only platform staff can reset"""
+
+    url = '/api/superadmin/metrics/'
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin@example.com', password='pw12345!',
+            role='Admin', company_name='Acme',
+        )
+        collector.reset()
+        self.addCleanup(collector.reset)
+        collector.record('sample', 12.0, 3, 1.5, 100, 200)
+
+    def test_tenant_admin_can_read_but_not_reset(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('sample', [row['endpoint'] for row in response.data['data']['endpoints']])
+
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('sample', collector.snapshot()['endpoints'])
+
+    def test_staff_can_reset(self):
+        self.admin.is_staff = True
+        self.admin.save(update_fields=['is_staff'])
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('sample', collector.snapshot()['endpoints'])
+
+
+
+@override_settings(REQUEST_LOGGING={'BODY_SAMPLE_RATE': 1.0, 'BODY_EXCLUDE_PATHS': ['/api/auth/']})
+class RequestLoggingMiddlewareTests(SimpleTestCase):
+    """RequestLoggingMiddleware writes one JSON record per request"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def log(self, request, status=200):
+        middleware = RequestLoggingMiddleware(lambda request: HttpResponse('ok', status=status))
+        with self.assertLogs('eagleeyeau.requests', 'INFO') as logs:
+            middleware(request)
+        self.assertEqual(len(logs.records), 1)
+        return logs.records[0].levelname, json.loads(logs.records[0].getMessage())
+
+    def test_record_fields(self):
+        request = self.factory.post(
+            '/api/admin/materials/?page=2', data='{"material_name": "Oak"}', content_type='application/json',
+            HTTP_X_FORWARDED_FOR='203.0.113.5, 10.0.0.1',
+        )
+        request.user = User(pk=7)
+
+        level, record = self.log(request)
+
+        self.assertEqual(level, 'INFO')
+        self.assertEqual(record['method'], 'POST')
+        self.assertEqual(record['path'], '/api/admin/materials/')
+        self.assertEqual((record['status'], record['size'], record['user_id']), (200, 2, 7))
+        self.assertEqual((record['ip'], record['query']), ('203.0.113.5', 'page=2'))
+        self.assertEqual(record['body'], '{"material_name": "Oak"}')
+        self.assertGreaterEqual(record['duration_ms'], 0)
+
+    def test_auth_bodies_are_never_captured(self):
+        request = self.factory.post(
+            '/api/auth/login/', data='{"password": "secret"}', content_type='application/json',
+        )
+        level, record = self.log(request, status=400)
+        self.assertEqual(level, 'WARNING')
+        self.assertNotIn('body', record)
+
+    def test_excluded_paths_are_not_logged(self):
+        middleware = RequestLoggingMiddleware(lambda request: HttpResponse('ok'))
+        with self.assertNoLogs('eagleeyeau.requests'):
+            middleware(self.factory.get('/static/app.css'))
+
+
+class QueueFileHandlerTests(SimpleTestCase):
+    """QueueFileHandler writes records from a per-process listener thread"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'requests.log'
+        self.handler = QueueFileHandler(str(self.path))
+        self.handler.setFormatter(logging.Formatter('{message}', style='{'))
+        self.addCleanup(self.handler.close)
+
+    def emit(self, message):
+        self.handler.handle(logging.makeLogRecord({'msg': message, 'levelno': logging.INFO}))
+
+    def test_records_are_written_one_per_line(self):
+        self.emit('{"path":"/a"}')
+        self.emit('{"path":"/b"}')
+        self.handler.close()
+
+        self.assertEqual(self.path.read_text().splitlines(), ['{"path":"/a"}', '{"path":"/b"}'])
+
+    @skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_listener_restarts_after_fork(self):
+        self.emit('parent before fork')
+        pid = os.fork()
+        if pid == 0:
+            # Child: the parent's listener thread did not survive the fork
+            try:
+                self.emit('child')
+                self.handler.close()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        self.emit('parent after fork')
+        self.handler.close()
+
+        self.assertEqual(
+            sorted(self.path.read_text().splitlines()), ['child', 'parent after fork', 'parent before fork']
+        )
+
+class SerialLiveServerThread(LiveServerThread):
+    """
+    Live server that handles one request at a time. The threaded one shares
+    the in-memory SQLite connection between its request threads, which
+    deadlocks under concurrent virtual users.
+    """
+
+    def _create_server(self, connections_override=None):
+        return WSGIServer((self.host, self.port), QuietWSGIRequestHandler, allow_reuse_address=False)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class LoadTestCommandTests(LiveServerTestCase):
+    """A short load_test run against the live test server"""
+
+    server_thread_class = SerialLiveServerThread
+
+    def setUp(self):
+        # The mix downloads PDFs; keep the rendered files out of the source tree
+        pdf_cache = tempfile.TemporaryDirectory()
+        self.addCleanup(pdf_cache.cleanup)
+        settings_override = override_settings(PDF_RENDER={'CACHE_DIR': pdf_cache.name})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_run_reports_every_endpoint(self):
+        generate_tenants(scale='small', prefix='load')
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / 'report.json'
+            call_command(
+                'load_test', '--base-url', self.live_server_url, '--users', '4', '--duration', '3',
+                '--think-time', '0', '--company-prefix', 'load', '--output', str(output), stdout=StringIO(),
+            )
+            report = json.loads(output.read_text())
+
+        self.assertEqual(report['failures'], [])
+        self.assertEqual(report['roles'], {'Employee': 2, 'Project Manager': 1, 'Estimator': 1})
+        self.assertEqual(report['endpoints']['auth.login']['requests'], 4)
+        self.assertGreater(report['totals']['requests'], 4)
+        self.assertGreater(report['totals']['rps'], 0)
+        actions = {action.name: action for role in ROLE_ACTIONS.values() for action in role}
+        self.assertIn('employee.assigned_tasks', report['endpoints'])
+        for name, stats in report['endpoints'].items():
+            if name != 'auth.login':
+                self.assertEqual(stats['path'], actions[name].path)
+            self.assertEqual(stats['errors'], 0, name)
+            self.assertLessEqual(stats['p50_ms'], stats['p95_ms'], name)
+            self.assertLessEqual(stats['p95_ms'], stats['p99_ms'], name)
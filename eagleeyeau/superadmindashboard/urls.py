@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import TermsAndConditionsView, PrivacyPolicyView
+from .views import TermsAndConditionsView, PrivacyPolicyView, RequestMetricsView
 
 urlpatterns = [
     path('terms-and-conditions/', TermsAndConditionsView.as_view(), name='terms-and-conditions'),
     path('privacy-policy/', PrivacyPolicyView.as_view(), name='privacy-policy'),
+    path('metrics/', RequestMetricsView.as_view(), name='request-metrics'),
 ]
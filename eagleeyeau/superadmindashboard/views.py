@@ -128,3 +128,88 @@ class PrivacyPolicyView(APIView):
         serializer.is_valid(raise_exception=True)
         serializer.save(updated_by=request.user)
         return Response(serializer.data)
+
+
+# ====================== REQUEST METRICS ======================
+
+class IsAdminRole(permissions.BasePermission):
+    """Allow access only to authenticated Admin users (reads included)"""
+    message = PERMISSION_MESSAGES['ADMIN_ONLY']
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.role == 'Admin')
+
+
+class RequestMetricsView(APIView):
+    """
+    Per-endpoint latency and SQL query metrics collected by MetricsMiddleware
+    - GET: Summary for this worker process (Admin only)
+    - DELETE: Reset the collected samples (platform staff only: the samples
+      are process-wide, so a tenant Admin must not be able to wipe them)
+    """
+    permission_classes = [IsAdminRole]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Per-endpoint latency, SQL query count, SQL time and response size "
+            "(mean/p50/p95/p99/max over a rolling window) for the worker process "
+            "that serves the request. Admin only."
+        ),
+        manual_parameters=[
+            openapi.Parameter('sort_by', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=['p95', 'p99', 'queries', 'sql_time', 'requests'],
+                              description='Sort endpoints by this metric, descending (default: p95)'),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description='Only return the top N endpoints'),
+        ],
+        responses={200: "Request metrics", 403: PERMISSION_MESSAGES['ADMIN_ONLY']},
+        tags=['Super Admin Dashboard']
+    )
+    def get(self, request):
+        from eagleeyeau.metrics import collector
+
+        snapshot = collector.snapshot()
+
+        sort_by = request.query_params.get('sort_by', 'p95').strip()
+        sort_mapping = {
+            'p95': lambda item: item[1]['latency_ms']['p95'],
+            'p99': lambda item: item[1]['latency_ms']['p99'],
+            'queries': lambda item: item[1]['query_count']['p95'],
+            'sql_time': lambda item: item[1]['sql_time_ms']['p95'],
+            'requests': lambda item: item[1]['total_requests'],
+        }
+        key = sort_mapping.get(sort_by, sort_mapping['p95'])
+        endpoints = sorted(snapshot['endpoints'].items(), key=key, reverse=True)
+
+        limit = request.query_params.get('limit', '').strip()
+        if limit.isdigit():
+            endpoints = endpoints[:int(limit)]
+
+        snapshot['endpoints'] = [{'endpoint': name, **stats} for name, stats in endpoints]
+        return Response(format_response(
+            success=True,
+            message="Request metrics retrieved successfully",
+            data=snapshot
+        ))
+
+    @swagger_auto_schema(
+        operation_description="Reset the collected request metrics for this worker process. Superusers/staff only.",
+        responses={200: "Metrics reset", 403: PERMISSION_MESSAGES['SUPERADMIN_ONLY']},
+        tags=['Super Admin Dashboard']
+    )
+    def delete(self, request):
+        from eagleeyeau.metrics import collector
+
+        if not (request.user.is_superuser or request.user.is_staff):
+            return Response(format_response(
+                success=False,
+                message=PERMISSION_MESSAGES['SUPERADMIN_ONLY'],
+                data=None
+            ), status=status.HTTP_403_FORBIDDEN)
+
+        collector.reset()
+        return Response(format_response(
+            success=True,
+            message="Request metrics reset successfully",
+            data=None
+        ))
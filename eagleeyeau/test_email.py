@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eagleeyeau.settings')
 django.setup()
 
+from authentication.outbox import send_pending
 from authentication.utils import send_otp_email
 from authentication.models import OTP
 
@@ -26,7 +27,11 @@ def test_email():
     print(f"Sending test OTP to: {test_email_address}")
     print(f"Test OTP: {test_otp}")
     
+    # Queue the email, then send it the way the outbox worker would
     result = send_otp_email(test_email_address, test_otp, 'password_reset')
+    if result:
+        sent, failed = send_pending()
+        result = sent > 0 and not failed
     
     if result:
         print("✅ Email sent successfully!")
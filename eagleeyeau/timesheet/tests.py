@@ -1,3 +1,17 @@
-from django.test import TestCase
+from eagleeyeau.testing import QueryBudgetTestCase
 
-# Create your tests here.
+
+class TimesheetQueryBudgetTests(QueryBudgetTestCase):
+    """Query and response-time budgets of the clock-in / clock-out listings"""
+
+    def test_my_entries(self):
+        self.assertQueryBudget('Employee', '/api/timesheet/my-entries/', 1)
+
+    def test_weekly_hours(self):
+        self.assertQueryBudget('Employee', '/api/timesheet/weekly-hours/', 6)
+
+    def test_today_status(self):
+        self.assertQueryBudget('Employee', '/api/timesheet/today-status/', 1)
+
+    def test_admin_all_entries(self):
+        self.assertQueryBudget('Admin', '/api/timesheet/admin/all-entries/', 1)
@@ -178,7 +178,7 @@ class MyTimeEntriesView(generics.ListAPIView):
     serializer_class = TimeEntrySerializer
 
     def get_queryset(self):
-        return TimeEntry.objects.filter(user=self.request.user)
+        return TimeEntry.objects.filter(user=self.request.user).select_related('user')
 
     @swagger_auto_schema(
         manual_parameters=[
@@ -278,9 +278,9 @@ class AllEmployeeTimeEntriesView(generics.ListAPIView):
     def get_queryset(self):
         # Only admins can view all entries
         if self.request.user.role != 'Admin':
-            return TimeEntry.objects.filter(user=self.request.user)
+            return TimeEntry.objects.filter(user=self.request.user).select_related('user')
         
-        return TimeEntry.objects.all()
+        return TimeEntry.objects.select_related('user')
 
     @swagger_auto_schema(
         manual_parameters=[
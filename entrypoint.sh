@@ -15,6 +15,11 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
-# Start server
-echo "Starting Django server on port 8005..."
-python manage.py runserver 0.0.0.0:8005
+# Start server: gunicorn (settings in gunicorn.conf.py) unless DJANGO_SERVER=runserver
+if [ "${DJANGO_SERVER:-gunicorn}" = "runserver" ]; then
+  echo "Starting Django development server on port 8005..."
+  exec python manage.py runserver 0.0.0.0:8005
+fi
+
+echo "Starting gunicorn on port 8005..."
+exec gunicorn eagleeyeau.wsgi:application --config gunicorn.conf.py